@@ -1,11 +1,7 @@
-from flask import Blueprint
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+"""
+Snapped backend package.
 
-# Create Blueprint for API routes
-api_bp = Blueprint('api', __name__)
-
-# Import routes after Blueprint creation to avoid circular imports
-from app.shared import database 
-
-# Empty file to make app a package 
\ No newline at end of file
+Kept free of imports: CPU pool workers are spawned processes that import
+app.* modules to unpickle their task functions, so anything imported
+here would load (database clients included) in every worker.
+"""
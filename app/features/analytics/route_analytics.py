@@ -51,6 +51,8 @@ import pandas as pd
 import io
 import logging
 from app.shared.auth import get_current_user_group, get_filtered_query
+from app.shared.directory import client_directory, invalidate_client
+from app.shared.logging_config import capped
 import os
 from pathlib import Path
 from bson import ObjectId
@@ -123,7 +125,7 @@ async def get_client_id_from_username(username: str) -> str:
     Maps Snapchat username to internal client_id.
     
     Integration Points:
-        - ClientInfo collection: Primary source of client data
+        - ClientDirectory: cached, indexed ClientInfo lookup
         - Multiple field mappings for backwards compatibility
         
     Error Handling:
@@ -140,15 +142,8 @@ async def get_client_id_from_username(username: str) -> str:
         # Log the lookup attempt
         logger.info(f"Searching ClientInfo for username: {username}")
         
-        # Try multiple possible field names
-        client = await client_info_collection.find_one({
-            "$or": [
-                {"snap_username": username},
-                {"username": username},
-                {"Username": username},  # Check case variations
-                {"Snap_Username": username}
-            ]
-        })
+        # Checks snap_username, username, Username and Snap_Username
+        client = await client_directory.by_username(username)
         
         # Log what we found
         logger.info(f"Database lookup result: {client is not None}")
@@ -303,7 +298,7 @@ async def get_snapchat_analytics(
             if sample_doc.get('sessions'):
                 first_session = sample_doc['sessions'][0]
                 logger.info(f"First session date: {first_session.get('date')}")
-                logger.info(f"First session metrics: {json.dumps(first_session.get('metrics', {}), indent=2)}")
+                logger.debug("First session metrics: %s", capped(first_session.get('metrics', {})))
         
         # Build aggregation pipeline with improved date handling
         pipeline = [
@@ -361,13 +356,13 @@ async def get_snapchat_analytics(
         ]
         
         # Log the pipeline
-        logger.info(f"Snapchat analytics pipeline: {json.dumps(pipeline, indent=2)}")
+        logger.debug("Snapchat analytics pipeline: %s", capped(pipeline))
         
         # Execute aggregation
         result = await content_data_collection.aggregate(pipeline).to_list(length=None)
         
         # Log the raw result
-        logger.info(f"Aggregation result: {json.dumps(result, indent=2)}")
+        logger.debug("Aggregation result: %s", capped(result))
         
         if result:
             metrics = result[0]
@@ -402,7 +397,7 @@ async def get_snapchat_analytics(
             }
             
         # Log the final response
-        logger.info(f"Sending response: {json.dumps(response, indent=2)}")
+        logger.debug("Sending response: %s", capped(response))
         return response
         
     except Exception as e:
@@ -666,13 +661,13 @@ async def get_mobile_analytics(
 
             # Log everything for debugging
             logger.info(f"Date range: {formatted_start} to {formatted_end}")
-            logger.info(f"Pipeline: {json.dumps(pipeline, indent=2)}")
+            logger.debug("Pipeline: %s", capped(pipeline))
             logger.info(f"Sample clean date: {sample_doc.get('sessions', [{}])[0].get('date', '').split(',')[0] if sample_doc else 'No sample'}")
             
             result = await content_data_collection.aggregate(pipeline).to_list(length=None)
             
             # Log raw result
-            logger.info(f"Raw aggregation result: {json.dumps(result, indent=2)}")
+            logger.debug("Raw aggregation result: %s", capped(result))
             
             if result:
                 metrics = result[0]
@@ -790,6 +785,8 @@ async def sync_profile_analytics(
             }
         )
         logger.info(f"ClientInfo update result: {client_result.modified_count} modified")
+        if client_result.modified_count:
+            await invalidate_client(user_id)
 
         # If no document was updated, try to find it to debug
         if client_result.modified_count == 0:
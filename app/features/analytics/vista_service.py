@@ -56,11 +56,12 @@ Error Handling:
     - Storage conflicts
 """
 
-import aiohttp
+from app.shared.http_clients import http_session
+from app.shared.executors import run_cpu
+from app.shared.tabular import parse_csv
 import asyncio
 import zipfile
 import io
-import pandas as pd
 from datetime import datetime, timedelta, timezone
 import logging
 from app.shared.database import async_client
@@ -179,8 +180,8 @@ class VistaAnalyticsService:
         logger.info(f"Cookies: {cookies}")
         logger.info(f"Payload: {json_data}")
 
-        async with aiohttp.ClientSession(cookies=cookies) as session:
-            async with session.post(url, json=payload, headers=headers) as response:
+        async with http_session() as session:
+            async with session.post(url, json=payload, headers=headers, cookies=cookies) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error(f"Vista API error: {response.status}, Response: {error_text}")
@@ -245,7 +246,7 @@ class VistaAnalyticsService:
                 latest_date = max(dates)
                 logger.info(f"Latest existing session date for {snap_id}: {latest_date.strftime('%m-%d-%Y')}")
             
-            df = pd.read_csv(io.StringIO(csv_content))
+            df = await run_cpu(parse_csv, csv_content)
             logger.info(f"Found {len(df)} rows of data")
             
             # Group all sessions for this snap_id
@@ -13,7 +13,7 @@ System Architecture:
             - spotlight_collection: Spotlight videos
             - content_dump_collection: Archive content
             - saved_collection: Saved content
-            - client_info: Creator metadata
+            - client_info: Creator metadata (via ClientDirectory)
     
     - Directory Structure:
         /sc/
@@ -67,7 +67,7 @@ Error Handling:
     - Missing metadata
 """
 
-import requests
+from app.shared.http_clients import get_sync_http_session
 import json
 from datetime import datetime, date, timedelta, timezone
 import os
@@ -76,12 +76,14 @@ import logging
 import re
 from motor.motor_asyncio import AsyncIOMotorClient
 import asyncio
-from app.shared.database import upload_collection, spotlight_collection, content_dump_collection, client_info, saved_collection
+from app.shared.database import upload_collection, spotlight_collection, content_dump_collection, saved_collection
+from app.shared.directory import client_directory
 from fastapi import APIRouter, HTTPException, Request
 from dotenv import load_dotenv
 import traceback
 from app.features.video.video_splitter import VideoSplitter
 from app.shared.bunny_cdn import BunnyCDN
+from app.shared.jobs import JobContext, enqueue, job, job_accepted
 
 # Configure logging for content management operations
 logging.basicConfig(level=logging.INFO)
@@ -162,12 +164,14 @@ class BunnyScanner:
             - Network failures
             - Invalid paths
             - Authentication errors
+        
+        Blocking (requests); call through asyncio.to_thread from coroutines.
         """
         url = f"{self.base_url}{self.storage_zone}/{path.strip('/')}"
         if not url.endswith('/'):
             url += '/'
         logger.info(f"Requesting directory listing from: {url}")
-        response = requests.get(url, headers=self.headers)
+        response = get_sync_http_session().get(url, headers=self.headers)
         logger.info(f"Response status code: {response.status_code}")
         
         if response.status_code == 200:
@@ -257,7 +261,7 @@ class BunnyScanner:
         session_id = f"F({scan_date})_{client_id}"
         
         # Get client info including timezone
-        client_doc = await client_info.find_one({"client_id": client_id})
+        client_doc = await client_directory.get(client_id)
         client_timezone = client_doc.get("Timezone") if client_doc else None
         
         if not client_timezone:
@@ -321,7 +325,7 @@ class BunnyScanner:
                 folder_path = f"/sc/{client_id}/{content_type}/F({scan_date})_{client_id}/"
                 
             logger.info(f"Scanning folder path: {folder_path}")
-            files = self.list_directory(folder_path)
+            files = await asyncio.to_thread(self.list_directory, folder_path)
             
             if not files:
                 logger.info(f"No files found in {folder_path}")
@@ -369,7 +373,7 @@ class BunnyScanner:
             return
         logger.info("Starting BunnyCDN scan...")
         
-        sc_contents = self.list_directory("sc/")
+        sc_contents = await asyncio.to_thread(self.list_directory, "sc/")
         if not sc_contents:
             return
 
@@ -380,7 +384,7 @@ class BunnyScanner:
             client_id = client_dir["ObjectName"]
             logger.info(f"Scanning client: {client_id}")
             
-            content_dirs = self.list_directory(f"sc/{client_id}/")
+            content_dirs = await asyncio.to_thread(self.list_directory, f"sc/{client_id}/")
             if not content_dirs:
                 continue
 
@@ -431,7 +435,8 @@ class BunnyScanner:
                         {"_id": client_doc["_id"]},
                         {
                             "$set": {
-                                "sessions": [client_doc['sessions']]
+                                "sessions": [client_doc['sessions']],
+                                "last_updated": datetime.now(timezone.utc)
                             }
                         }
                     )
@@ -487,7 +492,7 @@ class BunnyScanner:
                 else:
                     # Add new session to existing document
                     # Get client info including snap_ID first
-                    client_info_doc = await client_info.find_one({"client_id": client_id})
+                    client_info_doc = await client_directory.get(client_id)
                     if not client_info_doc:
                         logger.error(f"No client info found for client {client_id}")
                         raise ValueError(f"Missing client info for {client_id}")
@@ -513,7 +518,7 @@ class BunnyScanner:
                     )
             else:
                 # Get client info including snap_ID
-                client_info_doc = await client_info.find_one({"client_id": client_id})
+                client_info_doc = await client_directory.get(client_id)
                 if not client_info_doc:
                     logger.error(f"No client info found for client {client_id}")
                     raise ValueError(f"Missing client info for {client_id}")
@@ -584,7 +589,7 @@ class BunnyScanner:
             if not client_doc:
                 logger.info("No client doc found, getting client info...")
                 # Get client info including snap_ID
-                client_info_doc = await client_info.find_one({"client_id": client_id})
+                client_info_doc = await client_directory.get(client_id)
                 if not client_info_doc:
                     logger.error(f"No client info found for client {client_id}")
                     raise ValueError(f"Missing client info for {client_id}")
@@ -725,7 +730,8 @@ class BunnyScanner:
                         {"_id": client_doc["_id"]},
                         {
                             "$set": {
-                                "sessions": [client_doc['sessions']]
+                                "sessions": [client_doc['sessions']],
+                                "last_updated": datetime.now(timezone.utc)
                             }
                         }
                     )
@@ -860,7 +866,8 @@ class BunnyScanner:
                         {"_id": client_doc["_id"]},
                         {
                             "$set": {
-                                "sessions": [client_doc['sessions']]
+                                "sessions": [client_doc['sessions']],
+                                "last_updated": datetime.now(timezone.utc)
                             }
                         }
                     )
@@ -912,7 +919,7 @@ class BunnyScanner:
                     )
                 else:
                     # Add new session to existing document
-                    client_info_doc = await client_info.find_one({"client_id": client_id})
+                    client_info_doc = await client_directory.get(client_id)
                     if not client_info_doc:
                         logger.error(f"No client info found for client {client_id}")
                         raise ValueError(f"Missing client info for {client_id}")
@@ -938,7 +945,7 @@ class BunnyScanner:
                     )
             else:
                 # Create new document with first session
-                client_info_doc = await client_info.find_one({"client_id": client_id})
+                client_info_doc = await client_directory.get(client_id)
                 if not client_info_doc:
                     logger.error(f"No client info found for client {client_id}")
                     raise ValueError(f"Missing client info for {client_id}")
@@ -991,7 +998,7 @@ class BunnyScanner:
         """
         logger.info(f"Scanning specific path: {path}")
         
-        files = self.list_directory(path)
+        files = await asyncio.to_thread(self.list_directory, path)
         logger.info(f"Found {len(files) if files else 0} files in path")
         
         if not files:
@@ -1057,7 +1064,7 @@ class BunnyScanner:
                 folder_path = f"/sc/{client_id}/{content_type}/F({scan_date})_{client_id}/"
             
             logger.info(f"Refreshing folder path: {folder_path}")
-            files = self.list_directory(folder_path)
+            files = await asyncio.to_thread(self.list_directory, folder_path)
             
             if not files:
                 logger.info(f"No files found in {folder_path}")
@@ -1084,7 +1091,7 @@ class BunnyScanner:
                 raise ValueError(f"Invalid content type: {content_type}")
             
             # Get client info
-            client_info_doc = await client_info.find_one({"client_id": client_id})
+            client_info_doc = await client_directory.get(client_id)
             if not client_info_doc and content_type != "CONTENT_DUMP":
                 logger.error(f"No client info found for client {client_id}")
                 raise ValueError(f"Missing client info for {client_id}")
@@ -1141,6 +1148,33 @@ class BunnyScanner:
             logger.error(f"Error in refresh_client_content: {e}")
             raise e
 
+@job("bunnyscan.store", queue="scans")
+async def store_content_job(ctx: JobContext, kind: str, data: Dict):
+    """
+    Store scanned content on a job worker.
+    
+    Args:
+        ctx: Job context
+        kind: stories, spotlight, content_dump or saved
+        data: Content metadata and file information
+        
+    Returns:
+        Dict: Operation result
+    """
+    scanner = BunnyScanner()
+    store = {
+        "stories": scanner.store_stories,
+        "spotlight": scanner.store_spotlight,
+        "content_dump": scanner.store_content_dump,
+        "saved": scanner.store_saved
+    }[kind]
+    return await store(data)
+
+async def _queue_store(kind: str, data: Dict):
+    # Every payload is stored; identical sessions are not deduplicated
+    job_id = await enqueue(store_content_job, key=data.get("client_ID"), dedupe=False, kind=kind, data=data)
+    return job_accepted(job_id)
+
 @router.post("/stories")
 async def api_store_stories(data: Dict):
     """
@@ -1148,14 +1182,13 @@ async def api_store_stories(data: Dict):
     
     Processing:
         1. Request validation
-        2. Scanner initialization
-        3. Content storage
+        2. Job queued
+        3. Content storage on a worker
         
     Returns:
-        Dict: Operation result
+        JSONResponse: 202 with job id
     """
-    scanner = BunnyScanner()
-    return await scanner.store_stories(data)
+    return await _queue_store("stories", data)
 
 @router.post("/spotlight")
 async def api_store_spotlight(data: Dict):
@@ -1164,14 +1197,13 @@ async def api_store_spotlight(data: Dict):
     
     Processing:
         1. Data validation
-        2. Scanner initialization
-        3. Content processing
+        2. Job queued
+        3. Content processing on a worker
         
     Returns:
-        Dict: Operation result
+        JSONResponse: 202 with job id
     """
-    scanner = BunnyScanner()
-    return await scanner.store_spotlight(data)
+    return await _queue_store("spotlight", data)
 
 @router.post("/content_dump")
 async def api_store_content_dump(data: Dict):
@@ -1180,14 +1212,13 @@ async def api_store_content_dump(data: Dict):
     
     Processing:
         1. Request validation
-        2. Scanner initialization
-        3. Archive storage
+        2. Job queued
+        3. Archive storage on a worker
         
     Returns:
-        Dict: Operation result
+        JSONResponse: 202 with job id
     """
-    scanner = BunnyScanner()
-    return await scanner.store_content_dump(data)
+    return await _queue_store("content_dump", data)
 
 @router.post("/saved")
 async def api_store_saved(data: Dict):
@@ -1196,14 +1227,38 @@ async def api_store_saved(data: Dict):
     
     Processing:
         1. Data validation
-        2. Scanner initialization
-        3. Content storage
+        2. Job queued
+        3. Content storage on a worker
         
     Returns:
-        Dict: Operation result
+        JSONResponse: 202 with job id
+    """
+    return await _queue_store("saved", data)
+
+@job("bunnyscan.scan_path", queue="scans")
+async def scan_path_job(ctx: JobContext, path: str, client_id: str, content_type: str, scan_date: str):
+    """
+    Scan one client's CDN folder on a job worker.
+    
+    Args:
+        ctx: Job context
+        path: Requested CDN path
+        client_id: Client identifier
+        content_type: CONTENT_DUMP, SPOTLIGHT, STORIES or SAVED
+        scan_date: Session date (MM-DD-YYYY)
+        
+    Returns:
+        Dict: Scan results and status
     """
     scanner = BunnyScanner()
-    return await scanner.store_saved(data)
+    await scanner.scan_client_content(client_id, content_type, scan_date)
+    return {
+        "status": "success",
+        "message": f"Scanned path: {path}",
+        "client_id": client_id,
+        "content_type": content_type,
+        "scan_date": scan_date
+    }
 
 @router.post("/scan-path")
 async def scan_specific_path(request: Request):
@@ -1217,67 +1272,53 @@ async def scan_specific_path(request: Request):
             - Type checking
         
         2. Content Processing:
-            - Scanner initialization
-            - Content type routing
             - Date handling
+            - Scan queued for a job worker
+            - One active scan per path
         
         3. Error Handling:
             - Invalid paths
-            - Processing failures
             - Missing data
     
     Returns:
-        Dict: Scan results and status
+        JSONResponse: 202 with job id
     """
-    try:
-        data = await request.json()
-        path = data.get("path")
-        if not path:
-            raise HTTPException(status_code=400, detail="Path is required")
+    data = await request.json()
+    path = data.get("path")
+    if not path:
+        raise HTTPException(status_code=400, detail="Path is required")
 
-        # Extract client_id and content_type from path
-        path_parts = path.strip("/").split("/")
-        if len(path_parts) >= 3 and path_parts[0] == "sc":
-            client_id = path_parts[1]
-            content_type = path_parts[2]
-            
-            scanner = BunnyScanner()
-            today = datetime.now()
-            scan_date = today.strftime("%m-%d-%Y")
-
-            # Handle different content types
-            if content_type == "CONTENT_DUMP":
-                # Content dump doesn't use dates, just scan the folder
-                await scanner.scan_client_content(client_id, content_type, scan_date)
-            elif content_type in ["SPOTLIGHT", "STORIES", "SAVED"]:
-                # Get scan date if available from F(date) pattern
-                if len(path_parts) > 3 and path_parts[3].startswith("F("):
-                    scan_date = path_parts[3].split("_")[0][2:-1]  # Extract date from F(date)
-                    logger.info(f"Extracted scan date: {scan_date} from path: {path}")
-                
-                try:
-                    await scanner.scan_client_content(client_id, content_type, scan_date)
-                except Exception as e:
-                    logger.error(f"Error in scan_client_content: {str(e)}")
-                    logger.error(f"Full traceback: {traceback.format_exc()}")
-                    raise
-            else:
-                logger.error(f"Invalid content type: {content_type}")
-                raise HTTPException(status_code=400, detail=f"Invalid content type: {content_type}")
-                    
-            return {
-                "status": "success",
-                "message": f"Scanned path: {path}",
-                "client_id": client_id,
-                "content_type": content_type,
-                "scan_date": scan_date
-            }
-            
+    # Extract client_id and content_type from path
+    path_parts = path.strip("/").split("/")
+    if len(path_parts) < 3 or path_parts[0] != "sc":
         raise HTTPException(status_code=400, detail="Invalid path format")
-        
+
+    client_id = path_parts[1]
+    content_type = path_parts[2]
+    scan_date = datetime.now().strftime("%m-%d-%Y")
+
+    if content_type in ["SPOTLIGHT", "STORIES", "SAVED"]:
+        # Get scan date if available from F(date) pattern
+        if len(path_parts) > 3 and path_parts[3].startswith("F("):
+            scan_date = path_parts[3].split("_")[0][2:-1]  # Extract date from F(date)
+            logger.info(f"Extracted scan date: {scan_date} from path: {path}")
+    elif content_type != "CONTENT_DUMP":
+        # Content dump doesn't use dates, just scan the folder
+        logger.error(f"Invalid content type: {content_type}")
+        raise HTTPException(status_code=400, detail=f"Invalid content type: {content_type}")
+
+    try:
+        job_id = await enqueue(
+            scan_path_job,
+            key=path,
+            path=path,
+            client_id=client_id,
+            content_type=content_type,
+            scan_date=scan_date
+        )
+        return job_accepted(job_id)
     except Exception as e:
-        logger.error(f"Error scanning path: {str(e)}")
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.error(f"Error queueing path scan: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # if __name__ == "__main__":
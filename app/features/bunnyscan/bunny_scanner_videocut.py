@@ -62,6 +62,7 @@ from app.features.video.flipmedia import flip_to_vertical
 from app.features.video.extendmedia import extend_video_cdn
 from app.features.video.video_splitter import VideoSplitter
 from app.shared.bunny_cdn import BunnyCDN
+from app.shared.executors import run_media
 from datetime import datetime
 import tempfile
 import re
@@ -130,7 +131,7 @@ class BunnyScanner:
             bool: True if video needs vertical conversion
         """
         try:
-            probe = ffmpeg.probe(f"{self.bunny.cdn_url}{file_path}")
+            probe = await run_media(ffmpeg.probe, f"{self.bunny.cdn_url}{file_path}")
             video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
             
             width = int(video_stream['width'])
@@ -218,7 +219,8 @@ class BunnyScanner:
                 try:
                     # Add a small delay to ensure file is available
                     await asyncio.sleep(1)
-                    duration = float(ffmpeg.probe(f"{self.bunny.cdn_url}{current_path}")['format']['duration'])
+                    probe = await run_media(ffmpeg.probe, f"{self.bunny.cdn_url}{current_path}")
+                    duration = float(probe['format']['duration'])
                     logger.info(f"Video duration: {duration}s")
                     
                     if duration < self.MIN_DURATION:
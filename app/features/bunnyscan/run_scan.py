@@ -53,6 +53,8 @@ from datetime import datetime
 import asyncio
 from app.features.bunnyscan.bunny_scanner_videocut import BunnyScanner as VideoClipper
 from app.features.bunnyscan.bunny_scanner import BunnyScanner as DatabaseScanner
+from app.shared.jobs import JobContext, job
+from app.shared.scheduler import scheduled
 
 async def main():
     """
@@ -86,6 +88,17 @@ async def main():
     # Then run DatabaseScanner
     await DatabaseScanner().scan_uploads()
 
+@scheduled("15 * * * *")
+@job("bunnyscan.scan_all", queue="scans", max_attempts=2, timeout=3 * 3600)
+async def scan_all_job(ctx: JobContext, fire_time: datetime):
+    """
+    Run the scanner pipeline on schedule (was scripts/run_bunny_scan.py).
+    
+    Missed hours are coalesced into a single scan.
+    """
+    await main()
+    return {"status": "success"}
+
 if __name__ == "__main__":
     asyncio.run(main())
 
@@ -16,6 +16,8 @@ import base64
 from openai import AsyncOpenAI
 import subprocess
 import tempfile
+from app.shared.executors import run_cpu, run_media
+from app.shared.imaging import to_jpeg_bytes
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/captions")
@@ -105,7 +107,7 @@ class CaptionGenerator:
             ]
             
             # Run ffmpeg
-            process = subprocess.run(cmd, capture_output=True, text=True)
+            process = await run_media(subprocess.run, cmd, capture_output=True, text=True)
             if process.returncode != 0:
                 logger.error(f"FFmpeg error: {process.stderr}")
                 raise ValueError("Failed to extract frame from video")
@@ -132,12 +134,7 @@ class CaptionGenerator:
                 logger.info(f"Processing file of type: {content_type}")
                 if content_type.startswith('image/'):
                     # For images, ensure they're in JPEG format
-                    image = Image.open(io.BytesIO(file_data))
-                    if image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    img_byte_arr = io.BytesIO()
-                    image.save(img_byte_arr, format='JPEG')
-                    image_data = img_byte_arr.getvalue()
+                    image_data = await run_cpu(to_jpeg_bytes, file_data)
                 elif content_type.startswith('video/'):
                     # Extract a frame from the video
                     logger.info("Extracting frame from video using FFmpeg")
@@ -81,12 +81,21 @@ Dependencies:
 Author: Snapped Development Team
 """
 
-from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Dict, Any, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime, timedelta
 from app.shared.auth import get_current_user_group, filter_by_partner
+from app.shared.responses import FastJSONResponse, dumps
+from app.shared.etags import document_versions, make_etag, etag_matches, etag_headers, not_modified
+from app.shared.cache import ReadThroughCache
+from app.shared.directory import client_directory
+from app.shared.invalidation import InvalidationEvent, on_invalidation
+from app.shared.media_store import media_store
+from app.shared.session_routes import session_router
+from app.shared.session_reader import FILE_MASKS, file_fields_for, list_sessions, read_session
+from app.shared.jobs import JobContext, PermanentJobError, enqueue, job, job_accepted
 from app.shared.database import (
     upload_collection,
     saved_collection,
@@ -97,9 +106,13 @@ from app.shared.database import (
 )
 import logging
 import base64
+import hashlib
+import orjson
 import ffmpeg
 import tempfile
-import aiohttp
+from app.shared.http_clients import http_session
+from app.shared.executors import run_cpu, run_media
+from app.shared.imaging import square_thumbnail
 import os
 from PIL import Image, ImageDraw
 from io import BytesIO
@@ -115,10 +128,147 @@ CLOUDFRONT_DOMAIN = "d2jpg2hi585lgz.cloudfront.net"
 
 logger = logging.getLogger(__name__)
 
+# Session and file fields the folder tree renders
+TREE_SESSION_FIELDS = (
+    "session_id", "folder_id", "folder_path", "scan_date", "upload_date",
+    "total_files_count", "total_files_size_human", "total_images", "total_videos",
+    "editor_note", "total_session_views", "avrg_session_view_time", "all_video_length"
+)
+TREE_FILE_FIELDS = (
+    "file_name", "file_type", "file_size_human", "CDN_link", "caption", "seq_number",
+    "is_thumbnail", "upload_time", "video_length", "is_indexed"
+)
+
+# Exactly the fields build_folder_tree renders
+FOLDER_TREE_PROJECTION = {
+    "_id": 0,
+    "client_ID": 1,
+    "snap_ID": 1,
+    "last_updated": 1,
+    **{f"sessions.{field}": 1 for field in TREE_SESSION_FIELDS},
+    **{f"sessions.files.{field}": 1 for field in TREE_FILE_FIELDS}
+}
+
+# Part of the list-folders ETag; bump when the tree's shape changes
+FOLDER_TREE_VERSION = 1
+
+# Session and file fields the gallery renders
+GALLERY_SESSION_FIELDS = (
+    "session_id", "folder_id", "scan_date", "upload_date", "total_files_count", "total_files_size_human", "editor_note"
+)
+GALLERY_FILE_FIELDS = TREE_FILE_FIELDS + ("thumbnail", "video_summary")
+
+# Gallery keys for renamed file fields (masked views)
+GALLERY_KEYS = {"file_name": "name", "file_type": "type"}
+
+# get_users per ACL scope: dropped when client documents are created or
+# removed; TTLs bound last_updated/snap_ID staleness
+USERS_L1_TTL = 60
+USERS_REDIS_TTL = 300
+USERS_MAX_SCOPES = 1000
+
+# Paged folder tree: entries per expanded node
+TREE_DEFAULT_LIMIT = 50
+TREE_MAX_LIMIT = 500
+
+# File fields returned by the thumbnail endpoints
+MEDIA_FILE_INFO_PROJECTION = {
+    "_id": 0, "file_name": 1, "file_type": 1, "CDN_link": 1, "seq_number": 1, "upload_time": 1, "is_thumbnail": 1
+}
+
 router = APIRouter(
     tags=["cdn-mongo"]
 )
 
+
+user_directory_cache = ReadThroughCache("cdn_users", USERS_L1_TTL, USERS_REDIS_TTL, USERS_MAX_SCOPES)
+
+
+def _scope_key(client_scope: Dict[str, Any]) -> str:
+    # Users sharing a client set share an entry
+    if "$in" not in client_scope:
+        return "all"
+    clients = "\n".join(sorted(str(c) for c in client_scope["$in"]))
+    return hashlib.sha256(clients.encode()).hexdigest()
+
+
+async def invalidate_user_directory():
+    """
+    Invalidate every cached get_users result after client documents are
+    created or removed.
+    """
+    await user_directory_cache.invalidate_all()
+
+
+@on_invalidation("UploadDB.*")
+async def _client_documents_changed(events: List[InvalidationEvent], local: bool):
+    # Session updates don't change who is listed
+    if any(event.op != "update" for event in events):
+        await user_directory_cache.invalidate_all(local=local)
+
+
+def _client_entry(doc: Dict[str, Any], collection_name: str) -> Dict[str, Any]:
+    return {
+        "name": doc["client_ID"],
+        "type": "folder",
+        "path": f"sc/{doc['client_ID']}/{collection_name}/",
+        "snap_id": doc.get("snap_ID"),
+        "last_updated": doc.get("last_updated")
+    }
+
+
+def _session_entry(session: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": session.get("session_id"),
+        "type": "folder",
+        "path": session.get("folder_path", ""),
+        "folder_id": session.get("folder_id"),
+        "scan_date": session.get("scan_date"),
+        "upload_date": session.get("upload_date"),
+        "total_files": session.get("total_files_count", 0),
+        "total_size": session.get("total_files_size_human", "0 MB"),
+        "total_images": session.get("total_images", 0),
+        "total_videos": session.get("total_videos", 0),
+        "editor_note": session.get("editor_note", ""),
+        "total_session_views": session.get("total_session_views", 0),
+        "avrg_session_view_time": session.get("avrg_session_view_time", 0),
+        "all_video_length": session.get("all_video_length", 0)
+    }
+
+
+def _file_entry(file: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": file["file_name"],
+        "type": file["file_type"],
+        "size": file.get("file_size_human", "0 MB"),
+        "CDN_link": file.get("CDN_link", ""),
+        "caption": file.get("caption", ""),
+        "seq_number": file.get("seq_number", 0),
+        "is_thumbnail": file.get("is_thumbnail", False),
+        "upload_time": file.get("upload_time", ""),
+        "video_length": file.get("video_length", 0),
+        "is_indexed": file.get("is_indexed", False)
+    }
+
+
+def _array_page(array: Any, offset: int, limit: int, fields: Tuple[str, ...], extra: Optional[Dict] = None) -> Dict:
+    # $slice then $map: only the page, and only the rendered fields, leave the server
+    return {"$map": {
+        "input": {"$slice": [{"$ifNull": [array, []]}, offset, limit]},
+        "as": "item",
+        "in": {**{field: f"$$item.{field}" for field in fields}, **(extra or {})}
+    }}
+
+
+def _media_file_info(file: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "file_name": file["file_name"],
+        "file_type": file.get("file_type"),
+        "CDN_link": file.get("CDN_link"),
+        "seq_number": file.get("seq_number"),
+        "upload_time": file.get("upload_time")
+    }
+
 class CDNMongoService:
     """
     CDN MongoDB Service - Core Content Management Service
@@ -231,6 +381,66 @@ class CDNMongoService:
         # This matches our MongoDB structure where everything is flat under collections
         return '/'
 
+    def _users_pipeline(self, client_scope: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation listing every client across the collections.
+        Args:
+            client_scope: client_ID condition from _client_scope
+        Returns:
+            Pipeline for the first collection, $unionWith-ing the others
+        """
+        def branch(collection_name: str, ordinal: int) -> List[Dict[str, Any]]:
+            return [
+                {"$match": {"client_ID": client_scope}},
+                {"$project": {
+                    "_id": 0, "client_ID": 1, "snap_ID": 1, "last_updated": 1,
+                    "content_type": {"$literal": collection_name},
+                    "branch": {"$literal": ordinal}
+                }}
+            ]
+
+        first, *others = self.collections
+        return [
+            *branch(first, 0),
+            *[
+                {"$unionWith": {"coll": self.collections[name].name, "pipeline": branch(name, ordinal)}}
+                for ordinal, name in enumerate(others, 1)
+            ],
+            # $unionWith does not guarantee output order: snap_ID and
+            # last_updated come from the first collection holding the client
+            {"$sort": {"client_ID": 1, "branch": 1}},
+            {"$group": {
+                "_id": "$client_ID",
+                "snap_id": {"$first": "$snap_ID"},
+                "last_updated": {"$first": "$last_updated"},
+                "content_types": {"$addToSet": "$content_type"}
+            }},
+            {"$sort": {"_id": 1}}
+        ]
+
+    async def load_users(self, auth_data: dict = None) -> List[Dict[str, Any]]:
+        """
+        List the visible clients and their content types in one aggregation.
+        Args:
+            auth_data: Authentication data for access control
+        Returns:
+            User objects sorted by client_id, as JSON-compatible values
+        """
+        docs = await self.collections["Uploads"].aggregate(
+            self._users_pipeline(await self._client_scope(auth_data))
+        ).to_list(None)
+        users = [
+            {
+                "client_id": doc["_id"],
+                "snap_id": doc.get("snap_id"),
+                "last_updated": doc.get("last_updated"),
+                "content_types": sorted(doc["content_types"])
+            }
+            for doc in docs
+        ]
+        # Cached as JSON; same encoding as the response
+        return orjson.loads(dumps(users))
+
     async def get_users(self, auth_data: dict = None) -> List[Dict[str, Any]]:
         """
         Get list of all users and their available content types.
@@ -238,58 +448,97 @@ class CDNMongoService:
             auth_data: Authentication data for access control
         Returns:
             List of user objects with their client IDs and available content types
+        Notes:
+            - Cached per ACL scope; dropped when a client document is
+              created or removed in any of the collections
         """
-        try:
-            users = {}
-            
-            # If not admin, apply client filtering
-            allowed_clients = None
-            if auth_data and "ADMIN" not in auth_data["groups"]:
-                filter_query = await filter_by_partner(auth_data)
-                if filter_query.get("client_ID", {}).get("$in"):
-                    allowed_clients = set(filter_query["client_ID"]["$in"])
+        client_scope = await self._client_scope(auth_data)
+        return await user_directory_cache.get_or_load(
+            _scope_key(client_scope), lambda: self.load_users(auth_data)
+        )
 
-            # Query each collection to find all unique users and their content types
-            for collection_name, collection in self.collections.items():
-                query = {}
-                if allowed_clients:
-                    query["client_ID"] = {"$in": list(allowed_clients)}
-                
-                async for doc in collection.find(query, {"client_ID": 1, "snap_ID": 1, "last_updated": 1}):
-                    client_id = doc.get("client_ID")
-                    if not client_id:
-                        continue
-                        
-                    if client_id not in users:
-                        users[client_id] = {
-                            "client_id": client_id,
-                            "snap_id": doc.get("snap_ID"),
-                            "last_updated": doc.get("last_updated"),
-                            "content_types": set()
-                        }
-                    
-                    users[client_id]["content_types"].add(collection_name)
+    async def folder_query(self, client_id: Optional[str] = None, auth_data: dict = None) -> Dict[str, Any]:
+        """
+        Build the filter of the client documents the folder tree shows.
+        Args:
+            client_id: Only this client's documents
+            auth_data: Authentication data for access control
+        Returns:
+            Query for load_folder_docs and folder_versions
+        """
+        return {"client_ID": await self._client_scope(auth_data, client_id)}
 
-            # Convert sets to lists for JSON serialization and sort by client_id
-            user_list = []
-            for user in users.values():
-                user["content_types"] = sorted(list(user["content_types"]))
-                user_list.append(user)
-            
-            return sorted(user_list, key=lambda x: x["client_id"])
+    async def folder_versions(self, query: Dict[str, Any]) -> Dict[str, List[List[Any]]]:
+        """
+        Get the version stamps of the folder tree's client documents.
+        Args:
+            query: Filter from folder_query
+        Returns:
+            Collection name -> [_id, client_ID, last_updated] stamps
+        """
+        return {
+            collection_name: await document_versions(collection, query)
+            for collection_name, collection in self.collections.items()
+        }
 
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+    async def load_folder_docs(self, client_id: Optional[str] = None, auth_data: dict = None,
+                               query: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load the client documents the folder tree is built from.
+        Args:
+            client_id: Only load this client's documents
+            auth_data: Authentication data for access control
+            query: Filter from folder_query (built from the above if None)
+        Returns:
+            Collection name -> documents projected to FOLDER_TREE_PROJECTION
+        """
+        docs = {}
+        if query is None:
+            query = await self.folder_query(client_id, auth_data)
 
-    async def get_folder_tree(self, client_id: Optional[str] = None, auth_data: dict = None) -> List[Dict[str, Any]]:
+        for collection_name, collection in self.collections.items():
+            docs[collection_name] = await collection.find(query, FOLDER_TREE_PROJECTION).to_list(None)
+
+        return docs
+
+    async def _client_scope(self, auth_data: dict = None, client_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get the folder tree structure from MongoDB collections.
-        If client_id is provided, only return folders for that client.
+        Build the client_ID condition for the clients a user may see.
+        Args:
+            auth_data: Authentication data for access control
+            client_id: Only this client
+        Returns:
+            client_ID query condition (matches nothing if access is denied)
+        """
+        condition: Dict[str, Any] = {"$type": "string"}
+        if client_id is not None:
+            condition["$eq"] = client_id
+        if auth_data and "ADMIN" not in auth_data["groups"]:
+            # Partner filters are keyed by ClientInfo's client_id
+            scope = (await filter_by_partner(auth_data)).get("client_id")
+            if isinstance(scope, dict):
+                condition["$in"] = list(scope.get("$in", []))
+            elif scope is not None:
+                condition["$in"] = [scope]
+        return condition
+
+    def _tree_collection(self, collection_name: str):
+        if collection_name not in self.collections:
+            raise HTTPException(status_code=404, detail=f"Collection {collection_name} not found")
+        return self.collections[collection_name]
+
+    def build_folder_tree(self, docs: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Build the folder tree from load_folder_docs output.
+        Args:
+            docs: Collection name -> client documents
+        Returns:
+            One folder per collection, with client, session and file entries
         """
         folders = []
 
         # Add root level collection folders
-        for collection_name, collection in self.collections.items():
+        for collection_name, collection_docs in docs.items():
             # Base folder for each content type
             base_folder = {
                 "name": collection_name,
@@ -298,66 +547,15 @@ class CDNMongoService:
                 "contents": []
             }
 
-            # Query to find all documents (clients) in this collection
-            query = {"client_ID": client_id}
-            
-            # Apply auth filtering if not admin
-            if auth_data and "ADMIN" not in auth_data["groups"]:
-                filter_query = await filter_by_partner(auth_data)
-                if filter_query.get("client_ID", {}).get("$in"):
-                    query["client_ID"] = {"$in": filter_query["client_ID"]["$in"]}
-            
-            async for doc in collection.find(query):
-                client_folder = {
-                    "name": doc["client_ID"],
-                    "type": "folder",
-                    "path": f"sc/{doc['client_ID']}/{collection_name}/",
-                    "snap_id": doc.get("snap_ID"),
-                    "last_updated": doc.get("last_updated"),
-                    "contents": []
-                }
+            for doc in collection_docs:
+                client_folder = {**_client_entry(doc, collection_name), "contents": []}
 
                 # Add session folders for this client
                 for session in doc.get("sessions", []):
-                    session_id = session.get("session_id")
-                    folder_id = session.get("folder_id")
-                    scan_date = session.get("scan_date")
-                    
-                    # Create session folder
                     session_folder = {
-                        "name": session_id,
-                        "type": "folder",
-                        "path": session.get("folder_path", ""),
-                        "folder_id": folder_id,
-                        "scan_date": scan_date,
-                        "upload_date": session.get("upload_date"),
-                        "total_files": session.get("total_files_count", 0),
-                        "total_size": session.get("total_files_size_human", "0 MB"),
-                        "total_images": session.get("total_images", 0),
-                        "total_videos": session.get("total_videos", 0),
-                        "editor_note": session.get("editor_note", ""),
-                        "total_session_views": session.get("total_session_views", 0),
-                        "avrg_session_view_time": session.get("avrg_session_view_time", 0),
-                        "all_video_length": session.get("all_video_length", 0),
-                        "contents": []
+                        **_session_entry(session),
+                        "contents": [_file_entry(file) for file in session.get("files", [])]
                     }
-
-                    # Add files to session folder
-                    for file in session.get("files", []):
-                        file_entry = {
-                            "name": file["file_name"],
-                            "type": file["file_type"],
-                            "size": file.get("file_size_human", "0 MB"),
-                            "CDN_link": file.get("CDN_link", ""),
-                            "caption": file.get("caption", ""),
-                            "seq_number": file.get("seq_number", 0),
-                            "is_thumbnail": file.get("is_thumbnail", False),
-                            "upload_time": file.get("upload_time", ""),
-                            "video_length": file.get("video_length", 0),
-                            "is_indexed": file.get("is_indexed", False)
-                        }
-                        session_folder["contents"].append(file_entry)
-
                     client_folder["contents"].append(session_folder)
 
                 base_folder["contents"].append(client_folder)
@@ -366,14 +564,158 @@ class CDNMongoService:
 
         return folders
 
-    async def get_gallery_files(self, folder_path: str, auth_data: dict = None) -> List[Dict[str, Any]]:
+    async def get_folder_tree(self, client_id: Optional[str] = None, auth_data: dict = None) -> List[Dict[str, Any]]:
         """
-        Get all files from a specific session folder.
+        Get the folder tree structure from MongoDB collections.
+        If client_id is provided, only return folders for that client.
+        """
+        return self.build_folder_tree(await self.load_folder_docs(client_id, auth_data))
+
+    async def get_tree_collections(self, auth_data: dict = None) -> List[Dict[str, Any]]:
+        """
+        Get the top level of the paged folder tree.
+        Args:
+            auth_data: Authentication data for access control
+        Returns:
+            One folder per collection with its visible client count
+        """
+        query = {"client_ID": await self._client_scope(auth_data)}
+        counts = await asyncio.gather(*[
+            collection.count_documents(query) for collection in self.collections.values()
+        ])
+        return [
+            {"name": name, "type": "folder", "path": f"sc/{name}/", "total_clients": count}
+            for name, count in zip(self.collections, counts)
+        ]
+
+    async def get_tree_clients(self, collection_name: str, auth_data: dict = None, after: Optional[str] = None,
+                               limit: int = TREE_DEFAULT_LIMIT) -> Dict[str, Any]:
+        """
+        Get one page of the clients in a collection.
+        Args:
+            collection_name: Collection to list
+            auth_data: Authentication data for access control
+            after: Cursor (next_cursor of the previous page)
+            limit: Clients per page
+        Returns:
+            Client folders with session counts, by client_ID, and the next cursor
+        Raises:
+            HTTPException: 404 for unknown collections
+        """
+        collection = self._tree_collection(collection_name)
+        condition = await self._client_scope(auth_data)
+        if after is not None:
+            condition["$gt"] = after
+
+        docs = await collection.aggregate([
+            {"$match": {"client_ID": condition}},
+            {"$sort": {"client_ID": 1}},
+            {"$limit": limit + 1},
+            {"$project": {
+                "_id": 0, "client_ID": 1, "snap_ID": 1, "last_updated": 1,
+                "total_sessions": {"$size": {"$ifNull": ["$sessions", []]}}
+            }}
+        ]).to_list(None)
+
+        page = docs[:limit]
+        return {
+            "items": [{**_client_entry(doc, collection_name), "total_sessions": doc["total_sessions"]} for doc in page],
+            "next_cursor": page[-1]["client_ID"] if len(docs) > limit else None
+        }
+
+    async def get_tree_sessions(self, collection_name: str, client_id: str, auth_data: dict = None,
+                                offset: int = 0, limit: int = TREE_DEFAULT_LIMIT) -> Dict[str, Any]:
+        """
+        Get one page of a client's sessions, without their files.
+        Args:
+            collection_name: Collection the client's document is in
+            client_id: Client ID
+            auth_data: Authentication data for access control
+            offset: Index of the first session (next_offset of the previous page)
+            limit: Sessions per page
+        Returns:
+            Session folders with file counts, in stored order, and the next offset
+        Raises:
+            HTTPException: 404 for unknown or inaccessible clients
+        """
+        collection = self._tree_collection(collection_name)
+        docs = await collection.aggregate([
+            {"$match": {"client_ID": await self._client_scope(auth_data, client_id)}},
+            {"$limit": 1},
+            {"$project": {
+                "_id": 0,
+                "total": {"$size": {"$ifNull": ["$sessions", []]}},
+                "sessions": _array_page("$sessions", offset, limit, TREE_SESSION_FIELDS, {
+                    "file_count": {"$size": {"$ifNull": ["$$item.files", []]}}
+                })
+            }}
+        ]).to_list(None)
+        if not docs:
+            raise HTTPException(status_code=404, detail="Client not found")
+
+        doc = docs[0]
+        return {
+            "client_id": client_id,
+            "total": doc["total"],
+            "items": [{**_session_entry(s), "file_count": s["file_count"]} for s in doc["sessions"]],
+            "next_offset": offset + limit if offset + limit < doc["total"] else None
+        }
+
+    async def get_tree_files(self, collection_name: str, client_id: str, session_id: str, auth_data: dict = None,
+                             offset: int = 0, limit: int = TREE_DEFAULT_LIMIT) -> Dict[str, Any]:
+        """
+        Get one page of a session's files.
+        Args:
+            collection_name: Collection the session is in
+            client_id: Client ID
+            session_id: Session ID
+            auth_data: Authentication data for access control
+            offset: Index of the first file (next_offset of the previous page)
+            limit: Files per page
+        Returns:
+            File entries in stored order and the next offset
+        Raises:
+            HTTPException: 404 for unknown or inaccessible sessions
+        """
+        collection = self._tree_collection(collection_name)
+        docs = await collection.aggregate([
+            {"$match": {
+                "client_ID": await self._client_scope(auth_data, client_id),
+                "sessions.session_id": session_id
+            }},
+            {"$limit": 1},
+            {"$project": {"_id": 0, "session": {"$arrayElemAt": [
+                {"$filter": {"input": "$sessions", "as": "s", "cond": {"$eq": ["$$s.session_id", session_id]}}}, 0
+            ]}}},
+            {"$project": {
+                "total": {"$size": {"$ifNull": ["$session.files", []]}},
+                "files": _array_page("$session.files", offset, limit, TREE_FILE_FIELDS)
+            }}
+        ]).to_list(None)
+        if not docs:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        doc = docs[0]
+        return {
+            "client_id": client_id,
+            "session_id": session_id,
+            "total": doc["total"],
+            "items": [_file_entry(file) for file in doc["files"]],
+            "next_offset": offset + limit if offset + limit < doc["total"] else None
+        }
+
+    async def load_gallery_session(self, folder_path: str, auth_data: dict = None,
+                                   view: Optional[str] = None) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """
+        Load the session a gallery is built from.
         Args:
             folder_path: Path to the session folder (can handle various formats)
             auth_data: Authentication data for access control
+            view: FILE_MASKS name to load only those file fields
         Returns:
-            List of file objects with their metadata and CDN URLs
+            Client ID, the client document (client_ID, last_updated) and the session
+        Raises:
+            HTTPException: 400 for unparseable paths or views, 404 for unknown sessions
         """
         try:
             # Clean up path - remove any leading/trailing slashes and empty parts
@@ -422,38 +764,51 @@ class CDNMongoService:
             if not collection_name:
                 raise HTTPException(status_code=400, detail=f"Invalid content type: {content_type}")
 
-            collection = self.collections[collection_name]
-
-            # Build the query
-            query = {
-                "client_ID": client_id,
-                "sessions.session_id": session_id
-            }
-
-            # Apply auth filtering if not admin
-            if auth_data and "ADMIN" not in auth_data["groups"]:
-                filter_query = await filter_by_partner(auth_data)
-                if filter_query.get("client_ID", {}).get("$in"):
-                    query["client_ID"] = {"$in": filter_query["client_ID"]["$in"]}
-
-            # Find the document and extract the specific session
-            doc = await collection.find_one(query)
+            try:
+                file_fields = file_fields_for(view) or GALLERY_FILE_FIELDS
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            # Only the session (and the rendered fields) leave the server
+            doc = await read_session(
+                self.collections[collection_name],
+                await self._client_scope(auth_data, client_id),
+                {"session_id": session_id},
+                files=file_fields,
+                session_fields=GALLERY_SESSION_FIELDS
+            )
             if not doc:
                 raise HTTPException(status_code=404, detail=f"Session not found for {session_id}")
 
-            # Find the specific session in the sessions array
-            session = next(
-                (s for s in doc.get("sessions", []) if s.get("session_id") == session_id),
-                None
-            )
-            if not session:
-                raise HTTPException(status_code=404, detail=f"Session {session_id} not found in document")
+            return client_id, doc, doc.pop("session")
 
-            # Format the files with all available metadata
-            gallery_files = []
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error in load_gallery_session: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
 
-            for file in session.get("files", []):
-                # Create the gallery file entry
+    def build_gallery_files(self, client_id: str, session: Dict[str, Any], view: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Build gallery entries for a session and queue missing thumbnails.
+        Args:
+            client_id: Client the session belongs to
+            session: Session from load_gallery_session
+            view: FILE_MASKS name the session was loaded with
+        Returns:
+            List of file objects sorted by sequence number
+        """
+        session_id = session.get("session_id")
+
+        # Format the files with all available metadata
+        gallery_files = []
+
+        for file in session.get("files", []):
+            if view:
+                # Masked view: just the masked fields
+                gallery_file = {GALLERY_KEYS.get(field, field): file.get(field) for field in FILE_MASKS[view]}
+                gallery_file["seq_number"] = file.get("seq_number", 0)
+            else:
                 gallery_file = {
                     "name": file["file_name"],
                     "type": file["file_type"],
@@ -476,24 +831,31 @@ class CDNMongoService:
                         "editor_note": session.get("editor_note", "")
                     }
                 }
-                
-                gallery_files.append(gallery_file)
+            
+            gallery_files.append(gallery_file)
 
-                # Generate thumbnail if needed
-                if not file.get("thumbnail") and file.get("CDN_link"):
-                    asyncio.create_task(self.generate_and_store_thumbnail(
-                        client_id=client_id,
-                        session_id=session_id,
-                        file_name=file["file_name"]
-                    ))
+            # Generate thumbnail if needed
+            if not file.get("thumbnail") and file.get("CDN_link"):
+                asyncio.create_task(self.generate_and_store_thumbnail(
+                    client_id=client_id,
+                    session_id=session_id,
+                    file_name=file["file_name"]
+                ))
 
-            return sorted(gallery_files, key=lambda x: x["seq_number"])
+        return sorted(gallery_files, key=lambda x: x["seq_number"])
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error in get_gallery_files: {str(e)}")
-            raise HTTPException(status_code=500, detail=str(e))
+    async def get_gallery_files(self, folder_path: str, auth_data: dict = None, view: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get all files from a specific session folder.
+        Args:
+            folder_path: Path to the session folder (can handle various formats)
+            auth_data: Authentication data for access control
+            view: FILE_MASKS name ('thumbnails', 'captions') for a lighter listing
+        Returns:
+            List of file objects with their metadata and CDN URLs
+        """
+        client_id, _, session = await self.load_gallery_session(folder_path, auth_data, view)
+        return self.build_gallery_files(client_id, session, view)
 
     async def _verify_file_exists(self, collection, client_id: str, session_id: str, file_name: str) -> Dict[str, Any]:
         """
@@ -514,60 +876,11 @@ class CDNMongoService:
             logger.info(f"  file_name: {file_name}")
             logger.info(f"  collection: {collection.name}")
 
-            # First try to find the document with a more flexible query
-            pipeline = [
-                {
-                    "$match": {
-                        "client_ID": client_id
-                    }
-                },
-                {
-                    "$unwind": "$sessions"
-                },
-                {
-                    "$match": {
-                        "sessions.session_id": session_id
-                    }
-                },
-                {
-                    "$unwind": "$sessions.files"
-                },
-                {
-                    "$match": {
-                        "sessions.files.file_name": file_name
-                    }
-                },
-                {
-                    "$project": {
-                        "file_info": "$sessions.files"
-                    }
-                }
-            ]
-            
-            logger.info(f"Executing pipeline: {pipeline}")
-            cursor = collection.aggregate(pipeline)
-            result = await cursor.to_list(length=1)
-            logger.info(f"Pipeline result: {result}")
-
-            if not result:
-                # Try to find the document without file matching
-                doc = await collection.find_one({"client_ID": client_id})
-                if doc:
-                    logger.info(f"Found document for client_ID {client_id}")
-                    logger.info("Available sessions:")
-                    for session in doc.get("sessions", []):
-                        logger.info(f"  Session ID: {session.get('session_id')}")
-                        if session.get("session_id") == session_id:
-                            logger.info("  Files in matching session:")
-                            for file in session.get("files", []):
-                                logger.info(f"    {file.get('file_name')}")
-                else:
-                    logger.info(f"No document found for client_ID {client_id}")
-                
+            file_info = await media_store.get_file(collection.name, client_id, session_id, file_name, {"_id": 0})
+            if not file_info:
                 logger.error(f"No document found for {client_id}/{session_id}/{file_name}")
                 return {"status": "failed", "message": "File not found in database"}
-            
-            file_info = result[0]["file_info"]
+
             logger.info(f"Found file info: {file_info}")
             return {"status": "success", "file_info": file_info}
             
@@ -605,7 +918,7 @@ class CDNMongoService:
             with tempfile.TemporaryDirectory() as temp_dir:
                 # Download file
                 temp_input = os.path.join(temp_dir, file_name)
-                async with aiohttp.ClientSession() as session:
+                async with http_session("transfer") as session:
                     async with session.get(cdn_url) as response:
                         if response.status != 200:
                             logger.error(f"Failed to download from CDN URL {cdn_url}, status: {response.status}")
@@ -636,22 +949,11 @@ class CDNMongoService:
                             .output(temp_output, vframes=1)
                             .overwrite_output()
                         )
-                        ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
+                        await run_media(ffmpeg.run, stream, capture_stdout=True, capture_stderr=True)
                     else:
                         # Use PIL for image thumbnail
                         logger.info("Generating image thumbnail with PIL")
-                        with Image.open(temp_input) as img:
-                            img = img.convert('RGB')
-                            # Calculate dimensions for square crop
-                            width, height = img.size
-                            size = min(width, height)
-                            left = (width - size) // 2
-                            top = (height - size) // 2
-                            # Crop to square from center
-                            img = img.crop((left, top, left + size, top + size))
-                            # Scale to final size
-                            img = img.resize((480, 480), Image.Resampling.LANCZOS)
-                            img.save(temp_output, 'JPEG', quality=85)
+                        await run_cpu(square_thumbnail, temp_input, temp_output, 480)
 
                     # Upload to S3
                     s3_client = boto3.client('s3')
@@ -669,22 +971,9 @@ class CDNMongoService:
                     thumbnail_url = f"https://{CLOUDFRONT_DOMAIN}/{thumbnail_key}"
 
                     # Update MongoDB with thumbnail URL
-                    result = await collection.update_one(
-                        {
-                            "client_ID": client_id,
-                            "sessions.session_id": session_id,
-                            "sessions.files.file_name": file_name
-                        },
-                        {
-                            "$set": {
-                                "sessions.$[session].files.$[file].thumbnail": thumbnail_url,
-                                "sessions.$[session].files.$[file].thumbnail_failed": False
-                            }
-                        },
-                        array_filters=[
-                            {"session.session_id": session_id},
-                            {"file.file_name": file_name}
-                        ]
+                    result = await media_store.update_file(
+                        collection.name, client_id, session_id, file_name,
+                        {"thumbnail": thumbnail_url, "thumbnail_failed": False}
                     )
 
                     if result.modified_count == 0:
@@ -716,13 +1005,8 @@ class CDNMongoService:
         """
         try:
             logger.info(f"Getting client info for client_id: {client_id}")
-            # Query using both lowercase and uppercase client_id
-            client_doc = await client_info.find_one({
-                "$or": [
-                    {"client_id": client_id},
-                    {"client_ID": client_id}
-                ]
-            })
+            # Matches both lowercase and uppercase client_id
+            client_doc = await client_directory.get(client_id)
             
             logger.info(f"Found client doc: {client_doc}")
             
@@ -754,22 +1038,9 @@ class CDNMongoService:
     async def _mark_thumbnail_failed(self, collection, client_id: str, session_id: str, file_name: str, retry_after: int = 300):
         """Mark a file as having failed thumbnail generation with retry timing."""
         try:
-            await collection.update_one(
-                {
-                    "client_ID": client_id,
-                    "sessions.session_id": session_id,
-                    "sessions.files.file_name": file_name
-                },
-                {
-                    "$set": {
-                        "sessions.$[session].files.$[file].thumbnail_failed": True,
-                        "sessions.$[session].files.$[file].thumbnail_retry_after": retry_after
-                    }
-                },
-                array_filters=[
-                    {"session.session_id": session_id},
-                    {"file.file_name": file_name}
-                ]
+            await media_store.update_file(
+                collection.name, client_id, session_id, file_name,
+                {"thumbnail_failed": True, "thumbnail_retry_after": retry_after}
             )
             logger.info(f"Marked thumbnail as failed for {file_name} with retry after {retry_after}s")
         except Exception as e:
@@ -817,21 +1088,15 @@ class CDNMongoService:
                 raise HTTPException(status_code=404, detail=f"Collection {collection_name} not found")
             
             collection = self.collections[collection_name]
-            query = {"client_ID": client_id}
             
             # Apply auth filtering if not admin
-            if auth_data and "ADMIN" not in auth_data["groups"]:
-                filter_query = await filter_by_partner(auth_data)
-                if filter_query.get("client_ID", {}).get("$in"):
-                    if client_id not in filter_query["client_ID"]["$in"]:
-                        raise HTTPException(status_code=403, detail="Not authorized to access this client")
-
-            doc = await collection.find_one(query)
-            if not doc:
-                return []
+            client_scope = await self._client_scope(auth_data)
+            if "$in" in client_scope and client_id not in client_scope["$in"]:
+                raise HTTPException(status_code=403, detail="Not authorized to access this client")
 
+            # Session summaries only; files stay on the server
             sessions = []
-            for session in doc.get("sessions", []):
+            for session in await list_sessions(collection, client_id) or []:
                 sessions.append({
                     "session_id": session.get("session_id"),
                     "folder_id": session.get("folder_id"),
@@ -846,6 +1111,8 @@ class CDNMongoService:
             
             return sorted(sessions, key=lambda x: x.get("scan_date", ""), reverse=True)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error listing client sessions: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -985,6 +1252,8 @@ class CDNMongoService:
                     "last_updated": datetime.now().isoformat()
                 }
                 await collection.insert_one(doc)
+                await invalidate_user_directory()
+            await session_router.record(collection_name, client_id, session_id)
 
             return {
                 "status": "success",
@@ -1006,52 +1275,18 @@ class CDNMongoService:
             Dictionary containing thumbnail status
         """
         try:
-            # Determine collection based on session_id
-            collection_name = None
-            if session_id.startswith('CONTENTDUMP_'):
-                collection_name = "Content_Dump"
-            elif session_id.startswith('F('):
-                if 'SPOTLIGHT' in session_id:
-                    collection_name = "Spotlights"
-                elif 'SAVED' in session_id:
-                    collection_name = "Saved"
-                else:
-                    collection_name = "Uploads"
-
+            collection_name = await session_router.collection_name(session_id)
             if not collection_name:
                 raise HTTPException(status_code=400, detail="Invalid session ID format")
 
-            collection = self.collections[collection_name]
-
-            # Find the document and file
-            doc = await collection.find_one({
-                "client_ID": client_id,
-                "sessions.session_id": session_id,
-                "sessions.files.file_name": file_name
-            })
-
-            if not doc:
-                raise HTTPException(status_code=404, detail="File not found")
-
-            # Find the specific session and file
-            session = next((s for s in doc["sessions"] if s["session_id"] == session_id), None)
-            if not session:
-                raise HTTPException(status_code=404, detail="Session not found")
-
-            file = next((f for f in session["files"] if f["file_name"] == file_name), None)
+            file = await media_store.get_file(collection_name, client_id, session_id, file_name, MEDIA_FILE_INFO_PROJECTION)
             if not file:
-                raise HTTPException(status_code=404, detail="File not found in session")
+                raise HTTPException(status_code=404, detail="File not found")
 
             return {
                 "status": "success",
                 "is_thumbnail": file.get("is_thumbnail", False),
-                "file_info": {
-                    "file_name": file["file_name"],
-                    "file_type": file.get("file_type"),
-                    "CDN_link": file.get("CDN_link"),
-                    "seq_number": file.get("seq_number"),
-                    "upload_time": file.get("upload_time")
-                }
+                "file_info": _media_file_info(file)
             }
 
         except HTTPException:
@@ -1071,64 +1306,21 @@ class CDNMongoService:
             Dictionary containing the new thumbnail status
         """
         try:
-            # Determine collection based on session_id
-            collection_name = None
-            if session_id.startswith('CONTENTDUMP_'):
-                collection_name = "Content_Dump"
-            elif session_id.startswith('F('):
-                if 'SPOTLIGHT' in session_id:
-                    collection_name = "Spotlights"
-                elif 'SAVED' in session_id:
-                    collection_name = "Saved"
-                else:
-                    collection_name = "Uploads"
-
+            collection_name = await session_router.collection_name(session_id)
             if not collection_name:
                 raise HTTPException(status_code=400, detail="Invalid session ID format")
 
-            collection = self.collections[collection_name]
-
-            # Find the document and file
-            doc = await collection.find_one({
-                "client_ID": client_id,
-                "sessions.session_id": session_id,
-                "sessions.files.file_name": file_name
-            })
-
-            if not doc:
-                raise HTTPException(status_code=404, detail="File not found")
-
-            # Find the specific session and file
-            session = next((s for s in doc["sessions"] if s["session_id"] == session_id), None)
-            if not session:
-                raise HTTPException(status_code=404, detail="Session not found")
-
-            file = next((f for f in session["files"] if f["file_name"] == file_name), None)
+            file = await media_store.get_file(collection_name, client_id, session_id, file_name, MEDIA_FILE_INFO_PROJECTION)
             if not file:
-                raise HTTPException(status_code=404, detail="File not found in session")
+                raise HTTPException(status_code=404, detail="File not found")
 
             # Get current thumbnail status and toggle it
             current_status = file.get("is_thumbnail", False)
             new_status = not current_status
 
-            # Update the file's thumbnail status
-            result = await collection.update_one(
-                {
-                    "client_ID": client_id,
-                    "sessions.session_id": session_id,
-                    "sessions.files.file_name": file_name
-                },
-                {
-                    "$set": {
-                        "sessions.$[session].files.$[file].is_thumbnail": new_status
-                    }
-                },
-                array_filters=[
-                    {"session.session_id": session_id},
-                    {"file.file_name": file_name}
-                ]
+            result = await media_store.update_file(
+                collection_name, client_id, session_id, file_name, {"is_thumbnail": new_status}
             )
-
             if result.modified_count == 0:
                 raise HTTPException(status_code=500, detail="Failed to update thumbnail status")
 
@@ -1136,13 +1328,7 @@ class CDNMongoService:
                 "status": "success",
                 "previous_status": current_status,
                 "new_status": new_status,
-                "file_info": {
-                    "file_name": file["file_name"],
-                    "file_type": file.get("file_type"),
-                    "CDN_link": file.get("CDN_link"),
-                    "seq_number": file.get("seq_number"),
-                    "upload_time": file.get("upload_time")
-                }
+                "file_info": _media_file_info(file)
             }
 
         except HTTPException:
@@ -1163,30 +1349,9 @@ class CDNMongoService:
             Dictionary containing the status and moved file info
         """
         try:
-            def get_collection_name(session_id: str, content_type: str = None) -> str:
-                # If content type is explicitly provided as Content_Dump, use it
-                if content_type == "Content_Dump":
-                    return "Content_Dump"
-                
-                # If session ID starts with CONTENTDUMP_, use Content_Dump collection
-                if session_id.startswith('CONTENTDUMP_'):
-                    return "Content_Dump"
-                
-                # If session ID starts with F(), check its format
-                if session_id.startswith('F('):
-                    if 'SPOTLIGHT' in session_id:
-                        return "Spotlights"
-                    elif 'SAVED' in session_id:
-                        return "Saved"
-                    else:
-                        return "Uploads"
-                
-                # Default to Uploads if no other matches
-                return "Uploads"
-
-            # Get source and target collections
-            source_collection_name = get_collection_name(source_session_id)
-            target_collection_name = get_collection_name(target_session_id)
+            # Get source and target collections (Uploads for unknown ID formats)
+            source_collection_name = await session_router.collection_name(source_session_id) or "Uploads"
+            target_collection_name = await session_router.collection_name(target_session_id) or "Uploads"
             
             # Log collection resolution
             logger.info(f"Source session ID: {source_session_id} -> Collection: {source_collection_name}")
@@ -1271,7 +1436,8 @@ class CDNMongoService:
                             {
                                 "$pull": {
                                     "sessions.$[session].files": {"file_name": file_name}
-                                }
+                                },
+                                "$set": {"last_updated": datetime.now().isoformat()}
                             },
                             array_filters=[{"session.session_id": source_session_id}],
                             session=session
@@ -1286,7 +1452,8 @@ class CDNMongoService:
                             {
                                 "$push": {
                                     "sessions.$[session].files": file_to_move_updated
-                                }
+                                },
+                                "$set": {"last_updated": datetime.now().isoformat()}
                             },
                             array_filters=[{"session.session_id": target_session_id}],
                             session=session
@@ -1337,6 +1504,10 @@ class CDNMongoService:
                         logger.error(f"Error during file move transaction: {str(e)}")
                         raise HTTPException(status_code=500, detail=f"Transaction failed: {str(e)}")
 
+            # Both sessions changed in the nested layout; copy them over
+            await media_store.mirror_session(source_collection.name, client_id, source_session_id)
+            await media_store.mirror_session(target_collection_name, client_id, target_session_id)
+
             return {
                 "status": "success",
                 "message": "File moved successfully",
@@ -1370,60 +1541,26 @@ class CDNMongoService:
             Dictionary containing the update status and file info
         """
         try:
-            # Determine collection based on session_id
-            collection_name = None
-            if session_id.startswith('CONTENTDUMP_'):
-                collection_name = "Content_Dump"
-            elif session_id.startswith('F('):
-                if 'SPOTLIGHT' in session_id:
-                    collection_name = "Spotlights"
-                elif 'SAVED' in session_id:
-                    collection_name = "Saved"
-                else:
-                    collection_name = "Uploads"
-
+            collection_name = await session_router.collection_name(session_id)
             if not collection_name:
                 raise HTTPException(status_code=400, detail="Invalid session ID format")
 
-            collection = self.collections[collection_name]
-
-            # Update the file's caption
-            result = await collection.update_one(
-                {
-                    "client_ID": client_id,
-                    "sessions.session_id": session_id,
-                    "sessions.files.file_name": file_name
-                },
-                {
-                    "$set": {
-                        "sessions.$[session].files.$[file].caption": caption
-                    }
-                },
-                array_filters=[
-                    {"session.session_id": session_id},
-                    {"file.file_name": file_name}
-                ]
+            result = await media_store.update_file(
+                collection_name, client_id, session_id, file_name, {"caption": caption}
             )
 
+            if result.matched_count == 0:
+                raise HTTPException(status_code=404, detail="File not found")
             if result.modified_count == 0:
-                # Check if the file exists
-                doc = await collection.find_one({
-                    "client_ID": client_id,
-                    "sessions.session_id": session_id,
-                    "sessions.files.file_name": file_name
-                })
-                if not doc:
-                    raise HTTPException(status_code=404, detail="File not found")
-                else:
-                    # File exists but caption might be the same
-                    return {
-                        "status": "unchanged",
-                        "message": "Caption was already set to this value",
-                        "file_info": {
-                            "file_name": file_name,
-                            "caption": caption
-                        }
+                # File exists but caption might be the same
+                return {
+                    "status": "unchanged",
+                    "message": "Caption was already set to this value",
+                    "file_info": {
+                        "file_name": file_name,
+                        "caption": caption
                     }
+                }
 
             return {
                 "status": "success",
@@ -1452,73 +1589,40 @@ class CDNMongoService:
             Dictionary containing the update status and updated files info
         """
         try:
-            # Determine collection based on session_id
-            collection_name = None
-            if session_id.startswith('CONTENTDUMP_'):
-                collection_name = "Content_Dump"
-            elif session_id.startswith('F('):
-                if 'SPOTLIGHT' in session_id:
-                    collection_name = "Spotlights"
-                elif 'SAVED' in session_id:
-                    collection_name = "Saved"
-                else:
-                    collection_name = "Uploads"
-
+            collection_name = await session_router.collection_name(session_id)
             if not collection_name:
                 raise HTTPException(status_code=400, detail="Invalid session ID format")
 
-            collection = self.collections[collection_name]
-
             # Verify the session and files exist
-            doc = await collection.find_one({
-                "client_ID": client_id,
-                "sessions.session_id": session_id
-            })
-
-            if not doc:
+            files = await media_store.list_files(
+                collection_name, client_id, session_id, {"_id": 0, "file_name": 1, "seq_number": 1}
+            )
+            if not files:
                 raise HTTPException(status_code=404, detail="Session not found")
 
-            session = next((s for s in doc["sessions"] if s["session_id"] == session_id), None)
-            if not session:
-                raise HTTPException(status_code=404, detail="Session not found in document")
-
             # Get list of existing files for validation
-            existing_files = {f["file_name"]: f for f in session["files"]}
-            
+            existing_files = {f["file_name"]: f for f in files}
+
             # Validate all files exist before making any updates
             for update in file_updates:
                 if update["file_name"] not in existing_files:
                     raise HTTPException(
-                        status_code=404, 
+                        status_code=404,
                         detail=f"File not found: {update['file_name']}"
                     )
 
-            # Update each file's sequence number
-            updated_files = []
-            for update in file_updates:
-                result = await collection.update_one(
-                    {
-                        "client_ID": client_id,
-                        "sessions.session_id": session_id,
-                        "sessions.files.file_name": update["file_name"]
-                    },
-                    {
-                        "$set": {
-                            "sessions.$[session].files.$[file].seq_number": update["seq_number"]
-                        }
-                    },
-                    array_filters=[
-                        {"session.session_id": session_id},
-                        {"file.file_name": update["file_name"]}
-                    ]
-                )
-
-                if result.modified_count > 0:
-                    updated_files.append({
-                        "file_name": update["file_name"],
-                        "old_seq_number": existing_files[update["file_name"]].get("seq_number"),
-                        "new_seq_number": update["seq_number"]
-                    })
+            # One bulk write instead of a whole-document update per file
+            seq_numbers = {update["file_name"]: update["seq_number"] for update in file_updates}
+            await media_store.set_sequence_numbers(collection_name, client_id, session_id, seq_numbers)
+            updated_files = [
+                {
+                    "file_name": name,
+                    "old_seq_number": existing_files[name].get("seq_number"),
+                    "new_seq_number": seq_number
+                }
+                for name, seq_number in seq_numbers.items()
+                if existing_files[name].get("seq_number") != seq_number
+            ]
 
             return {
                 "status": "success",
@@ -1543,43 +1647,12 @@ class CDNMongoService:
             AsyncIOMotorCollection or None: The appropriate MongoDB collection, or None if format is invalid
         """
         try:
-            logger.info(f"Getting collection for session: {session_id}")
-            
-            # First try to find the document in Content_Dump collection
-            collection = self.collections["Content_Dump"]
-            doc = await collection.find_one({
-                "sessions": {
-                    "$elemMatch": {
-                        "session_id": session_id,
-                        "content_type": "ALL"
-                    }
-                }
-            })
-            
-            if doc:
-                logger.info("Found session in Content_Dump collection")
-                return collection
-            
-            # If not found in Content_Dump, check other collections based on session ID
-            if session_id.startswith('F('):
-                # Extract the session ID without the client ID part
-                base_session_id = session_id.split('_')[0] if '_' in session_id else session_id
-                logger.info(f"Base session ID: {base_session_id}")
-                
-                # Check for specific prefixes in the session ID
-                if 'SPOTLIGHT' in session_id:
-                    logger.info("Using Spotlights collection")
-                    return self.collections["Spotlights"]
-                elif 'SAVED' in session_id:
-                    logger.info("Using Saved collection")
-                    return self.collections["Saved"]
-                else:
-                    # Default to Uploads collection for F(date) format
-                    logger.info("Using Uploads collection")
-                    return self.collections["Uploads"]
-                
-            logger.error(f"Invalid session ID format: {session_id}")
-            return None
+            # Routing table (cached); Content_Dump wins for IDs in several collections
+            collection_name = await session_router.collection_name(session_id)
+            if not collection_name:
+                logger.error(f"Invalid session ID format: {session_id}")
+                return None
+            return self.collections[collection_name]
             
         except Exception as e:
             logger.error(f"Error determining collection for session {session_id}: {str(e)}")
@@ -1631,6 +1704,7 @@ async def update_sequence_numbers(
 
 @router.get("/get-users")
 async def get_users(
+    request: Request,
     auth_data: dict = Depends(get_current_user_group)
 ):
     """
@@ -1650,19 +1724,26 @@ async def get_users(
                 ...
             ]
         }
+    Notes:
+        - Served from the per-scope user directory cache
+        - Answers If-None-Match with 304 when the list is unchanged
     """
     try:
         cdn_service = CDNMongoService()
         users = await cdn_service.get_users(auth_data)
-        return {
+        etag = make_etag("get-users", users)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return FastJSONResponse({
             "status": "success",
             "users": users
-        }
+        }, headers=etag_headers(etag))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/list-folders")
 async def list_folders(
+    request: Request,
     client_id: Optional[str] = None,
     auth_data: dict = Depends(get_current_user_group)
 ):
@@ -1670,37 +1751,157 @@ async def list_folders(
     List all folders in the CDN structure.
     Optionally filter by client_id.
     Requires authentication.
+    Answers If-None-Match with 304 from the documents' last_updated
+    stamps, before any session is loaded.
+    Loads every session and file; dashboards should page with /folder-tree.
     """
     try:
         cdn_service = CDNMongoService()
-        folders = await cdn_service.get_folder_tree(client_id, auth_data)
-        return {
+        query = await cdn_service.folder_query(client_id, auth_data)
+        etag = make_etag("list-folders", FOLDER_TREE_VERSION, query, await cdn_service.folder_versions(query))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        docs = await cdn_service.load_folder_docs(query=query)
+        folders = cdn_service.build_folder_tree(docs)
+        return FastJSONResponse({
             "status": "success",
             "folders": folders
-        }
+        }, headers=etag_headers(etag))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _tree_response(request: Request, payload: Dict[str, Any]) -> FastJSONResponse:
+    # Pages are small: tag the page itself, 304 when the dashboard's copy matches
+    etag = make_etag("folder-tree", payload)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return FastJSONResponse({"status": "success", **payload}, headers=etag_headers(etag))
+
+@router.get("/folder-tree")
+async def folder_tree_collections(
+    request: Request,
+    auth_data: dict = Depends(get_current_user_group)
+):
+    """
+    Top level of the paged folder tree: one folder per collection.
+    Expand a collection with /folder-tree/{collection_name}.
+    """
+    try:
+        cdn_service = CDNMongoService()
+        return _tree_response(request, {"folders": await cdn_service.get_tree_collections(auth_data)})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/folder-tree/{collection_name}")
+async def folder_tree_clients(
+    request: Request,
+    collection_name: str,
+    after: Optional[str] = None,
+    limit: int = Query(TREE_DEFAULT_LIMIT, ge=1, le=TREE_MAX_LIMIT),
+    auth_data: dict = Depends(get_current_user_group)
+):
+    """
+    One page of a collection's clients, with session counts.
+    Args:
+        collection_name: Collection to expand (e.g., 'Uploads')
+        after: next_cursor of the previous page
+        limit: Clients per page
+    """
+    try:
+        cdn_service = CDNMongoService()
+        return _tree_response(request, await cdn_service.get_tree_clients(collection_name, auth_data, after, limit))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/folder-tree/{collection_name}/{client_id}")
+async def folder_tree_sessions(
+    request: Request,
+    collection_name: str,
+    client_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(TREE_DEFAULT_LIMIT, ge=1, le=TREE_MAX_LIMIT),
+    auth_data: dict = Depends(get_current_user_group)
+):
+    """
+    One page of a client's sessions, with file counts but no files.
+    Args:
+        collection_name: Collection the client is in (e.g., 'Uploads')
+        client_id: Client to expand (e.g., 'hl01192006')
+        offset: next_offset of the previous page
+        limit: Sessions per page
+    """
+    try:
+        cdn_service = CDNMongoService()
+        return _tree_response(
+            request, await cdn_service.get_tree_sessions(collection_name, client_id, auth_data, offset, limit)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/folder-tree/{collection_name}/{client_id}/{session_id}")
+async def folder_tree_files(
+    request: Request,
+    collection_name: str,
+    client_id: str,
+    session_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(TREE_DEFAULT_LIMIT, ge=1, le=TREE_MAX_LIMIT),
+    auth_data: dict = Depends(get_current_user_group)
+):
+    """
+    One page of a session's files.
+    Args:
+        collection_name: Collection the session is in (e.g., 'Uploads')
+        client_id: Client ID (e.g., 'hl01192006')
+        session_id: Session to expand (e.g., 'F(04-01-2025)_hl01192006')
+        offset: next_offset of the previous page
+        limit: Files per page
+    """
+    try:
+        cdn_service = CDNMongoService()
+        return _tree_response(
+            request,
+            await cdn_service.get_tree_files(collection_name, client_id, session_id, auth_data, offset, limit)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/file-gallery")
 async def file_gallery(
+    request: Request,
     folder_path: str,
+    view: Optional[str] = None,
     auth_data: dict = Depends(get_current_user_group)
 ):
     """
     Get all files from a specific session folder for gallery display.
     Args:
         folder_path: Path to the session folder (e.g., 'sc/hl01192006/STORIES/F(04-01-2025)_hl01192006/')
+        view: Optional field mask: 'thumbnails' or 'captions'
     Returns:
         List of files with their metadata and CDN URLs, sorted by sequence number
+        (304 if If-None-Match still matches the session)
     """
     try:
         cdn_service = CDNMongoService()
-        files = await cdn_service.get_gallery_files(folder_path, auth_data)
-        return {
+        client_id, doc, session = await cdn_service.load_gallery_session(folder_path, auth_data, view)
+        etag = make_etag("file-gallery", view, doc.get("client_ID"), doc.get("last_updated"), session)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        files = cdn_service.build_gallery_files(client_id, session, view)
+        return FastJSONResponse({
             "status": "success",
             "total_files": len(files),
             "files": files
-        }
+        }, headers=etag_headers(etag))
     except HTTPException as he:
         raise he
     except Exception as e:
@@ -1745,6 +1946,25 @@ async def get_client_info(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@job("cdn.generate_thumbnail", queue="media")
+async def generate_thumbnail_job(ctx: JobContext, client_ID: str, session_id: str, file_name: str):
+    """
+    Generate a thumbnail for a file and store it in the file object within the session
+    Args:
+        ctx: Job context
+        client_ID: Client ID
+        session_id: Session ID
+        file_name: Name of the file to generate thumbnail for
+    Returns:
+        Status of the operation
+    """
+    cdn_service = CDNMongoService()
+    result = await cdn_service.generate_and_store_thumbnail(client_ID, session_id, file_name)
+    if result.get("status") == "failed":
+        # Missing session/file/CDN link: retrying will not help
+        raise PermanentJobError(result.get("message", "Thumbnail generation failed"))
+    return result
+
 @router.post("/generate-thumbnail")
 async def generate_thumbnail(
     client_ID: str,
@@ -1753,20 +1973,24 @@ async def generate_thumbnail(
     auth_data: dict = Depends(get_current_user_group)
 ):
     """
-    Generate a thumbnail for a file and store it in the file object within the session
+    Queue thumbnail generation for a file
     Args:
         client_ID: Client ID
         session_id: Session ID
         file_name: Name of the file to generate thumbnail for
     Returns:
-        Status of the operation
+        202 with the job id; poll /api/jobs/{job_id} for the result
     """
     try:
-        cdn_service = CDNMongoService()
-        result = await cdn_service.generate_and_store_thumbnail(client_ID, session_id, file_name)
-        return result
-    except HTTPException as he:
-        raise he
+        job_id = await enqueue(
+            generate_thumbnail_job,
+            key=f"{client_ID}/{session_id}/{file_name}",
+            created_by=auth_data["user_id"],
+            client_ID=client_ID,
+            session_id=session_id,
+            file_name=file_name
+        )
+        return job_accepted(job_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -498,7 +498,8 @@ async def update_database_paths(items: List[str], new_path: str):
                 {
                     "$set": {
                         "sessions.$[session].files.$[file].file_path": new_path,
-                        "sessions.$[session].files.$[file].full_path": f"{new_path}/{filename}"
+                        "sessions.$[session].files.$[file].full_path": f"{new_path}/{filename}",
+                        "last_updated": datetime.now(timezone.utc)
                     }
                 },
                 array_filters=[
@@ -513,7 +514,8 @@ async def update_database_paths(items: List[str], new_path: str):
                 {
                     "$set": {
                         "sessions.$[session].files.$[file].file_path": new_path,
-                        "sessions.$[session].files.$[file].full_path": f"{new_path}/{filename}"
+                        "sessions.$[session].files.$[file].full_path": f"{new_path}/{filename}",
+                        "last_updated": datetime.now(timezone.utc)
                     }
                 },
                 array_filters=[
@@ -565,7 +567,8 @@ async def reorder_files(data: Dict = Body(...)):
                     },
                     {
                         "$set": {
-                            "sessions.$[session].files.$[file].seq_number": file['seq_number']
+                            "sessions.$[session].files.$[file].seq_number": file['seq_number'],
+                            "last_updated": datetime.now(timezone.utc)
                         }
                     },
                     array_filters=[
@@ -709,7 +712,8 @@ async def update_thumbnails(data: Dict = Body(...)):
             {"sessions.session_id": session_id},
             {
                 "$set": {
-                    "sessions.$[].files.$[].is_thumbnail": False
+                    "sessions.$[].files.$[].is_thumbnail": False,
+                    "last_updated": datetime.now(timezone.utc)
                 }
             }
         )
@@ -721,7 +725,8 @@ async def update_thumbnails(data: Dict = Body(...)):
                 {"sessions.session_id": session_id},
                 {
                     "$set": {
-                        "sessions.$[].files.$[file].is_thumbnail": True
+                        "sessions.$[].files.$[file].is_thumbnail": True,
+                        "last_updated": datetime.now(timezone.utc)
                     }
                 },
                 array_filters=[
@@ -839,7 +844,8 @@ async def renumber_files(data: Dict = Body(...)):
                                             "sessions.$[session].files": {
                                                 "file_name": old_name
                                             }
-                                        }
+                                        },
+                                        "$set": {"last_updated": datetime.now(timezone.utc)}
                                     },
                                     array_filters=[
                                         {"session.folder_id": "CONTENTDUMP_" + client_id}
@@ -864,7 +870,8 @@ async def renumber_files(data: Dict = Body(...)):
                                                 "caption": "",
                                                 "video_length": 0
                                             }
-                                        }
+                                        },
+                                        "$set": {"last_updated": datetime.now(timezone.utc)}
                                     },
                                     array_filters=[
                                         {"session.folder_id": "CONTENTDUMP_" + client_id}
@@ -939,7 +946,7 @@ async def update_caption(data: Dict = Body(...)):
         # Update the caption in the sessions array
         result = await collection.update_one(
             {"sessions.session_id": session_id},
-            {"$set": {"sessions.$[].files.$[file].caption": caption}},
+            {"$set": {"sessions.$[].files.$[file].caption": caption, "last_updated": datetime.now(timezone.utc)}},
             array_filters=[{"file.file_name": file_name}]
         )
         
@@ -1507,7 +1514,8 @@ async def remove_file_record(request: RemoveFileRequest):
                     "sessions.$.files": {
                         "file_name": request.file_name
                     }
-                }
+                },
+                "$set": {"last_updated": datetime.now(timezone.utc)}
             }
         )
         
@@ -1622,7 +1630,8 @@ async def add_file_record(request: AddFileRequest):
             {
                 "$push": {
                     "sessions.$.files": file_data
-                }
+                },
+                "$set": {"last_updated": datetime.now(timezone.utc)}
             }
         )
         
@@ -1760,7 +1769,8 @@ async def transfer_file_record(data: Dict = Body(...)):
             {
                 "$push": {
                     "sessions.$.files": file_data
-                }
+                },
+                "$set": {"last_updated": datetime.now(timezone.utc)}
             }
         )
         
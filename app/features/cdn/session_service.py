@@ -8,6 +8,7 @@ from app.shared.database import (
     client_info
 )
 from app.features.cdn.s3_service import S3Service
+from app.shared.session_routes import session_router
 import re
 from typing import List, Dict
 import traceback
@@ -112,6 +113,7 @@ class SessionService:
                     logger.info(f"New document structure: {new_doc}")
                     result = await collection.insert_one(new_doc)
                     logger.info(f"Insert result - inserted ID: {result.inserted_id}")
+                await session_router.record(collection.name, client_id, session_id)
 
             except Exception as db_error:
                 logger.error(f"Database operation failed: {str(db_error)}")
@@ -50,6 +50,7 @@ Dependencies:
 - datetime: Timestamp management
 - bson: ObjectID handling
 - typing: Type hints
+- media_store: Per-file caption and order updates
 
 Author: Snapped Development Team
 """
@@ -62,6 +63,8 @@ from app.shared.database import (
     spotlight_collection,
     saved_collection
 )
+from app.shared.media_store import client_id_for_session, media_store
+from app.shared.session_routes import session_router
 from bson import ObjectId
 
 class CDNSyncService:
@@ -180,16 +183,18 @@ class CDNSyncService:
         - F(date)_[clientid]: Regular content sessions
         - F(date)_[clientid]_SPOTLIGHT: Spotlight content
         - F(date)_[clientid]_SAVED: Saved content
+
+        The session routing table decides; the formats above only apply
+        to sessions no collection holds.
         """
-        if session_id.startswith('CONTENTDUMP_'):
-            return self.content_dump, 'content_dump'
-        elif session_id.startswith('F('):
-            if 'SPOTLIGHT' in session_id:
-                return self.spotlights, 'SPOTLIGHT'
-            elif 'SAVED' in session_id:
-                return self.saved, 'SAVED'
-            return self.uploads, 'STORIES'
-        return None
+        collection_name = await session_router.collection_name(session_id)
+        routes = {
+            "Content_Dump": (self.content_dump, 'content_dump'),
+            "Spotlights": (self.spotlights, 'SPOTLIGHT'),
+            "Saved": (self.saved, 'SAVED'),
+            "Uploads": (self.uploads, 'STORIES'),
+        }
+        return routes.get(collection_name)
 
     async def _process_moves(self, collection, session_id: str, operations: List, content_type: str):
         """
@@ -302,13 +307,13 @@ class CDNSyncService:
                 **file_data,
                 "CDN_link": f"{dest_path}/{file_name}",
                 "upload_time": datetime.utcnow().isoformat()
-            }}}
+            }}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
         # 3. Remove from Content_Dump
         await self.content_dump.update_one(
             {"client_ID": client_id},
-            {"$pull": {"sessions.$[].files": {"file_name": file_name}}}
+            {"$pull": {"sessions.$[].files": {"file_name": file_name}}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
     async def _move_stories_to_dump(self, client_id: str, file_name: str, source_path: str, stories_session_id: str):
@@ -358,13 +363,13 @@ class CDNSyncService:
                 **file_data,
                 "CDN_link": f"sc/{client_id}/CONTENT_DUMP/{file_name}",
                 "upload_time": datetime.utcnow().isoformat()
-            }}}
+            }}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
         # 3. Remove from Stories
         await self.uploads.update_one(
             {"session_id": stories_session_id},
-            {"$pull": {"files": {"file_name": file_name}}}
+            {"$pull": {"files": {"file_name": file_name}}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
     async def _update_file_location(self, collection, session_id: str, file_name: str, dest_path: str):
@@ -387,7 +392,8 @@ class CDNSyncService:
             {"session_id": session_id, "files.file_name": file_name},
             {"$set": {
                 "files.$.CDN_link": f"{dest_path}/{file_name}",
-                "files.$.upload_time": datetime.utcnow().isoformat()
+                "files.$.upload_time": datetime.utcnow().isoformat(),
+                "last_updated": datetime.utcnow()
             }}
         )
 
@@ -407,22 +413,12 @@ class CDNSyncService:
             'caption': str
         }
         """
+        client_id = client_id_for_session(session_id)
         for op in operations:
-            file_name = op['data']['file_name']
-            caption = op['data']['caption']
-
-            update_query = {
-                "session_id": session_id,
-                "files.file_name": file_name
-            }
-
-            update_data = {
-                "$set": {
-                    "files.$.caption": caption
-                }
-            }
-
-            await collection.update_one(update_query, update_data)
+            await media_store.update_file(
+                collection.name, client_id, session_id,
+                op['data']['file_name'], {"caption": op['data']['caption']}
+            )
 
     async def _process_reorder(self, collection, session_id: str, operations: List):
         """
@@ -444,23 +440,12 @@ class CDNSyncService:
             ]
         }
         """
+        client_id = client_id_for_session(session_id)
         for op in operations:
-            files = op['data']['files']
-            
-            # Update each file's sequence number
-            for file_info in files:
-                update_query = {
-                    "session_id": session_id,
-                    "files.file_name": file_info['file_name']
-                }
-
-                update_data = {
-                    "$set": {
-                        "files.$.seq_number": file_info['seq_number']
-                    }
-                }
-
-                await collection.update_one(update_query, update_data)
+            await media_store.set_sequence_numbers(
+                collection.name, client_id, session_id,
+                {file_info['file_name']: file_info['seq_number'] for file_info in op['data']['files']}
+            )
 
     async def _update_timestamp(self, collection, session_id: str):
         """
@@ -474,7 +459,7 @@ class CDNSyncService:
         by updating the last_updated field with the current UTC time.
         """
         await collection.update_one(
-            {"session_id": session_id},
+            {"sessions.session_id": session_id},
             {"$set": {"last_updated": datetime.utcnow()}}
         )
 
@@ -527,13 +512,13 @@ class CDNSyncService:
                 **file_data,
                 "CDN_link": f"{dest_path}/{file_name}",
                 "upload_time": datetime.utcnow().isoformat()
-            }}}
+            }}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
         # 3. Remove from Spotlight
         await self.spotlights.update_one(
             {"client_ID": client_id},
-            {"$pull": {"sessions.$[].files": {"file_name": file_name}}}
+            {"$pull": {"sessions.$[].files": {"file_name": file_name}}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
     async def _move_stories_to_spotlight(self, client_id: str, file_name: str, source_path: str, stories_session_id: str):
@@ -582,13 +567,13 @@ class CDNSyncService:
                 **file_data,
                 "CDN_link": f"sc/{client_id}/SPOTLIGHT/{file_name}",
                 "upload_time": datetime.utcnow().isoformat()
-            }}}
+            }}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
         # Remove from Stories
         await self.uploads.update_one(
             {"session_id": stories_session_id},
-            {"$pull": {"files": {"file_name": file_name}}}
+            {"$pull": {"files": {"file_name": file_name}}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
     async def _move_spotlight_to_dump(self, client_id: str, file_name: str, dest_path: str, spotlight_session_id: str):
@@ -641,13 +626,13 @@ class CDNSyncService:
                 **file_data,
                 "CDN_link": f"sc/{client_id}/CONTENT_DUMP/{file_name}",
                 "upload_time": datetime.utcnow().isoformat()
-            }}}
+            }}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
         # Remove from Spotlight
         await self.spotlights.update_one(
             {"client_ID": client_id},
-            {"$pull": {"sessions.$[].files": {"file_name": file_name}}}
+            {"$pull": {"sessions.$[].files": {"file_name": file_name}}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
     async def _move_dump_to_spotlight(self, client_id: str, file_name: str, dest_path: str, spotlight_session_id: str):
@@ -699,13 +684,13 @@ class CDNSyncService:
                 **file_data,
                 "CDN_link": f"{dest_path}/{file_name}",
                 "upload_time": datetime.utcnow().isoformat()
-            }}}
+            }}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
         # Remove from Content_Dump
         await self.content_dump.update_one(
             {"client_ID": client_id},
-            {"$pull": {"sessions.$[].files": {"file_name": file_name}}}
+            {"$pull": {"sessions.$[].files": {"file_name": file_name}}, "$set": {"last_updated": datetime.utcnow()}}
         )
 
     async def _move_saved_to_stories(self, client_id: str, file_name: str, dest_path: str, stories_session_id: str):
@@ -58,7 +58,8 @@ from datetime import datetime
 import base64
 import ffmpeg
 import tempfile
-import aiohttp
+from app.shared.http_clients import http_session
+from app.shared.executors import run_media
 from app.shared.bunny_cdn import BunnyCDN
 import os
 from urllib.parse import urlparse
@@ -181,7 +182,7 @@ class ThumbnailService:
             try:
                 # Download video
                 logger.info("\nDownloading video...")
-                async with aiohttp.ClientSession() as session:
+                async with http_session("transfer") as session:
                     async with session.get(video_url) as response:
                         logger.info(f"Download response status: {response.status}")
                         if response.status != 200:
@@ -197,15 +198,15 @@ class ThumbnailService:
                 # Generate thumbnail
                 logger.info("\nGenerating thumbnail with ffmpeg...")
                 try:
-                    out, err = (
+                    stream = (
                         ffmpeg
                         .input(temp_file.name)
                         .filter('select', 'eq(n,0)')
                         .filter('scale', w=480, h=480, force_original_aspect_ratio='decrease')  # Scale to fit within 480x480
                         .filter('pad', width=480, height=480, x='(ow-iw)/2', y='(oh-ih)/2', color='black')  # Pad to square
                         .output('pipe:', vframes=1, format='image2', vcodec='mjpeg')
-                        .run(capture_stdout=True, capture_stderr=True)
                     )
+                    out, err = await run_media(ffmpeg.run, stream, capture_stdout=True, capture_stderr=True)
                 except ffmpeg.Error as e:
                     logger.error(f"FFmpeg error: {str(e)}")
                     logger.error(f"FFmpeg stderr: {e.stderr.decode() if e.stderr else 'None'}")
@@ -0,0 +1,102 @@
+"""
+Contract PDF Module
+
+This module renders contract PDFs with ReportLab. Rendering is
+CPU-bound, so routes call it through the CPU process pool (run_cpu);
+it takes and returns plain data for that reason.
+
+Features:
+- Wrapped contract text
+- Page management
+- Signature section
+
+Data Model:
+- Contract text
+- Signature dicts (typed_name, timestamp, ip_address)
+- PDF bytes
+
+Dependencies:
+- ReportLab for PDF generation
+- textwrap for line wrapping
+
+Author: Snapped Development Team
+"""
+
+from io import BytesIO
+from textwrap import wrap
+from typing import Dict, Optional
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+
+def render_contract_pdf(
+    content: str,
+    client_signature: Optional[Dict] = None,
+    rep_signature: Optional[Dict] = None,
+    date_label: str = "Date"
+) -> bytes:
+    """
+    Render a contract and its signatures to PDF.
+
+    Args:
+        content: Contract text
+        client_signature: Client signature, if signed
+        rep_signature: Representative signature, if signed
+        date_label: Label for signature timestamps
+
+    Returns:
+        bytes: PDF document
+    """
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+
+    # Add contract content with page management
+    y_position = 750  # Starting position on first page
+    margin_left = 50
+    line_height = 15
+
+    # Split content into lines and wrap long lines
+    wrapped_lines = []
+    for line in content.split('\n'):
+        # Wrap any line that's too long (about 90 characters per line)
+        if line.strip():  # Only wrap non-empty lines
+            wrapped_lines.extend(wrap(line, width=90))
+        else:
+            wrapped_lines.append(line)  # Keep empty lines for spacing
+
+    # Draw the wrapped lines
+    for line in wrapped_lines:
+        # Check if we need a new page
+        if y_position < 50:  # Leave margin at bottom
+            p.showPage()
+            y_position = 750
+        p.drawString(margin_left, y_position, line)
+        y_position -= line_height
+
+    # Add signature section (on new page if needed)
+    if y_position < 200:  # Need at least 200 points for signatures
+        p.showPage()
+        y_position = 750
+
+    y_position -= 30
+    p.drawString(50, y_position, "SIGNATURES")
+
+    for title, sig_data in (("Client", client_signature), ("Snapped Representative", rep_signature)):
+        if not sig_data:
+            continue
+        y_position -= 30
+        p.drawString(50, y_position, f"{title}: {sig_data.get('typed_name', '')}")
+        y_position -= 15
+        p.drawString(50, y_position, f"{date_label}: {sig_data.get('timestamp', '')}")
+        y_position -= 15
+        p.drawString(50, y_position, f"IP Address: {sig_data.get('ip_address', 'unknown')}")
+
+    # Save the final page
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+__all__ = [
+    'render_contract_pdf'
+]
@@ -51,7 +51,7 @@ Contract States:
 Dependencies:
 -----------
 - FastAPI: Web framework
-- ReportLab: PDF generation
+- ReportLab: PDF generation (contract_pdf, CPU pool)
 - MongoDB: Document storage
 - SMTP: Email delivery
 - Base64: Data encoding
@@ -64,10 +64,10 @@ from app.shared.database import client_info, contracts_collection
 from app.shared.auth import get_filtered_query
 from datetime import datetime
 from bson import ObjectId
-from reportlab.pdfgen import canvas
 from io import BytesIO
 import base64
 from fastapi.responses import StreamingResponse, FileResponse
+from app.shared.responses import FastJSONResponse
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -80,8 +80,8 @@ from app.shared.config import (
     FROM_EMAIL
 )
 import asyncio
-from reportlab.lib.pagesizes import letter
-from textwrap import wrap
+from app.shared.executors import run_cpu
+from app.features.contracts.contract_pdf import render_contract_pdf
 
 router = APIRouter(
     prefix="/api/contracts",
@@ -325,69 +325,14 @@ async def sign_contract(data: dict):
                 updated_contract["rep_signature"] = previous_contract["rep_signature"]
 
         # Generate PDF with signatures
-        buffer = BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
-        
-        # Add contract content with page management
-        y_position = 750  # Starting position on first page
-        margin_left = 50
-        margin_right = 550  # This creates about 1 inch right margin
-        line_height = 15
-
-        # Split content into lines and wrap long lines
-        content_lines = updated_contract["current_content"].split('\n')
-        wrapped_lines = []
-        for line in content_lines:
-            # Wrap any line that's too long (about 90 characters per line)
-            if line.strip():  # Only wrap non-empty lines
-                wrapped = wrap(line, width=90)
-                wrapped_lines.extend(wrapped)
-            else:
-                wrapped_lines.append(line)  # Keep empty lines for spacing
-
-        # Draw the wrapped lines
-        for line in wrapped_lines:
-            # Check if we need a new page
-            if y_position < 50:  # Leave margin at bottom
-                p.showPage()  # Add a new page
-                y_position = 750  # Reset position for new page
-            
-            # Draw the line
-            p.drawString(margin_left, y_position, line)
-            y_position -= line_height
-
-        # Add signature section (on new page if needed)
-        if y_position < 200:  # Need at least 200 points for signatures
-            p.showPage()
-            y_position = 750
-
-        # Add signature section
-        y_position -= 30
-        p.drawString(50, y_position, "SIGNATURES")
-        
-        # Add client signature
-        sig_data = updated_contract["client_signature"]
-        y_position -= 30
-        p.drawString(50, y_position, f"Client: {sig_data.get('typed_name', '')}")
-        y_position -= 15
-        p.drawString(50, y_position, f"Signed on: {sig_data.get('timestamp', '')}")
-        y_position -= 15
-        p.drawString(50, y_position, f"IP Address: {sig_data.get('ip_address', 'unknown')}")
-
-        # Add representative signature if it exists
-        if "rep_signature" in updated_contract:
-            rep_sig = updated_contract["rep_signature"]
-            y_position -= 30
-            p.drawString(50, y_position, f"Snapped Representative: {rep_sig.get('typed_name', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"Signed on: {rep_sig.get('timestamp', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"IP Address: {rep_sig.get('ip_address', 'unknown')}")
-
-        # Save the final page
-        p.showPage()
-        p.save()
-        buffer.seek(0)
+        pdf_bytes = await run_cpu(
+            render_contract_pdf,
+            updated_contract["current_content"],
+            updated_contract["client_signature"],
+            updated_contract.get("rep_signature"),
+            "Signed on"
+        )
+        buffer = BytesIO(pdf_bytes)
 
         # Send email to client
         client_email_body = f"""
@@ -491,12 +436,12 @@ async def download_contract(id: str):
     """Generate and download a contract PDF."""
     try:
         # Try to find contract by client_id first
-        contract = contracts_collection.find_one({"client_id": id})
+        contract = await contracts_collection.find_one({"client_id": id})
         
         # If not found, try to find by ObjectId
         if not contract:
             try:
-                contract = contracts_collection.find_one({"_id": ObjectId(id)})
+                contract = await contracts_collection.find_one({"_id": ObjectId(id)})
             except:
                 pass
 
@@ -504,78 +449,21 @@ async def download_contract(id: str):
             raise HTTPException(status_code=404, detail="Contract not found")
 
         # Generate PDF
-        buffer = BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
-        
-        # Add contract content with page management
-        y_position = 750  # Starting position on first page
-        margin_left = 50
-        margin_right = 550  # This creates about 1 inch right margin
-        line_height = 15
-
-        # Split content into lines and wrap long lines
-        content_lines = contract.get("current_content", "").split('\n')
-        wrapped_lines = []
-        for line in content_lines:
-            # Wrap any line that's too long (about 90 characters per line)
-            if line.strip():  # Only wrap non-empty lines
-                wrapped = wrap(line, width=90)
-                wrapped_lines.extend(wrapped)
-            else:
-                wrapped_lines.append(line)  # Keep empty lines for spacing
-
-        # Draw the wrapped lines
-        for line in wrapped_lines:
-            # Check if we need a new page
-            if y_position < 50:  # Leave margin at bottom
-                p.showPage()  # Add a new page
-                y_position = 750  # Reset position for new page
-            
-            # Draw the line
-            p.drawString(margin_left, y_position, line)
-            y_position -= line_height
-
-        # Add signature section (on new page if needed)
-        if y_position < 200:  # Need at least 200 points for signatures
-            p.showPage()
-            y_position = 750
-
-        # Add signature section
-        y_position -= 30
-        p.drawString(50, y_position, "SIGNATURES")
-        
-        # Add client signature if exists
-        if "client_signature" in contract:
-            sig_data = contract["client_signature"]
-            y_position -= 30
-            p.drawString(50, y_position, f"Client: {sig_data.get('typed_name', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"Date: {sig_data.get('timestamp', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"IP Address: {sig_data.get('ip_address', 'unknown')}")
-
-        # Add representative signature if exists
-        if "rep_signature" in contract:
-            rep_sig = contract["rep_signature"]
-            y_position -= 30
-            p.drawString(50, y_position, f"Snapped Representative: {rep_sig.get('typed_name', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"Date: {rep_sig.get('timestamp', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"IP Address: {rep_sig.get('ip_address', 'unknown')}")
-        
-        # Save the final page
-        p.showPage()
-        p.save()
-        buffer.seek(0)
+        pdf_bytes = await run_cpu(
+            render_contract_pdf,
+            contract.get("current_content", ""),
+            contract.get("client_signature"),
+            contract.get("rep_signature")
+        )
         
-        return FileResponse(
-            buffer, 
+        return StreamingResponse(
+            BytesIO(pdf_bytes),
             media_type="application/pdf",
-            filename=f"signed_contract_{id}.pdf",
             headers={"Content-Disposition": f"attachment; filename=signed_contract_{id}.pdf"}
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error generating PDF: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -628,70 +516,13 @@ async def send_contract_to_client(data: dict):
             raise HTTPException(status_code=404, detail="Client not found")
 
         # Generate PDF
-        buffer = BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
-        
-        # Add contract content with page management
-        y_position = 750  # Starting position on first page
-        margin_left = 50
-        margin_right = 550  # This creates about 1 inch right margin
-        line_height = 15
-
-        # Split content into lines and wrap long lines
-        content_lines = contract["current_content"].split('\n')
-        wrapped_lines = []
-        for line in content_lines:
-            # Wrap any line that's too long (about 90 characters per line)
-            if line.strip():  # Only wrap non-empty lines
-                wrapped = wrap(line, width=90)
-                wrapped_lines.extend(wrapped)
-            else:
-                wrapped_lines.append(line)  # Keep empty lines for spacing
-
-        # Draw the wrapped lines
-        for line in wrapped_lines:
-            # Check if we need a new page
-            if y_position < 50:  # Leave margin at bottom
-                p.showPage()  # Add a new page
-                y_position = 750  # Reset position for new page
-            
-            # Draw the line
-            p.drawString(margin_left, y_position, line)
-            y_position -= line_height
-
-        # Add signature section (on new page if needed)
-        if y_position < 200:  # Need at least 200 points for signatures
-            p.showPage()
-            y_position = 750
-
-        # Add signature section
-        y_position -= 30
-        p.drawString(50, y_position, "SIGNATURES")
-        
-        # Add client signature if exists
-        if "client_signature" in contract:
-            sig_data = contract["client_signature"]
-            y_position -= 30
-            p.drawString(50, y_position, f"Client: {sig_data.get('typed_name', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"Date: {sig_data.get('timestamp', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"IP Address: {sig_data.get('ip_address', 'unknown')}")
-
-        # Add representative signature if exists
-        if "rep_signature" in contract:
-            rep_sig = contract["rep_signature"]
-            y_position -= 30
-            p.drawString(50, y_position, f"Snapped Representative: {rep_sig.get('typed_name', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"Date: {rep_sig.get('timestamp', '')}")
-            y_position -= 15
-            p.drawString(50, y_position, f"IP Address: {rep_sig.get('ip_address', 'unknown')}")
-        
-        # Save the final page
-        p.showPage()
-        p.save()
-        buffer.seek(0)
+        pdf_bytes = await run_cpu(
+            render_contract_pdf,
+            contract["current_content"],
+            contract.get("client_signature"),
+            contract.get("rep_signature")
+        )
+        buffer = BytesIO(pdf_bytes)
 
         # Update the signing link to use track.snapped.cc
         signing_link = f"https://track.snapped.cc/sign-contract/{client_data['client_id']}"
@@ -819,4 +650,4 @@ async def get_contract_versions(client_id: str):
 async def get_contracts(filter_query: dict = Depends(get_filtered_query)):
     """Retrieve filtered list of contracts."""
     contracts = await contracts_collection.find(filter_query).to_list(length=None)
-    return contracts 
\ No newline at end of file
+    return FastJSONResponse(contracts) 
\ No newline at end of file
@@ -53,6 +53,7 @@ Author: Snapped Development Team
 from fastapi import APIRouter, HTTPException
 from app.features.employees.models.employee import EmployeeCreate
 from app.shared.database import async_client
+from app.shared.directory import get_partner_list
 from datetime import datetime
 from pydantic import ValidationError
 
@@ -155,24 +156,10 @@ async def search_partners(query: str):
         return {"results": []}
         
     try:
-        # Get the correct collection
-        partners_collection = async_client["Partners"]["PartnerList"]
-        
-        # Case-insensitive search for partners by name
-        search_regex = {"name": {"$regex": f"^{query}", "$options": "i"}}
-        print(f"Search regex: {search_regex}")  # Debug log
-        
-        cursor = partners_collection.find(
-            search_regex,
-            {"_id": 1, "name": 1}
-        ).limit(10)
-        
-        # Convert cursor to list
-        partners = await cursor.to_list(length=None)
-        print(f"Found partners: {partners}")  # Debug log
-        
-        # Transform ObjectId to string for JSON response
-        results = [{"id": str(p["_id"]), "name": p["name"]} for p in partners]
+        # Case-insensitive prefix search over the cached partner list
+        prefix = query.lower()
+        partners = await get_partner_list()
+        results = [p for p in partners if p["name"].lower().startswith(prefix)][:10]
         print(f"Returning results: {results}")  # Debug log
         
         return {"results": results}
@@ -68,11 +68,15 @@ from app.shared.database import (
 from bson import ObjectId
 from datetime import datetime, timedelta
 from fastapi.responses import JSONResponse
+from app.shared.responses import FastJSONResponse
 import logging
 from bson import json_util
 import json
 from pymongo import UpdateOne
 from app.shared.auth import get_filtered_query, get_current_user_group  # Import our auth helper
+from app.shared.auth.acl_cache import invalidate_employee_acl
+from app.shared.directory import invalidate_client
+from app.shared.jobs import JobContext, enqueue, job, job_accepted
 import asyncio
 from typing import List, Optional
 
@@ -262,7 +266,7 @@ async def get_leads_grid(filter_query: dict = Depends(get_filtered_query)):
             }
             transformed_leads.append(transformed_lead)
             
-        return transformed_leads
+        return FastJSONResponse(transformed_leads)
         
     except Exception as e:
         logger.error(f"Error in get_leads: {str(e)}")
@@ -350,6 +354,8 @@ async def update_lead(lead_id: str, request: Request, filter_query: dict = Depen
                 {'$set': update_fields}
             )
             logger.info(f"Update result: {update_result.modified_count} documents modified")
+            if update_result.modified_count:
+                await invalidate_client(lead_id)
             
             if update_result.modified_count == 0:
                 logger.warning(f"Update operation didn't modify any documents. Query: {{'client_id': {lead_id}}}")
@@ -525,8 +531,10 @@ async def delete_note(client_id: str, note_type: str, note_timestamp: str):
 @router.delete("/leads/{lead_id}")
 async def delete_lead(lead_id: str):
     try:
-        result = await client_info.delete_one({'_id': ObjectId(lead_id)})
-        if result.deleted_count:
+        deleted = await client_info.find_one_and_delete({'_id': ObjectId(lead_id)})
+        if deleted:
+            if deleted.get('client_id'):
+                await invalidate_client(deleted['client_id'], deleted)
             return {"status": "success", "message": "Lead deleted successfully"}
         return {"status": "error", "message": "Lead not found"}
     except Exception as e:
@@ -759,6 +767,9 @@ async def assign_employee(request: Request):
 
         logger.info(f"Successfully assigned employee {user_id} to client {client_id}")
         
+        # Employee's client access changed
+        await invalidate_employee_acl(user_id)
+        
         # Assignment was successful
         return JSONResponse(
             status_code=200,
@@ -871,6 +882,9 @@ async def unassign_employee(request: Request):
 
         logger.info(f"Successfully unassigned employee {user_id} from client {client_id}")
         
+        # Employee's client access changed
+        await invalidate_employee_acl(user_id)
+        
         return JSONResponse(
             status_code=200,
             content={
@@ -1024,39 +1038,57 @@ def calculate_algo_score(lead):
 
     return max(min(round(score), 100), 0)  # Ensure score is between 0-100
 
+@job("leads.update_scores", queue="leads")
+async def update_scores_job(ctx: JobContext):
+    """
+    Recalculate algo_rank for every lead.
+
+    Args:
+        ctx: Job context
+
+    Returns:
+        dict: Update counts
+    """
+    current_time = datetime.utcnow()
+    
+    # Get ALL leads instead of just ones needing updates
+    leads_to_update = await client_info.find({}).to_list(length=None)
+    ctx.update_progress(current=0, total=len(leads_to_update))
+    
+    # Update scores in batches
+    updated_count = 0
+    for start in range(0, len(leads_to_update), 500):
+        batch = leads_to_update[start:start + 500]
+        result = await client_info.bulk_write([
+            UpdateOne(
+                {"_id": lead["_id"]},
+                {"$set": {"algo_rank": calculate_algo_score(lead), "last_score_update": current_time}}
+            )
+            for lead in batch
+        ], ordered=False)
+        updated_count += result.modified_count
+        ctx.update_progress(current=start + len(batch))
+    
+    return {
+        "status": "success",
+        "message": f"Updated scores for {updated_count} leads",
+        "total_processed": len(leads_to_update)
+    }
+
 @router.post("/update-scores")
 async def update_scores():
+    """
+    Queue a lead score recalculation.
+
+    Returns:
+        JSONResponse: 202 with job id
+    """
     try:
-        current_time = datetime.utcnow()
-        
-        # Get ALL leads instead of just ones needing updates
-        leads_to_update = await client_info.find({}).to_list(length=None)
-        
-        # Update scores
-        updated_count = 0
-        
-        for lead in leads_to_update:
-            score = calculate_algo_score(lead)
-            result = await client_info.update_one(
-                {"_id": lead["_id"]},
-                {
-                    "$set": {
-                        "algo_rank": score,
-                        "last_score_update": current_time
-                    }
-                }
-            )
-            if result.modified_count > 0:
-                updated_count += 1
-        
-        return {
-            "status": "success",
-            "message": f"Updated scores for {updated_count} leads",
-            "total_processed": len(leads_to_update)
-        }
+        job_id = await enqueue(update_scores_job, key="all")
+        return job_accepted(job_id)
         
     except Exception as e:
-        logger.error(f"Error updating scores: {str(e)}")
+        logger.error(f"Error queueing score update: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/ranks")
@@ -1199,7 +1231,7 @@ async def update_approval_status(request: Request):
         # Update all documents for this client_id
         result = await uploads_collection.update_many(
             {"client_ID": client_id},
-            {"$set": update_data}
+            {"$set": {**update_data, "last_updated": datetime.utcnow()}}
         )
         
         return {
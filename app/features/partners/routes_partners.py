@@ -47,6 +47,8 @@ Author: Snapped Development Team
 from fastapi import APIRouter, HTTPException
 from app.shared.database import partners_collection, monetized_by_collection, referred_by_collection, client_info
 from bson import ObjectId
+from app.shared.auth.acl_cache import invalidate_all_acls
+from app.shared.directory import get_partner_list, invalidate_partner_list
 
 router = APIRouter(prefix="/api/partners", tags=["partners"])
 
@@ -67,8 +69,7 @@ async def get_partners():
         HTTPException: For database errors
     """
     try:
-        partners = await partners_collection.find({}).to_list(None)
-        return [{"id": str(p["_id"]), "name": p["name"]} for p in partners]
+        return await get_partner_list()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -93,6 +94,7 @@ async def add_partner(partner: dict):
     """
     try:
         result = await partners_collection.insert_one({"name": partner["name"]})
+        await invalidate_partner_list()
         return {"id": str(result.inserted_id), "name": partner["name"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -186,6 +188,8 @@ async def update_referred_by(data: dict):
         if not data["partner_id"]:
             # Remove the document entirely
             await referred_by_collection.delete_one({"client_id": client_id})
+            # Partner admins' client access comes from ReferredBy
+            await invalidate_all_acls()
             return {"status": "success"}
             
         # Case 2: New assignment or updating existing
@@ -203,6 +207,7 @@ async def update_referred_by(data: dict):
                 }},
                 upsert=True
             )
+            await invalidate_all_acls()
             return {"status": "success"}
             
         except Exception as e:
@@ -51,7 +51,7 @@ Dependencies:
 Author: Snapped Development Team
 """
 
-import aiohttp
+from app.shared.http_clients import http_session
 import logging
 from datetime import datetime
 from typing import Dict, Any
@@ -127,7 +127,7 @@ async def send_to_quickbooks(payee_data: Dict[str, Any]) -> Dict[str, Any]:
         }
         sync_id = await qb_sync_history.insert_one(sync_record)
         
-        async with aiohttp.ClientSession() as session:
+        async with http_session() as session:
             async with session.post(
                 WEBHOOK_URL,
                 json=payee_data,
@@ -52,6 +52,7 @@ Author: Snapped Development Team
 """
 
 from fastapi import APIRouter, HTTPException, Request
+from app.shared.responses import FastJSONResponse
 from typing import Dict, List, Optional
 from datetime import datetime
 from app.shared.database import async_client
@@ -111,7 +112,7 @@ async def search_payouts(request: Request):
                 payout['_id'] = str(payout['_id'])
                 
         logger.info(f"Found {len(payout_list)} payouts")
-        return {"payouts": payout_list}
+        return FastJSONResponse({"payouts": payout_list})
     except Exception as e:
         logger.error(f"Error in search_payouts: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
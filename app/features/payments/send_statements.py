@@ -48,7 +48,7 @@ Security:
 
 Dependencies:
 -----------
-- requests: HTTP client
+- webhooks: Outbox delivery
 - MongoDB: Data storage
 - datetime: Time handling
 - logging: Debug tracking
@@ -63,7 +63,7 @@ import os
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-import requests
+from app.shared.webhooks import dispatch
 from datetime import datetime
 import logging
 from typing import Dict, Any, List
@@ -75,8 +75,8 @@ from bson import ObjectId
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Make webhook URL for payment statements
-MAKE_WEBHOOK_URL = "https://hook.us2.make.com/pm33xp0uztw57perdcn774vdb47gwaql"
+# Webhook target for payment statements (see WEBHOOK_TARGETS)
+STATEMENT_WEBHOOK_TARGET = "quickbooks_statement"
 
 async def format_statement_for_quickbooks(payee_statement: Dict[str, Any], statement_date: str) -> Dict[str, Any]:
     """
@@ -186,7 +186,7 @@ async def send_statement_to_quickbooks(statement_id: str) -> Dict[str, Any]:
         
     Notes:
         - Processes payees individually
-        - Implements rate limiting
+        - Rate limited and retried by the webhook outbox
         - Validates QuickBooks IDs
         - Updates statement status
         - Tracks results per payee
@@ -203,11 +203,6 @@ async def send_statement_to_quickbooks(statement_id: str) -> Dict[str, Any]:
         # Process each payee statement separately
         for i, payee_statement in enumerate(statement.get("payee_statements", [])):
             try:
-                # Add delay between webhook calls (except for first one)
-                if i > 0:
-                    logger.info("Waiting 2 seconds before next webhook call...")
-                    await asyncio.sleep(2)
-
                 # Skip if no earnings
                 if not payee_statement.get("total_earnings"):
                     logger.info(f"Skipping payee {payee_statement.get('payee_name')} - no earnings")
@@ -227,14 +222,19 @@ async def send_statement_to_quickbooks(statement_id: str) -> Dict[str, Any]:
                 # Log the data being sent
                 logger.info(f"Sending to Make webhook for {payee_statement.get('payee_name')} ({i+1} of {len(statement.get('payee_statements', []))})): {make_data}")
                 
-                # Send to Make webhook - each payee gets their own webhook call
-                response = requests.post(MAKE_WEBHOOK_URL, json=make_data)
+                # Send to Make webhook - each payee gets their own webhook call, once
+                # per statement, so re-sending a failed statement skips delivered payees
+                result = await dispatch(
+                    STATEMENT_WEBHOOK_TARGET,
+                    f"{statement_id}:{payee_statement.get('payee_id') or i}",
+                    make_data
+                )
                 
-                if response.status_code != 200:
-                    logger.error(f"Make webhook failed for {payee_statement.get('payee_name')}: {response.text}")
+                if not result.delivered:
+                    logger.error(f"Make webhook failed for {payee_statement.get('payee_name')} ({result.status}): {result.error}")
                     results.append({
                         "status": "failed",
-                        "message": f"Failed to submit to QuickBooks: {response.text}",
+                        "message": f"Failed to submit to QuickBooks: {result.error}",
                         "payee_name": payee_statement.get("payee_name"),
                         "payee_id": payee_statement.get("payee_id")
                     })
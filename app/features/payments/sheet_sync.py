@@ -63,8 +63,10 @@ import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from app.shared.database import async_client, client_info
+from app.shared.directory import client_directory
 import logging
 import os
+import re
 from dotenv import load_dotenv
 from fastapi import Request, HTTPException, APIRouter
 
@@ -162,8 +164,7 @@ class PayoutSheetSync:
             Optional[str]: Client ID if found, None otherwise
             
         Notes:
-            - Tries exact match first
-            - Falls back to case-insensitive
+            - Cached ClientDirectory lookup (exact, then case-insensitive)
             - Handles @snapped.cc variations
             - Logs all attempts
         """
@@ -171,33 +172,24 @@ class PayoutSheetSync:
             # Log the email we're looking up
             logger.info(f"Looking up client ID for email: {email}")
             
-            # Try exact match first
-            client = await client_info.find_one({"Email_Address": email})
+            # Exact or case-insensitive match
+            client = await client_directory.by_email(email)
             if client:
                 client_id = client.get('client_id')
-                logger.info(f"Found client ID with exact match: {client_id} for email: {email}")
-                return client_id
-                
-            # Try case-insensitive match
-            client = await client_info.find_one({"Email_Address": {"$regex": f"^{email}$", "$options": "i"}})
-            if client:
-                client_id = client.get('client_id')
-                logger.info(f"Found client ID with case-insensitive match: {client_id} for email: {email}")
+                logger.info(f"Found client ID with email match: {client_id} for email: {email}")
                 return client_id
 
             # Try without @snapped.cc
             base_email = email.replace('@snapped.cc', '')
-            client = await client_info.find_one({"Email_Address": {"$regex": f"^{base_email}", "$options": "i"}})
+            client = await client_info.find_one(
+                {"Email_Address": {"$regex": f"^{re.escape(base_email)}", "$options": "i"}},
+                {"client_id": 1}
+            )
             if client:
                 client_id = client.get('client_id')
                 logger.info(f"Found client ID with base email match: {client_id} for email: {email}")
                 return client_id
 
-            # Log all email addresses in database for debugging
-            cursor = client_info.find({"Email_Address": {"$exists": True}}, {"Email_Address": 1, "client_id": 1})
-            all_emails = await cursor.to_list(length=None)
-            logger.info(f"All emails in database: {[{'email': doc.get('Email_Address'), 'client_id': doc.get('client_id')} for doc in all_emails]}")
-                
             logger.warning(f"No client found for email: {email}")
             return None
         except Exception as e:
@@ -89,7 +89,8 @@ async def cleanup_queue_status():
                             },
                             {
                                 "$set": {
-                                    "sessions.$[outer].files.$[inner].queued": False
+                                    "sessions.$[outer].files.$[inner].queued": False,
+                                    "last_updated": datetime.utcnow()
                                 },
                                 "$unset": {
                                     "sessions.$[outer].files.$[inner].queue_time": ""
@@ -113,7 +114,8 @@ async def cleanup_queue_status():
                             },
                             {
                                 "$set": {
-                                    "tt_sessions.$[outer].files.$[inner].queued": False
+                                    "tt_sessions.$[outer].files.$[inner].queued": False,
+                                    "last_updated": datetime.utcnow()
                                 },
                                 "$unset": {
                                     "tt_sessions.$[outer].files.$[inner].queue_time": ""
@@ -49,7 +49,7 @@ Security:
 Dependencies:
 -----------
 - FastAPI: API framework
-- requests: HTTP client
+- webhooks: Outbox delivery
 - MongoDB: Data storage
 - pytz: Timezone handling
 - logging: Debug tracking
@@ -58,12 +58,14 @@ Author: Snapped Development Team
 """
 
 from fastapi import APIRouter, HTTPException
-import requests
+from app.shared.webhooks import dispatch
+from app.shared.logging_config import capped
+from app.shared.jobs import JobContext, enqueue, job, job_accepted
+from app.shared.scheduler import scheduled
 import logging
 from datetime import datetime, timedelta
 import pytz
 from typing import List, Dict
-import time
 from app.shared.database import async_client
 
 # Configure logging
@@ -81,7 +83,7 @@ class MakeProcessor:
     
     Attributes:
         queues: MongoDB queue collection
-        MAKE_WEBHOOK: Make.com webhook URL
+        webhook_target: Webhook target (see WEBHOOK_TARGETS)
         
     Notes:
         - Manages daily queues
@@ -92,7 +94,7 @@ class MakeProcessor:
     
     def __init__(self):
         self.queues = async_client['QueueDB']['Queue']
-        self.MAKE_WEBHOOK = "https://hook.us2.make.com/fheaw13hclbts7ght5n8tmvl8r57qldj"
+        self.webhook_target = "make_story"
 
     async def get_todays_queue(self, target_date: str = None) -> Dict:
         """
@@ -145,10 +147,9 @@ class MakeProcessor:
         Notes:
             - Processes stories individually
             - Handles timezone conversion
-            - Implements retry logic
+            - Retries and spacing via the webhook outbox
             - Tracks success status
         """
-        max_retries = 3
         success = True
         
         # Process each story individually instead of grouping by time
@@ -157,46 +158,39 @@ class MakeProcessor:
         logger.info(f"Processing {total_stories} stories for {client_name}")
         
         for story_index, story in enumerate(stories, 1):
-            retry_count = 0
-            while retry_count < max_retries:
-                try:
-                    dt = datetime.fromisoformat(story['scheduled_time'])
-                    if dt.tzinfo is None and story.get('timezone'):
-                        tz = pytz.timezone(story['timezone'])
-                        dt = tz.localize(dt)
-                    
-                    # Convert to UTC and format with Z
-                    utc_time = dt.astimezone(pytz.UTC)
-                    
-                    payload = {
-                        "profile": story['snap_id'],
-                        "media_urls": [story['cdn_url']],  # Single URL in array
-                        "publish_at": utc_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                        "draft": 'false',
-                        "snapchat_publish_as": 'STORY'
-                    }
-                    
-                    logger.info(f"Sending payload to Make for file {story['file_name']}: {payload}")
-                    response = requests.post(self.MAKE_WEBHOOK, json=payload)
-                    
-                    if response.status_code != 200:
-                        raise Exception(f"Make returned status code {response.status_code}")
-                    
-                    logger.info(f"✓ Successfully uploaded story {story_index}/{total_stories} ({story['file_name']}) for {client_name}")
-                    
-                    if story_index < total_stories:
-                        logger.info(f"Waiting 10 seconds before next story...")
-                        time.sleep(10)
-                        
-                    break
-                except Exception as e:
-                    logger.error(f"✗ Error uploading story {story_index}/{total_stories} for {client_name} (attempt {retry_count + 1}/{max_retries}): {str(e)}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        time.sleep(5)
-                        continue
-                    success = False
-                    break
+            try:
+                dt = datetime.fromisoformat(story['scheduled_time'])
+                if dt.tzinfo is None and story.get('timezone'):
+                    tz = pytz.timezone(story['timezone'])
+                    dt = tz.localize(dt)
+                
+                # Convert to UTC and format with Z
+                utc_time = dt.astimezone(pytz.UTC)
+                
+                payload = {
+                    "profile": story['snap_id'],
+                    "media_urls": [story['cdn_url']],  # Single URL in array
+                    "publish_at": utc_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    "draft": 'false',
+                    "snapchat_publish_as": 'STORY'
+                }
+            except Exception as e:
+                logger.error(f"✗ Invalid story {story_index}/{total_stories} for {client_name}: {str(e)}")
+                success = False
+                continue
+
+            logger.info(f"Sending payload to Make for file {story['file_name']}: {payload}")
+            # Spacing and retries are handled by the webhook target
+            result = await dispatch(
+                self.webhook_target,
+                f"{payload['profile']}:{story['cdn_url']}:{payload['publish_at']}",
+                payload
+            )
+            if result.delivered:
+                logger.info(f"✓ Successfully uploaded story {story_index}/{total_stories} ({story['file_name']}) for {client_name}")
+            else:
+                logger.error(f"✗ Error uploading story {story_index}/{total_stories} for {client_name} ({result.status}): {result.error}")
+                success = False
         
         return success
 
@@ -216,7 +210,7 @@ class MakeProcessor:
         try:
             logger.info("Starting process_all_queues...")
             queue = await self.get_todays_queue(target_date)
-            logger.info(f"Queue contents: {queue}")
+            logger.debug("Queue contents: %s", capped(queue))
             
             if not queue:
                 logger.warning("No queue found for today")
@@ -233,7 +227,7 @@ class MakeProcessor:
                 if success:
                     update_result = await self.queues.update_one(
                         {"queue_date": queue_date},  # Use the correct date here
-                        {"$set": {f"client_queues.{client}.processed": True}}
+                        {"$set": {f"client_queues.{client}.processed": True, "last_updated": datetime.utcnow()}}
                     )
                     logger.info(f"Update result: {update_result.modified_count} documents modified")
             
@@ -242,6 +236,43 @@ class MakeProcessor:
             logger.error(f"Error processing queues: {str(e)}")
             raise
 
+@job("posting.process_make", queue="posting", max_attempts=1)
+async def process_make_job(ctx: JobContext, target_date: str = None):
+    """
+    Send a day's queue to Make.com.
+
+    Args:
+        ctx: Job context
+        target_date (str, optional): Specific date to process
+
+    Returns:
+        dict: Operation status
+
+    Notes:
+        - Not retried; undelivered posts are retried from the webhook outbox
+    """
+    processor = MakeProcessor()
+    await processor.process_all_queues(target_date)
+    return {"status": "success"}
+
+@scheduled("0 5 * * *", misfire_grace=2 * 3600)
+@job("posting.daily_make", queue="posting", max_attempts=1)
+async def daily_make_job(ctx: JobContext, fire_time: datetime):
+    """
+    Send today's queue to Make.com on schedule (was run_make_processor.py).
+
+    Args:
+        ctx: Job context
+        fire_time (datetime): Scheduled time
+
+    Notes:
+        - Not retried; undelivered posts are retried from the webhook outbox
+        - Skipped when missed by more than two hours
+    """
+    processor = MakeProcessor()
+    await processor.process_all_queues()
+    return {"status": "success"}
+
 # API Routes
 @router.post("/process-make")
 async def trigger_make_processing(target_date: str = None):
@@ -252,20 +283,19 @@ async def trigger_make_processing(target_date: str = None):
         target_date (str, optional): Specific date to process
         
     Returns:
-        dict: Operation status
+        JSONResponse: 202 with job id
         
     Raises:
-        HTTPException: For processing errors
+        HTTPException: For queueing errors
         
     Notes:
         - Handles manual triggers
         - Processes specific dates
-        - Reports status
-        - Tracks errors
+        - Runs on a job worker
+        - One active run per date
     """
-    processor = MakeProcessor()
     try:
-        await processor.process_all_queues(target_date)
-        return {"status": "success"}
+        job_id = await enqueue(process_make_job, key=target_date or "today", target_date=target_date)
+        return job_accepted(job_id)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
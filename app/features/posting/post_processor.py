@@ -49,7 +49,7 @@ Security:
 Dependencies:
 -----------
 - FastAPI: API framework
-- requests: HTTP client
+- webhooks: Outbox delivery
 - MongoDB: Data storage
 - pytz: Timezone handling
 - logging: Debug tracking
@@ -58,12 +58,11 @@ Author: Snapped Development Team
 """
 
 from fastapi import APIRouter, HTTPException
-import requests
+from app.shared.webhooks import dispatch
 import logging
 from datetime import datetime, timedelta
 import pytz
 from typing import List, Dict
-import time
 from app.shared.database import async_client
 
 # Configure logging
@@ -81,7 +80,7 @@ class PostProcessor:
     
     Attributes:
         queue: MongoDB queue collection
-        ZAPIER_WEBHOOK: Zapier webhook URL
+        webhook_target: Webhook target (see WEBHOOK_TARGETS)
         
     Notes:
         - Manages post queues
@@ -92,7 +91,7 @@ class PostProcessor:
     
     def __init__(self):
         self.queues = async_client['QueueDB']['Queue']
-        self.ZAPIER_WEBHOOK = "https://hooks.zapier.com/hooks/catch/21145902/28asr8g/"
+        self.webhook_target = "zapier_story"
 
     async def get_todays_queue(self) -> Dict:
         """
@@ -132,10 +131,9 @@ class PostProcessor:
         Notes:
             - Processes posts
             - Handles scheduling
-            - Implements retry logic
+            - Retries and spacing via the webhook outbox
             - Tracks success status
         """
-        max_retries = 3
         success = True
         
         # Group stories by scheduled time
@@ -150,56 +148,48 @@ class PostProcessor:
         logger.info(f"Processing {total_batches} batches for {client_name}")
         
         for batch_index, (scheduled_time, batch) in enumerate(stories_by_time.items(), 1):
-            retry_count = 0
-            while retry_count < max_retries:
-                try:
-                    dt = datetime.fromisoformat(scheduled_time)
-                    if dt.tzinfo is None and batch[0].get('timezone'):
-                        tz = pytz.timezone(batch[0]['timezone'])
-                        dt = tz.localize(dt)
-                    
-                    # Add debug logging
-                    logger.info(f"Raw snap_id from MongoDB: {batch[0]['snap_id']} (type: {type(batch[0]['snap_id'])})")
-                    
-                    # Ensure snap_id is a clean string without any quotes
-                    snap_id = batch[0]['snap_id']
-                    if isinstance(snap_id, list):
-                        snap_id = snap_id[0]  # Take first element if it's a list
-                    snap_id = str(snap_id).strip('[]').strip().strip('"').strip("'")  # Remove all quotes and brackets
-                    
-                    # Convert 'STORIES' to 'STORY' for Vista Social
-                    publish_as = 'STORY' if batch[0]['snapchat_publish_as'].upper() == 'STORIES' else batch[0]['snapchat_publish_as'].upper()
-                    
-                    payload = {
-                        "profile": int(snap_id) if snap_id.isdigit() else snap_id,  # Convert to integer if it's a number
-                        "media_urls": [story['cdn_url'] for story in batch],
-                        "publish_at": dt.strftime('%Y-%m-%d %H:%M:%S'),
-                        "draft": 'false',
-                        "snapchat_publish_as": publish_as
-                    }
-                    
-                    logger.info(f"Final payload: {payload}")
-                    
-                    logger.info(f"Sending payload to Zapier: {payload}")
-                    response = requests.post(self.ZAPIER_WEBHOOK, json=payload)
-                    
-                    if response.status_code != 200:
-                        raise Exception(f"Zapier returned status code {response.status_code}")
-                    
-                    logger.info(f"✓ Successfully uploaded batch {batch_index}/{total_batches} for {client_name}")
-                    
-                    if batch_index < total_batches:
-                        time.sleep(5)
-                        
-                    break
-                except Exception as e:
-                    logger.error(f"✗ Error uploading batch {batch_index}/{total_batches} for {client_name} (attempt {retry_count + 1}/{max_retries}): {str(e)}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        time.sleep(5)
-                        continue
-                    success = False
-                    break
+            try:
+                dt = datetime.fromisoformat(scheduled_time)
+                if dt.tzinfo is None and batch[0].get('timezone'):
+                    tz = pytz.timezone(batch[0]['timezone'])
+                    dt = tz.localize(dt)
+                
+                # Add debug logging
+                logger.info(f"Raw snap_id from MongoDB: {batch[0]['snap_id']} (type: {type(batch[0]['snap_id'])})")
+                
+                # Ensure snap_id is a clean string without any quotes
+                snap_id = batch[0]['snap_id']
+                if isinstance(snap_id, list):
+                    snap_id = snap_id[0]  # Take first element if it's a list
+                snap_id = str(snap_id).strip('[]').strip().strip('"').strip("'")  # Remove all quotes and brackets
+                
+                # Convert 'STORIES' to 'STORY' for Vista Social
+                publish_as = 'STORY' if batch[0]['snapchat_publish_as'].upper() == 'STORIES' else batch[0]['snapchat_publish_as'].upper()
+                
+                payload = {
+                    "profile": int(snap_id) if snap_id.isdigit() else snap_id,  # Convert to integer if it's a number
+                    "media_urls": [story['cdn_url'] for story in batch],
+                    "publish_at": dt.strftime('%Y-%m-%d %H:%M:%S'),
+                    "draft": 'false',
+                    "snapchat_publish_as": publish_as
+                }
+            except Exception as e:
+                logger.error(f"✗ Invalid batch {batch_index}/{total_batches} for {client_name}: {str(e)}")
+                success = False
+                continue
+            
+            logger.info(f"Sending payload to Zapier: {payload}")
+            # Spacing and retries are handled by the webhook target
+            result = await dispatch(
+                self.webhook_target,
+                f"{snap_id}:{payload['publish_at']}:{','.join(payload['media_urls'])}",
+                payload
+            )
+            if result.delivered:
+                logger.info(f"✓ Successfully uploaded batch {batch_index}/{total_batches} for {client_name}")
+            else:
+                logger.error(f"✗ Error uploading batch {batch_index}/{total_batches} for {client_name} ({result.status}): {result.error}")
+                success = False
         
         return success
 
@@ -220,7 +210,7 @@ class PostProcessor:
                     if await self.send_to_zapier(client, client_queue):
                         await self.queues.update_one(
                             {"queue_date": datetime.now().date().isoformat()},
-                            {"$set": {f"client_queues.{client}.processed": True}}
+                            {"$set": {f"client_queues.{client}.processed": True, "last_updated": datetime.utcnow()}}
                         )
                 logger.info("Queue processing completed")
             else:
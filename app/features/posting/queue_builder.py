@@ -63,6 +63,8 @@ from typing import Dict, List, Tuple
 from fastapi import APIRouter, HTTPException
 import pytz
 from app.shared.models import QueueStatus
+from app.shared.jobs import JobContext, job
+from app.shared.scheduler import scheduled
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -276,7 +278,7 @@ class QueueBuilder:
             # Update or create queue document
             result = await self.queues.update_one(
                 {"queue_date": daily_queue["queue_date"]},
-                {"$set": daily_queue},
+                {"$set": {**daily_queue, "last_updated": datetime.now(timezone.utc)}},
                 upsert=True
             )
             logger.info(f"Queue {'updated' if result.modified_count else 'created'} with {daily_queue['total_posts']} posts")
@@ -310,29 +312,29 @@ class QueueBuilder:
             
             # Debug timezone adjustment
             hour_adjustment = self.timezone_adjustments.get(client_timezone, 0)
-            logger.info(f"\n=== TIMEZONE DEBUG for {client_id} ===")
-            logger.info(f"Client timezone: {client_timezone}")
-            logger.info(f"Hour adjustment from ET: {hour_adjustment}")
+            logger.debug("=== TIMEZONE DEBUG for %s ===", client_id)
+            logger.debug("Client timezone: %s", client_timezone)
+            logger.debug("Hour adjustment from ET: %s", hour_adjustment)
             
             # Store original date for session matching
             target_date = queue_date.date()
-            logger.info(f"Target date for matching: {target_date}")
+            logger.debug("Target date for matching: %s", target_date)
 
             # Create time blocks for legacy scheduling (no time extension)
             time_blocks = []
             for base_time in [self.MORNING_POST_TIME, self.AFTERNOON_POST_TIME, self.EVENING_POST_TIME]:
-                logger.info(f"\nProcessing base time: {base_time}:00 UTC")
-                logger.info(f"Before adjustment: {base_time}:00 UTC")
+                logger.debug("Processing base time: %s:00 UTC", base_time)
+                logger.debug("Before adjustment: %s:00 UTC", base_time)
                 
                 next_time = self._get_next_occurrence(base_time, hour_adjustment, queue_date)
                 
-                logger.info(f"After adjustment: {next_time.hour}:00 UTC")
-                logger.info(f"Expected local time: {(next_time.hour - hour_adjustment) % 24}:00")
+                logger.debug("After adjustment: %s:00 UTC", next_time.hour)
+                logger.debug("Expected local time: %s:00", (next_time.hour - hour_adjustment) % 24)
                 
                 time_blocks.append(next_time)
-                logger.info(f"Added time block: {next_time} for {client_id}")
+                logger.debug("Added time block: %s for %s", next_time, client_id)
 
-            logger.info(f"Created {len(time_blocks)} time blocks for {client_id}: {time_blocks}")
+            logger.debug("Created %d time blocks for %s: %s", len(time_blocks), client_id, time_blocks)
 
             # Initialize eligible_sessions list
             eligible_sessions = []
@@ -340,7 +342,7 @@ class QueueBuilder:
             # Log the sessions we're checking
             for session in client['sessions']:
                 session_id = session.get('session_id', '')
-                logger.info(f"\nChecking session: {session_id}")
+                logger.debug("Checking session: %s", session_id)
                 
                 if not session_id:
                     continue
@@ -349,7 +351,7 @@ class QueueBuilder:
                 try:
                     # Extract date from session_id: F(06-21-2025)_th10021994
                     date_str = session_id[2:].split(')')[0].strip('(')  # Get just "06-21-2025"
-                    logger.info(f"Processing date string: {date_str} for target date: {target_date}")
+                    logger.debug("Processing date string: %s for target date: %s", date_str, target_date)
                     
                     # Try mm-dd-yyyy format first
                     try:
@@ -362,17 +364,17 @@ class QueueBuilder:
                     session_date_str = session_date.strftime('%Y-%m-%d')
                     target_date_str = target_date.strftime('%Y-%m-%d')
                     
-                    logger.info(f"Comparing dates - Session: {session_date_str}, Target: {target_date_str}")
+                    logger.debug("Comparing dates - Session: %s, Target: %s", session_date_str, target_date_str)
                     
                     if session_date_str == target_date_str:
-                        logger.info("Date matches!")
+                        logger.debug("Date matches!")
                         if not session.get('queued'):
-                            logger.info("Session not queued - adding to eligible sessions")
+                            logger.debug("Session not queued - adding to eligible sessions")
                             eligible_sessions.append(session)
                         else:
-                            logger.info("Session already queued - skipping")
+                            logger.debug("Session already queued - skipping")
                     else:
-                        logger.info(f"Date mismatch - session date {session_date_str} != target date {target_date_str}")
+                        logger.debug("Date mismatch - session date %s != target date %s", session_date_str, target_date_str)
                         
                 except Exception as e:
                     logger.error(f"Error processing session {session_id}: {str(e)}")
@@ -535,7 +537,8 @@ class QueueBuilder:
                     {
                         "$set": {
                             "sessions.$.queued": True,
-                            "sessions.$.queue_date": datetime.now()
+                            "sessions.$.queue_date": datetime.now(),
+                            "last_updated": datetime.now(timezone.utc)
                         }
                     }
                 )
@@ -566,6 +569,22 @@ async def build_queue(queue_date: datetime = None):
     builder = QueueBuilder()
     return await builder.build_daily_queue(queue_date)
 
+@scheduled("0 4 * * *", misfire_grace=6 * 3600)
+@job("posting.build_daily_queue", queue="posting", max_attempts=2)
+async def build_daily_queue_job(ctx: JobContext, fire_time: datetime):
+    """
+    Build today's queue on schedule (was app/scripts/run_daily_queue.py).
+
+    Args:
+        ctx: Job context
+        fire_time (datetime): Scheduled time
+
+    Returns:
+        dict: Queued post count
+    """
+    queue = await build_queue()
+    return {"total_posts": queue.get("total_posts", 0) if queue else 0}
+
 router = APIRouter(prefix="/queue", tags=["queue"])
 
 @router.post("/build")
@@ -49,7 +49,7 @@ Security:
 Dependencies:
 -----------
 - FastAPI: API framework
-- requests: HTTP client
+- webhooks: Outbox delivery
 - MongoDB: Data storage
 - pytz: Timezone handling
 - logging: Debug tracking
@@ -58,12 +58,11 @@ Author: Snapped Development Team
 """
 
 from fastapi import APIRouter, HTTPException
-import requests
+from app.shared.webhooks import dispatch
 import logging
 from datetime import datetime, timedelta
 import pytz
 from typing import List, Dict
-import time
 from app.shared.database import async_client
 
 # Configure logging
@@ -81,7 +80,7 @@ class SavedMakeProcessor:
     
     Attributes:
         saved_queue: MongoDB saved queue collection
-        MAKE_WEBHOOK: Make.com webhook URL
+        webhook_target: Webhook target (see WEBHOOK_TARGETS)
         
     Notes:
         - Manages saved posts
@@ -92,7 +91,7 @@ class SavedMakeProcessor:
     
     def __init__(self):
         self.saved_queue = async_client['QueueDB']['SavedQueue']
-        self.MAKE_WEBHOOK = "https://hook.us2.make.com/7cqutngufim36r18w01rgixdv2ymcuqa"
+        self.webhook_target = "make_saved"
 
     async def get_todays_queue(self) -> Dict:
         """
@@ -156,10 +155,9 @@ class SavedMakeProcessor:
         Notes:
             - Processes saved posts
             - Handles scheduling
-            - Implements retry logic
+            - Retries and spacing via the webhook outbox
             - Tracks success status
         """
-        max_retries = 3
         success = True
         
         posts = queue_data.get('posts', [])
@@ -170,42 +168,35 @@ class SavedMakeProcessor:
         base_time = datetime.now(pytz.UTC).replace(hour=23, minute=0, second=0, microsecond=0)
         
         for post_index, post in enumerate(posts):
-            retry_count = 0
-            while retry_count < max_retries:
-                try:
-                    # Calculate scheduled time for this post
-                    scheduled_time = self.calculate_schedule_time(base_time, post_index)
-                    
-                    payload = {
-                        "profile": post['snap_id'],
-                        "media_urls": [post['cdn_url']],
-                        "publish_at": scheduled_time,
-                        "draft": 'false',
-                        "snapchat_publish_as": 'STORY',  # Posts as story for saved posts
-                        "caption": post.get('caption', '')  # Empty string if no caption
-                    }
-                    
-                    logger.info(f"Sending saved post payload to Make for file {post['file_name']}: {payload}")
-                    response = requests.post(self.MAKE_WEBHOOK, json=payload)
-                    
-                    if response.status_code != 200:
-                        raise Exception(f"Make returned status code {response.status_code}")
-                    
-                    logger.info(f"✓ Successfully uploaded saved post {post_index + 1}/{total_posts} ({post['file_name']}) for {client_name}")
-                    
-                    if post_index < total_posts - 1:
-                        logger.info("Waiting 5 seconds before next post...")
-                        time.sleep(5)
-                        
-                    break
-                except Exception as e:
-                    logger.error(f"✗ Error uploading saved post {post_index + 1}/{total_posts} for {client_name} (attempt {retry_count + 1}/{max_retries}): {str(e)}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        time.sleep(5)
-                        continue
-                    success = False
-                    break
+            try:
+                # Calculate scheduled time for this post
+                scheduled_time = self.calculate_schedule_time(base_time, post_index)
+                
+                payload = {
+                    "profile": post['snap_id'],
+                    "media_urls": [post['cdn_url']],
+                    "publish_at": scheduled_time,
+                    "draft": 'false',
+                    "snapchat_publish_as": 'STORY',  # Posts as story for saved posts
+                    "caption": post.get('caption', '')  # Empty string if no caption
+                }
+            except Exception as e:
+                logger.error(f"✗ Invalid saved post {post_index + 1}/{total_posts} for {client_name}: {str(e)}")
+                success = False
+                continue
+
+            logger.info(f"Sending saved post payload to Make for file {post['file_name']}: {payload}")
+            # Spacing and retries are handled by the webhook target
+            result = await dispatch(
+                self.webhook_target,
+                f"{payload['profile']}:{post['cdn_url']}:{scheduled_time}",
+                payload
+            )
+            if result.delivered:
+                logger.info(f"✓ Successfully uploaded saved post {post_index + 1}/{total_posts} ({post['file_name']}) for {client_name}")
+            else:
+                logger.error(f"✗ Error uploading saved post {post_index + 1}/{total_posts} for {client_name} ({result.status}): {result.error}")
+                success = False
         
         return success
 
@@ -278,7 +278,8 @@ class SavedQueueBuilder:
                         {
                             "$set": {
                                 "sessions.$[session].files.$[file].queued": True,
-                                "sessions.$[session].files.$[file].queue_time": datetime.now().isoformat()
+                                "sessions.$[session].files.$[file].queue_time": datetime.now().isoformat(),
+                                "last_updated": datetime.now(timezone.utc)
                             }
                         },
                         array_filters=[
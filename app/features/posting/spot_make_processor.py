@@ -49,7 +49,7 @@ Security:
 Dependencies:
 -----------
 - FastAPI: API framework
-- requests: HTTP client
+- webhooks: Outbox delivery
 - MongoDB: Data storage
 - pytz: Timezone handling
 - logging: Debug tracking
@@ -58,12 +58,13 @@ Author: Snapped Development Team
 """
 
 from fastapi import APIRouter, HTTPException
-import requests
+from app.shared.webhooks import dispatch
+from app.shared.jobs import JobContext, job
+from app.shared.scheduler import scheduled
 import logging
 from datetime import datetime, timedelta
 import pytz
 from typing import List, Dict
-import time
 from app.shared.database import async_client
 
 # Configure logging
@@ -81,7 +82,7 @@ class SpotMakeProcessor:
     
     Attributes:
         spot_queue: MongoDB spot queue collection
-        MAKE_WEBHOOK: Make.com webhook URL
+        webhook_target: Webhook target (see WEBHOOK_TARGETS)
         
     Notes:
         - Manages spot posts
@@ -92,7 +93,7 @@ class SpotMakeProcessor:
     
     def __init__(self):
         self.spot_queue = async_client['QueueDB']['SpotQueue']
-        self.MAKE_WEBHOOK = "https://hook.us2.make.com/6mv68gk7h51xn3l9i2ftd173qyt2xcwx"  # Updated webhook URL
+        self.webhook_target = "make_spotlight"
 
     async def get_todays_queue(self) -> Dict:
         """Load today's spotlight queue from MongoDB"""
@@ -145,10 +146,9 @@ class SpotMakeProcessor:
         Notes:
             - Processes spot posts
             - Handles scheduling
-            - Implements retry logic
+            - Retries and spacing via the webhook outbox
             - Tracks success status
         """
-        max_retries = 3
         success = True
         
         posts = queue_data.get('posts', [])
@@ -156,42 +156,35 @@ class SpotMakeProcessor:
         logger.info(f"Processing {total_posts} spotlight posts for {client_name}")
         
         for post_index, post in enumerate(posts, 1):
-            retry_count = 0
-            while retry_count < max_retries:
-                try:
-                    # Parse the scheduled time directly - it's already in UTC format
-                    scheduled_time = post['scheduled_time']
-                    
-                    payload = {
-                        "profile": post['snap_id'],
-                        "media_urls": [post['cdn_url']],
-                        "publish_at": scheduled_time,
-                        "draft": 'false',
-                        "snapchat_publish_as": 'SPOTLIGHT',
-                        "caption": post.get('caption') or '#spotlight'  # Default caption if none provided
-                    }
-                    
-                    logger.info(f"Sending spotlight payload to Make for file {post['file_name']}: {payload}")
-                    response = requests.post(self.MAKE_WEBHOOK, json=payload)
-                    
-                    if response.status_code != 200:
-                        raise Exception(f"Make returned status code {response.status_code}")
-                    
-                    logger.info(f"✓ Successfully uploaded spotlight post {post_index}/{total_posts} ({post['file_name']}) for {client_name}")
-                    
-                    if post_index < total_posts:
-                        logger.info(f"Waiting 10 seconds before next post...")
-                        time.sleep(10)
-                        
-                    break
-                except Exception as e:
-                    logger.error(f"✗ Error uploading spotlight post {post_index}/{total_posts} for {client_name} (attempt {retry_count + 1}/{max_retries}): {str(e)}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        time.sleep(5)
-                        continue
-                    success = False
-                    break
+            try:
+                # Parse the scheduled time directly - it's already in UTC format
+                scheduled_time = post['scheduled_time']
+                
+                payload = {
+                    "profile": post['snap_id'],
+                    "media_urls": [post['cdn_url']],
+                    "publish_at": scheduled_time,
+                    "draft": 'false',
+                    "snapchat_publish_as": 'SPOTLIGHT',
+                    "caption": post.get('caption') or '#spotlight'  # Default caption if none provided
+                }
+            except Exception as e:
+                logger.error(f"✗ Invalid spotlight post {post_index}/{total_posts} for {client_name}: {str(e)}")
+                success = False
+                continue
+
+            logger.info(f"Sending spotlight payload to Make for file {post['file_name']}: {payload}")
+            # Spacing and retries are handled by the webhook target
+            result = await dispatch(
+                self.webhook_target,
+                f"{payload['profile']}:{post['cdn_url']}:{scheduled_time}",
+                payload
+            )
+            if result.delivered:
+                logger.info(f"✓ Successfully uploaded spotlight post {post_index}/{total_posts} ({post['file_name']}) for {client_name}")
+            else:
+                logger.error(f"✗ Error uploading spotlight post {post_index}/{total_posts} for {client_name} ({result.status}): {result.error}")
+                success = False
         
         return success
 
@@ -221,6 +214,23 @@ class SpotMakeProcessor:
             logger.error(f"Error processing spotlight queues: {str(e)}")
             raise
 
+@scheduled("30 5 * * *", misfire_grace=2 * 3600)
+@job("posting.daily_spot_make", queue="posting", max_attempts=1)
+async def daily_spot_make_job(ctx: JobContext, fire_time: datetime):
+    """
+    Send today's spotlight queue to Make.com on schedule (was run_spot_make.py).
+
+    Args:
+        ctx: Job context
+        fire_time (datetime): Scheduled time
+
+    Notes:
+        - Not retried; undelivered posts are retried from the webhook outbox
+        - Skipped when missed by more than two hours
+    """
+    await SpotMakeProcessor().process_all_queues()
+    return {"status": "success"}
+
 # API Routes
 @router.post("/process-spot-make")
 async def trigger_spot_make_processing():
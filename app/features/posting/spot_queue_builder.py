@@ -64,6 +64,8 @@ from urllib.parse import quote_plus
 from datetime import datetime
 from fastapi import APIRouter
 import logging
+from app.shared.jobs import JobContext, job
+from app.shared.scheduler import scheduled
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/spot-queue")
@@ -380,7 +382,8 @@ class SpotQueueBuilder:
                         {
                             "$set": {
                                 "sessions.$[session].files.$[file].queued": True,
-                                "sessions.$[session].files.$[file].queue_time": queue_time
+                                "sessions.$[session].files.$[file].queue_time": queue_time,
+                                "last_updated": datetime.utcnow()
                             }
                         },
                         array_filters=[
@@ -414,7 +417,8 @@ class SpotQueueBuilder:
                         {
                             "$set": {
                                 "tt_sessions.$[session].files.$[file].queued": True,
-                                "tt_sessions.$[session].files.$[file].queue_time": queue_time
+                                "tt_sessions.$[session].files.$[file].queue_time": queue_time,
+                                "last_updated": datetime.utcnow()
                             }
                         },
                         array_filters=[
@@ -436,6 +440,22 @@ class SpotQueueBuilder:
             traceback.print_exc()
             raise
 
+@scheduled("30 4 * * *", misfire_grace=6 * 3600)
+@job("posting.build_spot_queue", queue="posting", max_attempts=2)
+async def build_spot_queue_job(ctx: JobContext, fire_time: datetime):
+    """
+    Build today's spotlight queue on schedule (was run_spot_queue.py).
+
+    Args:
+        ctx: Job context
+        fire_time (datetime): Scheduled time
+
+    Returns:
+        dict: Operation status
+    """
+    await SpotQueueBuilder().build_daily_queue()
+    return {"status": "success"}
+
 @router.post("/build")
 async def build_queue():
     """
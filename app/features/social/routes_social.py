@@ -35,7 +35,7 @@ from fastapi import APIRouter, HTTPException
 from app.shared.database import async_client
 from app.config.socialblade import SOCIALBLADE_CLIENT_ID, SOCIALBLADE_ACCESS_TOKEN
 import logging
-import aiohttp
+from app.shared.http_clients import get_http_session
 import json
 from typing import Optional, Dict, Any, List
 
@@ -56,7 +56,8 @@ class SocialBladeAPI:
         BASE_URL (str): Base URL for the Matrix API
         client_id (str): Social Blade client ID
         access_token (str): Social Blade access token
-        session (aiohttp.ClientSession): Async HTTP session
+        headers (dict): Authentication headers
+        session (aiohttp.ClientSession): Shared async HTTP session
     """
     
     BASE_URL = "https://matrix.sbapis.com/b"
@@ -71,18 +72,19 @@ class SocialBladeAPI:
         """
         self.client_id = client_id
         self.access_token = access_token
+        self.headers = {
+            "token": access_token,
+            "clientid": client_id
+        }
         self.session = None
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(headers={
-            "token": self.access_token,
-            "clientid": self.client_id
-        })
+        # Shared pooled session; credentials go on each request
+        self.session = get_http_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        self.session = None
 
     async def get_instagram_stats(self, username: str) -> Dict[str, Any]:
         """
@@ -103,6 +105,7 @@ class SocialBladeAPI:
         """
         async with self.session.get(
             f"{self.BASE_URL}/instagram/statistics",
+            headers=self.headers,
             params={
                 "query": username,
                 "history": "default",
@@ -187,6 +190,7 @@ class SocialBladeAPI:
         """
         async with self.session.get(
             f"{self.BASE_URL}/tiktok/statistics",
+            headers=self.headers,
             params={
                 "query": username,
                 "history": "default",
@@ -269,6 +273,7 @@ class SocialBladeAPI:
         """
         async with self.session.get(
             f"{self.BASE_URL}/youtube/statistics",
+            headers=self.headers,
             params={"query": username}
         ) as response:
             if response.status == 404:
@@ -50,6 +50,7 @@ from app.shared.database import (
     survey_questions
 )
 from app.shared.auth import get_current_user_group, filter_by_partner
+from app.shared.directory import get_survey_questions, invalidate_survey_questions
 
 router = APIRouter()
 
@@ -77,16 +78,10 @@ async def get_questions():
         - Removes MongoDB-specific fields
         - Returns empty list if no questions found
         - Preserves question order
+        - Served from the survey question cache
     """
     try:
-        questions = await survey_questions.find({}).to_list(None)
-        # Convert MongoDB objects to JSON-serializable format
-        questions_json = json.loads(json_util.dumps(questions))
-        # Remove MongoDB-specific fields if present
-        for q in questions_json:
-            if '_id' in q:
-                del q['_id']
-        return questions_json or []
+        return await get_survey_questions()
     except Exception as e:
         print(f"Error fetching questions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -241,6 +236,7 @@ async def add_question(
             raise HTTPException(status_code=403, detail="Admin access required")
             
         result = await survey_questions.insert_one(question)
+        await invalidate_survey_questions()
         return {"message": "Question added successfully", "id": str(result.inserted_id)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -257,6 +253,7 @@ async def update_questions(
         await survey_questions.delete_many({})
         if questions:
             await survey_questions.insert_many(questions)
+        await invalidate_survey_questions()
         return {"message": "Questions updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -264,7 +261,7 @@ async def update_questions(
 @router.get("/api/client_survey/sections")
 async def get_sections():
     try:
-        questions = await survey_questions.find({}).to_list(None)
+        questions = await get_survey_questions()
         # Get unique sections and maintain order using sectionOrder
         sections_with_order = [(q.get('section', ''), q.get('sectionOrder', 0)) for q in questions]
         unique_sections = list({section: order for section, order in sections_with_order}.items())
@@ -468,7 +465,7 @@ async def add_section(
             raise HTTPException(status_code=403, detail="Admin access required")
             
         # Get current max section order
-        questions = await survey_questions.find({}).to_list(None)
+        questions = await get_survey_questions()
         max_order = max([q.get('sectionOrder', 0) for q in questions]) if questions else 0
         
         # Create a new question as a section placeholder
@@ -482,6 +479,7 @@ async def add_section(
         }
         
         await survey_questions.insert_one(new_section)
+        await invalidate_survey_questions()
         return {"message": "Section added successfully", "section": section_data["name"]}
     except Exception as e:
         print(f"Error adding section: {str(e)}")
@@ -36,7 +36,7 @@ Dependencies:
 Author: Snapped Development Team
 """
 
-from fastapi import HTTPException, APIRouter, Depends
+from fastapi import HTTPException, APIRouter, Depends, Request
 from pydantic import BaseModel, Field
 from datetime import datetime, timezone, timedelta
 from typing import List, Optional
@@ -44,34 +44,42 @@ from app.shared.database import async_client
 from bson import ObjectId
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Security
-import jwt
 from app.shared.auth import filter_by_partner
+from app.shared.auth.context import get_auth_context
 from .task_notifications import router as notifications_router
 
 router = APIRouter()
 security = HTTPBearer()
 
-async def get_current_user_group(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+def _build_task_auth(decoded: dict) -> dict:
+    """
+    Build task auth data from token claims.
+    Handles both 'groups' and 'cognito:groups' formats.
+    """
+    # Try both group formats
+    groups = decoded.get("cognito:groups", decoded.get("groups", ["DEFAULT"]))
+    groups = [g.upper() for g in groups]  # Normalize to uppercase
+    
+    # Get user ID
+    user_id = decoded.get("custom:UserID", "")
+    
+    return {
+        "groups": groups,
+        "user_id": user_id
+    }
+
+async def get_current_user_group(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Security(security)
+) -> dict:
     """
     Extract user groups and ID from JWT token.
-    Now handles both 'groups' and 'cognito:groups' formats.
+    Reuses the request auth context, so the token is decoded at most once.
     """
     try:
         token = credentials.credentials
-        # Decode without verification since we trust Cognito's signed tokens
-        decoded = jwt.decode(token, options={"verify_signature": False})
-        
-        # Try both group formats
-        groups = decoded.get("cognito:groups", decoded.get("groups", ["DEFAULT"]))
-        groups = [g.upper() for g in groups]  # Normalize to uppercase
-        
-        # Get user ID
-        user_id = decoded.get("custom:UserID", "")
-        
-        return {
-            "groups": groups,
-            "user_id": user_id
-        }
+        context = get_auth_context(request, token)
+        return context.auth_data("tasks", _build_task_auth)
     except Exception as e:
         return {
             "groups": ["DEFAULT"],
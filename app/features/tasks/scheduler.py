@@ -2,29 +2,26 @@
 Task Scheduler Module
 
 This module handles the automated creation of tasks from templates.
-It runs as a background process and creates tasks based on template
-frequency settings.
+It runs as a scheduled job on the job workers and creates tasks based
+on template frequency settings.
 
 Features:
 - Daily task creation from templates
 - Weekly task creation (on Sundays)
 - Error handling and logging
 - Status tracking
-- Daily task notification emails
 
 Dependencies:
-- APScheduler for scheduling
+- scheduler for daily runs
 - MongoDB for storage
 - datetime for timing
 """
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime, timezone, timedelta
 from app.shared.database import async_client
-from bson import ObjectId
+from app.shared.jobs import JobContext, job
+from app.shared.scheduler import scheduled
 import logging
-from . import task_notifications
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -80,32 +77,15 @@ async def create_tasks_from_templates():
     except Exception as e:
         logger.error(f"Error in create_tasks_from_templates: {str(e)}")
 
-def init_scheduler():
+@scheduled("0 12 * * *", misfire_grace=12 * 3600)
+@job("tasks.create_from_templates", queue="default", max_attempts=2)
+async def create_tasks_from_templates_job(ctx: JobContext, fire_time: datetime):
     """
-    Initialize the task scheduler.
-    Runs every day at midday to create tasks from templates.
-    Weekly tasks are only created on Sundays.
-    Also initializes the task notification scheduler.
+    Create tasks from templates daily at midday.
+    
+    Replaces the per-process APScheduler and
+    scripts/create_tasks_from_templates.py cron entry, so the run
+    happens once per day across all nodes.
     """
-    try:
-        scheduler = AsyncIOScheduler()
-        
-        # Schedule task creation to run daily at midday (12:00 PM)
-        scheduler.add_job(
-            create_tasks_from_templates,
-            CronTrigger(hour=12, minute=0),
-            id='create_tasks_from_templates',
-            replace_existing=True
-        )
-        
-        scheduler.start()
-        logger.info("Task scheduler initialized successfully")
-        
-        # Initialize task notifications
-        task_notifications.init_notification_scheduler()
-        
-    except Exception as e:
-        logger.error(f"Error initializing scheduler: {str(e)}")
-
-# Initialize scheduler when module is imported
-init_scheduler() 
\ No newline at end of file
+    await create_tasks_from_templates()
+    return {"status": "success"}
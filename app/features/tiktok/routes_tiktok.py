@@ -51,14 +51,18 @@ from io import BytesIO
 import boto3
 import urllib.parse
 import tempfile
+from app.shared.jobs import JobContext, enqueue, job, job_accepted, latest_job
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/tiktok")
 
-# Add a dictionary to store progress
+# Progress of downloads running in this process (a job's progress dict)
 progress_store = {}
 
+# How often progress streams re-read the job document
+PROGRESS_POLL_SECONDS = 1
+
 # Initialize S3 manager
 s3_manager = S3UploadManager()
 
@@ -136,18 +140,22 @@ async def download_tiktok_video(url, client_id, current_video=1, total_videos=1)
                 'quiet': True
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                try:
-                    info = ydl.extract_info(url, download=True)
-                    if not info:
-                        logger.error("No info returned from yt-dlp")
+            def download():
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    try:
+                        info = ydl.extract_info(url, download=True)
+                        if not info:
+                            logger.error("No info returned from yt-dlp")
+                            return None, None
+                        
+                        with open(temp_file, 'rb') as f:
+                            return f.read(), info
+                    except Exception as e:
+                        logger.error(f"Error in yt-dlp download: {str(e)}")
                         return None, None
-                    
-                    with open(temp_file, 'rb') as f:
-                        return f.read(), info
-                except Exception as e:
-                    logger.error(f"Error in yt-dlp download: {str(e)}")
-                    return None, None
+            
+            # Blocking download off the loop, so job heartbeats keep the lease
+            return await asyncio.to_thread(download)
                     
     except Exception as e:
         logger.error(f"Download error: {str(e)}")
@@ -215,7 +223,9 @@ async def upload_to_s3(video_data, client_id, sequence_number, upload_path):
             'SPOT': 'true'
         })
         
-        s3_manager.s3_client.upload_fileobj(
+        # Blocking boto3 calls run off the loop (job heartbeats keep the lease)
+        await asyncio.to_thread(
+            s3_manager.s3_client.upload_fileobj,
             file_obj,
             s3_manager.bucket_name,
             key,
@@ -233,7 +243,8 @@ async def upload_to_s3(video_data, client_id, sequence_number, upload_path):
             Callback=progress_callback
         )
         
-        head = s3_manager.s3_client.head_object(
+        head = await asyncio.to_thread(
+            s3_manager.s3_client.head_object,
             Bucket=s3_manager.bucket_name,
             Key=key
         )
@@ -281,27 +292,30 @@ async def get_profile_videos(profile_url):
             'dump_single_json': True,
         }
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(profile_url, download=False)
-            if 'entries' in info:
-                return [{
-                    'url': entry['url'],
-                    'caption': entry.get('description', ''),
-                    'timestamp': entry.get('timestamp', ''),
-                    'view_count': entry.get('view_count', 0),
-                    'like_count': entry.get('like_count', 0),
-                    'comment_count': entry.get('comment_count', 0),
-                    'duration': entry.get('duration', 0)
-                } for entry in info['entries']]
+        def extract():
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                return ydl.extract_info(profile_url, download=False)
+        
+        info = await asyncio.to_thread(extract)
+        if 'entries' in info:
             return [{
-                'url': info['url'],
-                'caption': info.get('description', ''),
-                'timestamp': info.get('timestamp', ''),
-                'view_count': info.get('view_count', 0),
-                'like_count': info.get('like_count', 0),
-                'comment_count': info.get('comment_count', 0),
-                'duration': info.get('duration', 0)
-            }]
+                'url': entry['url'],
+                'caption': entry.get('description', ''),
+                'timestamp': entry.get('timestamp', ''),
+                'view_count': entry.get('view_count', 0),
+                'like_count': entry.get('like_count', 0),
+                'comment_count': entry.get('comment_count', 0),
+                'duration': entry.get('duration', 0)
+            } for entry in info['entries']]
+        return [{
+            'url': info['url'],
+            'caption': info.get('description', ''),
+            'timestamp': info.get('timestamp', ''),
+            'view_count': info.get('view_count', 0),
+            'like_count': info.get('like_count', 0),
+            'comment_count': info.get('comment_count', 0),
+            'duration': info.get('duration', 0)
+        }]
     except Exception as e:
         logger.error(f"Error getting profile videos: {str(e)}")
         return []
@@ -336,61 +350,64 @@ async def progress_stream(client_id: str):
         - Handles connection
     """
     async def event_generator():
+        last = None
         while True:
-            if client_id in progress_store:
-                yield f"data: {json.dumps(progress_store[client_id])}\n\n"
-            await asyncio.sleep(0.1)
+            progress = await _download_progress(client_id)
+            if progress is not None and progress != last:
+                last = progress
+                yield f"data: {json.dumps(progress)}\n\n"
+            await asyncio.sleep(PROGRESS_POLL_SECONDS)
             
     return EventSourceResponse(event_generator())
 
 @router.get("/progress-check/{client_id}")
 async def check_progress(client_id: str):
-    current_progress = progress_store.get(client_id, {
-        "current": 0,
-        "total": 0,
-        "currentFile": "",
-        "status": "Waiting to start..."
-    })
+    current_progress = await _download_progress(client_id)
+    if current_progress is None:
+        current_progress = {
+            "current": 0,
+            "total": 0,
+            "currentFile": "",
+            "status": "Waiting to start..."
+        }
     
     return current_progress
 
-@router.post("/download")
-async def download_tiktoks(request_data: dict):
+@job("tiktok.download", queue="media", max_attempts=2, timeout=2 * 3600)
+async def download_tiktoks_job(ctx: JobContext, client_id: str, tiktok_url: str, upload_path: str):
     """
-    Handle TikTok video download and processing request.
+    Download a TikTok profile's videos and store them on a job worker.
     
     Args:
-        request_data (dict): Request data with client_id and tiktok_url
+        ctx: Job context; its progress backs progress_store[client_id]
+        client_id (str): Client identifier
+        tiktok_url (str): TikTok profile or video URL
+        upload_path (str): S3 date folder (YYYYMMDD)
         
     Returns:
         dict: Processing results and file information
         
-    Raises:
-        HTTPException: For processing errors
-        
     Notes:
         - Downloads videos
         - Tracks progress
         - Uploads to S3
         - Updates database
     """
-    client_id = request_data["client_id"]
-    tiktok_url = request_data["tiktok_url"]
-    upload_path = datetime.now().strftime('%Y%m%d')
     uploaded_files = []
     
+    # Progress hooks write here; the worker flushes it to the job document
+    ctx.update_progress(
+        status="Getting video list...",
+        current=0,
+        total=0,
+        downloaded_bytes=0,
+        total_bytes=0,
+        speed=0,
+        download_progress=0
+    )
+    progress_store[client_id] = ctx.progress
+    
     try:
-        # Initialize progress
-        progress_store[client_id] = {
-            "status": "Getting video list...",
-            "current": 0,
-            "total": 0,
-            "downloaded_bytes": 0,
-            "total_bytes": 0,
-            "speed": 0,
-            "download_progress": 0
-        }
-        
         # Get video list
         videos = await get_profile_videos(tiktok_url)
         total_videos = len(videos)
@@ -451,13 +468,14 @@ async def download_tiktoks(request_data: dict):
             {
                 "$push": {
                     "tt_sessions": {
-                        "session_id": f"TT_{datetime.now().strftime('%Y%m%d')}_{client_id}",
+                        "session_id": f"TT_{upload_path}_{client_id}",
                         "upload_date": datetime.utcnow(),
                         "folder_path": f"public/{client_id}/SPOT/TIKTOKS/{upload_path}",
                         "total_videos": len(formatted_files),
                         "files": formatted_files
                     }
-                }
+                },
+                "$set": {"last_updated": datetime.utcnow()}
             },
             upsert=True
         )
@@ -466,13 +484,51 @@ async def download_tiktoks(request_data: dict):
         return {"status": "success", "files": uploaded_files}
         
     except Exception as e:
-        if client_id in progress_store:
-            progress_store[client_id]["status"] = f"Error: {str(e)}"
+        progress_store[client_id]["status"] = f"Error: {str(e)}"
         logger.error(f"Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise
         
     finally:
-        # Clean up progress after delay
-        await asyncio.sleep(2)
-        if client_id in progress_store:
-            del progress_store[client_id] 
\ No newline at end of file
+        progress_store.pop(client_id, None)
+
+async def _download_progress(client_id: str):
+    """Progress of the client's latest download job, or None."""
+    job_doc = await latest_job(download_tiktoks_job, client_id)
+    if job_doc is None:
+        return None
+    return job_doc.get("progress") or {"status": "Queued...", "current": 0, "total": 0}
+
+@router.post("/download")
+async def download_tiktoks(request_data: dict):
+    """
+    Queue a TikTok video download and processing job.
+    
+    Args:
+        request_data (dict): Request data with client_id and tiktok_url
+        
+    Returns:
+        JSONResponse: 202 with job id
+        
+    Raises:
+        HTTPException: For queueing errors
+        
+    Notes:
+        - Runs on a job worker
+        - One active download per client
+        - Progress via /progress/{client_id}
+    """
+    client_id = request_data["client_id"]
+    tiktok_url = request_data["tiktok_url"]
+    
+    try:
+        job_id = await enqueue(
+            download_tiktoks_job,
+            key=client_id,
+            client_id=client_id,
+            tiktok_url=tiktok_url,
+            upload_path=datetime.now().strftime('%Y%m%d')
+        )
+        return job_accepted(job_id)
+    except Exception as e:
+        logger.error(f"Error queueing download: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -37,7 +37,7 @@ Author: Snapped Development Team
 from fastapi import APIRouter, HTTPException, Depends
 from datetime import datetime, timedelta
 from typing import List
-import requests
+from app.shared.webhooks import dispatch
 from app.shared.database import (
     time_entries_collection,
     employees_collection,
@@ -67,8 +67,6 @@ time_entries = time_entries_collection
 employees = employees_collection
 clients = clients_collection
 
-QUICKBOOKS_WEBHOOK = "https://hook.us2.make.com/bcpx0sqimgo9dih97dvumlldjk3fpapk"
-
 logger = logging.getLogger(__name__)
 
 @router.get("/entries")
@@ -478,12 +476,11 @@ async def submit_invoice(auth_data: dict = Depends(get_current_user_group)):
             }
         }
 
-        # Send to Make webhook
+        # Send to Make webhook; one bill per invoice period, even if resubmitted
         logger.info(f"Sending to Make webhook: {make_data}")
-        response = requests.post(QUICKBOOKS_WEBHOOK, json=make_data)
-        
-        if response.status_code != 200:
-            logger.error(f"Make webhook failed: {response.text}")
+        result = await dispatch("quickbooks_bill", f"{user_id}:{active_invoice['start_date']}", make_data)
+        if not result.delivered:
+            logger.error(f"Make webhook failed ({result.status}): {result.error}")
             raise HTTPException(status_code=500, detail="Failed to submit to QuickBooks")
 
         # Mark invoice as submitted
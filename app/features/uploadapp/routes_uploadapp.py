@@ -40,16 +40,14 @@ from typing import Dict, Optional
 import logging
 from pydantic import BaseModel
 from datetime import datetime
-from app.shared.database import upload_collection, client_info, spotlight_collection, client, notes_collection
+from app.shared.database import upload_collection, client_info, spotlight_collection, notes_collection, content_dump_collection
+from app.shared.session_reader import file_fields_for, read_session
 from .upload_service import UploadService
 from urllib.parse import unquote
 
 logger = logging.getLogger(__name__)
 upload_service = UploadService()
 
-# Add Content_Dump collection reference
-content_dump_collection = client['UploadDB']['Content_Dump']
-
 class SessionData(BaseModel):
     """
     Session initialization data model.
@@ -117,46 +115,29 @@ async def add_file(session_id: str, file_data: Dict):
         logger.error(f"Error adding file: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+SESSION_FILE_FIELDS = ("file_name", "file_type", "CDN_link", "file_size_human", "video_length", "caption")
+
 @router.get("/content-files/{client_id}/{session_folder}")
-async def get_session_files(client_id: str, session_folder: str):
-    """Get all files for a specific session"""
+async def get_session_files(client_id: str, session_folder: str, fields: Optional[str] = None):
+    """Get all files for a specific session (fields: optional 'thumbnails' or 'captions' mask)"""
     try:
-        pipeline = [
-            {
-                "$match": {
-                    "client_ID": client_id,
-                    "sessions.session_id": session_folder
-                }
-            },
-            {
-                "$unwind": "$sessions"
-            },
-            {
-                "$match": {
-                    "sessions.session_id": session_folder
-                }
-            },
-            {
-                "$unwind": "$sessions.files"
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "session_id": "$sessions.session_id",
-                    "folder_path": "$sessions.folder_path",
-                    "folder_id": "$sessions.folder_id",
-                    "upload_date": "$sessions.upload_date",
-                    "file_name": "$sessions.files.file_name",
-                    "file_type": "$sessions.files.file_type",
-                    "CDN_link": "$sessions.files.CDN_link",
-                    "file_size": "$sessions.files.file_size_human",
-                    "video_length": "$sessions.files.video_length",
-                    "caption": "$sessions.files.caption"
-                }
-            }
+        try:
+            file_fields = file_fields_for(fields) or SESSION_FILE_FIELDS
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        doc = await read_session(
+            upload_collection, client_id, {"session_id": session_folder},
+            files=file_fields, session_fields=("session_id", "folder_path", "folder_id", "upload_date")
+        )
+        session = doc["session"] if doc else {}
+        session_info = {k: v for k, v in session.items() if k != "files"}
+        results = [
+            {**session_info, **{
+                "file_size" if k == "file_size_human" else k: v for k, v in file.items()
+            }}
+            for file in session.get("files") or []
         ]
-
-        results = await upload_collection.aggregate(pipeline).to_list(None)
         
         if not results:
             return {"status": "success", "data": [], "message": "No files found"}
@@ -167,6 +148,8 @@ async def get_session_files(client_id: str, session_folder: str):
             "message": f"Found {len(results)} files"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting session files: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
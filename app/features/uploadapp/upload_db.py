@@ -31,6 +31,7 @@ from datetime import datetime
 from typing import Dict, List
 import logging
 from app.shared.database import upload_collection, client_info, spotlight_collection
+from app.shared.directory import client_directory
 
 logger = logging.getLogger(__name__)
 
@@ -62,11 +63,11 @@ class UploadDB:
             str: Client's Snapchat ID or empty string
             
         Notes:
-            - Queries client info collection
+            - Cached ClientDirectory lookup
             - Returns empty if not found
             - No validation performed
         """
-        client_doc = await self.client_info.find_one({"client_id": client_ID})
+        client_doc = await client_directory.get(client_ID)
         return client_doc.get("snap_id", "") if client_doc else ""
 
     async def init_session(self, session_data: Dict):
@@ -116,7 +117,8 @@ class UploadDB:
                             **session_data,
                             "snap_ID": snap_id
                         }
-                    }
+                    },
+                    "$set": {"last_updated": datetime.utcnow()}
                 },
                 upsert=True
             )
@@ -168,6 +170,7 @@ class UploadDB:
                     "sessions.$.total_images": 1 if file_data["file_type"].startswith("image") else 0,
                     "sessions.$.total_videos": 1 if file_data["file_type"].startswith("video") else 0,
                     "sessions.$.all_video_length": file_data.get("video_length", 0)
-                }
+                },
+                "$set": {"last_updated": datetime.utcnow()}
             }
         )
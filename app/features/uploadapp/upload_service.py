@@ -123,7 +123,8 @@ class UploadService:
                     },
                     "$push": {
                         "sessions": session
-                    }
+                    },
+                    "$set": {"last_updated": datetime.utcnow()}
                 },
                 upsert=True
             )
@@ -178,7 +179,8 @@ class UploadService:
                         "sessions.$.total_images": 1 if file_data["file_type"].startswith("image") else 0,
                         "sessions.$.total_videos": 1 if file_data["file_type"].startswith("video") else 0,
                         "sessions.$.all_video_length": file_data.get("video_length", 0)
-                    }
+                    },
+                    "$set": {"last_updated": datetime.utcnow()}
                 }
             )
         except Exception as e:
@@ -37,7 +37,7 @@ Dependencies:
 Author: Snapped Development Team
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from datetime import datetime, timedelta
 import logging
 from app.shared.database import (
@@ -52,7 +52,11 @@ from app.shared.database import (
     saved_collection
 )
 from fastapi.responses import JSONResponse
-from typing import List
+from app.shared.responses import FastJSONResponse
+from app.shared.etags import document_versions, make_etag, etag_matches, etag_headers, not_modified
+from app.shared.logging_config import capped
+from app.shared.session_reader import file_fields_for, read_session
+from typing import List, Optional
 from app.shared.auth import get_current_user_group, filter_by_partner
 import re
 import boto3
@@ -62,6 +66,9 @@ import os
 router = APIRouter(prefix="/api/uploadapp", tags=["uploadapp"])
 logger = logging.getLogger(__name__)
 
+# Part of every activity ETag; bump when a response's shape changes
+ACTIVITY_VIEW_VERSION = 1
+
 def format_minutes(seconds):
     """
     Format seconds into MM:SS format.
@@ -77,13 +84,13 @@ def format_minutes(seconds):
         - Returns '00:00' for invalid inputs
         - Logs conversion process
     """
-    logger.info(f"format_minutes called with value: {seconds}, type: {type(seconds)}")
+    logger.debug("format_minutes called with value: %s, type: %s", seconds, type(seconds))
     if seconds is None:
         logger.info("Input was None, returning '00:00'")
         return "00:00"
     try:
         if isinstance(seconds, str):
-            logger.info(f"Converting string '{seconds}' to float")
+            logger.debug("Converting string '%s' to float", seconds)
             seconds = float(seconds)
         
         # Convert to integer to ensure whole seconds
@@ -95,18 +102,65 @@ def format_minutes(seconds):
         
         # Format as MM:SS
         result = f"{minutes:02d}:{remaining_seconds:02d}"
-        logger.info(f"Converted {seconds} seconds to {result}")
+        logger.debug("Converted %s seconds to %s", seconds, result)
         return result
     except (ValueError, TypeError) as e:
         logger.error(f"Error formatting minutes: {e}, value was: {seconds}, type: {type(seconds)}")
         return "00:00"
 
+def file_mask(fields):
+    """
+    Resolve the optional ?fields= file mask of the detail endpoints.
+    
+    Args:
+        fields: FILE_MASKS name ('thumbnails', 'captions') or None
+        
+    Returns:
+        tuple: File fields, or None for whole files
+        
+    Raises:
+        HTTPException: Unknown mask name (400)
+    """
+    try:
+        return file_fields_for(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def read_session_files(collection, client_id, match, fields=None):
+    """
+    Read the files of one session, with video lengths formatted as MM:SS.
+    
+    Args:
+        collection: Upload collection to read from
+        client_id: Client identifier
+        match: Session fields to match (see session_reader.read_session)
+        fields: Resolved file mask, or None for whole files
+        
+    Returns:
+        list: Session files, or None if no session matched
+        
+    Notes:
+        - Only the matched session's files leave the database
+    """
+    doc = await read_session(collection, client_id, match, files=fields, session_fields=("session_id", "folder_id"))
+    if not doc:
+        return None
+    files = doc["session"].get("files") or []
+    for file in files:
+        if file.get("file_type") == "video" and file.get("video_length") is not None:
+            original_length = file["video_length"]
+            file["video_length"] = format_minutes(original_length)
+            logger.debug("Formatted video length for %s: %s -> %s", file.get('file_name'), original_length, file['video_length'])
+    logger.info(f"Found {len(files)} files in session {doc['session'].get('session_id')}")
+    return files
+
 @router.get("/upload-activity")
-async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_group)):
+async def get_upload_activity(request: Request, user_groups: List[str] = Depends(get_current_user_group)):
     """
     Get upload activity for all clients.
     
     Args:
+        request: Incoming request (If-None-Match)
         user_groups: List of user group identifiers
         
     Returns:
@@ -117,6 +171,8 @@ async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_
         - Gets client names
         - Processes upload data
         - Formats video lengths
+        - 304 if no upload document's last_updated and no client name
+          changed, before the sessions are aggregated
     """
     try:
         # Calculate date range
@@ -157,8 +213,8 @@ async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_
                     if first_name or last_name:
                         client_names[client_id] = f"{first_name} {last_name}".strip()
 
-        logger.info(f"Found accessible clients: {accessible_clients}")
-        logger.info(f"Client names: {client_names}")
+        logger.debug("Found accessible clients: %s", capped(accessible_clients))
+        logger.debug("Client names: %s", capped(client_names))
 
         # If we don't have a name, try getting it from Users collection
         users_collection = async_client[DB_NAME]['Users']
@@ -178,6 +234,11 @@ async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_
             upload_filter["client_ID"] = filter_query["client_id"]
 
         logger.info(f"Upload filter: {upload_filter}")
+
+        etag = make_etag("upload-activity", ACTIVITY_VIEW_VERSION, sorted(accessible_clients), client_names,
+                         await document_versions(upload_collection, upload_filter))
+        if etag_matches(request, etag):
+            return not_modified(etag)
         
         logger.info("Using actual aggregated video length (all_video_length) for duration calculations")
         
@@ -282,7 +343,7 @@ async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_
         ]
         
         results = await upload_collection.aggregate(pipeline).to_list(None)
-        logger.info(f"Raw aggregation results: {results}")
+        logger.debug("Raw aggregation results: %s", capped(results))
         
         # Additional debug - check if all_video_length is being aggregated properly
         if results:
@@ -292,7 +353,7 @@ async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_
             
             # Log the session data to see each session's all_video_length
             if "sessions" in sample_client:
-                logger.info(f"Session data for sample client: {sample_client['sessions']}")
+                logger.debug("Session data for sample client: %s", capped(sample_client['sessions']))
             
             uploads_with_videos = [u for u in sample_client.get('uploads', []) 
                                 if u.get('stats', {}).get('videoCount', 0) > 0]
@@ -307,7 +368,7 @@ async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_
                 
         # Create a map of existing results
         results_map = {result["clientName"]: result for result in results}
-        logger.info(f"Results map: {results_map}")
+        logger.debug("Results map: %s", capped(results_map))
         
         # Create final results list with all accessible clients
         final_results = []
@@ -340,12 +401,12 @@ async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_
                     logger.error(f"Error parsing date {upload['date']}: {str(e)}")
                 
                 # Log the raw video minutes value before formatting
-                logger.info(f"Raw videoMinutes value: {upload['stats'].get('videoMinutes')}")
+                logger.debug("Raw videoMinutes value: %s", upload['stats'].get('videoMinutes'))
                 
                 upload["stats"]["videoMinutes"] = format_minutes(upload["stats"]["videoMinutes"])
                 
                 # Log the formatted video minutes value
-                logger.info(f"Formatted videoMinutes value: {upload['stats']['videoMinutes']}")
+                logger.debug("Formatted videoMinutes value: %s", upload['stats']['videoMinutes'])
                 
                 upload["stats"]["hasContent"] = upload["stats"]["videoCount"] > 0 or upload["stats"]["imageCount"] > 0
             
@@ -353,23 +414,24 @@ async def get_upload_activity(user_groups: List[str] = Depends(get_current_user_
             
         # Log a sample of the final data being sent to frontend
         if final_results:
-            logger.info(f"Sample final result for first client: {final_results[0]}")
+            logger.debug("Sample final result for first client: %s", capped(final_results[0]))
             
-        logger.info(f"Final results: {final_results}")
-        return {"data": final_results}
+        logger.debug("Final results: %s", capped(final_results))
+        return FastJSONResponse({"data": final_results}, headers=etag_headers(etag))
         
     except Exception as e:
         logger.error(f"Error in get_upload_activity: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/upload-media-details/{client_id}/{date}")
-async def get_media_details(client_id: str, date: str):
+async def get_media_details(client_id: str, date: str, fields: Optional[str] = None):
     """
     Get media details for a specific client and date.
     
     Args:
         client_id: Client identifier
         date: Date to fetch details for
+        fields: Optional file mask ('thumbnails' or 'captions')
         
     Returns:
         dict: Media file details
@@ -379,6 +441,7 @@ async def get_media_details(client_id: str, date: str):
         - Formats video lengths
         - Processes session data
     """
+    mask = file_mask(fields)
     try:
         logger.info(f"Looking for client_id: {client_id} on date: {date}")
         
@@ -387,41 +450,13 @@ async def get_media_details(client_id: str, date: str):
         
         if is_dump:
             # For dumps, use the content dump collection
-            dump_doc = await content_dump_collection.find_one(
-                {
-                    "client_ID": client_id,
-                    "sessions": {
-                        "$elemMatch": {
-                            "session_id": date,
-                            "content_type": "content_dump"
-                        }
-                    }
-                }
+            files = await read_session_files(
+                content_dump_collection, client_id,
+                {"session_id": date, "content_type": "content_dump"}, mask
             )
-            
-            if dump_doc and dump_doc.get("sessions"):
-                # Find the specific session
-                session = next(
-                    (s for s in dump_doc["sessions"] if s["session_id"] == date),
-                    None
-                )
-                if session:
-                    # Format video_length for each file
-                    files = session.get("files", [])
-                    for file in files:
-                        if file.get("file_type") == "video" and file.get("video_length") is not None:
-                            # Store the original value
-                            original_length = file.get("video_length", 0)
-                            # Format the video_length to MM:SS and replace original value
-                            file["video_length"] = format_minutes(original_length)
-                            logger.info(f"Formatted video length for {file.get('file_name')}: {original_length} -> {file['video_length']}")
-                    return {"files": files}
-            return {"files": []}
+            return {"files": files or []}
         
         # Regular story/spotlight handling
-        raw_doc = await upload_collection.find_one({"client_ID": client_id})
-        logger.info(f"Raw document found: {raw_doc}")
-        
         # If date is already in folder ID format (F(...)), use it directly
         if date.startswith('F(') and date.endswith(f')_{client_id}'):
             folder_id = date
@@ -444,46 +479,9 @@ async def get_media_details(client_id: str, date: str):
         
         logger.info(f"Looking for folder_ids: {folder_ids}")
         
-        # Find document by client_ID and any of the folder_ids
-        pipeline = [
-            {
-                "$match": {
-                    "client_ID": client_id,
-                    "sessions.folder_id": {"$in": folder_ids}
-                }
-            },
-            {
-                "$unwind": "$sessions"
-            },
-            {
-                "$match": {
-                    "sessions.folder_id": {"$in": folder_ids}
-                }
-            },
-            {
-                "$project": {
-                    "files": "$sessions.files",
-                    "folder_id": "$sessions.folder_id"
-                }
-            }
-        ]
-        
-        result = await upload_collection.aggregate(pipeline).to_list(length=None)
-        logger.info(f"Query result: {result}")
-        
-        if result and result[0].get('files'):
-            files = result[0]['files']
-            logger.info(f"Found {len(files)} files in folder {result[0].get('folder_id')}")
-            
-            # Format video_length for each file
-            for file in files:
-                if file.get("file_type") == "video" and file.get("video_length") is not None:
-                    # Store the original value
-                    original_length = file.get("video_length", 0)
-                    # Format the video_length to MM:SS and replace original value
-                    file["video_length"] = format_minutes(original_length)
-                    logger.info(f"Formatted video length for {file.get('file_name')}: {original_length} -> {file['video_length']}")
-            
+        # First session matching any of the folder_ids
+        files = await read_session_files(upload_collection, client_id, {"folder_id": {"$in": folder_ids}}, mask)
+        if files:
             return {"files": files}
             
         logger.info("No files found in any format")
@@ -639,7 +637,7 @@ async def get_session_notes(client_id: str, session_folder: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/content-dumps")
-async def get_content_dumps(user_groups: List[str] = Depends(get_current_user_group)):
+async def get_content_dumps(request: Request, user_groups: List[str] = Depends(get_current_user_group)):
     try:
         filter_query = await filter_by_partner(user_groups)
         logger.info(f"Filter query: {filter_query}")
@@ -671,8 +669,8 @@ async def get_content_dumps(user_groups: List[str] = Depends(get_current_user_gr
                     if first_name or last_name:
                         client_names[client_id] = f"{first_name} {last_name}".strip()
 
-        logger.info(f"Accessible clients: {accessible_clients}")
-        logger.info(f"Client names: {client_names}")
+        logger.debug("Accessible clients: %s", capped(accessible_clients))
+        logger.debug("Client names: %s", capped(client_names))
 
         # Basic query for Content_Dump collection
         query = {}
@@ -681,8 +679,20 @@ async def get_content_dumps(user_groups: List[str] = Depends(get_current_user_gr
 
         logger.info(f"Content_Dump query: {query}")
 
+        etag = make_etag("content-dumps", ACTIVITY_VIEW_VERSION, sorted(accessible_clients), client_names,
+                         await document_versions(content_dump_collection, query))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
         # Use the predefined collection
-        dumps = await content_dump_collection.find(query).to_list(None)
+        dumps = await content_dump_collection.find(query, {
+            "_id": 0,
+            "client_ID": 1,
+            "last_updated": 1,
+            "sessions.scan_date": 1,
+            "sessions.total_files_count": 1,
+            "sessions.total_files_size_human": 1
+        }).to_list(None)
         logger.info(f"Found {len(dumps)} content dumps")
         
         # Format results with client names
@@ -737,14 +747,14 @@ async def get_content_dumps(user_groups: List[str] = Depends(get_current_user_gr
         if final_results:
             logger.info(f"Sample result: {final_results[0]}")
 
-        return {"status": "success", "data": final_results}
+        return FastJSONResponse({"status": "success", "data": final_results}, headers=etag_headers(etag))
         
     except Exception as e:
         logger.error(f"Error in get_content_dumps: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/post-activity")
-async def get_post_activity(user_groups: List[str] = Depends(get_current_user_group)):
+async def get_post_activity(request: Request, user_groups: List[str] = Depends(get_current_user_group)):
     """Get post activity for all clients"""
     try:
         # Calculate date range
@@ -808,6 +818,11 @@ async def get_post_activity(user_groups: List[str] = Depends(get_current_user_gr
         # Add client filter if exists
         if filter_query and "client_id" in filter_query:
             queue_query["client_queues." + filter_query["client_id"]] = {"$exists": True}
+
+        etag = make_etag("post-activity", ACTIVITY_VIEW_VERSION, queue_query, sorted(accessible_clients), client_names,
+                         await document_versions(queue_collection, queue_query, key="queue_date"))
+        if etag_matches(request, etag):
+            return not_modified(etag)
             
         # Use the imported queue_collection directly
         queue_results = await queue_collection.find(queue_query).to_list(None)
@@ -855,7 +870,7 @@ async def get_post_activity(user_groups: List[str] = Depends(get_current_user_gr
                 }
         
         logger.info(f"Returning {len(final_results)} results")
-        return {"data": final_results}
+        return FastJSONResponse({"data": final_results}, headers=etag_headers(etag))
         
     except Exception as e:
         logger.error(f"Error in get_post_activity: {str(e)}")
@@ -933,7 +948,8 @@ async def approve_content(approval_data: dict):
         update_data = {
             "sessions.$.approved": True,
             "sessions.$.approved_by": approved_by,
-            "sessions.$.approved_at": datetime.utcnow().isoformat()
+            "sessions.$.approved_at": datetime.utcnow().isoformat(),
+            "last_updated": datetime.utcnow()
         }
 
         # Update all matching documents
@@ -968,7 +984,7 @@ async def approve_content(approval_data: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/spotlights")
-async def get_spotlights(user_groups: List[str] = Depends(get_current_user_group)):
+async def get_spotlights(request: Request, user_groups: List[str] = Depends(get_current_user_group)):
     try:
         filter_query = await filter_by_partner(user_groups)
         logger.info(f"Filter query: {filter_query}")
@@ -1003,7 +1019,21 @@ async def get_spotlights(user_groups: List[str] = Depends(get_current_user_group
         # Add content type filter for spotlights
         query["sessions.content_type"] = "SPOTLIGHT"
 
-        spotlight_data = await spotlight_collection.find(query).to_list(None)
+        etag = make_etag("spotlights", ACTIVITY_VIEW_VERSION, sorted(accessible_clients), client_names,
+                         await document_versions(spotlight_collection, query))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        spotlight_data = await spotlight_collection.find(query, {
+            "_id": 0,
+            "client_ID": 1,
+            "last_updated": 1,
+            "sessions.session_id": 1,
+            "sessions.content_type": 1,
+            "sessions.total_videos": 1,
+            "sessions.total_images": 1,
+            "sessions.all_video_length": 1
+        }).to_list(None)
         
         # Format results
         final_results = []
@@ -1038,15 +1068,16 @@ async def get_spotlights(user_groups: List[str] = Depends(get_current_user_group
             
             final_results.append(result)
 
-        return {"status": "success", "data": final_results}
+        return FastJSONResponse({"status": "success", "data": final_results}, headers=etag_headers(etag))
         
     except Exception as e:
         logger.error(f"Error in get_spotlights: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/spotlight-details/{client_id}/{date}")
-async def get_spotlight_details(client_id: str, date: str):
-    """Get spotlight media details for a specific client and date"""
+async def get_spotlight_details(client_id: str, date: str, fields: Optional[str] = None):
+    """Get spotlight media details for a specific client and date (fields: optional file mask)"""
+    mask = file_mask(fields)
     try:
         # Convert date from YYYY-MM-DD to MM-DD-YYYY
         year, month, day = date.split('-')
@@ -1059,42 +1090,14 @@ async def get_spotlight_details(client_id: str, date: str):
         logger.info(f"Date conversion: {date} -> {formatted_date}")
         
         # Query the spotlight collection
-        spotlight_doc = await spotlight_collection.find_one({
-            "client_ID": client_id,
-            "sessions": {
-                "$elemMatch": {
-                    "session_id": session_id,
-                    "content_type": "SPOTLIGHT"
-                }
-            }
-        })
-        
-        if not spotlight_doc:
-            logger.info(f"No spotlight document found for {client_id} on {formatted_date}")
-            return {"status": "success", "files": []}  # Return empty array instead of 404
-            
-        # Find the specific session
-        session = next(
-            (s for s in spotlight_doc.get("sessions", []) 
-             if s.get("session_id") == session_id and s.get("content_type") == "SPOTLIGHT"),
-            None
+        files = await read_session_files(
+            spotlight_collection, client_id,
+            {"session_id": session_id, "content_type": "SPOTLIGHT"}, mask
         )
         
-        if not session:
+        if files is None:
             logger.info(f"No spotlight session found for {session_id}")
             return {"status": "success", "files": []}  # Return empty array instead of 404
-            
-        logger.info(f"Found session with {len(session.get('files', []))} files")
-        
-        # Format video_length for each file
-        files = session.get("files", [])
-        for file in files:
-            if file.get("file_type") == "video" and file.get("video_length") is not None:
-                # Store the original value
-                original_length = file.get("video_length", 0)
-                # Format the video_length to MM:SS and replace original value
-                file["video_length"] = format_minutes(original_length)
-                logger.info(f"Formatted video length for {file.get('file_name')}: {original_length} -> {file['video_length']}")
         
         return {
             "status": "success",
@@ -1188,7 +1191,7 @@ async def get_editor_notes(client_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/saved-activity")
-async def get_saved_activity(user_groups: List[str] = Depends(get_current_user_group)):
+async def get_saved_activity(request: Request, user_groups: List[str] = Depends(get_current_user_group)):
     try:
         # Get filter query based on user's groups
         filter_query = await filter_by_partner(user_groups)
@@ -1221,6 +1224,11 @@ async def get_saved_activity(user_groups: List[str] = Depends(get_current_user_g
                     if first_name or last_name:
                         client_names[client_id] = f"{first_name} {last_name}".strip()
 
+        etag = make_etag("saved-activity", ACTIVITY_VIEW_VERSION, sorted(accessible_clients), client_names,
+                         await document_versions(saved_collection, filter_query or {}))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
         # Query for saved content
         pipeline = [
             {
@@ -1312,67 +1320,28 @@ async def get_saved_activity(user_groups: List[str] = Depends(get_current_user_g
             final_results.append(result)
             
         logger.info(f"Returning {len(final_results)} results with saved content")
-        return {"data": final_results}
+        return FastJSONResponse({"data": final_results}, headers=etag_headers(etag))
         
     except Exception as e:
         logger.error(f"Error in get_saved_activity: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/saved-media-details/{client_id}/{date}")
-async def get_saved_media_details(client_id: str, date: str):
+async def get_saved_media_details(client_id: str, date: str, fields: Optional[str] = None):
+    mask = file_mask(fields)
     try:
         # Format the session ID
         session_id = date  # date is already in F(MM-DD-YYYY)_clientId format
         
         logger.info(f"Looking for saved content with session_id: {session_id}")
         
-        # Find document by client_ID and session_id
-        pipeline = [
-            {
-                "$match": {
-                    "client_ID": client_id,
-                    "sessions": {
-                        "$elemMatch": {
-                            "session_id": session_id,
-                            "content_type": "SAVED"
-                        }
-                    }
-                }
-            },
-            {
-                "$unwind": "$sessions"
-            },
-            {
-                "$match": {
-                    "sessions.session_id": session_id,
-                    "sessions.content_type": "SAVED"
-                }
-            },
-            {
-                "$project": {
-                    "files": "$sessions.files"
-                }
-            }
-        ]
-        
-        logger.info(f"Running pipeline: {pipeline}")
-        
-        result = await saved_collection.aggregate(pipeline).to_list(None)
-        logger.info(f"Query result: {result}")
+        # Find the session by client_ID and session_id
+        files = await read_session_files(
+            saved_collection, client_id,
+            {"session_id": session_id, "content_type": "SAVED"}, mask
+        )
         
-        if result and result[0].get('files'):
-            files = result[0]['files']
-            logger.info(f"Found {len(files)} files")
-            
-            # Format video_length for each file
-            for file in files:
-                if file.get("file_type") == "video" and file.get("video_length") is not None:
-                    # Store the original value
-                    original_length = file.get("video_length", 0)
-                    # Format the video_length to MM:SS and replace original value
-                    file["video_length"] = format_minutes(original_length)
-                    logger.info(f"Formatted video length for {file.get('file_name')}: {original_length} -> {file['video_length']}")
-            
+        if files:
             return {"files": files}
             
         logger.info("No files found")
@@ -1456,7 +1425,8 @@ async def update_flag_status(
                 },
                 {
                     "$set": {
-                        "sessions.$[session].files.$[file].content_matches_status": "removed"
+                        "sessions.$[session].files.$[file].content_matches_status": "removed",
+                        "last_updated": datetime.utcnow()
                     }
                 },
                 array_filters=[
@@ -1479,7 +1449,8 @@ async def update_flag_status(
                 {
                     "$unset": {
                         "sessions.$[session].files.$[file].content_matches_status": ""
-                    }
+                    },
+                    "$set": {"last_updated": datetime.utcnow()}
                 },
                 array_filters=[
                     {"session.folder_id": folder_id},
@@ -1642,7 +1613,10 @@ async def delete_content(client_id: str, session_folder: str):
             # Delete from uploads collection
             upload_result = await upload_collection.update_one(
                 {"client_ID": client_id},
-                {"$pull": {"sessions": {"session_id": session_folder}}}
+                {
+                    "$pull": {"sessions": {"session_id": session_folder}},
+                    "$set": {"last_updated": datetime.utcnow()}
+                }
             )
             logger.info(f"Removed session from uploads collection: {upload_result.modified_count} modified")
 
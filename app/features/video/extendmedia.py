@@ -12,6 +12,7 @@ import asyncio
 import ffmpeg
 import shutil
 from fractions import Fraction
+from app.shared.executors import run_media
 
 logger = logging.getLogger(__name__)
 
@@ -155,7 +156,7 @@ async def extend_video_cdn(file_path: str, target_duration: float = 6.4, bunny_c
                 return False
 
             # Get video duration
-            probe = ffmpeg.probe(input_path)
+            probe = await run_media(ffmpeg.probe, input_path)
             duration = float(probe.get('format', {}).get('duration', 0))
             
             logger.info(f"Video duration: {duration} seconds")
@@ -165,7 +166,7 @@ async def extend_video_cdn(file_path: str, target_duration: float = 6.4, bunny_c
                 return False
 
             # Extend the video
-            if not extend_video_with_ffmpeg(input_path, output_path, target_duration):
+            if not await run_media(extend_video_with_ffmpeg, input_path, output_path, target_duration):
                 logger.error("Failed to extend video")
                 return False
 
@@ -267,7 +268,7 @@ async def extend_local(input_file: str, target_duration: float = 6.4, output_dir
             os.makedirs(output_dir)
             
         # Get video info
-        probe = ffmpeg.probe(input_file)
+        probe = await run_media(ffmpeg.probe, input_file)
         orig_duration = float(probe.get('format', {}).get('duration', 0))
         
         print(f"Video duration: {orig_duration} seconds")
@@ -284,7 +285,7 @@ async def extend_local(input_file: str, target_duration: float = 6.4, output_dir
         output_path = os.path.join(output_dir, output_name)
         
         # Extend the video
-        return extend_video_with_ffmpeg(input_file, output_path, target_duration)
+        return await run_media(extend_video_with_ffmpeg, input_file, output_path, target_duration)
         
     except Exception as e:
         print(f"Error processing media: {str(e)}")
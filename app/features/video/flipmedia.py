@@ -11,7 +11,8 @@ import aiohttp
 import asyncio
 import ffmpeg
 import shutil
-from PIL import Image  # Add PIL for image processing
+from app.shared.executors import run_cpu, run_media
+from app.shared.imaging import rotate_to_vertical
 
 logger = logging.getLogger(__name__)
 
@@ -149,46 +150,22 @@ async def flip_to_vertical(file_path: str, bunny_cdn=None) -> bool:
             needs_flip = False
             if is_image_file(input_path):
                 try:
-                    img = Image.open(input_path)
-                    width, height = img.size
-                    
-                    # Check if image is horizontal
-                    if width > height:
-                        needs_flip = True
-                        logger.info(f"Image is horizontal ({width}x{height}). Will flip.")
-                    else:
-                        logger.info(f"Image is already vertical ({width}x{height}). Skipping.")
-                        return False
-
-                    if needs_flip:
-                        # Check EXIF for rotation direction
-                        orientation = None
-                        try:
-                            exif = img._getexif()
-                            if exif:
-                                orientation = exif.get(274)
-                        except:
-                            pass
-
-                        output_name = f"{input_name[:4]}v{input_name[4:]}"
-                        output_path = os.path.join(temp_dir, output_name)
+                    output_name = f"{input_name[:4]}v{input_name[4:]}"
+                    output_path = os.path.join(temp_dir, output_name)
 
-                        # Rotate based on EXIF or default
-                        if orientation == 6:
-                            rotated = img.transpose(Image.ROTATE_270)
-                        elif orientation == 8:
-                            rotated = img.transpose(Image.ROTATE_90)
-                        else:
-                            rotated = img.transpose(Image.ROTATE_270)
-                        
-                        rotated.save(output_path)
-                        
-                        # Upload flipped version
-                        cdn_output_path = os.path.join(os.path.dirname(file_path), output_name)
-                        with open(output_path, 'rb') as f:
-                            if await bunny_cdn.upload_file(cdn_output_path, f.read()):
-                                await bunny_cdn.delete_files([file_path])
-                                return True
+                    # Rotate based on EXIF or default, off the event loop
+                    needs_flip = await run_cpu(rotate_to_vertical, input_path, output_path)
+                    if not needs_flip:
+                        logger.info(f"Image {input_name} is already vertical. Skipping.")
+                        return False
+                    logger.info(f"Image {input_name} was horizontal. Flipped.")
+
+                    # Upload flipped version
+                    cdn_output_path = os.path.join(os.path.dirname(file_path), output_name)
+                    with open(output_path, 'rb') as f:
+                        if await bunny_cdn.upload_file(cdn_output_path, f.read()):
+                            await bunny_cdn.delete_files([file_path])
+                            return True
                 except Exception as e:
                     logger.error(f"Image processing failed: {str(e)}")
                     return False
@@ -196,7 +173,7 @@ async def flip_to_vertical(file_path: str, bunny_cdn=None) -> bool:
             elif is_video_file(input_path):
                 try:
                     # Check video dimensions
-                    probe = ffmpeg.probe(input_path)
+                    probe = await run_media(ffmpeg.probe, input_path)
                     video_stream = next((stream for stream in probe['streams'] 
                                        if stream['codec_type'] == 'video'), None)
                     if not video_stream:
@@ -220,7 +197,7 @@ async def flip_to_vertical(file_path: str, bunny_cdn=None) -> bool:
                         stream = ffmpeg.input(input_path)
                         stream = ffmpeg.filter(stream, 'transpose', 2)
                         stream = ffmpeg.output(stream, output_path)
-                        ffmpeg.run(stream, overwrite_output=True, quiet=True)
+                        await run_media(ffmpeg.run, stream, overwrite_output=True, quiet=True)
                         
                         # Upload flipped version
                         cdn_output_path = os.path.join(os.path.dirname(file_path), output_name)
@@ -30,7 +30,7 @@ Author: Snapped Development Team
 import logging
 import tempfile
 import os
-import aiohttp
+from app.shared.http_clients import http_session
 import ffmpeg
 from app.shared.bunny_cdn import BunnyCDN
 from datetime import datetime
@@ -231,7 +231,7 @@ class VideoSplitter:
             temp_dir = tempfile.gettempdir()
             temp_file = os.path.join(temp_dir, 'temp_video.mp4')
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session("transfer") as session:
                 async with session.get(video_url) as response:
                     if response.status != 200:
                         raise Exception(f"Failed to download video: {response.status}")
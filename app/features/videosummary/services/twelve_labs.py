@@ -39,7 +39,9 @@ import logging
 import traceback
 from typing import Dict, List, Set
 from datetime import datetime, timezone
-import aiohttp
+from app.shared.http_clients import http_session
+from app.shared.jobs import JobContext, enqueue, job, job_accepted
+from app.shared.executors import run_media
 from app.shared.database import video_analysis_collection, analysis_queue_collection, upload_collection, summary_prompt_collection, MONGODB_URL, MONGO_SETTINGS
 from app.features.videosummary.insights import store_video_analysis_results, extract_insights, update_best_practices
 from twelvelabs import TwelveLabs
@@ -226,7 +228,7 @@ class TwelveLabsService:
                 input_path = os.path.join(temp_dir, 'input.mp4')
                 output_path = os.path.join(temp_dir, 'output.mp4')
 
-                async with aiohttp.ClientSession() as session:
+                async with http_session("transfer") as session:
                     async with session.get(video_url) as response:
                         if response.status != 200:
                             raise Exception(f"Failed to download video: {response.status}")
@@ -238,7 +240,7 @@ class TwelveLabsService:
                                 f.write(chunk)
 
                 # Get video dimensions
-                probe = ffmpeg.probe(input_path)
+                probe = await run_media(ffmpeg.probe, input_path)
                 video_stream = next((stream for stream in probe['streams'] 
                                    if stream['codec_type'] == 'video'), None)
                 if not video_stream:
@@ -271,7 +273,7 @@ class TwelveLabsService:
                                          vcodec='libx264',
                                          preset='ultrafast',
                                          acodec='aac')
-                    ffmpeg.run(stream, overwrite_output=True)
+                    await run_media(ffmpeg.run, stream, overwrite_output=True)
 
                     # Return path to processed video
                     return output_path
@@ -310,7 +312,7 @@ class TwelveLabsService:
                 input_path = os.path.join(temp_dir, original_filename)
                 output_path = os.path.join(temp_dir, f"processed_{original_filename}")
 
-                async with aiohttp.ClientSession() as session:
+                async with http_session("transfer") as session:
                     async with session.get(video_url) as response:
                         if response.status != 200:
                             raise Exception(f"Failed to download video: {response.status}")
@@ -322,7 +324,7 @@ class TwelveLabsService:
                                 f.write(chunk)
 
                 # Get video dimensions
-                probe = ffmpeg.probe(input_path)
+                probe = await run_media(ffmpeg.probe, input_path)
                 video_stream = next((stream for stream in probe['streams'] 
                                    if stream['codec_type'] == 'video'), None)
                 if not video_stream:
@@ -355,7 +357,7 @@ class TwelveLabsService:
                                          vcodec='libx264',
                                          preset='ultrafast',
                                          acodec='aac')
-                    ffmpeg.run(stream, overwrite_output=True)
+                    await run_media(ffmpeg.run, stream, overwrite_output=True)
                     video_path = output_path
                 else:
                     video_path = input_path
@@ -428,7 +430,8 @@ class TwelveLabsService:
                 "$set": {
                     "sessions.$[session].files.$[file].is_indexed": True,
                     "sessions.$[session].files.$[file].twelve_labs_task_id": task_id,
-                    "sessions.$[session].files.$[file].twelve_labs_video_id": video_id
+                    "sessions.$[session].files.$[file].twelve_labs_video_id": video_id,
+                    "last_updated": datetime.now(timezone.utc)
                 }
             },
             array_filters=[
@@ -562,7 +565,8 @@ class TwelveLabsService:
                             {
                                 "$set": {
                                     "sessions.$[session].files.$[file].content_matches": content_data,
-                                    "sessions.$[session].files.$[file].last_content_match": datetime.now(timezone.utc)
+                                    "sessions.$[session].files.$[file].last_content_match": datetime.now(timezone.utc),
+                                    "last_updated": datetime.now(timezone.utc)
                                 }
                             },
                             array_filters=[
@@ -783,7 +787,8 @@ class TwelveLabsService:
                 {
                     "$set": {
                         "sessions.$[].files.$[file].video_summary": formatted_summary,
-                        "sessions.$[].files.$[file].summary_prompt_version": prompt_id
+                        "sessions.$[].files.$[file].summary_prompt_version": prompt_id,
+                        "last_updated": datetime.now(timezone.utc)
                     }
                 },
                 array_filters=[{"file.twelve_labs_video_id": video_id}]
@@ -919,71 +924,77 @@ async def scan_for_indexes():
         logger.error(f"Error in scan_for_indexes: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/upload-videos")
-async def upload_videos():
-    """Process multiple videos concurrently"""
-    try:
-        async with TwelveLabsService() as service:
-            videos_to_process = []
-            
-            # Get today's date in MM-DD-YYYY format
-            today = datetime.now().strftime("%m-%d-%Y")
-            
-            # Collect all videos that need processing from today's sessions
-            async for doc in upload_collection.find({
-                "twelve_labs_index": {"$exists": True, "$ne": ""},
-                "sessions": {
-                    "$elemMatch": {
-                        "session_id": {"$regex": f"F\\({today}\\)"},
-                        "files": {
-                            "$elemMatch": {
-                                "is_indexed": {"$ne": True},
-                                "file_type": {"$regex": "video", "$options": "i"},
-                                "file_name": {"$exists": True, "$ne": ""}  # Ensure filename exists
-                            }
+@job("twelve_labs.upload_videos", queue="ai", max_attempts=2, timeout=4 * 3600)
+async def upload_videos_job(ctx: JobContext, date: str = None):
+    """Process a day's unindexed videos concurrently (date as MM-DD-YYYY, default today)"""
+    async with TwelveLabsService() as service:
+        videos_to_process = []
+        
+        # Date fixed at enqueue time so a retry after midnight keeps its day
+        today = date or datetime.now().strftime("%m-%d-%Y")
+        
+        # Collect all videos that need processing from today's sessions
+        async for doc in upload_collection.find({
+            "twelve_labs_index": {"$exists": True, "$ne": ""},
+            "sessions": {
+                "$elemMatch": {
+                    "session_id": {"$regex": f"F\\({today}\\)"},
+                    "files": {
+                        "$elemMatch": {
+                            "is_indexed": {"$ne": True},
+                            "file_type": {"$regex": "video", "$options": "i"},
+                            "file_name": {"$exists": True, "$ne": ""}  # Ensure filename exists
                         }
                     }
                 }
-            }):
-                client_id = doc.get("client_ID")
-                for session in doc.get("sessions", []):
-                    # Only process today's sessions
-                    if not session.get("session_id", "").startswith(f"F({today})"):
-                        continue
-                        
-                    for file in session.get("files", []):
-                        # Only process videos with valid filenames that aren't indexed
-                        if (not file.get("is_indexed") and 
-                            file.get("file_type", "").lower() == "video" and
-                            file.get("file_name")):  # Ensure filename exists
-                            
-                            logger.info(f"Queueing video for processing: {file.get('file_name')} from session {session.get('session_id')}")
-                            videos_to_process.append({
-                                "client_id": client_id,
-                                "file_data": {**file, "session_id": session.get("session_id", "")}
-                            })
-
-            # Process videos concurrently
-            results = await service.process_videos_concurrent(videos_to_process)
-            
-            # Compile statistics
-            stats = {
-                "total": len(videos_to_process),
-                "processed": len([r for r in results if r["status"] == "success"]),
-                "skipped": len([r for r in results if r["status"] == "skipped"]),
-                "failed": len([r for r in results if r["status"] == "error"]),
-                "errors": [r for r in results if r["status"] == "error"]
-            }
-
-            return {
-                "status": "success",
-                "message": "Completed processing videos",
-                "statistics": stats
             }
+        }):
+            client_id = doc.get("client_ID")
+            for session in doc.get("sessions", []):
+                # Only process today's sessions
+                if not session.get("session_id", "").startswith(f"F({today})"):
+                    continue
+                    
+                for file in session.get("files", []):
+                    # Only process videos with valid filenames that aren't indexed
+                    if (not file.get("is_indexed") and 
+                        file.get("file_type", "").lower() == "video" and
+                        file.get("file_name")):  # Ensure filename exists
+                        
+                        logger.info(f"Queueing video for processing: {file.get('file_name')} from session {session.get('session_id')}")
+                        videos_to_process.append({
+                            "client_id": client_id,
+                            "file_data": {**file, "session_id": session.get("session_id", "")}
+                        })
+
+        # Process videos concurrently
+        ctx.update_progress(total=len(videos_to_process))
+        results = await service.process_videos_concurrent(videos_to_process)
+        
+        # Compile statistics
+        stats = {
+            "total": len(videos_to_process),
+            "processed": len([r for r in results if r["status"] == "success"]),
+            "skipped": len([r for r in results if r["status"] == "skipped"]),
+            "failed": len([r for r in results if r["status"] == "error"]),
+            "errors": [r for r in results if r["status"] == "error"]
+        }
+
+        return {
+            "status": "success",
+            "message": "Completed processing videos",
+            "statistics": stats
+        }
 
+@router.post("/upload-videos")
+async def upload_videos():
+    """Queue indexing of today's unindexed videos"""
+    try:
+        today = datetime.now().strftime("%m-%d-%Y")
+        job_id = await enqueue(upload_videos_job, key=today, date=today)
+        return job_accepted(job_id)
     except Exception as e:
         logger.error(f"Error in upload_videos endpoint: {str(e)}")
-        logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/search-index")
@@ -1067,13 +1078,18 @@ async def match_search_results(client_id: str = None):
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
+@job("twelve_labs.summarize_videos", queue="ai", max_attempts=2, timeout=4 * 3600)
+async def summarize_videos_job(ctx: JobContext):
+    """Generate summaries for all newly indexed videos"""
+    async with TwelveLabsService() as service:
+        return await service.summarize_all_new_videos()
+
 @router.post("/summarize-videos")
 async def summarize_videos():
-    """Generate summaries for all newly indexed videos"""
+    """Queue summaries for all newly indexed videos"""
     try:
-        async with TwelveLabsService() as service:
-            results = await service.summarize_all_new_videos()
-            return results
+        job_id = await enqueue(summarize_videos_job, key="all")
+        return job_accepted(job_id)
     except Exception as e:
         logger.error(f"Error in summarize_videos endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -7,4 +7,14 @@ worker_class = "uvicorn.workers.UvicornWorker"
 max_requests = 1000
 max_requests_jitter = 50
 keepalive = 5
-timeout = 120
\ No newline at end of file
+timeout = 120
+
+
+def on_starting(server):
+    # LAZY_ROUTERS needs app/route_manifest.json; (re)build it once in the
+    # master before any worker starts (in a child process, see
+    # ensure_route_manifest)
+    from app.shared.lazy_routers import ensure_route_manifest, lazy_routers_enabled
+    if lazy_routers_enabled():
+        from app.routers import FEATURE_ROUTERS
+        ensure_route_manifest(FEATURE_ROUTERS)
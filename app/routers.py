@@ -0,0 +1,73 @@
+"""
+Feature Router Registry
+
+This module lists every feature router mounted by the application, in
+mount order, without importing the feature modules themselves.
+
+Features:
+- Single router registry
+- Mount order
+- Include options
+
+Data Model:
+- Feature name
+- Module path
+- Router attribute
+- Prefix and tags
+
+Dependencies:
+- lazy_routers for FeatureRouter
+
+Author: Snapped Development Team
+"""
+
+from .shared.lazy_routers import FeatureRouter
+
+FEATURE_ROUTERS = [
+    # Mount messages router first to ensure it takes precedence
+    FeatureRouter("messages", "app.features.messages.routes_messages", prefix="/api/messages"),
+
+    # Then mount other routers
+    FeatureRouter("uploadapp", "app.features.uploadapp.routes_uploadapp"),
+    FeatureRouter("callform", "app.features.callform.routes_callform"),
+    FeatureRouter("queue", "app.features.posting.queue_builder"),
+    FeatureRouter("payments", "app.features.payments.routes_payments"),
+    FeatureRouter("quickbooks", "app.features.payments.quickbooks_webhook"),
+    FeatureRouter("splits", "app.features.payments.routes_splits"),
+    FeatureRouter("clients", "app.features.clients.routes_clients", prefix="/api"),
+    FeatureRouter("cdn_mongo", "app.features.cdn.cdn_mongo", prefix="/api/cdn-mongo", tags=["cdn-mongo"]),
+    FeatureRouter("timesheet", "app.features.timesheet.routes_timesheet", prefix="/api", tags=["timesheet"]),
+    FeatureRouter("posting", "app.features.posting.post_processor"),
+    FeatureRouter("make", "app.features.posting.make_processor"),
+    FeatureRouter("uploadtracker", "app.features.uploadtracker.routes_uploadtracker"),
+    FeatureRouter("lead", "app.features.lead.route_lead", prefix="/api"),
+    FeatureRouter("lead_singular", "app.features.lead.route_lead", "router_singular", prefix="/api"),
+    FeatureRouter("dashboard", "app.features.lead.route_dashboard", prefix="/api"),
+    FeatureRouter("contracts", "app.features.contracts.routes_contracts"),
+    FeatureRouter("onboarding", "app.features.onboarding.routes_onboarding", prefix="/api"),
+    FeatureRouter("tasks", "app.features.tasks.routes_tasks", prefix="/api"),
+    FeatureRouter("tiktok", "app.features.tiktok.routes_tiktok"),
+    FeatureRouter("spot_queue", "app.features.posting.spot_queue_builder"),
+    FeatureRouter("spot_make", "app.features.posting.spot_make_processor"),
+    FeatureRouter("partners", "app.features.partners.routes_partners"),
+    FeatureRouter("cdn", "app.features.cdn.routes_cdn", tags=["cdn"]),
+    FeatureRouter("content_dump", "app.features.cdn.routes_cdn", "content_dump_router", prefix="/api", tags=["content-dump"]),
+    FeatureRouter("bunnyscan", "app.features.bunnyscan.bunny_scanner"),
+    FeatureRouter("employees", "app.features.employees.routes.signup"),
+    FeatureRouter("employee_management", "app.features.employees.routes.employee_management", prefix="/api", tags=["employee_management"]),
+    FeatureRouter("analytics", "app.features.analytics.route_analytics"),
+    FeatureRouter("data", "app.features.analytics.route_data_endpoint"),
+    FeatureRouter("demosite", "app.features.demosite.routes_demosite"),
+    FeatureRouter("support", "app.features.support.routes_support"),
+    FeatureRouter("saved_queue", "app.features.posting.saved_queue_builder"),
+    FeatureRouter("saved_make", "app.features.posting.saved_make_processor"),
+    FeatureRouter("twelve_labs", "app.features.videosummary.services.twelve_labs"),
+    FeatureRouter("video_summary", "app.features.videosummary.VideoSummaryReview", tags=["ai-review"]),
+    FeatureRouter("survey", "app.features.survey.survey_routes", tags=["survey"]),
+    FeatureRouter("aichat", "app.features.AIChat.routes_AIChat", prefix="/api", tags=["ai-chat"]),
+    FeatureRouter("desktop_upload", "app.features.desktop_upload", prefix="/api", tags=["desktop-upload"]),
+    FeatureRouter("social", "app.features.social.routes_social", prefix="/api"),
+    FeatureRouter("captions", "app.features.captions.routes_captions", tags=["captions"]),
+]
+
+__all__ = ['FEATURE_ROUTERS']
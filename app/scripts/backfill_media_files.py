@@ -0,0 +1,60 @@
+"""
+Media Files Backfill Module
+
+This module copies the nested sessions[].files[] layout of the upload
+collections into the normalized UploadDB.media_files and
+UploadDB.sessions collections.
+
+Also available as the media_files.backfill job (enqueue it to run on a
+worker with progress); use this script for manual runs.
+
+Features:
+- Per-collection backfill
+- Idempotent re-runs (unchanged sessions skipped)
+- Stale row cleanup
+- Logging
+
+Data Model:
+- Source: Uploads, Saved, Spotlights, Content_Dump
+- Target: media_files (one per file), sessions (one per session)
+
+Dependencies:
+- media_store for mirroring
+- logging for tracking
+- asyncio for the event loop
+
+Usage:
+    python -m app.scripts.backfill_media_files [Uploads Saved ...]
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import logging
+import sys
+from app.shared.media_store import backfill_media_files
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def main():
+    """
+    Backfill the normalized media layout.
+
+    Returns:
+        None
+
+    Notes:
+        - Collections may be named on the command line (default all)
+    """
+    try:
+        counts = await backfill_media_files(sys.argv[1:] or None)
+        logger.info(f"Backfilled media files: {counts}")
+
+    except Exception as e:
+        logger.error(f"Failed to backfill media files: {e}")
+        raise
+
+if __name__ == "__main__":
+    asyncio.run(main())
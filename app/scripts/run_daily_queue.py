@@ -4,6 +4,9 @@ Daily Queue Runner Module
 This module manages the execution of daily content queue building
 operations.
 
+Scheduled in-app as posting.build_daily_queue (python -m app.worker); use this
+script only for manual runs, not from cron.
+
 Features:
 - Queue building
 - Schedule management
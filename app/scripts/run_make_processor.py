@@ -4,6 +4,9 @@ Make Processor Runner Module
 This module manages the execution of Make integration processing
 for content queues.
 
+Scheduled in-app as posting.daily_make (python -m app.worker); use this
+script only for manual runs, not from cron.
+
 Features:
 - Queue processing
 - Make integration
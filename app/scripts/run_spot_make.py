@@ -4,6 +4,9 @@ Spotlight Make Runner Module
 This module manages the execution of Make integration processing
 for Spotlight content queues.
 
+Scheduled in-app as posting.daily_spot_make (python -m app.worker); use this
+script only for manual runs, not from cron.
+
 Features:
 - Spotlight processing
 - API integration
@@ -19,23 +22,22 @@ Data Model:
 - API responses
 
 Dependencies:
-- requests for API calls
+- SpotMakeProcessor for processing
 - logging for tracking
-- datetime for timestamps
+- asyncio for the event loop
 
 Author: Snapped Development Team
 """
 
-import requests
-import os
-from datetime import datetime
+import asyncio
 import logging
+from app.features.posting.spot_make_processor import SpotMakeProcessor
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def main():
+async def main():
     """
     Run Spotlight queue processing.
     
@@ -43,21 +45,17 @@ def main():
         None
         
     Notes:
-        - Triggers API
-        - Handles responses
-        - Logs status
+        - Runs the processor in-process (no API round trip)
+        - Webhook sends go through the outbox
         - Error handling
     """
-    url = "https://track.snapped.cc/api/spot-queue/process-make"
-    
     try:
-        response = requests.post(url)
-        response.raise_for_status()
-        logger.info("Successfully triggered spotlight queue processing")
+        await SpotMakeProcessor().process_all_queues()
+        logger.info("Successfully processed spotlight queue")
         
     except Exception as e:
-        logger.error(f"Failed to trigger spotlight queue processing: {e}")
+        logger.error(f"Failed to process spotlight queue: {e}")
         raise
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main())
@@ -4,6 +4,9 @@ Spotlight Queue Runner Module
 This module manages the execution of Spotlight content queue
 building operations.
 
+Scheduled in-app as posting.build_spot_queue (python -m app.worker); use this
+script only for manual runs, not from cron.
+
 Features:
 - Queue building
 - Schedule management
@@ -4,10 +4,14 @@ from .auth import (
     get_filtered_query,
     filter_by_partner
 )
+from .context import AuthContext, get_auth_context, set_auth_context
 
 __all__ = [
     'get_current_user_group',
     'get_current_user_id',
     'get_filtered_query',
-    'filter_by_partner'
+    'filter_by_partner',
+    'AuthContext',
+    'get_auth_context',
+    'set_auth_context'
 ] 
\ No newline at end of file
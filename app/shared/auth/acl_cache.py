@@ -0,0 +1,252 @@
+"""
+ACL Cache Module
+
+This module caches the resolved partner/employee client filter per user
+so filter_by_partner is a single cache hit on the hot path.
+
+Features:
+- In-process L1 with TTL
+- Redis L2 shared by workers
+- Per-employee invalidation
+- Global invalidation
+- Change stream invalidation (Employees, ReferredBy)
+- Negative result caching
+
+Data Model:
+- Cache key: user ID + groups
+- Cached value: MongoDB filter
+- Employee index sets
+
+Security:
+- L1 TTL bounds staleness while the bus is down
+- Copy on read
+- Redis outage fallback
+
+Dependencies:
+- redis.asyncio for L2
+- json for storage
+- time for TTLs
+- logging for tracking
+
+Author: Snapped Development Team
+"""
+
+import copy
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import List, Optional
+from app.shared.invalidation import InvalidationEvent, on_invalidation
+from app.shared.redis_client import REDIS_UNAVAILABLE_ERRORS, get_redis, mark_redis_down
+
+logger = logging.getLogger(__name__)
+
+# Seconds an entry is served from worker memory (the invalidation bus
+# drops changed employees sooner)
+ACL_L1_TTL = 300
+
+# Seconds an entry is served from Redis
+ACL_REDIS_TTL = 3600
+
+# Max users kept in worker memory
+ACL_L1_MAX_ENTRIES = 5000
+
+ACL_KEY_PREFIX = "acl:filter:"
+ACL_EMPLOYEE_PREFIX = "acl:employee:"
+ACL_ALL_KEYS = "acl:keys"
+
+
+class ACLCache:
+    """
+    Two-level cache of resolved partner filters.
+
+    Positive results (an employee record matched) are shared through
+    Redis and indexed by employee so assignment changes can drop them.
+    Negative results stay in L1 only; a new employee record clears
+    them through the invalidation bus (or within ACL_L1_TTL seconds).
+
+    Attributes:
+        l1: LRU of key -> (expires_at, filter, employee_id)
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.l1 = OrderedDict()
+
+    @staticmethod
+    def cache_key(auth_data: dict) -> str:
+        """
+        Build the cache key for auth data.
+
+        Args:
+            auth_data: Auth data with groups and user ID
+
+        Returns:
+            str: Stable key for this user and group set
+        """
+        groups = ",".join(sorted(auth_data.get("groups", [])))
+        return f"{auth_data.get('user_id')}|{groups}"
+
+    async def get(self, auth_data: dict) -> Optional[dict]:
+        """
+        Get a cached filter.
+
+        Args:
+            auth_data: Auth data with groups and user ID
+
+        Returns:
+            dict: Copy of the filter, or None on miss
+
+        Notes:
+            - L1 first, then Redis
+            - Redis hits refill L1
+        """
+        key = self.cache_key(auth_data)
+        entry = self.l1.get(key)
+        if entry is not None:
+            expires_at, filter_query, employee_id = entry
+            if time.monotonic() < expires_at:
+                self.l1.move_to_end(key)
+                return copy.deepcopy(filter_query)
+            del self.l1[key]
+
+        redis_client = get_redis()
+        if not redis_client:
+            return None
+        try:
+            raw = await redis_client.get(ACL_KEY_PREFIX + key)
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+            return None
+        if raw is None:
+            return None
+
+        cached = json.loads(raw)
+        self._put_l1(key, cached["filter"], cached.get("employee_id"))
+        return copy.deepcopy(cached["filter"])
+
+    async def set(self, auth_data: dict, filter_query: dict, employee_id: Optional[str]):
+        """
+        Store a resolved filter.
+
+        Args:
+            auth_data: Auth data with groups and user ID
+            filter_query: Resolved MongoDB filter
+            employee_id: Matched employee user_id, None if no record
+        """
+        key = self.cache_key(auth_data)
+        self._put_l1(key, filter_query, employee_id)
+
+        if not employee_id:
+            return
+        redis_client = get_redis()
+        if not redis_client:
+            return
+        try:
+            employee_key = ACL_EMPLOYEE_PREFIX + employee_id
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(
+                    ACL_KEY_PREFIX + key,
+                    json.dumps({"filter": filter_query, "employee_id": employee_id}),
+                    ex=ACL_REDIS_TTL
+                )
+                pipe.sadd(employee_key, key)
+                pipe.expire(employee_key, ACL_REDIS_TTL)
+                pipe.sadd(ACL_ALL_KEYS, key)
+                pipe.expire(ACL_ALL_KEYS, ACL_REDIS_TTL)
+                await pipe.execute()
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+
+    async def invalidate_employee(self, employee_id: str, local: bool = False):
+        """
+        Drop cached filters resolved from one employee record.
+
+        Args:
+            employee_id: Employee user_id whose clients changed
+            local: Drop this worker's copies only
+        """
+        for key in [k for k, entry in self.l1.items() if entry[2] == employee_id]:
+            del self.l1[key]
+
+        redis_client = None if local else get_redis()
+        if not redis_client:
+            return
+        try:
+            employee_key = ACL_EMPLOYEE_PREFIX + employee_id
+            keys = await redis_client.smembers(employee_key)
+            await redis_client.delete(employee_key, *[ACL_KEY_PREFIX + k for k in keys])
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+        logger.info(f"Invalidated ACL cache for employee {employee_id}")
+
+    async def invalidate_all(self, local: bool = False):
+        """
+        Drop every cached filter (partner mappings changed).
+
+        Args:
+            local: Drop this worker's copies only
+        """
+        self.l1.clear()
+
+        redis_client = None if local else get_redis()
+        if not redis_client:
+            return
+        try:
+            keys = await redis_client.smembers(ACL_ALL_KEYS)
+            await redis_client.delete(ACL_ALL_KEYS, *[ACL_KEY_PREFIX + k for k in keys])
+            async for employee_key in redis_client.scan_iter(f"{ACL_EMPLOYEE_PREFIX}*"):
+                await redis_client.delete(employee_key)
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+        logger.info("Invalidated all ACL cache entries")
+
+    def _put_l1(self, key: str, filter_query: dict, employee_id: Optional[str]):
+        self.l1[key] = (time.monotonic() + ACL_L1_TTL, copy.deepcopy(filter_query), employee_id)
+        self.l1.move_to_end(key)
+        if len(self.l1) > ACL_L1_MAX_ENTRIES:
+            self.l1.popitem(last=False)
+
+
+acl_cache = ACLCache()
+
+
+@on_invalidation("Opps.Employees")
+async def _employees_changed(events: List[InvalidationEvent], local: bool):
+    # New or removed records change negative results, which aren't indexed
+    if any(event.is_reset or event.op != "update" or not event.keys.get("user_id") for event in events):
+        await acl_cache.invalidate_all(local=local)
+        return
+    for employee_id in {event.keys["user_id"] for event in events}:
+        await acl_cache.invalidate_employee(employee_id, local=local)
+
+
+@on_invalidation("Partners.ReferredBy")
+async def _referrals_changed(events: List[InvalidationEvent], local: bool):
+    await acl_cache.invalidate_all(local=local)
+
+
+async def invalidate_employee_acl(employee_id: str):
+    """
+    Invalidate cached access for an employee after assignment changes.
+
+    Args:
+        employee_id: Employee user_id
+    """
+    await acl_cache.invalidate_employee(employee_id)
+
+
+async def invalidate_all_acls():
+    """
+    Invalidate all cached access after partner mapping changes.
+    """
+    await acl_cache.invalidate_all()
+
+
+__all__ = [
+    'ACLCache',
+    'acl_cache',
+    'invalidate_employee_acl',
+    'invalidate_all_acls'
+]
@@ -6,6 +6,8 @@ for API endpoints and services.
 
 Features:
 - JWT validation
+- Per-request auth context
+- Cached ACL resolution
 - Group management
 - Partner filtering
 - Access control
@@ -35,20 +37,90 @@ Dependencies:
 Author: Snapped Development Team
 """
 
-from fastapi import Depends, HTTPException, Security
+from fastapi import Depends, HTTPException, Request, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import jwt
-from typing import List, Optional
+import re
+import logging
+from typing import List, Optional, Tuple
 from app.shared.database import referred_by_collection, async_client
 from jwt.exceptions import InvalidTokenError
+from .context import get_auth_context
+from .acl_cache import acl_cache
+from app.shared.logging_config import capped
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
-async def get_current_user_group(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
+def _build_group_auth(decoded_token: dict) -> dict:
+    """
+    Build auth data from decoded token claims.
+    
+    Args:
+        decoded_token: Token claims
+        
+    Returns:
+        dict: User groups and ID
+        
+    Raises:
+        HTTPException: If no user ID is present
+    """
+    logger.debug("Decoded token fields: %s", list(decoded_token.keys()))
+    
+    # Get groups and normalize them to uppercase for consistency
+    cognito_groups = [
+        group.upper() 
+        for group in (
+            decoded_token.get('cognito:groups', []) or 
+            decoded_token.get('groups', []) or 
+            []
+        )
+    ]
+    
+    # Get user ID from various possible locations
+    user_id_fields = [
+        'custom:UserID',
+        'sub',
+        'username',
+        'cognito:username',
+        'email'
+    ]
+    
+    user_id = None
+    for field in user_id_fields:
+        if field in decoded_token:
+            user_id = decoded_token[field]
+            logger.debug("Found user_id in field '%s': %s", field, user_id)
+            break
+    
+    logger.debug("Final user_id selected: %s", user_id)
+    logger.debug("Found groups: %s", cognito_groups)
+    
+    if not cognito_groups:
+        logger.warning("No groups found in token")
+        cognito_groups = ["DEFAULT"]
+        
+    if not user_id:
+        raise HTTPException(
+            status_code=401,
+            detail="No user ID found in token"
+        )
+        
+    return {
+        "groups": cognito_groups,
+        "user_id": user_id
+    }
+
+async def get_current_user_group(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Security(security)
+) -> dict:
     """
     Extract user groups from JWT token.
     
     Args:
+        request: Current request
         credentials: HTTP auth credentials
         
     Returns:
@@ -58,66 +130,19 @@ async def get_current_user_group(credentials: HTTPAuthorizationCredentials = Sec
         HTTPException: For auth errors
         
     Notes:
-        - Decodes token
+        - Reuses request auth context
+        - Decodes token at most once
         - Gets groups
         - Gets user ID
         - Handles errors
     """
     try:
         token = credentials.credentials
-        print("\n=== Auth Token Debug ===")
-        print(f"Token received: {token[:50]}...")
-        
-        decoded_token = jwt.decode(token, options={"verify_signature": False})
-        print(f"Decoded token fields: {list(decoded_token.keys())}")
-        
-        # Get groups and normalize them to uppercase for consistency
-        cognito_groups = [
-            group.upper() 
-            for group in (
-                decoded_token.get('cognito:groups', []) or 
-                decoded_token.get('groups', []) or 
-                []
-            )
-        ]
-        
-        # Get user ID from various possible locations
-        user_id_fields = [
-            'custom:UserID',
-            'sub',
-            'username',
-            'cognito:username',
-            'email'
-        ]
-        
-        user_id = None
-        for field in user_id_fields:
-            if field in decoded_token:
-                user_id = decoded_token[field]
-                print(f"Found user_id in field '{field}': {user_id}")
-                break
-        
-        print(f"Final user_id selected: {user_id}")
-        print(f"Found groups: {cognito_groups}")
-        
-        if not cognito_groups:
-            print("Warning: No groups found in token")
-            cognito_groups = ["DEFAULT"]
-            
-        if not user_id:
-            raise HTTPException(
-                status_code=401,
-                detail="No user ID found in token"
-            )
-            
-        return {
-            "groups": cognito_groups,
-            "user_id": user_id
-        }
+        context = get_auth_context(request, token)
+        return context.auth_data("groups", _build_group_auth)
         
     except Exception as e:
-        print(f"Auth error: {str(e)}")
-        print(f"Token contents: {decoded_token if 'decoded_token' in locals() else 'Not decoded'}")
+        logger.warning("Auth error: %s", e)
         raise HTTPException(
             status_code=401,
             detail=f"Authentication error: {str(e)}"
@@ -150,7 +175,7 @@ async def get_partner_client_ids(partner_name: str) -> List[str]:
         ]
     })
     client_ids = [doc["client_id"] for doc in await cursor.to_list(length=None)]
-    print(f"Found client_ids for {partner_name}: {client_ids}")  # Debug print
+    logger.debug("Found client_ids for %s: %s", partner_name, capped(client_ids))
     return client_ids
 
 async def get_employee_client_ids(user_id: str) -> List[str]:
@@ -176,6 +201,33 @@ async def get_employee_client_ids(user_id: str) -> List[str]:
         
     return employee.get("clients", [])
 
+async def get_partner_client_ids_for_groups(groups: List[str]) -> List[str]:
+    """
+    Get client IDs for all partner groups in one query.
+    
+    Args:
+        groups: Partner group names
+        
+    Returns:
+        list: Associated client IDs
+        
+    Notes:
+        - Same matching as get_partner_client_ids
+        - Skips ADMIN
+        - Single round trip
+    """
+    partner_names = [group for group in groups if group != "ADMIN"]
+    if not partner_names:
+        return []
+    
+    cursor = referred_by_collection.find({
+        "$or": [
+            {"partner_name": {"$regex": f"^{re.escape(name)}$", "$options": "i"}}
+            for name in partner_names
+        ] + [{"company_id": {"$in": partner_names}}]
+    }, {"client_id": 1})
+    return list(dict.fromkeys(doc["client_id"] for doc in await cursor.to_list(length=None)))
+
 async def filter_by_partner(auth_data: dict):
     """
     Create MongoDB filter for partner.
@@ -187,22 +239,51 @@ async def filter_by_partner(auth_data: dict):
         dict: MongoDB filter
         
     Notes:
+        - Resolved once per request
+        - Served from ACL cache
         - Handles admin
         - Checks employees
         - Gets client IDs
         - Format handling
     """
+    # If user is in ADMIN Cognito group, they see everything
+    if "ADMIN" in auth_data["groups"]:
+        return {}  # Empty filter = see all documents
+    
+    context = getattr(auth_data, "context", None)
+    if context is not None:
+        cached = context.get_partner_filter(auth_data)
+        if cached is not None:
+            return cached
+    
+    filter_query = await acl_cache.get(auth_data)
+    if filter_query is None:
+        filter_query, employee_id = await _resolve_partner_filter(auth_data)
+        await acl_cache.set(auth_data, filter_query, employee_id)
+    
+    if context is not None:
+        context.set_partner_filter(auth_data, filter_query)
+    return filter_query
+
+async def _resolve_partner_filter(auth_data: dict) -> Tuple[dict, Optional[str]]:
+    """
+    Resolve the partner filter from employee and partner records.
+    
+    Args:
+        auth_data: Auth data with groups
+        
+    Returns:
+        tuple: MongoDB filter and matched employee user_id (or None)
+        
+    Notes:
+        - One employee query for all ID variants
+        - One partner query for all groups
+        - One ClientInfo validation query
+    """
     groups = auth_data["groups"]
     user_id = auth_data["user_id"]
     
-    print(f"=== Auth Filter Debug ===")
-    print(f"User ID from token: {user_id}")
-    print(f"Groups: {groups}")
-    
-    # If user is in ADMIN Cognito group, they see everything
-    if "ADMIN" in groups:
-        print("User is ADMIN - full access granted")
-        return {}  # Empty filter = see all documents
+    logger.debug(f"Resolving partner filter for {user_id} with groups {groups}")
     
     # For non-admin users, check their employee record
     employees_collection = async_client["Opps"]["Employees"]
@@ -224,64 +305,55 @@ async def filter_by_partner(auth_data: dict):
     
     # Remove duplicates while preserving order
     possible_user_ids = list(dict.fromkeys(possible_user_ids))
-    print(f"Trying user IDs: {possible_user_ids}")
-    
-    # Try each possible user ID format
-    employee = None
-    for try_user_id in possible_user_ids:
-        print(f"Looking up employee with user_id: {try_user_id}")
-        employee = await employees_collection.find_one({"user_id": try_user_id})
-        if employee:
-            print(f"Found employee record with user_id {try_user_id}:")
-            print(employee)
-            break
+    
+    # Fetch all candidate records at once, then keep the first format that matches
+    candidates = await employees_collection.find(
+        {"user_id": {"$in": possible_user_ids}},
+        {"user_id": 1, "clients": 1}
+    ).to_list(None)
+    by_user_id = {doc["user_id"]: doc for doc in candidates}
+    employee = next((by_user_id[uid] for uid in possible_user_ids if uid in by_user_id), None)
     
     if not employee:
-        print("No employee record found for any user ID format!")
-        return {"client_id": "NO_ACCESS"}
+        logger.info(f"No employee record found for {user_id} (tried {possible_user_ids})")
+        return {"client_id": "NO_ACCESS"}, None
     
+    employee_id = employee["user_id"]
     assigned_clients = employee.get("clients", [])
-    print(f"Assigned clients: {assigned_clients}")
     
     # If employee has no clients assigned, they see nothing
     if not assigned_clients:
-        print("No clients assigned to employee")
-        return {"client_id": "NO_ACCESS"}
+        logger.info(f"No clients assigned to employee {employee_id}")
+        return {"client_id": "NO_ACCESS"}, employee_id
         
     # Check for admin access - look for "admin" in any case
     has_admin_access = any(client.lower() == "admin" for client in assigned_clients)
-    print(f"Has admin access: {has_admin_access}")
         
     # If they have admin access, show all clients for their partner groups
     if has_admin_access:
-        print("Employee has partner admin access")
+        client_ids = await get_partner_client_ids_for_groups(groups)
         partner_client_ids = []
-        for group in groups:
-            client_ids = await get_partner_client_ids(group)
-            print(f"Found partner client IDs for {group}: {client_ids}")
-            if client_ids:  # Only query if we have IDs to check
-                existing_clients = await client_info_collection.find(
-                    {"client_id": {"$in": client_ids}},
-                    {"client_id": 1}
-                ).to_list(None)
-                valid_ids = [doc["client_id"] for doc in existing_clients]
-                print(f"Valid client IDs: {valid_ids}")
-                partner_client_ids.extend(valid_ids)
+        if client_ids:  # Only query if we have IDs to check
+            existing_clients = await client_info_collection.find(
+                {"client_id": {"$in": client_ids}},
+                {"client_id": 1}
+            ).to_list(None)
+            valid_ids = {doc["client_id"] for doc in existing_clients}
+            partner_client_ids = [c for c in client_ids if c in valid_ids]
+        logger.debug(f"Partner admin {employee_id} resolved {len(partner_client_ids)} clients")
         
         if partner_client_ids:
-            return {"client_id": {"$in": partner_client_ids}}
+            return {"client_id": {"$in": partner_client_ids}}, employee_id
         else:
             # If admin but no specific client IDs found, show all clients
-            return {}
+            return {}, employee_id
     
     # For regular employees, only show their specific assigned clients
-    print("Employee has specific client access")
     # Filter out 'admin' from assigned clients
     client_ids = [c for c in assigned_clients if c.lower() != 'admin']
     
     if not client_ids:
-        print("No valid client IDs found")
-        return {"client_id": "NO_ACCESS"}
+        return {"client_id": "NO_ACCESS"}, employee_id
     
     existing_clients = await client_info_collection.find(
         {"client_id": {"$in": client_ids}},
@@ -289,13 +361,12 @@ async def filter_by_partner(auth_data: dict):
     ).to_list(None)
     
     valid_client_ids = [doc["client_id"] for doc in existing_clients]
-    print(f"Valid client IDs for specific access: {valid_client_ids}")
+    logger.debug(f"Employee {employee_id} resolved {len(valid_client_ids)} clients")
     
     if not valid_client_ids:
-        print("No valid client IDs found")
-        return {"client_id": "NO_ACCESS"}
+        return {"client_id": "NO_ACCESS"}, employee_id
         
-    return {"client_id": {"$in": valid_client_ids}}
+    return {"client_id": {"$in": valid_client_ids}}, employee_id
 
 # Helper function for routes
 async def get_filtered_query(auth_data: dict = Depends(get_current_user_group)):
@@ -316,11 +387,15 @@ async def get_filtered_query(auth_data: dict = Depends(get_current_user_group)):
     return await filter_by_partner(auth_data)
 
 # Add this function alongside get_current_user_group
-async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Security(security)) -> str:
+async def get_current_user_id(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Security(security)
+) -> str:
     """
     Get user ID from token.
     
     Args:
+        request: Current request
         credentials: HTTP auth credentials
         
     Returns:
@@ -330,14 +405,14 @@ async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Securi
         HTTPException: For auth errors
         
     Notes:
-        - Decodes token
+        - Reuses request auth context
         - Gets custom ID
         - Validates
         - Handles errors
     """
     try:
         token = credentials.credentials
-        decoded_token = jwt.decode(token, options={"verify_signature": False})
+        decoded_token = get_auth_context(request, token).claims
         
         # Get user ID from custom:UserID field
         user_id = decoded_token.get('custom:UserID')
@@ -352,4 +427,4 @@ async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Securi
         raise HTTPException(
             status_code=401,
             detail="Could not validate credentials",
-        ) 
\ No newline at end of file
+        ) 
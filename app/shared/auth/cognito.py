@@ -5,16 +5,22 @@ This module handles JWT validation for AWS Cognito tokens.
 It implements proper JWK validation, caching, and token verification.
 
 Features:
-- JWK caching and auto-refresh
+- JWK caching and background refresh
+- Verified token cache
 - Token validation
 - Signature verification
 - Claims validation
 - Error handling
+- Local test keys for load testing
 """
 
 import jwt
-import requests
+import httpx
+import asyncio
+import hashlib
 import json
+import os
+from collections import OrderedDict
 from datetime import datetime
 import time
 from typing import Dict, Optional, List
@@ -27,56 +33,223 @@ logger = logging.getLogger(__name__)
 COGNITO_REGION = 'us-east-2'
 COGNITO_USER_POOL_ID = 'us-east-2_iIfwSsdCU'  # Primary user pool
 COGNITO_APP_CLIENT_ID = '1rv7iijlcgv4cortina322ntri'
+COGNITO_ISSUER = f'https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}'
 
 # JWK URL for the user pool
-COGNITO_JWK_URL = f'https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json'
+COGNITO_JWK_URL = f'{COGNITO_ISSUER}/.well-known/jwks.json'
 
 # Cache for JWKs
 jwks_cache = {
     'keys': None,
+    'public_keys': {},  # kid -> parsed RSA public key
     'last_updated': 0,
-    'cache_duration': 3600  # Cache for 1 hour
+    'cache_duration': 3600,  # Cache for 1 hour
+    'retry_interval': 60,  # Retry failed/forced refreshes at most once a minute
+    'last_attempt': 0
 }
 
-def get_jwks() -> Dict:
+# JWK set trusted alongside Cognito's keys, so a local instance accepts
+# tokens minted by scripts/load_test.py. Never set in production.
+AUTH_LOCAL_JWKS_FILE = os.getenv("AUTH_LOCAL_JWKS_FILE")
+
+# Verified token cache settings
+TOKEN_CACHE_MAX_SIZE = 10000
+
+_jwks_lock = asyncio.Lock()
+
+class VerifiedTokenCache:
     """
-    Fetch and cache JWKs from Cognito.
-    
+    Bounded LRU of verified token claims.
+
+    Entries are keyed by a digest of the raw token, so tokens are never
+    held in memory, and expire at the token's own exp claim.
+
+    Attributes:
+        max_size: Max cached tokens
+        entries: digest -> (claims, exp)
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Max cached tokens
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """
+        Hash a token into its cache key.
+
+        Args:
+            token: Raw JWT
+
+        Returns:
+            bytes: Token digest
+        """
+        return hashlib.blake2b(token.encode(), digest_size=20).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """
+        Get verified claims for a token.
+
+        Args:
+            token: Raw JWT
+
+        Returns:
+            Dict: Cached claims, or None if missing or expired
+        """
+        key = self.digest(token)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        claims, exp = entry
+        if time.time() >= exp:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: Dict):
+        """
+        Store verified claims for a token.
+
+        Args:
+            token: Raw JWT
+            claims: Verified claims
+
+        Notes:
+            - Skips tokens without exp
+            - Evicts least recently used
+        """
+        exp = claims.get('exp')
+        if not exp:
+            return
+        self.entries[self.digest(token)] = (claims, float(exp))
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached claims."""
+        self.entries.clear()
+
+token_cache = VerifiedTokenCache()
+
+def _store_jwks(jwks: Dict):
+    """
+    Parse JWKs into public keys and update the cache.
+
+    Args:
+        jwks: JWK set from Cognito
+
+    Notes:
+        - Parses once per refresh
+        - Skips malformed keys
+    """
+    public_keys = {}
+    for key in jwks.get('keys', []):
+        try:
+            public_keys[key['kid']] = jwt.algorithms.RSAAlgorithm.from_jwk(key)
+        except Exception as e:
+            logger.error(f"Skipping unparseable JWK {key.get('kid')}: {str(e)}")
+
+    jwks_cache['keys'] = jwks
+    jwks_cache['public_keys'] = {**local_public_keys, **public_keys}
+    jwks_cache['last_updated'] = time.time()
+
+def _load_local_jwks(path: Optional[str]) -> Dict:
+    """
+    Parse the local test JWK set, if configured.
+
+    Args:
+        path: JWKS JSON file
+
     Returns:
-        Dict: JWKs from Cognito
-        
+        Dict: kid -> parsed RSA public key
+    """
+    if not path:
+        return {}
+    with open(path) as f:
+        jwks = json.load(f)
+    keys = {
+        key['kid']: jwt.algorithms.RSAAlgorithm.from_jwk(key)
+        for key in jwks.get('keys', [])
+    }
+    logger.warning(f"Trusting {len(keys)} local JWKs from {path} - test use only")
+    return keys
+
+local_public_keys = _load_local_jwks(AUTH_LOCAL_JWKS_FILE)
+jwks_cache['public_keys'].update(local_public_keys)
+
+async def refresh_jwks(force: bool = False) -> bool:
+    """
+    Fetch JWKs from Cognito without blocking the event loop.
+
+    Args:
+        force: Refresh even if the cache is still fresh
+
+    Returns:
+        bool: Whether usable keys are cached
+
     Notes:
-        - Caches JWKs for 1 hour
-        - Auto-refreshes when expired
-        - Handles connection errors
+        - Single flight via lock
+        - Rate limits forced refreshes
+        - Keeps old keys on error
     """
-    current_time = time.time()
-    
-    # Return cached keys if still valid
-    if (jwks_cache['keys'] is not None and 
-        current_time - jwks_cache['last_updated'] < jwks_cache['cache_duration']):
-        return jwks_cache['keys']
+    async with _jwks_lock:
+        current_time = time.time()
+        fresh = current_time - jwks_cache['last_updated'] < jwks_cache['cache_duration']
+        if jwks_cache['keys'] is not None and (fresh and not force):
+            return True
+        if current_time - jwks_cache['last_attempt'] < jwks_cache['retry_interval']:
+            return jwks_cache['keys'] is not None
+        jwks_cache['last_attempt'] = current_time
+
+        try:
+            logger.info("Fetching fresh JWKs from Cognito")
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(COGNITO_JWK_URL)
+                response.raise_for_status()
+                _store_jwks(response.json())
+            return True
+        except Exception as e:
+            logger.error(f"Error fetching JWKs: {str(e)}")
+            if jwks_cache['keys'] is not None:
+                logger.warning("Using expired JWKs from cache")
+                return True
+            return False
+
+async def jwks_refresh_loop():
+    """
+    Keep JWKs fresh in the background.
+
+    Notes:
+        - Started in lifespan
+        - Refreshes before expiry
+        - Retries failures sooner
+    """
+    while True:
+        ok = await refresh_jwks(force=True)
+        delay = jwks_cache['cache_duration'] * 0.9 if ok else jwks_cache['retry_interval']
+        await asyncio.sleep(delay)
+
+def get_jwks() -> Optional[Dict]:
+    """
+    Get cached JWKs from Cognito.
     
-    try:
-        logger.info("Fetching fresh JWKs from Cognito")
-        response = requests.get(COGNITO_JWK_URL)
-        response.raise_for_status()
-        jwks = response.json()
-        
-        # Update cache
-        jwks_cache['keys'] = jwks
-        jwks_cache['last_updated'] = current_time
+    Returns:
+        Dict: Cached JWKs, or None before the first refresh
         
-        return jwks
-    except Exception as e:
-        logger.error(f"Error fetching JWKs: {str(e)}")
-        # Return cached keys if available, even if expired
-        if jwks_cache['keys'] is not None:
-            logger.warning("Using expired JWKs from cache")
-            return jwks_cache['keys']
-        raise
+    Notes:
+        - Never performs I/O
+        - Refreshed by jwks_refresh_loop
+    """
+    return jwks_cache['keys']
 
-def get_public_key(kid: str) -> Optional[Dict]:
+async def get_public_key(kid: str):
     """
     Get public key for token verification.
     
@@ -84,20 +257,21 @@ def get_public_key(kid: str) -> Optional[Dict]:
         kid: Key ID from token header
         
     Returns:
-        Dict: Public key if found
+        RSAPublicKey: Parsed public key if found
         
     Notes:
         - Matches kid from token
+        - Refreshes once for unknown kid
         - Returns None if not found
-        - Handles missing kid
     """
-    jwks = get_jwks()
-    for key in jwks['keys']:
-        if key['kid'] == kid:
-            return key
-    return None
+    public_key = jwks_cache['public_keys'].get(kid)
+    if public_key is None:
+        # Cold start or key rotation
+        await refresh_jwks(force=True)
+        public_key = jwks_cache['public_keys'].get(kid)
+    return public_key
 
-def validate_token(token: str) -> Dict:
+async def validate_token(token: str) -> Dict:
     """
     Validate and decode a Cognito JWT token.
     
@@ -111,11 +285,16 @@ def validate_token(token: str) -> Dict:
         jwt.InvalidTokenError: For invalid tokens
         
     Notes:
+        - Serves repeat tokens from cache
         - Verifies signature
         - Validates claims
         - Checks expiration
         - Verifies issuer
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         # First decode headers without verification to get kid
         headers = jwt.get_unverified_header(token)
@@ -123,17 +302,14 @@ def validate_token(token: str) -> Dict:
             raise jwt.InvalidTokenError("Token missing kid in headers")
             
         # Get public key
-        public_key = get_public_key(headers['kid'])
+        public_key = await get_public_key(headers['kid'])
         if not public_key:
             raise jwt.InvalidTokenError("Unable to find public key for token")
-            
-        # Convert JWK to PEM format
-        public_key_pem = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(public_key))
         
         # Decode and verify token
         decoded = jwt.decode(
             token,
-            key=public_key_pem,
+            key=public_key,
             algorithms=['RS256'],
             options={
                 'verify_signature': True,
@@ -143,9 +319,10 @@ def validate_token(token: str) -> Dict:
                 'verify_iss': True
             },
             audience=COGNITO_APP_CLIENT_ID,
-            issuer=f'https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}'
+            issuer=COGNITO_ISSUER
         )
         
+        token_cache.put(token, decoded)
         return decoded
         
     except jwt.ExpiredSignatureError:
@@ -158,7 +335,38 @@ def validate_token(token: str) -> Dict:
         logger.error(f"Error validating token: {str(e)}")
         raise jwt.InvalidTokenError(f"Token validation failed: {str(e)}")
 
-def get_user_from_token(token: str) -> Dict:
+def extract_user_info(decoded: Dict) -> Dict:
+    """
+    Extract user information from verified token claims.
+    
+    Args:
+        decoded: Verified token claims
+        
+    Returns:
+        Dict: User information including:
+            - user_id: User identifier
+            - groups: User groups
+            - email: User email
+    """
+    return {
+        'user_id': (
+            decoded.get('custom:UserID') or 
+            decoded.get('cognito:username') or 
+            decoded.get('sub')
+        ),
+        'groups': [
+            g.upper() for g in (
+                decoded.get('cognito:groups', []) or 
+                decoded.get('groups', []) or 
+                ['DEFAULT']
+            )
+        ],
+        'email': decoded.get('email'),
+        'given_name': decoded.get('given_name'),
+        'family_name': decoded.get('family_name')
+    }
+
+async def get_user_from_token(token: str) -> Dict:
     """
     Extract user information from validated token.
     
@@ -178,32 +386,14 @@ def get_user_from_token(token: str) -> Dict:
     """
     try:
         # Validate and decode token
-        decoded = validate_token(token)
+        decoded = await validate_token(token)
         
         # Extract user information
-        user_info = {
-            'user_id': (
-                decoded.get('custom:UserID') or 
-                decoded.get('cognito:username') or 
-                decoded.get('sub')
-            ),
-            'groups': [
-                g.upper() for g in (
-                    decoded.get('cognito:groups', []) or 
-                    decoded.get('groups', []) or 
-                    ['DEFAULT']
-                )
-            ],
-            'email': decoded.get('email'),
-            'given_name': decoded.get('given_name'),
-            'family_name': decoded.get('family_name')
-        }
-        
-        return user_info
+        return extract_user_info(decoded)
         
     except jwt.InvalidTokenError as e:
         logger.error(f"Invalid token in get_user_from_token: {str(e)}")
         raise
     except Exception as e:
         logger.error(f"Error in get_user_from_token: {str(e)}")
-        raise jwt.InvalidTokenError(f"Failed to extract user info: {str(e)}") 
\ No newline at end of file
+        raise jwt.InvalidTokenError(f"Failed to extract user info: {str(e)}")
@@ -0,0 +1,165 @@
+"""
+Request Auth Context Module
+
+This module keeps a per-request authentication context on
+request.state so the token is decoded and the partner filter is
+resolved at most once per request.
+
+Features:
+- Shared token claims
+- Middleware hand-off
+- Auth data views
+- Partner filter memo
+
+Data Model:
+- Raw token
+- Decoded claims
+- Verification flag
+- Resolved filters
+
+Security:
+- Token matching
+- Copy on read
+- Request isolation
+
+Dependencies:
+- FastAPI for requests
+- JWT for decoding
+- copy for isolation
+
+Author: Snapped Development Team
+"""
+
+import copy
+import jwt
+from fastapi import Request
+from typing import Dict, Optional
+
+
+class AuthData(dict):
+    """
+    Auth data dict returned by auth dependencies.
+
+    Behaves exactly like the plain {"groups", "user_id"} dict routes
+    already use, but remembers the request context it came from.
+
+    Attributes:
+        context: Owning AuthContext, if any
+    """
+    context = None
+
+
+class AuthContext:
+    """
+    Per-request authentication state.
+
+    Attributes:
+        token: Raw bearer token
+        claims: Decoded token claims
+        verified: Whether the signature was verified
+        views: Cached auth data per dependency
+        partner_filters: Resolved filters per (groups, user_id)
+    """
+
+    def __init__(self, token: str, claims: Dict, verified: bool = False):
+        """
+        Initialize context.
+
+        Args:
+            token: Raw bearer token
+            claims: Decoded token claims
+            verified: Whether the signature was verified
+        """
+        self.token = token
+        self.claims = claims
+        self.verified = verified
+        self.views = {}
+        self.partner_filters = {}
+
+    def auth_data(self, name: str, builder) -> AuthData:
+        """
+        Get or build a named auth data view of the claims.
+
+        Args:
+            name: View name (one per dependency flavour)
+            builder: Callable turning claims into a dict
+
+        Returns:
+            AuthData: Cached view bound to this context
+        """
+        view = self.views.get(name)
+        if view is None:
+            view = AuthData(builder(self.claims))
+            view.context = self
+            self.views[name] = view
+        return view
+
+    def get_partner_filter(self, auth_data: dict) -> Optional[dict]:
+        """
+        Get a partner filter already resolved in this request.
+
+        Args:
+            auth_data: Auth data with groups and user ID
+
+        Returns:
+            dict: Copy of the filter, or None if not resolved yet
+        """
+        cached = self.partner_filters.get(self._filter_key(auth_data))
+        return copy.deepcopy(cached) if cached is not None else None
+
+    def set_partner_filter(self, auth_data: dict, filter_query: dict):
+        """
+        Remember a resolved partner filter.
+
+        Args:
+            auth_data: Auth data with groups and user ID
+            filter_query: Resolved MongoDB filter
+        """
+        self.partner_filters[self._filter_key(auth_data)] = copy.deepcopy(filter_query)
+
+    @staticmethod
+    def _filter_key(auth_data: dict) -> tuple:
+        return (tuple(auth_data.get("groups", [])), auth_data.get("user_id"))
+
+
+def set_auth_context(request: Request, context: AuthContext):
+    """
+    Attach an auth context to the request.
+
+    Args:
+        request: Current request
+        context: Auth context to share
+    """
+    request.state.auth_context = context
+
+
+def get_auth_context(request: Request, token: str) -> AuthContext:
+    """
+    Get the auth context for a request, decoding the token only if needed.
+
+    Args:
+        request: Current request
+        token: Raw bearer token
+
+    Returns:
+        AuthContext: Shared context for this request
+
+    Notes:
+        - Reuses middleware claims
+        - Decodes once otherwise
+        - Token must match
+    """
+    context = getattr(request.state, "auth_context", None)
+    if context is None or context.token != token:
+        claims = jwt.decode(token, options={"verify_signature": False})
+        context = AuthContext(token, claims, verified=False)
+        set_auth_context(request, context)
+    return context
+
+
+__all__ = [
+    'AuthData',
+    'AuthContext',
+    'set_auth_context',
+    'get_auth_context'
+]
@@ -35,7 +35,7 @@ Author: Snapped Development Team
 """
 
 import os
-import aiohttp
+from .http_clients import http_session
 from dotenv import load_dotenv
 import logging
 
@@ -116,7 +116,7 @@ class BunnyCDN:
             - Error handling
             - CDN URLs
         """
-        async with aiohttp.ClientSession() as session:
+        async with http_session("transfer") as session:
             # Add storage zone to path and ensure trailing slash
             clean_path = f"{self.storage_zone}/{path.strip('/')}/"
             url = f"{self.base_url}/{clean_path}"
@@ -174,7 +174,7 @@ class BunnyCDN:
             - Logs status
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_session("transfer") as session:
                 url = f"{self.base_url}/{self.storage_zone}/{path.lstrip('/')}"
                 logger.info(f"Creating directory at URL: {url}")
                 logger.info(f"Using headers: {self.headers}")
@@ -216,7 +216,7 @@ class BunnyCDN:
             logger.info(f"Storage zone: {self.storage_zone}")
             logger.info(f"Base URL: {self.base_url}")
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session("transfer") as session:
                 results = []
                 for item in items:
                     # Clean up paths - remove leading/trailing slashes but keep sc/
@@ -303,7 +303,7 @@ class BunnyCDN:
             - Error handling
             - Status tracking
         """
-        async with aiohttp.ClientSession() as session:
+        async with http_session("transfer") as session:
             results = []
             for item in items:
                 try:
@@ -353,7 +353,7 @@ class BunnyCDN:
                 "Content-Type": "application/octet-stream"
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session("transfer") as session:
                 async with session.get(url, headers=download_headers) as response:
                     if response.status == 200:
                         with open(local_path, 'wb') as f:
@@ -399,7 +399,7 @@ class BunnyCDN:
                 "Content-Type": "application/octet-stream"
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session("transfer") as session:
                 async with session.put(url, headers=upload_headers, data=file_data) as response:
                     if response.status in [200, 201]:
                         logger.info(f"Successfully uploaded file to {file_path}")
@@ -0,0 +1,285 @@
+"""
+Cache Module
+
+This module provides a generic read-through cache for small, hot
+reference data (client identifiers, partner lists, survey questions):
+an in-process LRU in front of Redis, with TTLs at both levels, request
+coalescing and explicit invalidation.
+
+Features:
+- In-process LRU with TTL
+- Redis L2 shared by workers
+- Single-flight loading per key
+- Negative result caching (L1 only)
+- Per-key and per-namespace invalidation
+
+Data Model:
+- Redis key: cache:<namespace>:<key>
+- Redis value: JSON
+- Namespace key set: cache:<namespace>:keys
+
+Security:
+- Invalidation bus (or L1 TTL) bounds cross-worker staleness
+- Copy on read
+- Redis outage fallback to the loader
+
+Dependencies:
+- redis.asyncio for L2
+- asyncio for request coalescing
+- json for storage
+- prometheus_client for hit rates
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import copy
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+from prometheus_client import Counter
+from app.shared.redis_client import REDIS_UNAVAILABLE_ERRORS, get_redis, mark_redis_down
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "cache:"
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Read-through cache lookups by the level that answered",
+    ["namespace", "level"]
+)
+
+_MISSING = object()
+
+
+class ReadThroughCache:
+    """
+    Two-level read-through cache for one namespace.
+
+    Values must be JSON-serializable. A loader returning None is cached
+    in L1 only, so a record created on another worker becomes visible
+    within l1_ttl seconds without an explicit invalidation. Concurrent
+    misses for the same key share a single loader call.
+
+    Attributes:
+        namespace: Key prefix and metrics label
+        l1_ttl: Seconds an entry is served from worker memory
+        redis_ttl: Seconds an entry is served from Redis
+        max_entries: Max keys kept in worker memory
+        l1: LRU of key -> (expires_at, value)
+        inflight: Key -> future of the running loader
+    """
+
+    def __init__(self, namespace: str, l1_ttl: float = 30, redis_ttl: int = 600, max_entries: int = 5000):
+        """
+        Initialize an empty cache.
+
+        Args:
+            namespace: Key prefix and metrics label
+            l1_ttl: Seconds an entry is served from worker memory
+            redis_ttl: Seconds an entry is served from Redis
+            max_entries: Max keys kept in worker memory
+        """
+        self.namespace = namespace
+        self.l1_ttl = l1_ttl
+        self.redis_ttl = redis_ttl
+        self.max_entries = max_entries
+        self.l1 = OrderedDict()
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+    def redis_key(self, key: str) -> str:
+        """
+        Build the Redis key for a cache key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            str: Namespaced Redis key
+        """
+        return f"{CACHE_KEY_PREFIX}{self.namespace}:{key}"
+
+    @property
+    def keys_key(self) -> str:
+        """Redis set of every key written in this namespace."""
+        return f"{CACHE_KEY_PREFIX}{self.namespace}:keys"
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a value, loading and caching it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value (None for
+                "not found")
+
+        Returns:
+            Any: Copy of the cached or loaded value
+
+        Raises:
+            Exception: Whatever the loader raises (nothing is cached)
+
+        Notes:
+            - L1 first, then Redis, then the loader
+            - Concurrent misses await the first caller's loader
+        """
+        value = self._get_l1(key)
+        if value is not _MISSING:
+            CACHE_LOOKUPS.labels(self.namespace, "l1").inc()
+            return copy.deepcopy(value)
+
+        pending = self.inflight.get(key)
+        if pending is not None:
+            CACHE_LOOKUPS.labels(self.namespace, "coalesced").inc()
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            value = await self._get_redis(key)
+            if value is not _MISSING:
+                CACHE_LOOKUPS.labels(self.namespace, "redis").inc()
+                self._put_l1(key, value)
+            else:
+                CACHE_LOOKUPS.labels(self.namespace, "miss").inc()
+                value = await loader()
+                # Skip the store if the key was invalidated meanwhile
+                if self.inflight.get(key) is future:
+                    await self.set(key, value)
+            future.set_result(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; don't warn if nobody was waiting
+            future.exception()
+            raise
+        finally:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+        return copy.deepcopy(value)
+
+    async def peek(self, key: str) -> Any:
+        """
+        Get a cached value without loading it.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Any: Copy of the cached value, or None if not cached
+        """
+        value = self._get_l1(key)
+        if value is _MISSING:
+            value = await self._get_redis(key)
+        return None if value is _MISSING else copy.deepcopy(value)
+
+    async def set(self, key: str, value: Any):
+        """
+        Store a value at both levels.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value; None is kept in L1 only
+        """
+        self._put_l1(key, value)
+        if value is None:
+            return
+        redis_client = get_redis()
+        if not redis_client:
+            return
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(self.redis_key(key), json.dumps(value), ex=self.redis_ttl)
+                pipe.sadd(self.keys_key, key)
+                pipe.expire(self.keys_key, self.redis_ttl)
+                await pipe.execute()
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+
+    async def invalidate(self, *keys: str, local: bool = False):
+        """
+        Drop keys from both levels.
+
+        Args:
+            *keys: Cache keys
+            local: Drop this worker's copies only (Redis already done)
+
+        Notes:
+            - Other workers drop their L1 copies on the invalidation
+              bus, or when l1_ttl runs out
+            - A loader already running for a key is not cancelled,
+              but its result is not shared with later callers
+        """
+        for key in keys:
+            self.l1.pop(key, None)
+            self.inflight.pop(key, None)
+
+        redis_client = None if local else get_redis()
+        if not redis_client or not keys:
+            return
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.delete(*[self.redis_key(key) for key in keys])
+                pipe.srem(self.keys_key, *keys)
+                await pipe.execute()
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+
+    async def invalidate_all(self, local: bool = False):
+        """
+        Drop every key in this namespace from both levels.
+
+        Args:
+            local: Drop this worker's copies only (Redis already done)
+        """
+        self.l1.clear()
+        self.inflight.clear()
+
+        redis_client = None if local else get_redis()
+        if not redis_client:
+            return
+        try:
+            keys = await redis_client.smembers(self.keys_key)
+            await redis_client.delete(self.keys_key, *[self.redis_key(key) for key in keys])
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+        logger.info(f"Invalidated all {self.namespace} cache entries")
+
+    def _get_l1(self, key: str) -> Any:
+        entry = self.l1.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self.l1[key]
+            return _MISSING
+        self.l1.move_to_end(key)
+        return value
+
+    async def _get_redis(self, key: str) -> Any:
+        redis_client = get_redis()
+        if not redis_client:
+            return _MISSING
+        try:
+            raw = await redis_client.get(self.redis_key(key))
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+            return _MISSING
+        return _MISSING if raw is None else json.loads(raw)
+
+    def _put_l1(self, key: str, value: Any):
+        self.l1[key] = (time.monotonic() + self.l1_ttl, copy.deepcopy(value))
+        self.l1.move_to_end(key)
+        if len(self.l1) > self.max_entries:
+            self.l1.popitem(last=False)
+
+
+__all__ = [
+    'ReadThroughCache',
+    'CACHE_LOOKUPS'
+]
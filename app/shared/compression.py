@@ -0,0 +1,205 @@
+"""
+Compression Module
+
+This module provides response compression negotiated from the
+client's Accept-Encoding header: brotli when accepted, gzip otherwise.
+
+Features:
+- Brotli and gzip
+- Size threshold
+- Streaming responses
+- Large bodies compressed off the event loop
+
+Data Model:
+- Accept-Encoding negotiation
+- Compressible content types
+
+Security:
+- Already-encoded responses untouched
+- Server-sent events untouched
+- Vary header set
+
+Dependencies:
+- brotli for br
+- zlib for gzip
+- asyncio for worker threads
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import zlib
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+# Bodies smaller than this are sent as-is
+COMPRESSION_MINIMUM_SIZE = 1024
+
+# Bodies larger than this are compressed in a worker thread
+COMPRESSION_THREAD_THRESHOLD = 256 * 1024
+
+GZIP_LEVEL = 6
+
+# Quality 4 compresses JSON about as well as gzip -6 and faster
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """
+    Pick the response encoding.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        str: "br", "gzip" or "" for identity
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip())
+    if "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return ""
+
+
+def _compressor(encoding: str):
+    if encoding == "br":
+        return brotli.Compressor(quality=BROTLI_QUALITY)
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a whole body.
+
+    Args:
+        body: Response body
+        encoding: "br" or "gzip"
+
+    Returns:
+        bytes: Compressed body
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    compressor = _compressor(encoding)
+    return compressor.compress(body) + compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    Compresses compressible responses above a size threshold.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application
+            minimum_size: Smallest body worth compressing
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message = None
+        self.mode = None  # None until first body: "identity", "stream"
+        self.compressor = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            headers = Headers(raw=self.start_message["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                "content-encoding" in headers
+                or content_type.startswith("text/event-stream")
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                self.mode = "identity"
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            start_headers = MutableHeaders(raw=self.start_message["headers"])
+            start_headers["Content-Encoding"] = self.encoding
+            start_headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                self.mode = "identity"
+                if len(body) > COMPRESSION_THREAD_THRESHOLD:
+                    body = await asyncio.to_thread(compress, body, self.encoding)
+                else:
+                    body = compress(body, self.encoding)
+                start_headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            self.mode = "stream"
+            self.compressor = _compressor(self.encoding)
+            del start_headers["Content-Length"]
+            await self.send(self.start_message)
+
+        if self.mode == "identity":
+            await self.send(message)
+            return
+
+        chunk = self.compressor.process(body) if self.encoding == "br" else self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish() if self.encoding == "br" else self.compressor.flush()
+        elif self.encoding == "gzip":
+            chunk += self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            chunk += self.compressor.flush()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+__all__ = [
+    'CompressionMiddleware',
+    'negotiate_encoding',
+    'compress'
+]
@@ -0,0 +1,332 @@
+"""
+Directory Module
+
+This module resolves clients by any of their identifiers (client_id,
+snap_id, email, username) and serves the partner list and survey
+questions, all through read-through caches so hot paths stop
+re-querying ClientInfo and the small reference collections.
+
+Features:
+- One projected, indexed ClientInfo lookup per identifier
+- Alias -> client_id caching with self-healing on mismatch
+- Cached partner list
+- Cached survey questions
+- Explicit invalidation hooks for writers
+- Change stream invalidation (ClientInfo, PartnerList)
+
+Data Model:
+- Client record: CLIENT_RECORD_PROJECTION fields of ClientInfo
+- Alias keys: snap_id:<id>, email:<lowercased>, username:<name>
+- Partner: {id, name}
+- Survey question: stored document without _id
+
+Security:
+- Projection keeps PII to the fields callers use
+- Bounded staleness (cache TTLs) when a writer skips invalidation
+
+Dependencies:
+- app.shared.cache for caching
+- app.shared.database for collections
+- bson.json_util for question documents
+
+Author: Snapped Development Team
+"""
+
+import re
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+from bson import json_util
+from app.shared.cache import ReadThroughCache
+from app.shared.database import client_info, partners_collection, survey_questions
+from app.shared.invalidation import InvalidationEvent, on_invalidation
+
+logger = logging.getLogger(__name__)
+
+# ClientInfo fields kept in a client record
+CLIENT_RECORD_PROJECTION = {
+    "_id": 0,
+    "client_id": 1,
+    "client_ID": 1,
+    "snap_id": 1,
+    "Email_Address": 1,
+    "snap_username": 1,
+    "username": 1,
+    "Username": 1,
+    "Snap_Username": 1,
+    "snap_profile_name": 1,
+    "First_Legal_Name": 1,
+    "Last_Legal_Name": 1,
+    "Stage_Name": 1,
+    "Timezone": 1,
+    "name": 1,
+}
+
+# Field names a Snapchat username has been stored under over time
+USERNAME_FIELDS = ["snap_username", "username", "Username", "Snap_Username"]
+
+# Client records and aliases: the invalidation bus drops changed
+# clients, TTLs only bound staleness while it is down
+CLIENT_L1_TTL = 600
+CLIENT_REDIS_TTL = 86400
+CLIENT_L1_MAX_ENTRIES = 20000
+
+# Partner list (bus invalidated) and survey questions (writers invalidate)
+REFERENCE_L1_TTL = 600
+REFERENCE_REDIS_TTL = 86400
+
+
+class ClientDirectory:
+    """
+    Cached client lookups by any identifier.
+
+    Records are cached by client_id. Other identifiers are cached as
+    aliases pointing at a client_id; a resolved record that no longer
+    carries the alias (the identifier moved to another client) drops
+    the alias and resolves it again.
+
+    Attributes:
+        records: client_id -> client record cache
+        aliases: alias key -> client_id cache
+    """
+
+    def __init__(self):
+        """Initialize empty caches."""
+        self.records = ReadThroughCache("clients", CLIENT_L1_TTL, CLIENT_REDIS_TTL, CLIENT_L1_MAX_ENTRIES)
+        self.aliases = ReadThroughCache("client_aliases", CLIENT_L1_TTL, CLIENT_REDIS_TTL, CLIENT_L1_MAX_ENTRIES)
+
+    async def get(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a client record by client_id.
+
+        Args:
+            client_id: Client identifier (client_id or client_ID field)
+
+        Returns:
+            dict: Client record copy, or None if not found
+        """
+        if not client_id:
+            return None
+        return await self.records.get_or_load(
+            client_id,
+            lambda: client_info.find_one(
+                {"$or": [{"client_id": client_id}, {"client_ID": client_id}]},
+                CLIENT_RECORD_PROJECTION
+            )
+        )
+
+    async def by_snap_id(self, snap_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a client record by Snapchat ID.
+
+        Args:
+            snap_id: Snapchat user ID
+
+        Returns:
+            dict: Client record copy, or None if not found
+        """
+        if not snap_id:
+            return None
+        return await self._resolve(
+            f"snap_id:{snap_id}",
+            [{"snap_id": snap_id}],
+            lambda record: record.get("snap_id") == snap_id
+        )
+
+    async def by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a client record by email address.
+
+        Args:
+            email: Email address (any case)
+
+        Returns:
+            dict: Client record copy, or None if not found
+
+        Notes:
+            - Exact match first, then case-insensitive
+        """
+        if not email:
+            return None
+        email = email.strip()
+        folded = email.lower()
+        return await self._resolve(
+            f"email:{folded}",
+            [
+                {"Email_Address": email},
+                {"Email_Address": {"$regex": f"^{re.escape(email)}$", "$options": "i"}},
+            ],
+            lambda record: (record.get("Email_Address") or "").lower() == folded
+        )
+
+    async def by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a client record by Snapchat username.
+
+        Args:
+            username: Snapchat username
+
+        Returns:
+            dict: Client record copy, or None if not found
+
+        Notes:
+            - Checks every USERNAME_FIELDS spelling
+        """
+        if not username:
+            return None
+        return await self._resolve(
+            f"username:{username}",
+            [{"$or": [{field: username} for field in USERNAME_FIELDS]}],
+            lambda record: any(record.get(field) == username for field in USERNAME_FIELDS)
+        )
+
+    async def invalidate(self, client_id: str, record: Optional[Dict[str, Any]] = None, local: bool = False):
+        """
+        Drop a client's cached record and aliases.
+
+        Args:
+            client_id: Client identifier
+            record: Pre-change record (or ClientInfo document) whose
+                aliases should be dropped; the cached record is used
+                when omitted
+            local: Drop this worker's copies only
+        """
+        if record is None:
+            record = await self.records.peek(client_id)
+        await self.records.invalidate(client_id, local=local)
+        keys = _alias_keys(record or {})
+        if keys:
+            await self.aliases.invalidate(*keys, local=local)
+
+    async def invalidate_all(self, local: bool = False):
+        """
+        Drop every cached record and alias (bulk imports).
+
+        Args:
+            local: Drop this worker's copies only
+        """
+        await self.records.invalidate_all(local=local)
+        await self.aliases.invalidate_all(local=local)
+
+    async def _resolve(self, key: str, queries: List[dict], matches: Callable[[dict], bool]) -> Optional[Dict[str, Any]]:
+        for _ in range(2):
+            client_id = await self.aliases.get_or_load(key, lambda: _find_client_id(queries))
+            if client_id is None:
+                return None
+            record = await self.get(client_id)
+            if record and matches(record):
+                return record
+            # Either side may be stale: re-read both
+            await self.aliases.invalidate(key)
+            await self.records.invalidate(client_id)
+        logger.warning(f"Client alias {key} did not settle on a matching record")
+        return None
+
+
+def _alias_keys(record: Dict[str, Any]) -> List[str]:
+    keys = []
+    if record.get("snap_id"):
+        keys.append(f"snap_id:{record['snap_id']}")
+    if isinstance(record.get("Email_Address"), str):
+        keys.append(f"email:{record['Email_Address'].strip().lower()}")
+    keys += [f"username:{record[field]}" for field in USERNAME_FIELDS if record.get(field)]
+    return keys
+
+
+async def _find_client_id(queries: List[dict]) -> Optional[str]:
+    for query in queries:
+        doc = await client_info.find_one(query, {"_id": 0, "client_id": 1, "client_ID": 1})
+        if doc and (doc.get("client_id") or doc.get("client_ID")):
+            return doc.get("client_id") or doc.get("client_ID")
+    return None
+
+
+client_directory = ClientDirectory()
+
+partner_list_cache = ReadThroughCache("partners", REFERENCE_L1_TTL, REFERENCE_REDIS_TTL, max_entries=1)
+survey_questions_cache = ReadThroughCache("survey_questions", REFERENCE_L1_TTL, REFERENCE_REDIS_TTL, max_entries=1)
+
+
+async def invalidate_client(client_id: str, record: Optional[Dict[str, Any]] = None):
+    """
+    Invalidate a client's cached lookups after ClientInfo changes.
+
+    Args:
+        client_id: Client identifier
+        record: Pre-change document, if the change touched identifiers
+    """
+    await client_directory.invalidate(client_id, record)
+
+
+@on_invalidation("ClientDb.ClientInfo")
+async def _client_info_changed(events: List[InvalidationEvent], local: bool):
+    # Deletes and resets don't say which client changed
+    if any(event.is_reset or not event.keys for event in events):
+        await client_directory.invalidate_all(local=local)
+        return
+    client_ids, alias_keys = set(), set()
+    for event in events:
+        client_ids.update(event.keys[k] for k in ("client_id", "client_ID") if event.keys.get(k))
+        alias_keys.update(_alias_keys(event.keys))
+    # Aliases of the pre-change document heal on their next lookup
+    await client_directory.records.invalidate(*client_ids, local=local)
+    await client_directory.aliases.invalidate(*alias_keys, local=local)
+
+
+@on_invalidation("Partners.PartnerList")
+async def _partner_list_changed(events: List[InvalidationEvent], local: bool):
+    await partner_list_cache.invalidate_all(local=local)
+
+
+async def get_partner_list() -> List[Dict[str, str]]:
+    """
+    Get every partner.
+
+    Returns:
+        list: Partners as {id, name}, in stored order
+    """
+    async def load():
+        partners = await partners_collection.find({}, {"name": 1}).to_list(None)
+        return [{"id": str(p["_id"]), "name": p["name"]} for p in partners]
+
+    return await partner_list_cache.get_or_load("all", load)
+
+
+async def invalidate_partner_list():
+    """
+    Invalidate the cached partner list after partners change.
+    """
+    await partner_list_cache.invalidate_all()
+
+
+async def get_survey_questions() -> List[Dict[str, Any]]:
+    """
+    Get every survey question.
+
+    Returns:
+        list: Questions as JSON-compatible dicts without _id, in stored
+            order
+    """
+    async def load():
+        questions = await survey_questions.find({}, {"_id": 0}).to_list(None)
+        return json.loads(json_util.dumps(questions))
+
+    return await survey_questions_cache.get_or_load("all", load)
+
+
+async def invalidate_survey_questions():
+    """
+    Invalidate the cached survey questions after they change.
+    """
+    await survey_questions_cache.invalidate_all()
+
+
+__all__ = [
+    'ClientDirectory',
+    'client_directory',
+    'invalidate_client',
+    'get_partner_list',
+    'invalidate_partner_list',
+    'get_survey_questions',
+    'invalidate_survey_questions'
+]
@@ -0,0 +1,144 @@
+"""
+ETags Module
+
+This module provides conditional GET support for polled read endpoints.
+An ETag is a digest of the view, its version, the request parameters
+and the (_id, key, last_updated) stamps of the documents the response
+is built from. The stamps come from a query that returns nothing else,
+so a matching If-None-Match is answered with 304 before the documents
+themselves are loaded; every writer to those documents bumps
+last_updated.
+
+Features:
+- Weak ETags from document version stamps
+- Version stamps of the documents matching a query
+- If-None-Match parsing (lists, weak tags, *)
+- 304 responses
+- Revalidate-every-time cache headers
+
+Data Model:
+- ETag: W/"<blake2b hex>"
+- Parts: view name, view version, request parameters, version stamps
+- Stamp: [str(_id), key field, last_updated]
+
+Security:
+- Private caching only (per-user access scopes)
+- Writers that skip last_updated serve stale 304s; bump it on every
+  write to a polled collection
+
+Dependencies:
+- hashlib for digests
+- orjson (via responses) for canonical bytes
+- FastAPI for requests and responses
+
+Author: Snapped Development Team
+"""
+
+import hashlib
+from typing import Any, Dict, List
+from fastapi import Request, Response
+from app.shared.responses import dumps
+
+# Browsers keep the body but must revalidate it on every poll
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the inputs a response is rendered from.
+
+    Args:
+        *parts: View name, view version, request parameters and
+            version stamps (JSON-like, MongoDB types allowed)
+
+    Returns:
+        str: Weak ETag, e.g. W/"3f2a..."
+
+    Notes:
+        - Weak, since compression changes the bytes on the wire
+        - Bump the view version when the rendered shape changes, so
+          cached copies from before a deploy miss
+    """
+    digest = hashlib.blake2b(dumps(parts), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+async def document_versions(collection, query: Dict[str, Any], key: str = "client_ID",
+                            field: str = "last_updated") -> List[List[Any]]:
+    """
+    Get the version stamps of the documents matching a query.
+
+    Args:
+        collection: Motor collection
+        query: Same filter the response is loaded with
+        key: Identifying field to include (e.g. client_ID, queue_date)
+        field: Field every writer bumps
+
+    Returns:
+        list: [str(_id), key, field] per document, by _id
+
+    Notes:
+        - Only the stamps leave the database, not the documents
+        - Inserts, deletes and bumped writes all change the list
+    """
+    docs = await collection.find(query, {key: 1, field: 1}).sort("_id", 1).to_list(None)
+    return [[str(doc["_id"]), doc.get(key), doc.get(field)] for doc in docs]
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check a request's If-None-Match header against an ETag.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag
+
+    Returns:
+        bool: True if the client's copy is current
+
+    Notes:
+        - Weak comparison (W/ prefixes ignored), as RFC 9110 requires
+          for If-None-Match
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in header.split(","))
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """
+    Headers to send with a 200 carrying an ETag.
+
+    Args:
+        etag: Current ETag
+
+    Returns:
+        dict: ETag and Cache-Control headers
+    """
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build a 304 Not Modified response.
+
+    Args:
+        etag: Current ETag
+
+    Returns:
+        Response: Empty 304 with the ETag headers
+    """
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+__all__ = [
+    'make_etag',
+    'document_versions',
+    'etag_matches',
+    'etag_headers',
+    'not_modified'
+]
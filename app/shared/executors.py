@@ -0,0 +1,309 @@
+"""
+Executor Service Module
+
+This module provides the app-scoped worker pools that blocking media
+and CPU-bound work is handed to, so ffmpeg runs, image resizing, PDF
+rendering and CSV parsing never stall the event loop.
+
+Features:
+- Media pool (threads) for ffmpeg/ffprobe subprocesses
+- CPU pool (processes) for PIL, reportlab and pandas work
+- Bounded in-flight work per pool
+- Queue depth, wait and run time metrics
+- Started and stopped in lifespan
+
+Data Model:
+- Pools: name -> kind, workers, pending limit
+- In-flight count per pool
+
+Security:
+- Full pools reject work with 503 instead of queueing without bound
+- Process workers are spawned, not forked
+- Process workers are recycled
+- Process workers import only pool_worker and the task's module;
+  CPU tasks live in import-light modules (imaging, tabular, contract_pdf)
+
+Dependencies:
+- concurrent.futures for pools
+- asyncio for awaiting results
+- prometheus_client for metrics
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException
+from prometheus_client import Counter, Gauge, Histogram
+from .pool_worker import timed_call
+
+logger = logging.getLogger(__name__)
+
+# Worker and pending limits per pool; every web worker process has its own pools
+EXECUTOR_POOLS = {
+    # Threads only wait on ffmpeg/ffprobe child processes
+    "media": {
+        "kind": "thread",
+        "workers": int(os.getenv("MEDIA_POOL_WORKERS", "4")),
+        "max_pending": 32
+    },
+    # Pure-Python CPU work needs its own processes to get off the GIL
+    "cpu": {
+        "kind": "process",
+        "workers": int(os.getenv("CPU_POOL_WORKERS", "2")),
+        "max_pending": 16
+    },
+}
+
+# Tasks a CPU process runs before it is replaced (bounds leaks in PIL/reportlab)
+CPU_POOL_MAX_TASKS_PER_CHILD = 200
+
+EXECUTOR_IN_FLIGHT = Gauge(
+    "executor_tasks_in_flight",
+    "Tasks submitted to a pool and not yet finished",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "executor_queue_depth",
+    "Tasks waiting for a free pool worker",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+EXECUTOR_WAIT = Histogram(
+    "executor_wait_seconds",
+    "Time a task waited for a pool worker",
+    ["pool"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 5, 15, 60, 300)
+)
+EXECUTOR_RUN = Histogram(
+    "executor_run_seconds",
+    "Time a task ran on a pool worker",
+    ["pool"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 15, 60, 300, 1800)
+)
+EXECUTOR_REJECTIONS = Counter(
+    "executor_rejections_total",
+    "Tasks rejected because a pool was full",
+    ["pool"]
+)
+
+
+class ExecutorBusy(HTTPException):
+    """Raised when a pool already holds its maximum in-flight tasks."""
+
+    def __init__(self, pool: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy ({pool} workers), please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+
+
+class BoundedPool:
+    """
+    A thread or process pool with a cap on in-flight tasks.
+
+    Attributes:
+        name: Pool name (metric label)
+        kind: "thread" or "process"
+        workers: Worker count
+        max_pending: Tasks allowed to wait beyond the workers
+        in_flight: Submitted, unfinished tasks
+    """
+
+    def __init__(self, name: str, kind: str, workers: int, max_pending: int):
+        """
+        Initialize pool settings; workers start on first use or start().
+
+        Args:
+            name: Pool name
+            kind: "thread" or "process"
+            workers: Worker count
+            max_pending: Queued task limit
+        """
+        self.name = name
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> Executor:
+        """
+        Create the underlying executor if needed.
+
+        Returns:
+            Executor: Thread or process pool
+        """
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        max_tasks_per_child=CPU_POOL_MAX_TASKS_PER_CHILD
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix=f"{self.name}-pool"
+                    )
+            return self._executor
+
+    def shutdown(self):
+        """
+        Stop the executor; queued tasks are cancelled, running ones finish.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _update_gauges(self):
+        EXECUTOR_IN_FLIGHT.labels(self.name).set(self.in_flight)
+        EXECUTOR_QUEUE_DEPTH.labels(self.name).set(max(0, self.in_flight - self.workers))
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.in_flight -= 1
+            self._update_gauges()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) on the pool and await its result.
+
+        Args:
+            func: Callable; for process pools it and its arguments must
+                be picklable (module-level function in a module that
+                imports no database or web framework)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Any: func's return value
+
+        Raises:
+            ExecutorBusy: The pool is full
+        """
+        executor = self.start()
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_pending:
+                EXECUTOR_REJECTIONS.labels(self.name).inc()
+                raise ExecutorBusy(self.name)
+            self.in_flight += 1
+            self._update_gauges()
+
+        submitted = time.time()
+        try:
+            future = executor.submit(timed_call, func, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the work ends, even if the awaiting request is cancelled
+        future.add_done_callback(self._release)
+
+        started, finished, result = await asyncio.wrap_future(future)
+        EXECUTOR_WAIT.labels(self.name).observe(max(0.0, started - submitted))
+        EXECUTOR_RUN.labels(self.name).observe(finished - started)
+        return result
+
+
+class ExecutorService:
+    """
+    Registry of the app's bounded pools.
+
+    Attributes:
+        pools: name -> BoundedPool
+    """
+
+    def __init__(self):
+        """Initialize pools from EXECUTOR_POOLS."""
+        self.pools: Dict[str, BoundedPool] = {
+            name: BoundedPool(name, **settings) for name, settings in EXECUTOR_POOLS.items()
+        }
+
+    def start(self):
+        """
+        Create every pool's executor.
+        """
+        for pool in self.pools.values():
+            pool.start()
+        logger.info(
+            "Started executors: %s",
+            ", ".join(f"{p.name}={p.kind}x{p.workers}" for p in self.pools.values())
+        )
+
+    async def shutdown(self):
+        """
+        Stop every pool without blocking the event loop.
+        """
+        for pool in self.pools.values():
+            await asyncio.to_thread(pool.shutdown)
+
+    async def run(self, pool: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func on a named pool.
+
+        Args:
+            pool: Pool name
+            func: Callable
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Any: func's return value
+        """
+        return await self.pools[pool].run(func, *args, **kwargs)
+
+
+executors = ExecutorService()
+
+
+async def run_media(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking subprocess call (ffmpeg.run, ffmpeg.probe,
+    subprocess.run) on the media pool.
+
+    Args:
+        func: Callable
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        Any: func's return value
+    """
+    return await executors.run("media", func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run CPU-bound Python on the process pool.
+
+    Args:
+        func: Module-level function (picklable)
+        *args: Picklable positional arguments
+        **kwargs: Picklable keyword arguments
+
+    Returns:
+        Any: func's return value (picklable)
+    """
+    return await executors.run("cpu", func, *args, **kwargs)
+
+
+__all__ = [
+    'EXECUTOR_POOLS',
+    'BoundedPool',
+    'ExecutorBusy',
+    'ExecutorService',
+    'executors',
+    'run_media',
+    'run_cpu'
+]
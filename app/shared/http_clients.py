@@ -0,0 +1,224 @@
+"""
+HTTP Client Registry Module
+
+This module provides the app-scoped, pooled HTTP clients used for all
+outbound calls (BunnyCDN, CDN downloads, webhooks, third-party APIs),
+so connections and TLS sessions are reused instead of being set up on
+every call.
+
+Features:
+- Shared aiohttp sessions
+- Keep-alive pooling
+- Per-host connection limits
+- DNS caching
+- Per-profile timeouts
+- Pooled requests session for sync code
+
+Data Model:
+- Profiles: name -> connector/timeout settings
+- Sessions per event loop and profile
+
+Security:
+- No shared cookie state
+- Bounded connection pools
+- Timeouts on every call
+
+Dependencies:
+- aiohttp for async HTTP
+- requests for sync HTTP
+- asyncio for loop tracking
+- logging for tracking
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Connection pool, DNS cache and timeout settings per client profile
+HTTP_CLIENT_PROFILES = {
+    # API calls and webhooks
+    "default": {
+        "limit": 100,
+        "limit_per_host": 20,
+        "timeout": aiohttp.ClientTimeout(total=60, connect=10)
+    },
+    # Storage API uploads/downloads and CDN media fetches - large bodies,
+    # so only connect and per-read timeouts
+    "transfer": {
+        "limit": 100,
+        "limit_per_host": 32,
+        "timeout": aiohttp.ClientTimeout(total=None, connect=10, sock_read=300)
+    },
+}
+
+# Seconds resolved hosts are cached
+HTTP_DNS_CACHE_TTL = 300
+
+# Seconds an idle connection is kept open
+HTTP_KEEPALIVE_TIMEOUT = 30
+
+# (connect, read) timeout for sync requests
+SYNC_HTTP_TIMEOUT = (10, 120)
+
+
+class _TimeoutSession(requests.Session):
+    """requests.Session with a default timeout."""
+
+    def request(self, *args, **kwargs):
+        kwargs.setdefault("timeout", SYNC_HTTP_TIMEOUT)
+        return super().request(*args, **kwargs)
+
+
+class HTTPClientRegistry:
+    """
+    Registry of pooled HTTP sessions.
+
+    aiohttp sessions are bound to the event loop they were created on,
+    so sessions are kept per loop; the app loop opens its sessions in
+    lifespan, scripts running their own loops get their own sessions.
+
+    Attributes:
+        sessions: loop -> {profile: ClientSession}
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.sessions = weakref.WeakKeyDictionary()
+        self._sync_session = None
+        self._sync_lock = threading.Lock()
+
+    def get(self, name: str = "default") -> aiohttp.ClientSession:
+        """
+        Get the shared session for a profile on the running loop.
+
+        Args:
+            name: Profile name
+
+        Returns:
+            ClientSession: Shared session, do not close
+
+        Raises:
+            KeyError: Unknown profile
+            RuntimeError: No running event loop
+        """
+        loop = asyncio.get_running_loop()
+        loop_sessions = self.sessions.setdefault(loop, {})
+        session = loop_sessions.get(name)
+        if session is None or session.closed:
+            session = self._create(name)
+            loop_sessions[name] = session
+        return session
+
+    def _create(self, name: str) -> aiohttp.ClientSession:
+        profile = HTTP_CLIENT_PROFILES[name]
+        connector = aiohttp.TCPConnector(
+            limit=profile["limit"],
+            limit_per_host=profile["limit_per_host"],
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+        )
+        # Shared across users, so never keep cookies between calls
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=profile["timeout"],
+            cookie_jar=aiohttp.DummyCookieJar()
+        )
+
+    async def open(self):
+        """
+        Open every profile on the running loop.
+        """
+        for name in HTTP_CLIENT_PROFILES:
+            self.get(name)
+        logger.info(f"Opened HTTP clients: {', '.join(HTTP_CLIENT_PROFILES)}")
+
+    async def close(self):
+        """
+        Close the sessions of the running loop and the sync session.
+        """
+        loop_sessions = self.sessions.pop(asyncio.get_running_loop(), {})
+        for session in loop_sessions.values():
+            await session.close()
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+
+    def sync_session(self) -> requests.Session:
+        """
+        Get the shared requests session for sync code.
+
+        Returns:
+            requests.Session: Pooled session with default timeouts
+        """
+        if self._sync_session is None:
+            with self._sync_lock:
+                if self._sync_session is None:
+                    session = _TimeoutSession()
+                    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._sync_session = session
+        return self._sync_session
+
+
+http_clients = HTTPClientRegistry()
+
+
+def get_http_session(name: str = "default") -> aiohttp.ClientSession:
+    """
+    Get a shared aiohttp session.
+
+    Args:
+        name: Profile name ("default" or "transfer")
+
+    Returns:
+        ClientSession: Shared session, do not close
+    """
+    return http_clients.get(name)
+
+
+@asynccontextmanager
+async def http_session(name: str = "default"):
+    """
+    Borrow a shared aiohttp session.
+
+    Drop-in for `async with aiohttp.ClientSession() as session:` that
+    leaves the session open for the next caller.
+
+    Args:
+        name: Profile name ("default" or "transfer")
+
+    Yields:
+        ClientSession: Shared session
+    """
+    yield http_clients.get(name)
+
+
+def get_sync_http_session() -> requests.Session:
+    """
+    Get the shared requests session.
+
+    Returns:
+        requests.Session: Pooled session with default timeouts
+    """
+    return http_clients.sync_session()
+
+
+__all__ = [
+    'HTTP_CLIENT_PROFILES',
+    'HTTPClientRegistry',
+    'http_clients',
+    'get_http_session',
+    'http_session',
+    'get_sync_http_session'
+]
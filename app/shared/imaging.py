@@ -0,0 +1,112 @@
+"""
+Imaging Module
+
+This module holds the CPU-bound PIL operations used by request
+handlers and jobs. They are plain module-level functions over file
+paths and bytes so they can run on the CPU process pool (run_cpu).
+
+Features:
+- Square thumbnails
+- Rotation to vertical
+- JPEG normalization
+
+Data Model:
+- Local file paths in, file paths or bytes out
+
+Security:
+- Temp files only
+- No network access
+
+Dependencies:
+- PIL for image processing
+
+Author: Snapped Development Team
+"""
+
+import io
+from PIL import Image
+
+
+def square_thumbnail(input_path: str, output_path: str, size: int = 480, quality: int = 85):
+    """
+    Center-crop an image to a square and save it as a JPEG thumbnail.
+
+    Args:
+        input_path: Source image
+        output_path: Destination JPEG
+        size: Edge length in pixels
+        quality: JPEG quality
+    """
+    with Image.open(input_path) as img:
+        img = img.convert('RGB')
+        # Calculate dimensions for square crop
+        width, height = img.size
+        edge = min(width, height)
+        left = (width - edge) // 2
+        top = (height - edge) // 2
+        # Crop to square from center
+        img = img.crop((left, top, left + edge, top + edge))
+        # Scale to final size
+        img = img.resize((size, size), Image.Resampling.LANCZOS)
+        img.save(output_path, 'JPEG', quality=quality)
+
+
+def rotate_to_vertical(input_path: str, output_path: str) -> bool:
+    """
+    Rotate a horizontal image to vertical.
+
+    Args:
+        input_path: Source image
+        output_path: Destination image
+
+    Returns:
+        bool: False if the image was already vertical (nothing written)
+
+    Notes:
+        - EXIF orientation 8 rotates 90, anything else 270
+    """
+    with Image.open(input_path) as img:
+        width, height = img.size
+        if width <= height:
+            return False
+
+        # Check EXIF for rotation direction
+        orientation = None
+        try:
+            exif = img._getexif()
+            if exif:
+                orientation = exif.get(274)
+        except Exception:
+            pass
+
+        if orientation == 8:
+            rotated = img.transpose(Image.ROTATE_90)
+        else:
+            rotated = img.transpose(Image.ROTATE_270)
+        rotated.save(output_path)
+        return True
+
+
+def to_jpeg_bytes(data: bytes) -> bytes:
+    """
+    Re-encode image bytes as an RGB JPEG.
+
+    Args:
+        data: Image bytes in any PIL format
+
+    Returns:
+        bytes: JPEG bytes
+    """
+    image = Image.open(io.BytesIO(data))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    output = io.BytesIO()
+    image.save(output, format='JPEG')
+    return output.getvalue()
+
+
+__all__ = [
+    'square_thumbnail',
+    'rotate_to_vertical',
+    'to_jpeg_bytes'
+]
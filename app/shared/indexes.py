@@ -0,0 +1,256 @@
+"""
+Index Registry Module
+
+This module declares the MongoDB indexes the hot query paths depend on
+and applies them at startup, plus the hot query shapes used to check
+that every one of them is served by an index.
+
+Features:
+- Declarative index specs
+- Idempotent creation
+- Hot query registry
+- Explain plan checks
+
+Data Model:
+- (database, collection) -> IndexModels
+- Hot query: database, collection, filter, sort
+
+Security:
+- Default index names (match manual indexes)
+- Conflicts logged, not fatal
+- Background application
+
+Dependencies:
+- PyMongo for IndexModel
+- Motor for async access
+- logging for tracking
+
+Author: Snapped Development Team
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Collections holding per-client session/file documents
+SESSION_COLLECTIONS = ["Uploads", "Saved", "Spotlights", "Content_Dump"]
+
+# ClientInfo identifiers resolved by the ClientDirectory
+CLIENT_ALIAS_FIELDS = ["client_ID", "snap_id", "Email_Address", "snap_username", "username", "Username", "Snap_Username"]
+
+# Collections holding one document per queue day
+QUEUE_COLLECTIONS = ["Queue", "SavedQueue", "SpotQueue"]
+
+
+def _session_indexes() -> List[IndexModel]:
+    # File lookups always come with client_ID or session_id, so a
+    # separate multikey index on every file name is not worth its writes
+    return [
+        IndexModel([("client_ID", ASCENDING)]),
+        IndexModel([("sessions.session_id", ASCENDING)]),
+    ]
+
+
+INDEX_REGISTRY: Dict[Tuple[str, str], List[IndexModel]] = {
+    **{("UploadDB", name): _session_indexes() for name in SESSION_COLLECTIONS},
+    **{("QueueDB", name): [IndexModel([("queue_date", ASCENDING)])] for name in QUEUE_COLLECTIONS},
+    # Normalized media layout (media_store.py); keys lead with client_ID
+    ("UploadDB", "media_files"): [
+        IndexModel([("client_ID", ASCENDING), ("collection", ASCENDING), ("session_id", ASCENDING),
+                    ("file_name", ASCENDING)], unique=True),
+    ],
+    ("UploadDB", "sessions"): [
+        IndexModel([("client_ID", ASCENDING), ("collection", ASCENDING), ("session_id", ASCENDING)], unique=True),
+    ],
+    # Session routing (session_routes.py); one route per collection holding the ID
+    ("UploadDB", "session_routes"): [
+        IndexModel([("session_id", ASCENDING), ("collection", ASCENDING)], unique=True),
+        IndexModel([("client_ID", ASCENDING), ("collection", ASCENDING)]),
+    ],
+    ("Opps", "time_track"): [IndexModel([("user_id", ASCENDING)])],
+    ("Opps", "Employees"): [IndexModel([("user_id", ASCENDING)])],
+    ("Messages", "message_store"): [IndexModel([("user_id", ASCENDING)])],
+    ("ClientDb", "ClientInfo"): [
+        IndexModel([("client_id", ASCENDING)]),
+        # ClientDirectory identifiers; sparse since most leads lack them
+        *[IndexModel([(field, ASCENDING)], sparse=True) for field in CLIENT_ALIAS_FIELDS],
+    ],
+    ("ClientDb", "content_data"): [
+        IndexModel([("snap_profile_name", ASCENDING), ("platform", ASCENDING)])
+    ],
+    ("JobQueue", "Jobs"): [
+        # Claim: next due job per queue; expired leases per queue
+        IndexModel([("queue", ASCENDING), ("status", ASCENDING), ("run_at", ASCENDING)]),
+        IndexModel([("queue", ASCENDING), ("status", ASCENDING), ("lease_until", ASCENDING)]),
+        # Latest job per name/key (progress polling, dedupe)
+        IndexModel([("name", ASCENDING), ("key", ASCENDING), ("created_at", DESCENDING)]),
+        # One queued/running job per deduped name/key (enqueue races)
+        IndexModel([("name", ASCENDING), ("key", ASCENDING)], unique=True,
+                   partialFilterExpression={"active": True}),
+        # Run history per scheduled job
+        IndexModel([("name", ASCENDING), ("created_at", DESCENDING)]),
+        # Finished jobs are kept for a week
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    ("JobQueue", "WebhookOutbox"): [
+        # Retry job: due and abandoned deliveries; pending count per target
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)]),
+        IndexModel([("target", ASCENDING), ("status", ASCENDING)]),
+        # Delivered and dead deliveries are kept for a month
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+}
+
+
+class HotQuery:
+    """
+    A query shape on a hot path that must be index-backed.
+
+    Attributes:
+        database: Database name
+        collection: Collection name
+        filter: Example filter with representative values
+        sort: Optional sort specification
+    """
+
+    def __init__(self, database: str, collection: str, filter: Dict, sort: Optional[List] = None):
+        """
+        Initialize hot query.
+
+        Args:
+            database: Database name
+            collection: Collection name
+            filter: Example filter with representative values
+            sort: Optional sort specification
+        """
+        self.database = database
+        self.collection = collection
+        self.filter = filter
+        self.sort = sort
+
+    def __repr__(self) -> str:
+        return f"HotQuery({self.database}.{self.collection} {self.filter})"
+
+
+HOT_QUERIES: List[HotQuery] = [
+    *[HotQuery("UploadDB", name, {"client_ID": "jd01011990"}) for name in SESSION_COLLECTIONS],
+    *[HotQuery("UploadDB", name, {"sessions.session_id": "F(01-01-2024)_jd01011990"}) for name in SESSION_COLLECTIONS],
+    # Paged folder tree: next page of clients
+    HotQuery("UploadDB", "Uploads", {"client_ID": {"$type": "string", "$gt": "jd01011990"}}, sort=[("client_ID", ASCENDING)]),
+    HotQuery("UploadDB", "Uploads", {
+        "client_ID": "jd01011990",
+        "sessions.session_id": "F(01-01-2024)_jd01011990",
+        "sessions.files.file_name": "0001.mp4"
+    }),
+    HotQuery("UploadDB", "media_files", {
+        "client_ID": "jd01011990", "collection": "Uploads",
+        "session_id": "F(01-01-2024)_jd01011990", "file_name": "0001.mp4"
+    }),
+    HotQuery("UploadDB", "media_files", {
+        "client_ID": "jd01011990", "collection": "Uploads", "session_id": "F(01-01-2024)_jd01011990"
+    }, sort=[("seq_number", ASCENDING)]),
+    HotQuery("UploadDB", "sessions", {"client_ID": "jd01011990", "collection": "Uploads"}),
+    HotQuery("UploadDB", "session_routes", {"session_id": "F(01-01-2024)_jd01011990"}),
+    HotQuery("UploadDB", "session_routes", {"client_ID": "jd01011990", "collection": "Uploads"}),
+    *[HotQuery("QueueDB", name, {"queue_date": "2024-01-01"}) for name in QUEUE_COLLECTIONS],
+    HotQuery("Opps", "time_track", {"user_id": "jd01011990"}),
+    HotQuery("Opps", "Employees", {"user_id": {"$in": ["jd01011990", "JD01011990"]}}),
+    HotQuery("Messages", "message_store", {"user_id": "jd01011990"}),
+    HotQuery("ClientDb", "ClientInfo", {"client_id": {"$in": ["jd01011990"]}}),
+    HotQuery("ClientDb", "ClientInfo", {"$or": [{"client_id": "jd01011990"}, {"client_ID": "jd01011990"}]}),
+    HotQuery("ClientDb", "ClientInfo", {"snap_id": "5f3c0e1a-0000-0000-0000-000000000000"}),
+    HotQuery("ClientDb", "ClientInfo", {"Email_Address": "jane@example.com"}),
+    HotQuery("ClientDb", "ClientInfo", {"$or": [
+        {"snap_username": "janedoe"}, {"username": "janedoe"}, {"Username": "janedoe"}, {"Snap_Username": "janedoe"}
+    ]}),
+    HotQuery("ClientDb", "content_data", {"snap_profile_name": "janedoe", "platform": "snapchat"}),
+]
+
+
+async def ensure_indexes(client, db_prefix: str = "") -> Dict[str, List[str]]:
+    """
+    Create every registered index that does not exist yet.
+
+    Args:
+        client: Motor client
+        db_prefix: Prefix for database names (tests)
+
+    Returns:
+        dict: Index names per "db.collection", or the error message
+
+    Notes:
+        - create_indexes is a no-op for existing indexes
+        - Conflicting definitions are logged and skipped
+    """
+    results = {}
+    for (database, collection), models in INDEX_REGISTRY.items():
+        namespace = f"{db_prefix}{database}.{collection}"
+        try:
+            results[namespace] = await client[db_prefix + database][collection].create_indexes(models)
+        except PyMongoError as e:
+            logger.error(f"Failed to ensure indexes on {namespace}: {e}")
+            results[namespace] = [str(e)]
+    logger.info(f"Ensured indexes on {len(results)} collections")
+    return results
+
+
+def _plan_stages(plan: Dict) -> List[str]:
+    stages = [plan["stage"]] if "stage" in plan else []
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    return stages
+
+
+async def explain_hot_queries(client, db_prefix: str = "") -> List[Tuple[HotQuery, List[str]]]:
+    """
+    Explain every hot query and collect its winning plan stages.
+
+    Args:
+        client: Motor client
+        db_prefix: Prefix for database names (tests)
+
+    Returns:
+        list: (hot query, winning plan stages) pairs
+    """
+    results = []
+    for query in HOT_QUERIES:
+        cursor = client[db_prefix + query.database][query.collection].find(query.filter)
+        if query.sort:
+            cursor = cursor.sort(query.sort)
+        explain = await cursor.explain()
+        results.append((query, _plan_stages(explain["queryPlanner"]["winningPlan"])))
+    return results
+
+
+async def find_collection_scans(client, db_prefix: str = "") -> List[HotQuery]:
+    """
+    Find hot queries whose winning plan is a collection scan.
+
+    Args:
+        client: Motor client
+        db_prefix: Prefix for database names (tests)
+
+    Returns:
+        list: Hot queries planned with COLLSCAN
+    """
+    return [
+        query for query, stages in await explain_hot_queries(client, db_prefix)
+        if "COLLSCAN" in stages
+    ]
+
+
+__all__ = [
+    'INDEX_REGISTRY',
+    'HOT_QUERIES',
+    'HotQuery',
+    'ensure_indexes',
+    'explain_hot_queries',
+    'find_collection_scans'
+]
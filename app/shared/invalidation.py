@@ -0,0 +1,543 @@
+"""
+Invalidation Module
+
+This module keeps caches on top of MongoDB fresh no matter which route
+wrote the change. One process at a time holds a MongoDB leader lease and
+tails change streams on the watched collections; it drops the shared
+(Redis) cache entries for each batch of changes and publishes the batch
+over Redis pub/sub, where every worker drops its in-process copies.
+
+Features:
+- Change streams on ClientInfo, content_data, Employees, Partners.*
+  and the upload collections
+- Leader election by lease; resume tokens survive leader changes
+- Batched Redis pub/sub fan-out to every worker
+- Handler registry by source pattern
+- Full reset when events may have been missed
+
+Data Model:
+- Event: source (db.collection), op, doc_id, identifier keys, changed
+  field paths of updates
+- Lease and resume tokens in JobQueue.Leases (_id "invalidation")
+- Channel message: {"origin": owner, "events": [...]}
+
+Security:
+- Only identifier fields and changed field paths (no values) leave the
+  change stream
+- Leases expire when a leader dies
+- Resets after history loss or a lost subscription
+
+Dependencies:
+- Motor for change streams and the lease
+- redis.asyncio for pub/sub
+- fnmatch for source patterns
+- prometheus_client for metrics
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import socket
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
+from .database import async_client
+from .indexes import CLIENT_ALIAS_FIELDS, SESSION_COLLECTIONS
+from .redis_client import REDIS_RETRY_INTERVAL, REDIS_UNAVAILABLE_ERRORS, create_pubsub_client, get_redis, mark_redis_down
+
+logger = logging.getLogger(__name__)
+
+# Collections tailed per database (None: every collection)
+WATCHED_COLLECTIONS: Dict[str, Optional[List[str]]] = {
+    "ClientDb": ["ClientInfo", "content_data"],
+    "Opps": ["Employees"],
+    "Partners": None,
+    "UploadDB": SESSION_COLLECTIONS,
+}
+
+# Post-change document fields carried by an event
+EVENT_KEY_FIELDS = ["client_id", "user_id", "snap_profile_name", *CLIENT_ALIAS_FIELDS]
+
+# Changed field paths of an update are cut to this many segments
+# ("sessions.3.files.2.caption" -> "sessions.3"); updates touching more
+# distinct paths than EVENT_MAX_FIELDS carry none (whole document)
+EVENT_FIELD_DEPTH = 2
+EVENT_MAX_FIELDS = 100
+
+INVALIDATION_CHANNEL = "invalidation:events"
+
+# Leader lease; a new leader resumes from the stored tokens
+INVALIDATION_LEASE_ID = "invalidation"
+INVALIDATION_LEASE_SECONDS = 30
+
+# Changes are collected this long before a batch is published
+INVALIDATION_FLUSH_SECONDS = 0.1
+INVALIDATION_MAX_BATCH = 500
+
+# Wait before retrying after change streams fail (e.g. no replica set)
+INVALIDATION_RETRY_SECONDS = 60
+
+# Resume token no longer usable: ChangeStreamHistoryLost, ChangeStreamFatalError, InvalidResumeToken
+RESUME_FAILURE_CODES = {286, 280, 260}
+
+INVALIDATION_EVENTS = Counter(
+    "invalidation_events_total",
+    "Change events published to workers",
+    ["source"]
+)
+INVALIDATION_LAG = Histogram(
+    "invalidation_event_lag_seconds",
+    "Delay between a MongoDB write and its invalidation being published",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 30)
+)
+INVALIDATION_LEADER = Gauge(
+    "invalidation_bus_is_leader",
+    "1 while this process tails the change streams",
+    multiprocess_mode="livesum"
+)
+
+
+@dataclass
+class InvalidationEvent:
+    """
+    A change to a watched document.
+
+    Attributes:
+        source: "<database>.<collection>", "*" for a reset
+        op: Change operation (insert, update, replace, delete, drop...)
+            or "reset"
+        doc_id: String form of the document _id
+        keys: EVENT_KEY_FIELDS of the post-change document (empty for
+            deletes and collection-level operations)
+        fields: Updated, removed and truncated field paths of an update,
+            cut to EVENT_FIELD_DEPTH segments; None when unknown (any
+            other operation), meaning the whole document changed
+    """
+    source: str
+    op: str
+    doc_id: Optional[str] = None
+    keys: Dict[str, Any] = field(default_factory=dict)
+    fields: Optional[List[str]] = None
+
+    @property
+    def is_reset(self) -> bool:
+        """Whether every cached entry must be dropped."""
+        return self.op == "reset"
+
+
+def reset_event() -> InvalidationEvent:
+    """Event telling handlers that changes may have been missed."""
+    return InvalidationEvent("*", "reset")
+
+
+InvalidationHandler = Callable[[List[InvalidationEvent], bool], Awaitable[None]]
+
+_HANDLERS: List[Tuple[str, InvalidationHandler]] = []
+
+
+def on_invalidation(pattern: str):
+    """
+    Register a handler for changes to matching sources.
+
+    Args:
+        pattern: Source pattern, e.g. "ClientDb.ClientInfo" or "Partners.*"
+
+    Returns:
+        Callable: Decorator registering handler(events, local)
+
+    Notes:
+        - Handlers get batches; reset events match every pattern
+        - local=False on the leader (drop shared Redis entries too),
+          local=True on every other worker (drop in-process copies)
+        - Events without keys mean "anything from this source"
+    """
+    def decorator(func: InvalidationHandler) -> InvalidationHandler:
+        _HANDLERS.append((pattern, func))
+        return func
+    return decorator
+
+
+def has_handlers(source: str) -> bool:
+    """
+    Check whether any handler listens to a source.
+
+    Args:
+        source: "<database>.<collection>"
+
+    Returns:
+        bool: True if an event from source would be handled
+    """
+    return any(fnmatch.fnmatchcase(source, pattern) for pattern, _ in _HANDLERS)
+
+
+async def dispatch_events(events: List[InvalidationEvent], local: bool):
+    """
+    Run every matching handler on a batch.
+
+    Args:
+        events: Batch of events
+        local: Drop in-process copies only
+
+    Notes:
+        - A failing handler is logged and does not stop the others
+    """
+    for pattern, handler in list(_HANDLERS):
+        matched = [e for e in events if e.is_reset or fnmatch.fnmatchcase(e.source, pattern)]
+        if not matched:
+            continue
+        try:
+            await handler(matched, local)
+        except Exception as e:
+            logger.error(f"Invalidation handler {handler.__qualname__} failed: {e}")
+
+
+def event_from_change(change: Dict, db_prefix: str = "") -> InvalidationEvent:
+    """
+    Build an event from a change stream document.
+
+    Args:
+        change: Change document (projected by the watch pipeline)
+        db_prefix: Database name prefix to strip (tests)
+
+    Returns:
+        InvalidationEvent: Event with identifier keys and, for updates,
+            changed field paths
+    """
+    ns = change.get("ns") or {}
+    document = change.get("fullDocument") or {}
+    doc_id = (change.get("documentKey") or {}).get("_id")
+    fields = None
+    if change["operationType"] == "update" and change.get("changedFields") is not None:
+        paths = {".".join(path.split(".")[:EVENT_FIELD_DEPTH]) for path in change["changedFields"]}
+        fields = sorted(paths) if len(paths) <= EVENT_MAX_FIELDS else None
+    return InvalidationEvent(
+        source=f"{ns.get('db', '').removeprefix(db_prefix)}.{ns.get('coll', '*')}",
+        op=change["operationType"],
+        doc_id=None if doc_id is None else str(doc_id),
+        keys={k: document[k] for k in EVENT_KEY_FIELDS if isinstance(document.get(k), (str, int))},
+        fields=fields
+    )
+
+
+def _watch_pipeline(collections: Optional[List[str]]) -> List[Dict]:
+    pipeline = [{"$match": {"ns.coll": {"$in": collections}}}] if collections else []
+    # Only identifiers and changed paths leave the server (documents
+    # and updatedFields values can hold whole sessions)
+    pipeline.append({"$project": {
+        "operationType": 1, "ns": 1, "documentKey": 1, "clusterTime": 1,
+        **{f"fullDocument.{k}": 1 for k in EVENT_KEY_FIELDS},
+        "changedFields": {"$concatArrays": [
+            {"$map": {
+                "input": {"$objectToArray": {"$ifNull": ["$updateDescription.updatedFields", {}]}},
+                "in": "$$this.k"
+            }},
+            {"$ifNull": ["$updateDescription.removedFields", []]},
+            {"$map": {"input": {"$ifNull": ["$updateDescription.truncatedArrays", []]}, "in": "$$this.field"}}
+        ]}
+    }})
+    return pipeline
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class InvalidationBus:
+    """
+    Change stream tailer (leader) and pub/sub listener (every worker).
+
+    Attributes:
+        client: Motor client to watch
+        db_prefix: Prefix for database names (tests)
+        owner: Lease owner id, also the message origin
+        is_leader: Whether this process is tailing
+        subscribed: Set while the pub/sub subscription is live
+    """
+
+    def __init__(self, client=None, db_prefix: str = "", owner: Optional[str] = None):
+        """
+        Initialize bus.
+
+        Args:
+            client: Motor client (default shared client)
+            db_prefix: Prefix for database names (tests)
+            owner: Lease owner id (default host:pid)
+        """
+        self.client = client or async_client
+        self.db_prefix = db_prefix
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.leases = self.client[db_prefix + "JobQueue"]["Leases"]
+        self.is_leader = False
+        self.subscribed = asyncio.Event()
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop tailing and listening, and give up the lease."""
+        self._stopping.set()
+
+    async def acquire_lease(self) -> Optional[Dict]:
+        """
+        Take or renew the leader lease.
+
+        Returns:
+            dict: Lease document (with resume_tokens) if leader, else None
+        """
+        now = _utcnow()
+        try:
+            lease = await self.leases.find_one_and_update(
+                {
+                    "_id": INVALIDATION_LEASE_ID,
+                    "$or": [{"owner": self.owner}, {"lease_until": {"$lte": now}}]
+                },
+                {
+                    "$set": {
+                        "owner": self.owner,
+                        "lease_until": now + timedelta(seconds=INVALIDATION_LEASE_SECONDS),
+                        "renewed_at": now,
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Held by another live owner
+            lease = None
+
+        leader = lease is not None and lease.get("owner") == self.owner
+        if leader != self.is_leader:
+            logger.info("Invalidation bus %s %s leadership", self.owner, "acquired" if leader else "lost")
+        self.is_leader = leader
+        INVALIDATION_LEADER.set(1 if leader else 0)
+        return lease if leader else None
+
+    async def release_lease(self):
+        """Give up the lease so another worker takes over at once."""
+        await self.leases.update_one(
+            {"_id": INVALIDATION_LEASE_ID, "owner": self.owner},
+            {"$set": {"lease_until": _utcnow()}}
+        )
+        self.is_leader = False
+        INVALIDATION_LEADER.set(0)
+
+    async def publish(self, events: List[InvalidationEvent]):
+        """
+        Apply a batch here (shared entries included) and fan it out.
+
+        Args:
+            events: Batch of events
+
+        Notes:
+            - Shared entries are dropped before publishing, so a worker
+              reloading on the message can't refill from stale Redis
+            - Lost if Redis is down; listeners reset on reconnect
+        """
+        await dispatch_events(events, local=False)
+        for event in events:
+            INVALIDATION_EVENTS.labels(event.source).inc()
+
+        redis_client = get_redis()
+        if not redis_client:
+            return
+        message = json.dumps({"origin": self.owner, "events": [asdict(e) for e in events]})
+        try:
+            await redis_client.publish(INVALIDATION_CHANNEL, message)
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+
+    async def handle_message(self, raw: str):
+        """
+        Apply a published batch to this worker's in-process caches.
+
+        Args:
+            raw: Channel message data
+        """
+        message = json.loads(raw)
+        if message.get("origin") == self.owner:
+            return
+        events = [InvalidationEvent(**event) for event in message.get("events", [])]
+        if events:
+            await dispatch_events(events, local=True)
+
+    async def _watch(self, database: str, collections: Optional[List[str]], token: Optional[Dict], queue: asyncio.Queue):
+        # Feeds (database, event or None, resume token) until cancelled
+        db = self.client[self.db_prefix + database]
+        while True:
+            try:
+                async with db.watch(
+                    _watch_pipeline(collections),
+                    full_document="updateLookup",
+                    resume_after=token,
+                    max_await_time_ms=int(INVALIDATION_LEASE_SECONDS * 1000 / 3)
+                ) as stream:
+                    while stream.alive:
+                        change = await stream.try_next()
+                        if change is None:
+                            # Idle: keep the stored token current anyway
+                            token = stream.resume_token
+                            await queue.put((database, None, token))
+                            continue
+                        if change["operationType"] == "invalidate":
+                            # Watched database dropped; start over
+                            token = None
+                            await queue.put((database, reset_event(), None))
+                            break
+                        if change.get("clusterTime"):
+                            INVALIDATION_LAG.observe(max(0.0, time.time() - change["clusterTime"].time))
+                        token = stream.resume_token
+                        await queue.put((database, event_from_change(change, self.db_prefix), token))
+            except OperationFailure as e:
+                if token is None or e.code not in RESUME_FAILURE_CODES:
+                    raise
+                logger.warning(f"Change stream history lost for {database}, resetting caches: {e}")
+                token = None
+                await queue.put((database, reset_event(), None))
+
+    async def _next_batch(self, queue: asyncio.Queue, timeout: float) -> Tuple[List[InvalidationEvent], Dict[str, Any]]:
+        # Waits up to timeout for a first event, then INVALIDATION_FLUSH_SECONDS for more
+        batch, tokens = [], {}
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while len(batch) < INVALIDATION_MAX_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                database, event, token = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            tokens[database] = token
+            if event is not None and (event.is_reset or has_handlers(event.source)):
+                if not batch:
+                    deadline = min(deadline, loop.time() + INVALIDATION_FLUSH_SECONDS)
+                batch.append(event)
+        return batch, tokens
+
+    async def lead(self, lease: Dict):
+        """
+        Tail the change streams while the lease is held.
+
+        Args:
+            lease: Lease document from acquire_lease
+
+        Notes:
+            - Resumes from the tokens of the previous leader
+            - Tokens are saved after their batch is published
+              (at-least-once)
+            - Resets every cache when a stream has no token yet
+        """
+        tokens = dict(lease.get("resume_tokens") or {})
+        queue = asyncio.Queue(maxsize=INVALIDATION_MAX_BATCH * 4)
+        watchers = [
+            asyncio.create_task(self._watch(database, collections, tokens.get(database), queue))
+            for database, collections in WATCHED_COLLECTIONS.items()
+        ]
+        renew_every = INVALIDATION_LEASE_SECONDS / 3
+        try:
+            if any(tokens.get(database) is None for database in WATCHED_COLLECTIONS):
+                await self.publish([reset_event()])
+            renew_at = time.monotonic() + renew_every
+            while not self._stopping.is_set():
+                batch, changed_tokens = await self._next_batch(queue, max(0.0, renew_at - time.monotonic()))
+                for watcher in watchers:
+                    if watcher.done():
+                        # Surfaces the watcher's error (or ends leadership)
+                        watcher.result()
+                        return
+                if batch:
+                    await self.publish(batch)
+                if changed_tokens:
+                    await self.leases.update_one(
+                        {"_id": INVALIDATION_LEASE_ID, "owner": self.owner},
+                        {"$set": {f"resume_tokens.{db}": token for db, token in changed_tokens.items()}}
+                    )
+                if time.monotonic() >= renew_at:
+                    if not await self.acquire_lease():
+                        return
+                    renew_at = time.monotonic() + renew_every
+        finally:
+            for watcher in watchers:
+                watcher.cancel()
+            await asyncio.gather(*watchers, return_exceptions=True)
+
+    async def listen(self):
+        """
+        Apply other workers' published batches until stopped.
+
+        Notes:
+            - Resets this worker's caches on every (re)subscribe, since
+              batches published while unsubscribed are lost
+            - Resubscribes after any error, not just Redis outages
+        """
+        while not self._stopping.is_set():
+            redis_client = create_pubsub_client()
+            try:
+                async with redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    await dispatch_events([reset_event()], local=True)
+                    self.subscribed.set()
+                    while not self._stopping.is_set():
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message is not None:
+                            await self.handle_message(message["data"])
+            except REDIS_UNAVAILABLE_ERRORS as e:
+                logger.warning(f"Invalidation subscription lost: {e}")
+            except Exception:
+                # A failing handler or bad message must not end the listener
+                logger.exception("Invalidation listener failed, resubscribing")
+            finally:
+                self.subscribed.clear()
+                await redis_client.aclose()
+            await self._sleep(REDIS_RETRY_INTERVAL)
+
+    async def run(self):
+        """
+        Listen, and tail whenever this process holds the lease, until
+        stop() is called.
+        """
+        logger.info(f"Invalidation bus {self.owner} started")
+        listener = asyncio.create_task(self.listen())
+        try:
+            while not self._stopping.is_set():
+                delay = INVALIDATION_LEASE_SECONDS / 3
+                try:
+                    lease = await self.acquire_lease()
+                    if lease:
+                        await self.lead(lease)
+                except PyMongoError as e:
+                    logger.error(f"Invalidation change streams failed: {e}")
+                    delay = INVALIDATION_RETRY_SECONDS
+                await self._sleep(delay)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+            if self.is_leader:
+                await self.release_lease()
+
+    async def _sleep(self, seconds: float):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+invalidation_bus = InvalidationBus()
+
+
+__all__ = [
+    'InvalidationEvent',
+    'InvalidationBus',
+    'invalidation_bus',
+    'on_invalidation',
+    'dispatch_events',
+    'event_from_change',
+    'reset_event',
+    'WATCHED_COLLECTIONS'
+]
@@ -0,0 +1,709 @@
+"""
+Jobs Module
+
+This module provides a MongoDB-backed durable job queue. Endpoints
+enqueue long-running work and return a job id straight away; separate
+worker processes (python -m app.worker) claim and run the jobs.
+
+Features:
+- Durable job documents
+- Worker leases and heartbeats
+- Retries with exponential backoff
+- Per-queue concurrency limits (lease slots)
+- Progress reporting
+- Duplicate suppression by key
+- Debounced keys for follow-up work on bursts of changes
+- Job status endpoint
+- Duration and wait metrics
+
+Data Model:
+- One document per job in JobQueue.Jobs
+- Status, attempts and run_at
+- Progress and result
+- Lease owner and expiry
+- active flag while a deduped job is queued or running; unique
+  (name, key) among active jobs
+- Queue slots in JobQueue.Leases: queue:<name>:<n>, one per allowed
+  running job
+
+Security:
+- Status visible to the creator and admins
+- Bounded result size
+- Finished jobs expire
+
+Dependencies:
+- Motor for job storage
+- FastAPI for status routes
+- asyncio for workers
+- prometheus_client for metrics
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import orjson
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from prometheus_client import Histogram
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from .auth import get_current_user_group
+from .database import jobs_collection, leases_collection
+from .models import JobStatus
+from .responses import dumps
+
+logger = logging.getLogger(__name__)
+
+# Jobs run at once per queue, across all workers
+JOB_QUEUES: Dict[str, int] = {
+    "default": 4,
+    "media": 2,      # TikTok downloads, thumbnails
+    "scans": 2,      # BunnyCDN scans and session stores
+    "posting": 1,    # Make.com posting runs
+    "ai": 2,         # Twelve Labs uploads and summaries
+    "leads": 1,      # Lead score recalculation
+}
+
+# A running job is reclaimed when its worker stops heartbeating this long
+JOB_LEASE_SECONDS = 60
+
+# Queue slot lease ids: <prefix><queue>:<n>
+JOB_SLOT_PREFIX = "queue:"
+
+# Lease extension and progress flush interval
+JOB_HEARTBEAT_SECONDS = 5
+
+# Idle worker poll interval
+JOB_POLL_SECONDS = 1.0
+
+# Retry delay: base * 2^(attempt-1), capped, with +/-20% jitter
+JOB_RETRY_BASE_SECONDS = 30
+JOB_RETRY_MAX_SECONDS = 1800
+
+# Finished jobs are removed by a TTL index after this long
+JOB_RETENTION = timedelta(days=7)
+
+# Largest stored result; bigger results are replaced by a note
+JOB_MAX_RESULT_BYTES = 1024 * 1024
+
+# Running jobs get this long to finish when a worker shuts down
+JOB_SHUTDOWN_GRACE_SECONDS = int(os.getenv("JOB_SHUTDOWN_GRACE_SECONDS", "30"))
+
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Job attempt run time",
+    ["job", "status"],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 1800, 3600, 7200, 14400)
+)
+JOB_WAIT = Histogram(
+    "job_queue_wait_seconds",
+    "Delay between a job becoming due and a worker claiming it",
+    ["queue"],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600)
+)
+
+
+class PermanentJobError(Exception):
+    """Raised by a job to fail without further retries."""
+
+
+@dataclass
+class JobSpec:
+    """
+    A registered job function.
+
+    Attributes:
+        name: Registry name stored on job documents
+        func: async func(ctx, **args)
+        queue: Queue name (see JOB_QUEUES)
+        max_attempts: Attempts before the job fails
+        timeout: Seconds per attempt
+    """
+
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    queue: str = "default"
+    max_attempts: int = 3
+    timeout: float = 3600
+
+
+JOB_REGISTRY: Dict[str, JobSpec] = {}
+
+
+def job(name: str, queue: str = "default", max_attempts: int = 3, timeout: float = 3600):
+    """
+    Register an async function as a job.
+
+    The function is called as func(ctx, **args) with a JobContext; args
+    must be BSON-serializable.
+
+    Args:
+        name: Registry name
+        queue: Queue name
+        max_attempts: Attempts before the job fails
+        timeout: Seconds per attempt
+
+    Returns:
+        Decorator
+    """
+    if queue not in JOB_QUEUES:
+        raise ValueError(f"Unknown job queue: {queue}")
+
+    def decorator(func):
+        JOB_REGISTRY[name] = JobSpec(name, func, queue, max_attempts, timeout)
+        func.job_name = name
+        return func
+    return decorator
+
+
+class JobContext:
+    """
+    Handle passed to a running job.
+
+    Attributes:
+        job_id: Job id
+        attempt: Current attempt, starting at 1
+        progress: Progress fields; mutate freely, flushed on heartbeat
+    """
+
+    def __init__(self, job_doc: Dict):
+        """
+        Initialize context.
+
+        Args:
+            job_doc: Claimed job document
+        """
+        self.job_id = str(job_doc["_id"])
+        self.attempt = job_doc.get("attempts", 1)
+        self.progress: Dict[str, Any] = dict(job_doc.get("progress") or {})
+
+    def update_progress(self, **fields):
+        """
+        Update progress fields.
+
+        Safe to call from worker threads; written on the next heartbeat.
+
+        Args:
+            **fields: Progress fields
+        """
+        self.progress.update(fields)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _storable(value: Any) -> Any:
+    """Reduce a job result to plain JSON types, bounded in size."""
+    encoded = dumps(value)
+    if len(encoded) > JOB_MAX_RESULT_BYTES:
+        return {"truncated": True, "size": len(encoded)}
+    return orjson.loads(encoded)
+
+
+def retry_delay(attempt: int) -> float:
+    """
+    Backoff before retrying a failed attempt.
+
+    Args:
+        attempt: Attempt that just failed, starting at 1
+
+    Returns:
+        float: Seconds
+    """
+    delay = min(JOB_RETRY_MAX_SECONDS, JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def debounce(key: str, seconds: float) -> Tuple[str, float]:
+    """
+    Key and delay that coalesce a burst of enqueues into one job.
+
+    Args:
+        key: Job key (the subject)
+        seconds: Window length
+
+    Returns:
+        tuple: Key for the current window, seconds until it closes
+
+    Notes:
+        - The job starts after its window closes, so an enqueue inside
+          the window always finds it queued (deduped), never running
+          with the change already missed
+    """
+    now = time.time()
+    window = int(now // seconds)
+    return f"{key}:{window}", (window + 1) * seconds - now
+
+
+async def enqueue(
+    job_ref: Union[str, Callable],
+    *,
+    key: Optional[str] = None,
+    created_by: Optional[str] = None,
+    dedupe: bool = True,
+    delay: float = 0,
+    **args
+) -> str:
+    """
+    Queue a job.
+
+    Args:
+        job_ref: Job function or registry name
+        key: Identifies the job's subject (client id, path, date)
+        created_by: User id allowed to read the job
+        dedupe: Return the active job with the same name and key instead
+        delay: Seconds before the job may start
+        **args: Job arguments
+
+    Returns:
+        str: Job id
+
+    Raises:
+        KeyError: For unregistered jobs
+    """
+    name = getattr(job_ref, "job_name", job_ref)
+    spec = JOB_REGISTRY[name]
+
+    now = _utcnow()
+    job_doc = {
+        "name": name,
+        "queue": spec.queue,
+        "key": key,
+        "args": args,
+        "status": JobStatus.QUEUED.value,
+        "attempts": 0,
+        "max_attempts": spec.max_attempts,
+        "run_at": now + timedelta(seconds=delay),
+        "created_at": now,
+        "created_by": created_by,
+        "progress": {},
+    }
+    deduped = key is not None and dedupe
+    if deduped:
+        job_doc["active"] = True
+        active_id = await _active_job_id(name, key)
+        if active_id:
+            return active_id
+
+    try:
+        result = await jobs_collection.insert_one(job_doc)
+    except DuplicateKeyError:
+        # Enqueued concurrently with the same key (unique among active jobs)
+        active_id = await _active_job_id(name, key) if deduped else None
+        if active_id is None:
+            raise
+        return active_id
+    logger.info("Queued job %s %s (key=%s)", name, result.inserted_id, key)
+    return str(result.inserted_id)
+
+
+async def _active_job_id(name: str, key: str) -> Optional[str]:
+    active = await jobs_collection.find_one(
+        {
+            "name": name,
+            "key": key,
+            "status": {"$in": [JobStatus.QUEUED.value, JobStatus.RUNNING.value]}
+        },
+        {"_id": 1}
+    )
+    return str(active["_id"]) if active else None
+
+
+async def get_job(job_id: str) -> Optional[Dict]:
+    """
+    Load a job document.
+
+    Args:
+        job_id: Job id
+
+    Returns:
+        Dict: Job document, or None
+    """
+    try:
+        return await jobs_collection.find_one({"_id": ObjectId(job_id)})
+    except InvalidId:
+        return None
+
+
+async def latest_job(job_ref: Union[str, Callable], key: str) -> Optional[Dict]:
+    """
+    Most recent job with a name and key.
+
+    Args:
+        job_ref: Job function or registry name
+        key: Job key
+
+    Returns:
+        Dict: Job document, or None
+    """
+    name = getattr(job_ref, "job_name", job_ref)
+    return await jobs_collection.find_one({"name": name, "key": key}, sort=[("created_at", -1)])
+
+
+def job_view(job_doc: Dict) -> Dict:
+    """
+    Public fields of a job.
+
+    Args:
+        job_doc: Job document
+
+    Returns:
+        Dict: Status payload
+    """
+    return {
+        "job_id": str(job_doc["_id"]),
+        "name": job_doc["name"],
+        "queue": job_doc["queue"],
+        "status": job_doc["status"],
+        "attempts": job_doc.get("attempts", 0),
+        "max_attempts": job_doc.get("max_attempts"),
+        "progress": job_doc.get("progress") or {},
+        "result": job_doc.get("result"),
+        "error": job_doc.get("error"),
+        "created_at": job_doc.get("created_at"),
+        "run_at": job_doc.get("run_at"),
+        "started_at": job_doc.get("started_at"),
+        "finished_at": job_doc.get("finished_at"),
+    }
+
+
+def job_accepted(job_id: str) -> JSONResponse:
+    """
+    202 response for an enqueued job.
+
+    Args:
+        job_id: Job id
+
+    Returns:
+        JSONResponse: Job id and status URL
+    """
+    return JSONResponse(
+        status_code=202,
+        content={"status": "queued", "job_id": job_id, "status_url": f"/api/jobs/{job_id}"}
+    )
+
+
+class JobWorker:
+    """
+    Claims and runs jobs from a set of queues.
+
+    Attributes:
+        queues: Queue names served
+        worker_id: Lease owner id
+        running: Running tasks per queue
+    """
+
+    def __init__(self, queues: Optional[Iterable[str]] = None, worker_id: Optional[str] = None):
+        """
+        Initialize worker.
+
+        Args:
+            queues: Queue names (default all)
+            worker_id: Lease owner id (default host:pid)
+        """
+        self.queues: List[str] = list(queues or JOB_QUEUES)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.running: Dict[str, set] = {queue: set() for queue in self.queues}
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop claiming jobs; run() returns once running jobs finish."""
+        self._stopping.set()
+
+    async def claim(self, queue: str) -> Optional[Dict]:
+        """
+        Lease the next due job on a queue, if under its limit.
+
+        Args:
+            queue: Queue name
+
+        Returns:
+            Dict: Claimed job, or None
+
+        Notes:
+            - A job runs only while its worker holds one of the queue's
+              slots, so the limit holds across workers
+            - Jobs with expired leases are reclaimed
+        """
+        now = _utcnow()
+        due = {
+            "queue": queue,
+            "$or": [
+                {"status": JobStatus.QUEUED.value, "run_at": {"$lte": now}},
+                {"status": JobStatus.RUNNING.value, "lease_until": {"$lte": now}},
+            ]
+        }
+        # Idle polls stay read-only
+        if await jobs_collection.find_one(due, {"_id": 1}) is None:
+            return None
+        slot = await self._acquire_slot(queue, now)
+        if slot is None:
+            return None
+
+        job_doc = await jobs_collection.find_one_and_update(
+            due,
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "worker_id": self.worker_id,
+                    "lease_until": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    "started_at": now,
+                    "slot": slot,
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if job_doc is None:
+            # Taken by another worker meanwhile
+            await self._free_slot(slot)
+        return job_doc
+
+    async def _acquire_slot(self, queue: str, now: datetime) -> Optional[Dict]:
+        # Take the first free (new or expired) slot; a live slot fails the
+        # filter and the upsert hits its _id
+        token = ObjectId()
+        for n in range(JOB_QUEUES.get(queue, 1)):
+            slot_id = f"{JOB_SLOT_PREFIX}{queue}:{n}"
+            try:
+                await leases_collection.update_one(
+                    {"_id": slot_id, "lease_until": {"$lte": now}},
+                    {"$set": {
+                        "owner": self.worker_id,
+                        "token": token,
+                        "lease_until": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    }},
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                continue
+            return {"id": slot_id, "token": token}
+        return None
+
+    async def _free_slot(self, slot: Optional[Dict]):
+        if not slot:
+            return
+        await leases_collection.update_one(
+            {"_id": slot["id"], "token": slot["token"]},
+            {"$set": {"lease_until": _utcnow()}}
+        )
+
+    async def _heartbeat(self, job_doc: Dict, ctx: JobContext):
+        flushed = None
+        slot = job_doc.get("slot")
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+            lease_until = _utcnow() + timedelta(seconds=JOB_LEASE_SECONDS)
+            update = {"lease_until": lease_until}
+            if ctx.progress != flushed:
+                flushed = dict(ctx.progress)
+                update["progress"] = _storable(flushed)
+            try:
+                await jobs_collection.update_one(
+                    {"_id": job_doc["_id"], "worker_id": self.worker_id},
+                    {"$set": update}
+                )
+                if slot:
+                    await leases_collection.update_one(
+                        {"_id": slot["id"], "token": slot["token"]},
+                        {"$set": {"lease_until": lease_until}}
+                    )
+            except Exception as e:
+                logger.warning("Heartbeat failed for job %s: %s", job_doc["_id"], e)
+
+    async def _finish(self, job_doc: Dict, fields: Dict):
+        now = _utcnow()
+        await jobs_collection.update_one(
+            {"_id": job_doc["_id"], "worker_id": self.worker_id},
+            {
+                "$set": {**fields, "finished_at": now, "expires_at": now + JOB_RETENTION},
+                "$unset": {"lease_until": "", "active": ""}
+            }
+        )
+        await self._free_slot(job_doc.get("slot"))
+
+    async def _retry_or_fail(self, job_doc: Dict, ctx: JobContext, error: BaseException):
+        permanent = isinstance(error, PermanentJobError) or (
+            getattr(error, "status_code", 500) < 500
+        )
+        message = f"{type(error).__name__}: {error}"
+        if permanent or job_doc["attempts"] >= job_doc["max_attempts"]:
+            logger.error("Job %s %s failed: %s", job_doc["name"], job_doc["_id"], message)
+            await self._finish(job_doc, {
+                "status": JobStatus.FAILED.value,
+                "error": message,
+                "traceback": traceback.format_exc()[-4000:],
+                "progress": _storable(ctx.progress),
+            })
+            return
+
+        delay = retry_delay(job_doc["attempts"])
+        logger.warning(
+            "Job %s %s attempt %d failed, retrying in %.0fs: %s",
+            job_doc["name"], job_doc["_id"], job_doc["attempts"], delay, message
+        )
+        await jobs_collection.update_one(
+            {"_id": job_doc["_id"], "worker_id": self.worker_id},
+            {
+                "$set": {
+                    "status": JobStatus.QUEUED.value,
+                    "error": message,
+                    "run_at": _utcnow() + timedelta(seconds=delay),
+                    "progress": _storable(ctx.progress),
+                },
+                "$unset": {"lease_until": "", "worker_id": "", "slot": ""}
+            }
+        )
+        await self._free_slot(job_doc.get("slot"))
+
+    async def _release(self, job_doc: Dict):
+        # Shutdown mid-run: hand the job back without using up an attempt
+        await jobs_collection.update_one(
+            {"_id": job_doc["_id"], "worker_id": self.worker_id},
+            {
+                "$set": {"status": JobStatus.QUEUED.value, "run_at": _utcnow()},
+                "$inc": {"attempts": -1},
+                "$unset": {"lease_until": "", "worker_id": "", "slot": ""}
+            }
+        )
+        await self._free_slot(job_doc.get("slot"))
+
+    async def run_job(self, job_doc: Dict):
+        """
+        Run one claimed job to completion, retry or failure.
+
+        Args:
+            job_doc: Claimed job document
+        """
+        spec = JOB_REGISTRY.get(job_doc["name"])
+        ctx = JobContext(job_doc)
+        if spec is None:
+            await self._retry_or_fail(job_doc, ctx, PermanentJobError(f"Unknown job {job_doc['name']}"))
+            return
+        if job_doc["attempts"] > job_doc["max_attempts"]:
+            # Reclaimed after its worker died on the last attempt
+            await self._retry_or_fail(job_doc, ctx, PermanentJobError("Worker lost on final attempt"))
+            return
+
+        run_at = job_doc["run_at"].replace(tzinfo=timezone.utc)
+        JOB_WAIT.labels(spec.queue).observe(max(0.0, (_utcnow() - run_at).total_seconds()))
+        started = time.monotonic()
+        status = JobStatus.FAILED.value
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_doc, ctx))
+        try:
+            logger.info("Running job %s %s (attempt %d)", spec.name, job_doc["_id"], ctx.attempt)
+            result = await asyncio.wait_for(spec.func(ctx, **job_doc.get("args", {})), timeout=spec.timeout)
+            await self._finish(job_doc, {
+                "status": JobStatus.SUCCEEDED.value,
+                "result": _storable(result),
+                "progress": _storable(ctx.progress),
+                "error": None,
+            })
+            status = JobStatus.SUCCEEDED.value
+            logger.info("Job %s %s succeeded", spec.name, job_doc["_id"])
+        except asyncio.CancelledError:
+            status = "released"
+            await asyncio.shield(self._release(job_doc))
+            raise
+        except Exception as e:
+            await self._retry_or_fail(job_doc, ctx, e)
+        finally:
+            heartbeat.cancel()
+            JOB_DURATION.labels(spec.name, status).observe(time.monotonic() - started)
+
+    async def run(self):
+        """
+        Claim and run jobs until stop() is called.
+
+        Notes:
+            - Fills each queue up to its limit
+            - Polls when idle
+            - Drains running jobs on stop, then releases the rest
+        """
+        logger.info("Job worker %s serving queues %s", self.worker_id, self.queues)
+        while not self._stopping.is_set():
+            claimed = False
+            for queue in self.queues:
+                while len(self.running[queue]) < JOB_QUEUES.get(queue, 1) and not self._stopping.is_set():
+                    try:
+                        job_doc = await self.claim(queue)
+                    except Exception as e:
+                        logger.error("Error claiming from %s: %s", queue, e)
+                        break
+                    if job_doc is None:
+                        break
+                    claimed = True
+                    task = asyncio.create_task(self.run_job(job_doc))
+                    self.running[queue].add(task)
+                    task.add_done_callback(self.running[queue].discard)
+            if not claimed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+        tasks = [task for tasks in self.running.values() for task in tasks]
+        if tasks:
+            logger.info("Waiting up to %ss for %d running jobs", JOB_SHUTDOWN_GRACE_SECONDS, len(tasks))
+            _, pending = await asyncio.wait(tasks, timeout=JOB_SHUTDOWN_GRACE_SECONDS)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+jobs_router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@jobs_router.get("/{job_id}")
+async def get_job_status(job_id: str, auth_data: dict = Depends(get_current_user_group)):
+    """
+    Get a job's status, progress and result.
+
+    Args:
+        job_id: Job id
+        auth_data: Auth data with groups
+
+    Returns:
+        dict: Job status payload
+
+    Raises:
+        HTTPException: 404 for unknown jobs or jobs of other users
+    """
+    job_doc = await get_job(job_id)
+    if job_doc is None or (
+        "ADMIN" not in auth_data["groups"]
+        and job_doc.get("created_by") not in (None, auth_data["user_id"])
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_view(job_doc)
+
+
+__all__ = [
+    'JOB_QUEUES',
+    'JOB_REGISTRY',
+    'JobContext',
+    'JobWorker',
+    'PermanentJobError',
+    'job',
+    'enqueue',
+    'debounce',
+    'get_job',
+    'latest_job',
+    'job_view',
+    'job_accepted',
+    'jobs_router'
+]
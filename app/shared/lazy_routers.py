@@ -0,0 +1,399 @@
+"""
+Lazy Router Module
+
+This module lets the application start without importing every feature
+module. Route stubs are registered from a generated manifest and the
+real router is imported on first use or by a background warm-up.
+
+Features:
+- Feature router registry
+- Route manifest generation
+- Stale manifest detection and rebuild at server start (gunicorn
+  on_starting hook)
+- First-use loading
+- Background warm-up
+
+Data Model:
+- Feature routers
+- Route manifest (path, methods, sources)
+- Load state per feature
+
+Security:
+- Exact path/method stubs only
+- Falls back to eager imports
+- Preserves route precedence
+
+Dependencies:
+- FastAPI for routing
+- importlib for loading
+- asyncio for warm-up
+- hashlib for staleness
+- subprocess for manifest rebuilds
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+from fastapi import APIRouter, FastAPI
+from starlette.routing import Route, WebSocketRoute
+
+logger = logging.getLogger(__name__)
+
+# Repository root, used to store manifest source paths portably
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Generated by scripts/build_route_manifest.py, which the gunicorn
+# on_starting hook (app/gunicorn_config.py) runs when LAZY_ROUTERS is on
+# and the manifest is missing or stale; not committed, since it records
+# source hashes of the deployed tree
+ROUTE_MANIFEST_PATH = os.path.join(BASE_DIR, "app", "route_manifest.json")
+ROUTE_MANIFEST_SCRIPT = os.path.join(BASE_DIR, "scripts", "build_route_manifest.py")
+
+# Seconds a manifest rebuild may take before the server starts without it
+ROUTE_MANIFEST_BUILD_TIMEOUT = 300
+
+# Seconds to wait after startup before warming the remaining routers
+LAZY_ROUTER_WARMUP_DELAY = float(os.getenv("LAZY_ROUTER_WARMUP_DELAY", "2"))
+
+
+def lazy_routers_enabled() -> bool:
+    """
+    Check whether lazy router loading is switched on.
+
+    Returns:
+        bool: True when LAZY_ROUTERS is set to a truthy value
+
+    Notes:
+        - Needs app/route_manifest.json; under gunicorn it is rebuilt
+          before workers start (ensure_route_manifest), elsewhere run
+          scripts/build_route_manifest.py as a build step
+        - Without a current manifest entry a feature loads eagerly
+    """
+    return os.getenv("LAZY_ROUTERS", "false").lower() in ("1", "true", "yes")
+
+
+class FeatureRouter:
+    """
+    A feature module router and how it is mounted.
+
+    Attributes:
+        name: Unique feature name
+        module: Dotted module path
+        attr: Router attribute in the module
+        include_kwargs: Arguments for app.include_router
+    """
+
+    def __init__(self, name: str, module: str, attr: str = "router", **include_kwargs):
+        """
+        Initialize feature router.
+
+        Args:
+            name: Unique feature name
+            module: Dotted module path
+            attr: Router attribute in the module
+            include_kwargs: Arguments for app.include_router
+        """
+        self.name = name
+        self.module = module
+        self.attr = attr
+        self.include_kwargs = include_kwargs
+
+    def load(self) -> APIRouter:
+        """
+        Import the module and return its router.
+
+        Returns:
+            APIRouter: Feature router
+        """
+        return getattr(importlib.import_module(self.module), self.attr)
+
+
+def _source_hash(path: str) -> str:
+    with open(os.path.join(BASE_DIR, path), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _iter_routes(routes: list, prefix: str = ""):
+    # Newer FastAPI keeps included routers nested instead of copying routes
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            yield from _iter_routes(included.routes, prefix + route.include_context.prefix)
+        else:
+            yield prefix + route.path, route
+
+
+def build_route_manifest(features: List[FeatureRouter]) -> Dict:
+    """
+    Import every feature and record its routes.
+
+    Args:
+        features: Feature routers in mount order
+
+    Returns:
+        dict: Manifest keyed by feature name with:
+            - routes: path, methods and websocket flag
+            - sources: endpoint source files and hashes
+            - import_seconds: import time in this process
+    """
+    manifest = {}
+    for feature in features:
+        started = time.perf_counter()
+        router = feature.load()
+        elapsed = time.perf_counter() - started
+
+        routes = []
+        sources = set()
+        for path, route in _iter_routes(router.routes, feature.include_kwargs.get("prefix", "")):
+            routes.append({
+                "path": path,
+                "methods": sorted(getattr(route, "methods", None) or []),
+                "websocket": isinstance(route, WebSocketRoute)
+            })
+            source = inspect.getsourcefile(route.endpoint)
+            if source:
+                sources.add(os.path.relpath(source, BASE_DIR))
+
+        manifest[feature.name] = {
+            "module": feature.module,
+            "routes": routes,
+            "sources": {path: _source_hash(path) for path in sorted(sources)},
+            "import_seconds": round(elapsed, 4)
+        }
+    return manifest
+
+
+def load_route_manifest() -> Dict:
+    """
+    Read the route manifest.
+
+    Returns:
+        dict: Manifest, empty if missing or unreadable
+    """
+    try:
+        with open(ROUTE_MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Route manifest unavailable, loading routers eagerly: {e}")
+        return {}
+
+
+def is_manifest_entry_current(entry: Optional[Dict]) -> bool:
+    """
+    Check that a manifest entry matches the code on disk.
+
+    Args:
+        entry: Manifest entry for one feature
+
+    Returns:
+        bool: True if every recorded source file is unchanged
+    """
+    if not entry or not entry.get("routes"):
+        return False
+    try:
+        return all(_source_hash(path) == digest for path, digest in entry["sources"].items())
+    except OSError:
+        return False
+
+
+def ensure_route_manifest(features: List[FeatureRouter]) -> bool:
+    """
+    Rebuild the route manifest if any feature's entry is missing or stale.
+
+    Args:
+        features: Feature routers in mount order
+
+    Returns:
+        bool: True if the manifest is current afterwards
+
+    Notes:
+        - Builds in a child process, so the caller (the gunicorn master)
+          imports no feature modules and opens no clients before forking
+        - A failed build is logged; workers then load routers eagerly
+    """
+    manifest = load_route_manifest()
+    if all(is_manifest_entry_current(manifest.get(feature.name)) for feature in features):
+        return True
+
+    logger.info("Route manifest missing or stale, rebuilding")
+    try:
+        subprocess.run(
+            [sys.executable, ROUTE_MANIFEST_SCRIPT],
+            cwd=BASE_DIR, check=True, timeout=ROUTE_MANIFEST_BUILD_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.error(f"Route manifest build failed, routers will load eagerly: {e}")
+        return False
+    return True
+
+
+class _LazyEndpoint:
+    """ASGI endpoint behind a route stub: load the feature, then re-dispatch."""
+
+    def __init__(self, manager: "LazyRouterManager", feature: FeatureRouter):
+        self.manager = manager
+        self.feature = feature
+
+    async def __call__(self, scope, receive, send):
+        await self.manager.ensure_loaded(self.feature)
+        await self.manager.app.router(scope, receive, send)
+
+
+class LazyRouterManager:
+    """
+    Registers route stubs and swaps in real routers on demand.
+
+    Stubs are inserted where the eager include_router call would have
+    put the routes, and replaced in place, so route precedence (and the
+    catch-all SPA route registered last) is identical to eager mode.
+
+    Attributes:
+        app: FastAPI application
+        features: Feature routers in mount order
+        loaded: Names of loaded features
+    """
+
+    def __init__(self, app: FastAPI, features: List[FeatureRouter]):
+        """
+        Initialize manager.
+
+        Args:
+            app: FastAPI application
+            features: Feature routers in mount order
+        """
+        self.app = app
+        self.features = features
+        self.loaded = set()
+        self.load_seconds = {}
+        self._locks = {}
+
+    def install(self, manifest: Dict):
+        """
+        Register stubs for current manifest entries, eager-load the rest.
+
+        Args:
+            manifest: Route manifest
+
+        Notes:
+            - Stale entries load eagerly
+            - Called before the catch-all route
+        """
+        for feature in self.features:
+            entry = manifest.get(feature.name)
+            if not is_manifest_entry_current(entry):
+                logger.info(f"Route manifest stale for {feature.name}, loading eagerly")
+                self._include(feature, feature.load())
+                continue
+
+            endpoint = _LazyEndpoint(self, feature)
+            for route in entry["routes"]:
+                if route["websocket"]:
+                    stub = WebSocketRoute(route["path"], endpoint=endpoint)
+                else:
+                    stub = Route(route["path"], endpoint=endpoint, methods=route["methods"], include_in_schema=False)
+                stub.lazy_feature = feature.name
+                self.app.router.routes.append(stub)
+
+    async def ensure_loaded(self, feature: FeatureRouter):
+        """
+        Import a feature once and replace its stubs with real routes.
+
+        Args:
+            feature: Feature to load
+
+        Notes:
+            - Single flight per feature
+            - Import runs in a worker thread
+        """
+        if feature.name in self.loaded:
+            return
+        lock = self._locks.setdefault(feature.name, asyncio.Lock())
+        async with lock:
+            if feature.name in self.loaded:
+                return
+            started = time.perf_counter()
+            router = await asyncio.to_thread(feature.load)
+            self._include(feature, router)
+            self.load_seconds[feature.name] = time.perf_counter() - started
+            logger.info(f"Loaded feature router {feature.name} in {self.load_seconds[feature.name]:.3f}s")
+
+    async def warm_up(self, delay: float = LAZY_ROUTER_WARMUP_DELAY):
+        """
+        Load every remaining feature in the background.
+
+        Args:
+            delay: Seconds to wait so the server can bind first
+        """
+        await asyncio.sleep(delay)
+        for feature in self.features:
+            try:
+                await self.ensure_loaded(feature)
+            except Exception as e:
+                logger.error(f"Failed to warm feature router {feature.name}: {e}")
+        logger.info("All feature routers loaded")
+
+    def _include(self, feature: FeatureRouter, router: APIRouter):
+        routes = self.app.router.routes
+        before = len(routes)
+        self.app.include_router(router, **feature.include_kwargs)
+        new_routes = routes[before:]
+        del routes[before:]
+
+        stub_positions = [
+            i for i, route in enumerate(routes)
+            if getattr(route, "lazy_feature", None) == feature.name
+        ]
+        if stub_positions:
+            insert_at = stub_positions[0]
+            for i in reversed(stub_positions):
+                del routes[i]
+            routes[insert_at:insert_at] = new_routes
+        else:
+            routes.extend(new_routes)
+
+        self.loaded.add(feature.name)
+        self.app.openapi_schema = None
+
+
+def include_feature_routers(app: FastAPI, features: List[FeatureRouter]) -> Optional[LazyRouterManager]:
+    """
+    Mount feature routers eagerly, or as lazy stubs when enabled.
+
+    Args:
+        app: FastAPI application
+        features: Feature routers in mount order
+
+    Returns:
+        LazyRouterManager: Manager in lazy mode, None in eager mode
+    """
+    if not lazy_routers_enabled():
+        for feature in features:
+            app.include_router(feature.load(), **feature.include_kwargs)
+        return None
+
+    manager = LazyRouterManager(app, features)
+    manager.install(load_route_manifest())
+    app.state.lazy_routers = manager
+    return manager
+
+
+__all__ = [
+    'FeatureRouter',
+    'LazyRouterManager',
+    'ROUTE_MANIFEST_PATH',
+    'build_route_manifest',
+    'load_route_manifest',
+    'ensure_route_manifest',
+    'include_feature_routers',
+    'lazy_routers_enabled'
+]
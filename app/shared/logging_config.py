@@ -0,0 +1,255 @@
+"""
+Logging Configuration Module
+
+This module sets up non-blocking application logging: records are put
+on a queue by the calling thread and formatted and written by a
+background listener thread, so hot request paths never wait on I/O.
+
+Features:
+- QueueHandler/QueueListener pipeline
+- Formatting off the event loop
+- Per-logger rate limits
+- Size-capped messages
+- Capped payload reprs
+
+Data Model:
+- Log records on an in-memory queue
+- Token bucket per logger
+- Dropped record counts
+
+Security:
+- Warnings and errors never rate limited
+- Bounded message size
+- Bounded queue
+
+Dependencies:
+- logging.handlers for queueing
+- reprlib for capped reprs
+- threading for rate limits
+
+Author: Snapped Development Team
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import reprlib
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+# INFO/DEBUG records per second allowed per logger (prefix match);
+# these handlers log whole documents or per-file detail on every call
+LOG_RATE_LIMITS: Dict[str, float] = {
+    "app.features.uploadtracker.routes_uploadtracker": 5,
+    "app.features.posting.queue_builder": 10,
+    "app.features.posting.make_processor": 10,
+    "app.features.cdn.cdn_mongo": 20,
+    "app.shared.rate_limit": 20,
+}
+
+# Longest message written, in characters
+LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "4000"))
+
+# Records buffered before new INFO/DEBUG records are dropped
+LOG_QUEUE_SIZE = 10000
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_stream_handler: Optional[logging.Handler] = None
+
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 4
+_payload_repr.maxdict = 10
+_payload_repr.maxlist = 10
+_payload_repr.maxstring = 200
+_payload_repr.maxother = 200
+
+
+class CappedPayload:
+    """
+    Lazily rendered, size-capped repr of a payload.
+
+    Attributes:
+        payload: Object to preview
+    """
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        size = f" ({len(self.payload)} items)" if hasattr(self.payload, "__len__") else ""
+        return _payload_repr.repr(self.payload) + size
+
+    __repr__ = __str__
+
+
+def capped(payload) -> CappedPayload:
+    """
+    Wrap a payload for logging as a lazy %-style argument.
+
+    Nothing is rendered unless the record is written, and then only a
+    bounded preview (nested containers cut off after a few items), on
+    the listener thread:
+
+        logger.debug("Raw aggregation results: %s", capped(results))
+
+    Args:
+        payload: Document, list or aggregation result
+
+    Returns:
+        CappedPayload: Lazy preview
+    """
+    return CappedPayload(payload)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger for INFO and below.
+
+    Attributes:
+        limits: Logger name prefix -> records per second
+        dropped: Dropped record count per logger
+    """
+
+    def __init__(self, limits: Dict[str, float]):
+        """
+        Initialize filter.
+
+        Args:
+            limits: Logger name prefix -> records per second
+        """
+        super().__init__()
+        self.limits = limits
+        self.buckets = {}
+        self.dropped = {}
+        self._rates = {}
+        self._lock = threading.Lock()
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._rates:
+            matches = [prefix for prefix in self.limits if name == prefix or name.startswith(prefix + ".")]
+            self._rates[name] = self.limits[max(matches, key=len)] if matches else None
+        return self._rates[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        if rate is None:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self.buckets.get(record.name, (rate, now))
+            tokens = min(rate, tokens + (now - last) * rate)
+            if tokens < 1:
+                self.buckets[record.name] = (tokens, now)
+                self.dropped[record.name] = self.dropped.get(record.name, 0) + 1
+                return False
+            self.buckets[record.name] = (tokens - 1, now)
+            return True
+
+
+class _CappedFormatter(logging.Formatter):
+    """Formatter that truncates oversized messages."""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        if len(record.message) > LOG_MAX_MESSAGE_CHARS:
+            cut = len(record.message) - LOG_MAX_MESSAGE_CHARS
+            record.message = f"{record.message[:LOG_MAX_MESSAGE_CHARS]}... [{cut} chars truncated]"
+        return super().formatMessage(record)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock prepare() formats the message on the calling thread;
+    here only the traceback is rendered eagerly, so lazy %-style
+    arguments are formatted off the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Shed INFO/DEBUG under backlog; wait briefly for anything louder
+            if record.levelno > logging.INFO:
+                try:
+                    self.queue.put(record, timeout=1)
+                except queue.Full:
+                    pass
+
+
+def setup_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a background listener.
+
+    Args:
+        level: Root log level
+
+    Returns:
+        QueueListener: Running listener
+
+    Notes:
+        - Idempotent
+        - Replaces root handlers
+        - Same output format as logging.basicConfig
+    """
+    global _listener, _queue_handler, _stream_handler
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(_CappedFormatter(logging.BASIC_FORMAT))
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(LOG_RATE_LIMITS))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    _queue_handler, _stream_handler = queue_handler, stream_handler
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """
+    Flush queued records, stop the listener and log directly again.
+    """
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _listener.stop()
+    root.addHandler(_stream_handler)
+    _listener = None
+
+
+__all__ = [
+    'LOG_RATE_LIMITS',
+    'RateLimitFilter',
+    'CappedPayload',
+    'capped',
+    'setup_logging',
+    'stop_logging'
+]
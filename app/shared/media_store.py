@@ -0,0 +1,598 @@
+"""
+Media Store Module
+
+This module owns the normalized media layout: one document per file in
+UploadDB.media_files and one per session in UploadDB.sessions, next to
+the per-client documents with nested sessions[].files[] arrays in
+Uploads, Saved, Spotlights and Content_Dump. While readers migrate,
+writes go to both layouts and reads come from the nested layout of
+record; after cutover, single-file reads and updates use the small
+per-file documents.
+
+Features:
+- Per-file reads and updates on indexed, single-file documents
+- Dual writes into the nested layout (MEDIA_NESTED_WRITES)
+- Session mirroring, skipped when a session is unchanged; only rows
+  that differ are rewritten
+- Backfill job and script
+- Change stream mirroring (debounced jobs) of just the sessions a
+  nested-layout writer changed; whole clients only when the change
+  names no session
+
+Data Model:
+- media_files: client_ID, collection, session_id, file_name + file fields
+- sessions: client_ID, collection, session_id + session fields (no
+  files), file_count, digest of the nested session
+- Unique keys: (client_ID, collection, session_id[, file_name])
+
+Security:
+- Nested layout stays the source of truth until cutover
+- Mirrors replace rows wholesale, so they converge on every change
+- Files gone from the nested session are deleted from media_files
+- Dual writes are tagged (MEDIA_WRITE_TAG) and not mirrored again
+
+Dependencies:
+- Motor for database access
+- PyMongo for bulk writes
+- bson for session digests
+- app.shared.invalidation for change stream mirroring
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+import bson
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+from pymongo.results import UpdateResult
+from .database import (
+    content_dump_collection,
+    media_files_collection,
+    media_sessions_collection,
+    saved_collection,
+    spotlight_collection,
+    upload_collection
+)
+from .invalidation import InvalidationEvent, on_invalidation
+from .jobs import JobContext, debounce, enqueue, job
+
+logger = logging.getLogger(__name__)
+
+# Keep the nested layout written until every reader uses media_files
+MEDIA_NESTED_WRITES = os.getenv("MEDIA_NESTED_WRITES", "true").lower() in ("1", "true", "yes")
+
+# Nested array filters per update (sequence changes are chunked)
+MEDIA_MAX_ARRAY_FILTERS = 100
+
+# Clients per progress update in the backfill
+MEDIA_BACKFILL_BATCH = 50
+
+# Nested-layout changes of a session (or client) within this window share one mirror job
+MEDIA_MIRROR_DEBOUNCE_SECONDS = 2
+
+# Top-level field MediaStore's own nested writes set to a fresh value;
+# their change events are skipped, the write already reached both layouts
+MEDIA_WRITE_TAG = "media_store_write"
+
+
+def collection_for_session(session_id: str) -> Optional[str]:
+    """
+    Get the collection a session lives in from its ID.
+
+    Args:
+        session_id: Session ID (e.g. 'F(01-29-2025)_ch11231999')
+
+    Returns:
+        str: Collection name, or None for an unknown format
+    """
+    if session_id.startswith('CONTENTDUMP_'):
+        return "Content_Dump"
+    if session_id.startswith('F('):
+        if 'SPOTLIGHT' in session_id:
+            return "Spotlights"
+        if 'SAVED' in session_id:
+            return "Saved"
+        return "Uploads"
+    return None
+
+
+def client_id_for_session(session_id: str) -> Optional[str]:
+    """
+    Get the client a session belongs to from its ID.
+
+    Args:
+        session_id: 'F(date)_<client>[_...]' or 'CONTENTDUMP_<client>'
+
+    Returns:
+        str: Client ID, or None for an unknown format
+    """
+    parts = session_id.split('_')
+    return parts[1] if len(parts) > 1 and parts[1] else None
+
+
+def changed_session_indexes(fields: Optional[List[str]]) -> Optional[Set[int]]:
+    """
+    Get the nested sessions an update changed from its field paths.
+
+    Args:
+        fields: Changed paths of an invalidation event
+            (e.g. ["last_updated", "sessions.3"])
+
+    Returns:
+        set: Indexes into sessions[], or None if the update replaced the
+            array (or its paths are unknown)
+    """
+    if fields is None:
+        return None
+    indexes = set()
+    for path in fields:
+        parts = path.split(".")
+        if parts[0] != "sessions":
+            continue
+        if len(parts) < 2 or not parts[1].isdigit():
+            return None
+        indexes.add(int(parts[1]))
+    return indexes
+
+
+def _session_digest(session: Dict[str, Any]) -> str:
+    return hashlib.blake2b(bson.encode(session), digest_size=16).hexdigest()
+
+
+def _without_id(document: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in document.items() if k != "_id"}
+
+
+def _projected(document: Dict[str, Any], projection: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    # Top-level inclusion/exclusion projections, as the find() callers pass
+    if not projection:
+        return document
+    included = [k for k, v in projection.items() if v and k != "_id"]
+    if included:
+        return {k: document[k] for k in included if k in document}
+    return {k: v for k, v in document.items() if projection.get(k, 1)}
+
+
+class MediaStore:
+    """
+    Per-file media documents, kept in step with the nested layout.
+
+    Attributes:
+        nested: Collection name -> nested layout collection
+        files: media_files collection
+        sessions: sessions collection
+        nested_writes: Whether updates also go to the nested layout
+    """
+
+    def __init__(self, nested: Optional[Dict[str, Any]] = None, files=None, sessions=None,
+                 nested_writes: bool = MEDIA_NESTED_WRITES):
+        """
+        Initialize store.
+
+        Args:
+            nested: Collection name -> nested collection (default shared)
+            files: media_files collection (default shared)
+            sessions: sessions collection (default shared)
+            nested_writes: Also write the nested layout
+        """
+        self.nested = nested or {
+            "Uploads": upload_collection,
+            "Saved": saved_collection,
+            "Spotlights": spotlight_collection,
+            "Content_Dump": content_dump_collection,
+        }
+        self.files = files if files is not None else media_files_collection
+        self.sessions = sessions if sessions is not None else media_sessions_collection
+        self.nested_writes = nested_writes
+
+    @staticmethod
+    def session_key(collection: str, client_id: str, session_id: str) -> Dict[str, str]:
+        """
+        Build the key of a session document.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+            session_id: Session ID
+
+        Returns:
+            dict: Filter matching the session and its files
+        """
+        return {"client_ID": client_id, "collection": collection, "session_id": session_id}
+
+    async def get_file(self, collection: str, client_id: str, session_id: str, file_name: str,
+                       projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get one file.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+            session_id: Session ID
+            file_name: File name
+            projection: Fields to return (default all)
+
+        Returns:
+            dict: File document, or None if not found
+
+        Notes:
+            - Read from the nested layout while nested_writes is on
+        """
+        if self.nested_writes:
+            files = await self._nested_files(collection, client_id, session_id, file_name)
+            return _projected(files[0], projection) if files else None
+        query = {**self.session_key(collection, client_id, session_id), "file_name": file_name}
+        return await self.files.find_one(query, projection)
+
+    async def list_files(self, collection: str, client_id: str, session_id: str,
+                         projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Get every file of a session.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+            session_id: Session ID
+            projection: Fields to return (default all)
+
+        Returns:
+            list: File documents by seq_number
+
+        Notes:
+            - Read from the nested layout while nested_writes is on
+        """
+        if self.nested_writes:
+            files = await self._nested_files(collection, client_id, session_id)
+            files.sort(key=lambda f: f.get("seq_number") or 0)
+            return [_projected(f, projection) for f in files]
+        cursor = self.files.find(self.session_key(collection, client_id, session_id), projection)
+        return await cursor.sort("seq_number", 1).to_list(None)
+
+    async def update_file(self, collection: str, client_id: str, session_id: str, file_name: str,
+                          fields: Dict[str, Any]) -> UpdateResult:
+        """
+        Set fields on one file in both layouts.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+            session_id: Session ID
+            file_name: File name
+            fields: Field -> new value
+
+        Returns:
+            UpdateResult: Result from the layout of record (nested while
+                nested_writes is on)
+        """
+        query = {**self.session_key(collection, client_id, session_id), "file_name": file_name}
+        if not self.nested_writes:
+            return await self.files.update_one(query, {"$set": fields})
+
+        result = await self.nested[collection].update_one(
+            {"client_ID": client_id, "sessions.session_id": session_id, "sessions.files.file_name": file_name},
+            {"$set": {**{f"sessions.$[session].files.$[file].{k}": v for k, v in fields.items()},
+                      "last_updated": datetime.utcnow(), MEDIA_WRITE_TAG: uuid.uuid4().hex}},
+            array_filters=[{"session.session_id": session_id}, {"file.file_name": file_name}]
+        )
+        if result.matched_count:
+            mirrored = await self.files.update_one(query, {"$set": fields})
+            if not mirrored.matched_count:
+                await self.mirror_session(collection, client_id, session_id)
+        return result
+
+    async def set_sequence_numbers(self, collection: str, client_id: str, session_id: str,
+                                   seq_numbers: Dict[str, int]) -> int:
+        """
+        Set the seq_number of several files of a session.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+            session_id: Session ID
+            seq_numbers: File name -> new seq_number
+
+        Returns:
+            int: Files whose seq_number changed (in media_files)
+
+        Notes:
+            - One bulk write on media_files; nested updates carry up to
+              MEDIA_MAX_ARRAY_FILTERS files each instead of one per file
+            - Files media_files does not have yet are mirrored afterwards
+        """
+        if not seq_numbers:
+            return 0
+        key = self.session_key(collection, client_id, session_id)
+
+        if self.nested_writes:
+            items = list(seq_numbers.items())
+            for start in range(0, len(items), MEDIA_MAX_ARRAY_FILTERS):
+                chunk = items[start:start + MEDIA_MAX_ARRAY_FILTERS]
+                await self.nested[collection].update_one(
+                    {"client_ID": client_id, "sessions.session_id": session_id},
+                    {"$set": {**{f"sessions.$[session].files.$[f{i}].seq_number": seq for i, (_, seq) in enumerate(chunk)},
+                              "last_updated": datetime.utcnow(), MEDIA_WRITE_TAG: uuid.uuid4().hex}},
+                    array_filters=[{"session.session_id": session_id},
+                                   *[{f"f{i}.file_name": name} for i, (name, _) in enumerate(chunk)]]
+                )
+
+        result = await self.files.bulk_write(
+            [UpdateOne({**key, "file_name": name}, {"$set": {"seq_number": seq}}) for name, seq in seq_numbers.items()],
+            ordered=False
+        )
+        if self.nested_writes and result.matched_count < len(seq_numbers):
+            await self.mirror_session(collection, client_id, session_id)
+        return result.modified_count
+
+    async def mirror_session(self, collection: str, client_id: str, session_id: str) -> bool:
+        """
+        Copy one nested session into the normalized layout.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+            session_id: Session ID
+
+        Returns:
+            bool: True if the session exists in the nested layout
+
+        Notes:
+            - A session gone from the nested layout is deleted here too
+        """
+        doc = await self.nested[collection].find_one(
+            {"client_ID": client_id, "sessions.session_id": session_id},
+            {"_id": 0, "sessions": {"$elemMatch": {"session_id": session_id}}}
+        )
+        sessions = (doc or {}).get("sessions") or []
+        if not sessions:
+            await self._delete_sessions(collection, client_id, [session_id])
+            return False
+        await self._write_sessions(collection, client_id, sessions)
+        return True
+
+    async def mirror_client(self, collection: str, client_id: str) -> int:
+        """
+        Copy every changed session of a client into the normalized layout.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+
+        Returns:
+            int: Sessions rewritten
+
+        Notes:
+            - Sessions whose digest matches the stored one are skipped
+            - Sessions gone from the nested document are deleted
+            - Reads the whole sessions array; change events use
+              mirror_session, this is for the backfill and for changes
+              that replaced the array
+        """
+        doc = await self.nested[collection].find_one({"client_ID": client_id}, {"_id": 0, "sessions": 1})
+        nested_sessions = [s for s in (doc or {}).get("sessions") or [] if s.get("session_id")]
+        stored = {
+            s["session_id"]: s.get("digest")
+            async for s in self.sessions.find(
+                {"client_ID": client_id, "collection": collection}, {"_id": 0, "session_id": 1, "digest": 1}
+            )
+        }
+        changed = [s for s in nested_sessions if stored.get(s["session_id"]) != _session_digest(s)]
+        gone = set(stored) - {s["session_id"] for s in nested_sessions}
+        if changed:
+            await self._write_sessions(collection, client_id, changed)
+        if gone:
+            await self._delete_sessions(collection, client_id, list(gone))
+        return len(changed)
+
+    async def session_ids(self, collection: str, client_ids: List[str]) -> Dict[str, List[Optional[str]]]:
+        """
+        Get the session IDs of clients' nested documents, in array order.
+
+        Args:
+            collection: Nested collection name
+            client_ids: Client IDs
+
+        Returns:
+            dict: Client ID -> session_id per sessions[] index
+        """
+        return {
+            doc["client_ID"]: [s.get("session_id") for s in doc.get("sessions") or [] if isinstance(s, dict)]
+            async for doc in self.nested[collection].find(
+                {"client_ID": {"$in": client_ids}}, {"_id": 0, "client_ID": 1, "sessions.session_id": 1}
+            )
+        }
+
+    async def _nested_files(self, collection: str, client_id: str, session_id: str,
+                            file_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Files of one nested session (or just file_name) as media_files rows
+        files = {"$ifNull": ["$session.files", []]}
+        if file_name is not None:
+            files = {"$filter": {"input": files, "as": "f", "cond": {"$eq": ["$$f.file_name", file_name]}}}
+        docs = await self.nested[collection].aggregate([
+            {"$match": {"client_ID": client_id, "sessions.session_id": session_id}},
+            {"$limit": 1},
+            {"$project": {"_id": 0, "session": {"$arrayElemAt": [
+                {"$filter": {"input": "$sessions", "as": "s", "cond": {"$eq": ["$$s.session_id", session_id]}}}, 0
+            ]}}},
+            {"$project": {"files": files}},
+        ]).to_list(None)
+        key = self.session_key(collection, client_id, session_id)
+        return [{**_without_id(f), **key} for f in (docs[0].get("files") or [] if docs else []) if f.get("file_name")]
+
+    async def _write_sessions(self, collection: str, client_id: str, sessions: Iterable[Dict[str, Any]]):
+        sessions = list(sessions)
+        now = datetime.utcnow()
+        # Dual writes (update_file, set_sequence_numbers) already put
+        # their changes here; only rows that differ are rewritten
+        stored: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        async for row in self.files.find(
+            {"client_ID": client_id, "collection": collection, "session_id": {"$in": [s["session_id"] for s in sessions]}},
+            {"_id": 0, "mirrored_at": 0}
+        ):
+            stored.setdefault(row["session_id"], {})[row["file_name"]] = row
+        session_ops, file_ops = [], []
+        for session in sessions:
+            key = self.session_key(collection, client_id, session["session_id"])
+            files = [f for f in session.get("files") or [] if f.get("file_name")]
+            session_fields = {k: v for k, v in _without_id(session).items() if k != "files"}
+            session_ops.append(ReplaceOne(key, {
+                **session_fields, **key,
+                "file_count": len(files),
+                "digest": _session_digest(session),
+                "mirrored_at": now,
+            }, upsert=True))
+            rows = stored.get(session["session_id"], {})
+            for f in files:
+                row = {**_without_id(f), **key}
+                if rows.get(f["file_name"]) != row:
+                    file_ops.append(ReplaceOne({**key, "file_name": f["file_name"]}, {**row, "mirrored_at": now}, upsert=True))
+            gone = set(rows) - {f["file_name"] for f in files}
+            if gone:
+                file_ops.append(DeleteMany({**key, "file_name": {"$in": sorted(gone)}}))
+        if file_ops:
+            await self.files.bulk_write(file_ops, ordered=False)
+        if session_ops:
+            await self.sessions.bulk_write(session_ops, ordered=False)
+
+    async def _delete_sessions(self, collection: str, client_id: str, session_ids: List[str]):
+        query = {"client_ID": client_id, "collection": collection, "session_id": {"$in": session_ids}}
+        await self.files.delete_many(query)
+        await self.sessions.delete_many(query)
+
+
+media_store = MediaStore()
+
+
+@on_invalidation("UploadDB.*")
+async def _nested_layout_changed(events: List[InvalidationEvent], local: bool):
+    # Mirrored by jobs the leader enqueues, off the dispatch path;
+    # deletes carry no client_ID and are left to the next backfill
+    if local:
+        return
+    whole_clients, changed = set(), {}
+    for event in events:
+        if event.is_reset or not event.keys.get("client_ID"):
+            continue
+        collection = event.source.split(".", 1)[1]
+        if collection not in media_store.nested or MEDIA_WRITE_TAG in (event.fields or []):
+            continue
+        target = (collection, event.keys["client_ID"])
+        indexes = changed_session_indexes(event.fields)
+        if indexes is None:
+            whole_clients.add(target)
+        elif indexes:
+            changed.setdefault(target, set()).update(indexes)
+
+    # Indexes shift only when sessions are pulled or the array replaced,
+    # and those changes mirror the whole client
+    sessions = set()
+    by_collection = {}
+    for collection, client_id in changed:
+        if (collection, client_id) not in whole_clients:
+            by_collection.setdefault(collection, []).append(client_id)
+    for collection, client_ids in by_collection.items():
+        for client_id, session_ids in (await media_store.session_ids(collection, client_ids)).items():
+            for index in changed[(collection, client_id)]:
+                if index < len(session_ids) and session_ids[index]:
+                    sessions.add((collection, client_id, session_ids[index]))
+
+    enqueues = []
+    for collection, client_id in whole_clients:
+        key, delay = debounce(f"{collection}:{client_id}", MEDIA_MIRROR_DEBOUNCE_SECONDS)
+        enqueues.append(enqueue(mirror_client_job, key=key, delay=delay, collection=collection, client_id=client_id))
+    for collection, client_id, session_id in sessions:
+        key, delay = debounce(f"{collection}:{client_id}:{session_id}", MEDIA_MIRROR_DEBOUNCE_SECONDS)
+        enqueues.append(enqueue(mirror_session_job, key=key, delay=delay,
+                                collection=collection, client_id=client_id, session_id=session_id))
+    await asyncio.gather(*enqueues)
+
+
+@job("media_files.mirror_session", queue="default", max_attempts=3, timeout=120)
+async def mirror_session_job(ctx: JobContext, collection: str, client_id: str, session_id: str):
+    """
+    Mirror one session after a nested-layout write changed it.
+
+    Args:
+        ctx: Job context
+        collection: Nested collection name
+        client_id: Client ID
+        session_id: Session ID
+
+    Returns:
+        dict: Whether the session still exists in the nested layout
+    """
+    return {"exists": await media_store.mirror_session(collection, client_id, session_id)}
+
+
+@job("media_files.mirror_client", queue="default", max_attempts=3, timeout=600)
+async def mirror_client_job(ctx: JobContext, collection: str, client_id: str):
+    """
+    Mirror a client's changed sessions after a write replaced its
+    sessions array (or the whole document).
+
+    Args:
+        ctx: Job context
+        collection: Nested collection name
+        client_id: Client ID
+
+    Returns:
+        dict: Sessions rewritten
+    """
+    return {"sessions": await media_store.mirror_client(collection, client_id)}
+
+
+async def backfill_media_files(collections: Optional[List[str]] = None, ctx: Optional[JobContext] = None) -> Dict[str, int]:
+    """
+    Copy the nested layout into media_files and sessions.
+
+    Args:
+        collections: Nested collection names (default all)
+        ctx: Job context for progress, if run as a job
+
+    Returns:
+        dict: Clients scanned and sessions rewritten per collection
+
+    Notes:
+        - Idempotent; unchanged sessions are skipped, so re-runs are cheap
+    """
+    counts = {}
+    for collection in collections or list(media_store.nested):
+        client_ids = await media_store.nested[collection].distinct("client_ID")
+        rewritten = 0
+        for done, client_id in enumerate(client_ids, 1):
+            rewritten += await media_store.mirror_client(collection, client_id)
+            if ctx and (done % MEDIA_BACKFILL_BATCH == 0 or done == len(client_ids)):
+                ctx.update_progress(collection=collection, current=done, total=len(client_ids))
+        counts[collection] = rewritten
+        counts[f"{collection}_clients"] = len(client_ids)
+        logger.info(f"Backfilled {collection}: {rewritten} sessions from {len(client_ids)} clients")
+    return counts
+
+
+@job("media_files.backfill", queue="default", max_attempts=1, timeout=6 * 3600)
+async def backfill_media_files_job(ctx: JobContext, collections: Optional[List[str]] = None):
+    """
+    Backfill the normalized media layout.
+
+    Args:
+        ctx: Job context
+        collections: Nested collection names (default all)
+
+    Returns:
+        dict: Clients scanned and sessions rewritten per collection
+    """
+    return await backfill_media_files(collections, ctx)
+
+
+__all__ = [
+    'MediaStore',
+    'media_store',
+    'collection_for_session',
+    'client_id_for_session',
+    'backfill_media_files',
+    'MEDIA_NESTED_WRITES'
+]
@@ -0,0 +1,238 @@
+"""
+Metrics Module
+
+This module provides the Prometheus registry endpoint, per-route HTTP
+latency and payload metrics, and the request context that lets lower
+layers (database, HTTP clients) attribute their work to the FastAPI
+route being served.
+
+Features:
+- Current route context
+- Route template labels
+- Request latency histograms
+- Response size histograms
+- In-flight gauge
+- /metrics endpoint
+- Multiprocess support
+
+Data Model:
+- ASGI scope per request (contextvar)
+- Labels: method, route, status
+- Prometheus collectors
+
+Security:
+- Optional scrape token
+- Scrapes not recorded
+- Bounded label cardinality
+- Templates, never raw paths
+
+Dependencies:
+- prometheus_client for metrics
+- contextvars for attribution
+- FastAPI for routing
+
+Author: Snapped Development Team
+"""
+
+import os
+import secrets
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, REGISTRY, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+# Optional shared secret for scrapes (X-Metrics-Token header)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Label used outside of any request (startup, background tasks)
+NO_ROUTE = "-"
+
+# Label used for requests that matched no route
+UNMATCHED_ROUTE = "unmatched"
+
+# ASGI scope of the request being served
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+# Paths not worth a time series
+HTTP_METRICS_EXCLUDED_PATHS = {"/metrics"}
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the last body chunk is sent",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "http_response_bytes",
+    "HTTP response body size",
+    ["method", "route", "status"],
+    buckets=(256, 1024, 16384, 131072, 1048576, 4194304, 16777216, 67108864)
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+
+
+def route_template(scope: dict) -> str:
+    """
+    Get the route template for an ASGI scope.
+
+    Args:
+        scope: ASGI scope after routing
+
+    Returns:
+        str: Template such as /api/cdn-mongo/folders/{client_id}
+
+    Notes:
+        - Cached on the scope
+        - Newer FastAPI stores the un-prefixed route, so the
+          prefix is recovered from the matched path
+    """
+    cached = scope.get("metrics.route")
+    if cached:
+        return cached
+
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_regex"):
+        # Not routed yet, so don't cache
+        return UNMATCHED_ROUTE
+
+    path = scope.get("path", "")
+    template = route.path
+    segments = path.split("/")
+    for i in range(1, len(segments)):
+        if route.path_regex.match("/" + "/".join(segments[i:])):
+            template = "/".join(segments[:i]) + route.path
+            break
+    scope["metrics.route"] = template
+    return template
+
+
+def current_route() -> str:
+    """
+    Get the route template of the request being served.
+
+    Returns:
+        str: Route template, or "-" outside of a request
+    """
+    scope = current_scope.get()
+    return route_template(scope) if scope is not None else NO_ROUTE
+
+
+class RequestContextMiddleware:
+    """
+    Publishes the ASGI scope of each HTTP request in a contextvar.
+
+    Plain ASGI middleware so the contextvar is set in the same context
+    the endpoint and its database calls run in.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+class HTTPMetricsMiddleware:
+    """
+    Records latency, response size and in-flight requests.
+
+    Latency runs until the last body chunk is sent, so large JSON
+    payloads include serialization and transfer. In-flight requests are
+    counted per method: the route is only known once routing ran.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in HTTP_METRICS_EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status = [500]
+        body_bytes = [0]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes[0] += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            labels = (method, route_template(scope), str(status[0]))
+            HTTP_REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - started)
+            HTTP_RESPONSE_BYTES.labels(*labels).observe(body_bytes[0])
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Expose Prometheus metrics.
+
+    Args:
+        request: Scrape request
+
+    Returns:
+        Response: Prometheus text format
+
+    Raises:
+        HTTPException: If METRICS_TOKEN is set and does not match
+    """
+    if METRICS_TOKEN and not secrets.compare_digest(
+        request.headers.get("X-Metrics-Token", ""), METRICS_TOKEN
+    ):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Aggregate across worker processes
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+__all__ = [
+    'current_scope',
+    'current_route',
+    'route_template',
+    'RequestContextMiddleware',
+    'HTTPMetricsMiddleware',
+    'metrics_router'
+]
@@ -31,4 +31,35 @@ class QueueStatus(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
-    SKIPPED = "skipped" 
\ No newline at end of file
+    SKIPPED = "skipped"
+
+
+class JobStatus(str, Enum):
+    """
+    Background job status.
+    
+    Attributes:
+        QUEUED: Waiting for a worker (or for its retry time)
+        RUNNING: Leased by a worker
+        SUCCEEDED: Finished with a result
+        FAILED: Out of attempts or failed permanently
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class WebhookStatus(str, Enum):
+    """
+    Webhook outbox delivery status.
+    
+    Attributes:
+        PENDING: Waiting to be sent (or for its retry time)
+        SENDING: Leased by a sender
+        DELIVERED: Accepted by the target
+        DEAD: Rejected, out of attempts or too old
+    """
+    PENDING = "pending"
+    SENDING = "sending"
+    DELIVERED = "delivered"
+    DEAD = "dead"
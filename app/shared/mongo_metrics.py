@@ -0,0 +1,167 @@
+"""
+MongoDB Command Metrics Module
+
+This module records the latency, returned documents and reply size of
+every MongoDB command, attributed to the FastAPI route that issued it,
+and logs slow commands.
+
+Features:
+- Per-command histograms
+- Route attribution
+- Reply size tracking
+- Slow query log
+- Failure counts
+
+Data Model:
+- Labels: command, namespace, route
+- Duration, documents, reply bytes
+- In-flight command shapes
+
+Security:
+- Filter keys only, never values
+- Bounded label cardinality
+- Listener errors contained
+
+Dependencies:
+- PyMongo monitoring API
+- bson for reply sizes
+- prometheus_client for metrics
+- logging for slow queries
+
+Author: Snapped Development Team
+"""
+
+import os
+import logging
+import bson
+from pymongo import monitoring
+from prometheus_client import Counter, Histogram
+from .metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+# Commands slower than this are logged (milliseconds)
+MONGO_SLOW_QUERY_MS = float(os.getenv("MONGO_SLOW_QUERY_MS", "500"))
+
+# Re-encoding replies to measure them costs CPU on large results
+MONGO_METRICS_REPLY_SIZE = os.getenv("MONGO_METRICS_REPLY_SIZE", "true").lower() in ("1", "true", "yes")
+
+# Commands that are not worth a time series
+IGNORED_COMMANDS = {"hello", "isMaster", "ismaster", "ping", "saslStart", "saslContinue", "endSessions", "killCursors"}
+
+LABELS = ["command", "namespace", "route"]
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency",
+    LABELS,
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+MONGO_COMMAND_DOCUMENTS = Histogram(
+    "mongo_command_documents",
+    "Documents returned per MongoDB command",
+    LABELS,
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000)
+)
+MONGO_COMMAND_REPLY_BYTES = Histogram(
+    "mongo_command_reply_bytes",
+    "MongoDB command reply size",
+    LABELS,
+    buckets=(1024, 16384, 131072, 1048576, 4194304, 16777216, 67108864)
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongo_command_failures_total",
+    "Failed MongoDB commands",
+    LABELS
+)
+
+
+def _namespace(command_name: str, command: dict, database: str) -> str:
+    target = command.get("collection") if command_name == "getMore" else command.get(command_name)
+    return f"{database}.{target}" if isinstance(target, str) else database
+
+
+def _command_shape(command_name: str, command: dict) -> str:
+    # Keys and stage names only - values may hold client data
+    if command_name == "aggregate":
+        return str([next(iter(stage), "?") for stage in command.get("pipeline", [])])
+    if command_name in ("update", "delete"):
+        key = "updates" if command_name == "update" else "deletes"
+        return str([sorted(op.get("q", {})) for op in command.get(key, [])[:3]])
+    query = command.get("filter", command.get("query"))
+    return str(sorted(query)) if isinstance(query, dict) else ""
+
+
+def _returned_documents(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    return reply.get("n", 0) if isinstance(reply.get("n"), int) else 0
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    Records MongoDB command metrics.
+
+    Called by PyMongo on the thread running the command; Motor copies
+    the caller's context into that thread, so the current route is
+    available in both callbacks.
+
+    Attributes:
+        in_flight: (connection, request_id) -> (namespace, route, command)
+    """
+
+    def __init__(self):
+        """Initialize listener."""
+        self.in_flight = {}
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        try:
+            namespace = _namespace(event.command_name, event.command, event.database_name)
+            self.in_flight[(event.connection_id, event.request_id)] = (namespace, current_route(), event.command)
+        except Exception as e:
+            logger.debug(f"Mongo metrics start failed: {e}")
+
+    def succeeded(self, event):
+        started = self.in_flight.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        try:
+            namespace, route, command = started
+            labels = (event.command_name, namespace, route)
+            seconds = event.duration_micros / 1e6
+            documents = _returned_documents(event.reply)
+            reply_bytes = len(bson.encode(event.reply)) if MONGO_METRICS_REPLY_SIZE else 0
+
+            MONGO_COMMAND_DURATION.labels(*labels).observe(seconds)
+            MONGO_COMMAND_DOCUMENTS.labels(*labels).observe(documents)
+            if MONGO_METRICS_REPLY_SIZE:
+                MONGO_COMMAND_REPLY_BYTES.labels(*labels).observe(reply_bytes)
+
+            if seconds * 1000 >= MONGO_SLOW_QUERY_MS:
+                logger.warning(
+                    f"Slow Mongo command {event.command_name} on {namespace} "
+                    f"from {route}: {seconds * 1000:.0f}ms, {documents} docs, "
+                    f"{reply_bytes} bytes, shape {_command_shape(event.command_name, command)}"
+                )
+        except Exception as e:
+            logger.debug(f"Mongo metrics record failed: {e}")
+
+    def failed(self, event):
+        started = self.in_flight.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        namespace, route, _ = started
+        MONGO_COMMAND_FAILURES.labels(event.command_name, namespace, route).inc()
+
+
+mongo_command_listener = CommandMetricsListener()
+
+
+__all__ = [
+    'CommandMetricsListener',
+    'mongo_command_listener',
+    'MONGO_SLOW_QUERY_MS'
+]
@@ -0,0 +1,50 @@
+"""
+Pool Worker Module
+
+This module holds the code that runs inside executor pool workers
+around every task. CPU pool workers are spawned processes that import
+it to unpickle each task, so it imports nothing beyond the standard
+library.
+
+Features:
+- Task timing on the worker (start/end wall-clock times)
+
+Data Model:
+- Result: (started, finished, task result)
+
+Security:
+- No imports of app modules with side effects
+
+Dependencies:
+- time for wall-clock timestamps
+
+Author: Snapped Development Team
+"""
+
+import time
+from typing import Any, Callable, Tuple
+
+
+def timed_call(func: Callable, args: tuple, kwargs: dict) -> Tuple[float, float, Any]:
+    """
+    Run a task and time it on the worker.
+
+    Args:
+        func: Task function
+        args: Positional arguments
+        kwargs: Keyword arguments
+
+    Returns:
+        tuple: Start time, end time, func's return value
+
+    Notes:
+        - Wall-clock times are comparable across processes
+    """
+    started = time.time()
+    result = func(*args, **kwargs)
+    return started, time.time(), result
+
+
+__all__ = [
+    'timed_call'
+]
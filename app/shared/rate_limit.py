@@ -6,11 +6,13 @@ It implements a distributed rate limiter that can be used across multiple server
 
 Features:
 - Distributed rate limiting with Redis
+- Sliding window counting
 - Per-IP and per-endpoint limiting
 - Configurable rate limits
 - Automatic cleanup
 - Burst handling
 - Penalty system for repeated violations
+- In-process token bucket fallback
 
 Security:
 - DoS protection
@@ -18,6 +20,11 @@ Security:
 - Redis security
 - Error handling
 - Logging
+
+Performance:
+- Non-blocking redis.asyncio client
+- One atomic Lua script per request
+- No Redis calls while Redis is down
 """
 
 from fastapi import Request, HTTPException
@@ -26,33 +33,25 @@ from starlette.responses import JSONResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-import redis
-import os
+from collections import OrderedDict
+import itertools
+import math
+import time
+import uuid
 from datetime import datetime, timedelta
 import logging
-from .auth.cognito import get_user_from_token
+from .auth.cognito import validate_token, extract_user_info
+from .auth.context import AuthContext, set_auth_context
+from .redis_client import REDIS_URL, REDIS_UNAVAILABLE_ERRORS, get_redis, mark_redis_down
 import json
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Get Redis URL from environment or use default
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
-
-# Initialize Redis client
-try:
-    redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-    redis_client.ping()  # Test connection
-    logger.info("Successfully connected to Redis")
-except redis.ConnectionError as e:
-    logger.error(f"Failed to connect to Redis: {e}")
-    # Fallback to in-memory storage if Redis is not available
-    redis_client = None
-
 # Initialize rate limiter
 limiter = Limiter(
     key_func=get_remote_address,
-    storage_uri=REDIS_URL if redis_client else "memory://"
+    storage_uri=REDIS_URL
 )
 
 # Default rate limits (can be adjusted based on needs)
@@ -75,6 +74,78 @@ PENALTY_CONFIG = {
     "config_version": "2"          # Increment this when changing penalty config
 }
 
+# Length of the sliding rate limit window
+RATE_LIMIT_WINDOW_SECONDS = 60
+
+# Max identifier/path pairs kept by the in-process fallback
+LOCAL_BUCKET_MAX_KEYS = 10000
+
+# Sliding window check plus penalty, violation, cooldown and config version
+# bookkeeping, executed atomically inside Redis in a single round trip.
+#
+# KEYS: window, violations, penalty, cooldown, post_limit, config_version
+# ARGV: now_ms, window_ms, limit, member, config_version, violation_threshold,
+#       violation_window, penalty_duration, penalty_rate_limit, cooldown,
+#       requests_after_limit
+#
+# Returns {status, count, limit, retry_after, penalty_until}
+#   status: 0 = allowed, 1 = rate limited, 2 = under penalty
+SLIDING_WINDOW_SCRIPT = """
+local now_ms = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local threshold = tonumber(ARGV[6])
+
+if redis.call('GET', KEYS[6]) ~= ARGV[5] then
+    redis.call('DEL', KEYS[2], KEYS[3], KEYS[4], KEYS[5])
+    redis.call('SET', KEYS[6], ARGV[5])
+end
+
+local penalty_until = tonumber(redis.call('GET', KEYS[3]) or '0')
+if penalty_until * 1000 > now_ms then
+    return {2, 0, limit, 0, tostring(penalty_until)}
+end
+
+local violations = tonumber(redis.call('GET', KEYS[2]) or '0')
+if violations >= threshold then
+    limit = tonumber(ARGV[9])
+end
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - window_ms)
+local count = redis.call('ZCARD', KEYS[1])
+
+if count >= limit then
+    if redis.call('EXISTS', KEYS[4]) == 0 then
+        local post_limit = redis.call('INCR', KEYS[5])
+        redis.call('EXPIRE', KEYS[5], 60)
+        if post_limit >= tonumber(ARGV[11]) then
+            redis.call('SET', KEYS[4], '1', 'EX', tonumber(ARGV[10]))
+            redis.call('DEL', KEYS[5])
+            violations = redis.call('INCR', KEYS[2])
+            redis.call('EXPIRE', KEYS[2], tonumber(ARGV[7]))
+            if violations >= threshold then
+                local duration = tonumber(ARGV[8])
+                redis.call('SET', KEYS[3], tostring(now_ms / 1000 + duration), 'EX', duration)
+            end
+        end
+    end
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    local retry_ms = window_ms
+    if oldest[2] then
+        retry_ms = tonumber(oldest[2]) + window_ms - now_ms
+    end
+    return {1, count, limit, math.max(1, math.ceil(retry_ms / 1000)), tostring(violations)}
+end
+
+redis.call('ZADD', KEYS[1], now_ms, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window_ms)
+return {0, count + 1, limit, 0, tostring(violations)}
+"""
+
+# Unique per-process prefix so window members never collide across workers
+_member_prefix = uuid.uuid4().hex[:12]
+_member_seq = itertools.count()
+
 def extract_token_from_header(auth_header: str) -> str:
     """
     Extract JWT token from Authorization header.
@@ -121,154 +192,196 @@ def get_rate_limit(request: Request, user_info: dict = None) -> str:
     
     return RATE_LIMITS["default"]
 
+class LocalTokenBucket:
+    """
+    In-process token bucket used while Redis is unavailable.
+
+    Limits are per worker rather than cluster wide, which keeps some
+    DoS protection in place without blocking on a dead Redis.
+
+    Attributes:
+        max_keys: Max tracked identifier/path pairs
+        buckets: LRU of (tokens, last_refill) per key
+    """
+
+    def __init__(self, max_keys: int = LOCAL_BUCKET_MAX_KEYS):
+        """
+        Initialize the bucket store.
+
+        Args:
+            max_keys: Max tracked identifier/path pairs
+        """
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+
+    def consume(self, key: str, limit: int, period: int = RATE_LIMIT_WINDOW_SECONDS) -> dict:
+        """
+        Take one token for a key.
+
+        Args:
+            key: Identifier and path
+            limit: Requests allowed per period
+            period: Refill period in seconds
+
+        Returns:
+            dict: Decision with allowed flag and retry_after
+
+        Notes:
+            - Refills continuously
+            - Evicts least recently used
+        """
+        now = time.monotonic()
+        tokens, last_refill = self.buckets.pop(key, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - last_refill) * limit / period)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+
+        return {
+            "allowed": allowed,
+            "count": int(limit - tokens),
+            "limit": limit,
+            "retry_after": 0 if allowed else max(1, math.ceil((1 - tokens) * period / limit)),
+            "penalty_until": None
+        }
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
     Middleware class for rate limiting requests.
     Inherits from FastAPI's BaseHTTPMiddleware.
     """
-    
-    async def clear_penalties(self, identifier: str = None):
+
+    def __init__(self, app):
         """
-        Clear all penalty-related data for an identifier or all users.
-        
+        Initialize middleware state.
+
         Args:
-            identifier: Optional user ID or IP to clear. If None, clears all.
+            app: ASGI application
         """
-        if not redis_client:
-            return
-            
-        if identifier:
-            # Clear specific user's data
-            keys_to_clear = [
-                f"violations:{identifier}",
-                f"penalty:{identifier}",
-                f"cooldown:{identifier}",
-                f"post_limit:{identifier}",
-                f"rate_limit:*:{identifier}:*",
-                f"config_version:{identifier}"
-            ]
-            for key in keys_to_clear:
-                redis_client.delete(key)
-        else:
-            # Clear all penalty data
-            for key in redis_client.scan_iter("violations:*"):
-                redis_client.delete(key)
-            for key in redis_client.scan_iter("penalty:*"):
-                redis_client.delete(key)
-            for key in redis_client.scan_iter("cooldown:*"):
-                redis_client.delete(key)
-            for key in redis_client.scan_iter("post_limit:*"):
-                redis_client.delete(key)
-            for key in redis_client.scan_iter("config_version:*"):
-                redis_client.delete(key)
-    
-    async def check_config_version(self, identifier: str):
+        super().__init__(app)
+        self.local_buckets = LocalTokenBucket()
+        self._script = None
+        self._script_client = None
+
+    def get_script(self, redis_client):
         """
-        Check if stored penalties are from current config version.
-        Clears old data if config has changed.
-        
+        Get the sliding window script bound to a Redis client.
+
         Args:
-            identifier: User ID or IP address
+            redis_client: Async Redis client
+
+        Returns:
+            AsyncScript: Registered script (EVALSHA with reload)
         """
-        if not redis_client:
-            return
-            
-        version_key = f"config_version:{identifier}"
-        stored_version = redis_client.get(version_key)
-        
-        if stored_version != PENALTY_CONFIG["config_version"]:
-            # Config changed, clear old data
-            await self.clear_penalties(identifier)
-            redis_client.set(version_key, PENALTY_CONFIG["config_version"])
-    
-    async def check_penalty_status(self, identifier: str) -> dict:
+        if self._script is None or self._script_client is not redis_client:
+            self._script = redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+            self._script_client = redis_client
+        return self._script
+
+    async def clear_penalties(self, identifier: str = None):
         """
-        Check if user/IP is under penalty and get violation count.
+        Clear all penalty-related data for an identifier or all users.
         
         Args:
-            identifier: User ID or IP address
-            
-        Returns:
-            dict: Penalty status including violation count and penalty expiry
+            identifier: Optional user ID or IP to clear. If None, clears all.
         """
+        redis_client = get_redis()
         if not redis_client:
-            return {"violations": 0, "penalty_until": None}
-        
-        # Check config version first
-        await self.check_config_version(identifier)
-            
-        violations_key = f"violations:{identifier}"
-        penalty_key = f"penalty:{identifier}"
-        
-        # Get current violations count
-        violations = redis_client.get(violations_key)
-        violations = int(violations) if violations else 0
-        
-        # Check if under penalty
-        penalty_until = redis_client.get(penalty_key)
-        if penalty_until:
-            penalty_until = float(penalty_until)
-            if datetime.now().timestamp() > penalty_until:
-                # Penalty expired, clear it
-                redis_client.delete(penalty_key)
-                # Also clear violations since penalty expired
-                redis_client.delete(violations_key)
-                violations = 0
-                penalty_until = None
-        
-        return {
-            "violations": violations,
-            "penalty_until": penalty_until
-        }
-    
-    async def record_violation(self, identifier: str):
+            return
+
+        try:
+            if identifier:
+                # Clear specific user's data
+                keys_to_clear = [
+                    f"violations:{identifier}",
+                    f"penalty:{identifier}",
+                    f"cooldown:{identifier}",
+                    f"post_limit:{identifier}",
+                    f"config_version:{identifier}"
+                ]
+                keys_to_clear.extend([
+                    key async for key in redis_client.scan_iter(f"rate_window:{identifier}:*")
+                ])
+                await redis_client.delete(*keys_to_clear)
+            else:
+                # Clear all penalty data
+                for pattern in ["violations:*", "penalty:*", "cooldown:*", "post_limit:*", "config_version:*"]:
+                    async for key in redis_client.scan_iter(pattern):
+                        await redis_client.delete(key)
+        except REDIS_UNAVAILABLE_ERRORS as e:
+            mark_redis_down(e)
+
+    async def check_rate_limit(self, identifier: str, path: str, limit: int) -> dict:
         """
-        Record a rate limit violation and apply penalty if threshold reached.
-        Only counts as violation if user continues making requests after being rate limited.
-        
+        Count a request against the sliding window for identifier and path.
+
         Args:
             identifier: User ID or IP address
+            path: Request path
+            limit: Requests allowed per window
+
+        Returns:
+            dict: Decision including:
+                - allowed: Whether to serve the request
+                - count: Requests in the current window
+                - limit: Effective limit (reduced after violations)
+                - retry_after: Seconds until a slot frees up
+                - penalty_until: Penalty expiry timestamp or None
+
+        Notes:
+            - Single atomic Redis round trip
+            - Handles penalty system
+            - Falls back to local bucket
         """
-        if not redis_client:
-            return
-            
-        violations_key = f"violations:{identifier}"
-        penalty_key = f"penalty:{identifier}"
-        cooldown_key = f"cooldown:{identifier}"
-        post_limit_key = f"post_limit:{identifier}"
-        
-        # Check if in cooldown period
-        if redis_client.get(cooldown_key):
-            return
-            
-        # Get/increment post-limit request counter
-        post_limit_count = redis_client.incr(post_limit_key)
-        redis_client.expire(post_limit_key, 60)  # Reset counter after 1 minute
-        
-        # Only count as violation if enough post-limit requests
-        if post_limit_count >= PENALTY_CONFIG["requests_after_limit"]:
-            # Start cooldown period
-            redis_client.setex(cooldown_key, PENALTY_CONFIG["cooldown"], "1")
-            
-            # Reset post-limit counter
-            redis_client.delete(post_limit_key)
-            
-            # Increment violations count
-            violations = redis_client.incr(violations_key)
-            redis_client.expire(violations_key, PENALTY_CONFIG["violation_window"])
-            
-            logger.warning(f"Rate limit violation {violations}/{PENALTY_CONFIG['violation_threshold']} for {identifier}")
-            
-            # Check if we should apply penalty
-            if violations >= PENALTY_CONFIG["violation_threshold"]:
-                penalty_until = datetime.now().timestamp() + PENALTY_CONFIG["penalty_duration"]
-                redis_client.setex(
-                    penalty_key,
-                    PENALTY_CONFIG["penalty_duration"],
-                    str(penalty_until)
+        redis_client = get_redis()
+        if redis_client:
+            keys = [
+                f"rate_window:{identifier}:{path}",
+                f"violations:{identifier}",
+                f"penalty:{identifier}",
+                f"cooldown:{identifier}",
+                f"post_limit:{identifier}",
+                f"config_version:{identifier}"
+            ]
+            args = [
+                int(time.time() * 1000),
+                RATE_LIMIT_WINDOW_SECONDS * 1000,
+                limit,
+                f"{_member_prefix}:{next(_member_seq)}",
+                PENALTY_CONFIG["config_version"],
+                PENALTY_CONFIG["violation_threshold"],
+                PENALTY_CONFIG["violation_window"],
+                PENALTY_CONFIG["penalty_duration"],
+                PENALTY_CONFIG["penalty_rate_limit"],
+                PENALTY_CONFIG["cooldown"],
+                PENALTY_CONFIG["requests_after_limit"]
+            ]
+            try:
+                status, count, effective_limit, retry_after, extra = await self.get_script(redis_client)(
+                    keys=keys, args=args
                 )
-                logger.warning(f"Applied penalty to {identifier} until {datetime.fromtimestamp(penalty_until)}")
-    
+                if status == 1:
+                    logger.warning(
+                        f"Rate limit exceeded for {identifier} on {path} "
+                        f"(violations: {extra}/{PENALTY_CONFIG['violation_threshold']})"
+                    )
+                return {
+                    "allowed": status == 0,
+                    "count": count,
+                    "limit": effective_limit,
+                    "retry_after": retry_after,
+                    "penalty_until": float(extra) if status == 2 else None
+                }
+            except REDIS_UNAVAILABLE_ERRORS as e:
+                mark_redis_down(e)
+
+        return self.local_buckets.consume(f"{identifier}:{path}", limit)
+
     async def dispatch(self, request: Request, call_next):
         """
         Process each request through rate limiting.
@@ -294,7 +407,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 try:
                     token = extract_token_from_header(auth_header)
                     if token:
-                        user_info = get_user_from_token(token)
+                        claims = await validate_token(token)
+                        # Share verified claims with route auth dependencies
+                        set_auth_context(request, AuthContext(token, claims, verified=True))
+                        user_info = extract_user_info(claims)
                 except Exception as e:
                     logger.warning(f"Failed to validate token: {str(e)}")
                     # Continue with unauthenticated rate limit
@@ -302,10 +418,15 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             # Use user_id or IP as identifier
             identifier = user_info['user_id'] if user_info else client_ip
             
-            # Check penalty status
-            penalty_status = await self.check_penalty_status(identifier)
-            if penalty_status["penalty_until"]:
-                penalty_expiry = datetime.fromtimestamp(penalty_status["penalty_until"])
+            # Get appropriate rate limit
+            rate_limit = get_rate_limit(request, user_info)
+            limit = int(rate_limit.split("/")[0])
+            
+            # Check penalty status and rate limit in one step
+            decision = await self.check_rate_limit(identifier, request.url.path, limit)
+            
+            if decision["penalty_until"]:
+                penalty_expiry = datetime.fromtimestamp(decision["penalty_until"])
                 logger.warning(f"Request from penalized {identifier}, penalty until: {penalty_expiry}")
                 return JSONResponse(
                     status_code=429,
@@ -315,52 +436,22 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     }
                 )
             
-            # Get appropriate rate limit
-            rate_limit = get_rate_limit(request, user_info)
-            limit = int(rate_limit.split("/")[0])
-            
-            # If under penalty but penalty expired, use reduced limit
-            if penalty_status["violations"] >= PENALTY_CONFIG["violation_threshold"]:
-                limit = PENALTY_CONFIG["penalty_rate_limit"]
-            
-            # Check rate limit
-            if redis_client:
-                key = f"rate_limit:{identifier}:{request.url.path}"
-                
-                # Get current count atomically and increment
-                current = redis_client.get(key)
-                
-                if current is None:
-                    # First request in window
-                    redis_client.setex(key, 60, 1)  # 1 minute expiry
-                    current_count = 1
-                else:
-                    current_count = int(current)
-                    if current_count >= limit:
-                        # Only record violation for requests after hitting limit
-                        await self.record_violation(identifier)
-                        
-                        logger.warning(
-                            f"Rate limit exceeded for {identifier} "
-                            f"on {request.url.path}"
-                        )
-                        return JSONResponse(
-                            status_code=429,
-                            content={
-                                "detail": "Too many requests. Please try again later.",
-                                "retry_after": 60
-                            }
-                        )
-                    
-                    # Increment counter
-                    current_count = redis_client.incr(key)
-                
-                # Log request details with proper count
-                logger.info(
-                    f"Request from {identifier}: "
-                    f"{current_count}/{limit} requests"
+            if not decision["allowed"]:
+                return JSONResponse(
+                    status_code=429,
+                    content={
+                        "detail": "Too many requests. Please try again later.",
+                        "retry_after": decision["retry_after"]
+                    },
+                    headers={"Retry-After": str(decision["retry_after"])}
                 )
             
+            # Log request details with proper count
+            logger.info(
+                f"Request from {identifier}: "
+                f"{decision['count']}/{decision['limit']} requests"
+            )
+            
             # Process the request
             response = await call_next(request)
             return response
@@ -379,4 +470,4 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return JSONResponse(
                 status_code=500,
                 content={"detail": "Internal server error"}
-            ) 
\ No newline at end of file
+            ) 
@@ -0,0 +1,137 @@
+"""
+Redis Client Module
+
+This module owns the shared asyncio Redis connection used by middleware
+and services that need a fast, distributed key-value store.
+
+Features:
+- Lazy async client
+- Shared connection pool
+- Outage backoff
+- Graceful shutdown
+
+Data Model:
+- Rate limit windows
+- Penalty counters
+- Cached lookups
+
+Security:
+- Socket timeouts
+- Error isolation
+- Env based config
+
+Dependencies:
+- redis.asyncio for async access
+- os for config
+- time for backoff
+- logging for tracking
+
+Author: Snapped Development Team
+"""
+
+import os
+import time
+import logging
+from typing import Optional
+from redis import asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Get Redis URL from environment or use default
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+# Connection settings - short timeouts so an outage never stalls requests
+REDIS_SETTINGS = {
+    "decode_responses": True,
+    "socket_timeout": float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.25")),
+    "socket_connect_timeout": float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.25")),
+    "health_check_interval": 30,
+    "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", "200")),
+}
+
+# Seconds to skip Redis after a connection failure before trying again
+REDIS_RETRY_INTERVAL = float(os.getenv("REDIS_RETRY_INTERVAL", "5"))
+
+# Errors that mean Redis is unreachable rather than a bad command
+REDIS_UNAVAILABLE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+
+_client: Optional[aioredis.Redis] = None
+_down_until = 0.0
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """
+    Get the shared async Redis client.
+
+    Returns:
+        Redis: Async client, or None while Redis is marked down
+
+    Notes:
+        - Created on first use
+        - No network I/O here
+        - Skips Redis during backoff
+    """
+    global _client
+    if time.monotonic() < _down_until:
+        return None
+    if _client is None:
+        _client = aioredis.from_url(REDIS_URL, **REDIS_SETTINGS)
+    return _client
+
+
+def mark_redis_down(error: Exception):
+    """
+    Record a Redis outage so callers use their fallbacks.
+
+    Args:
+        error: Connection error raised by the client
+
+    Notes:
+        - Logs once per outage
+        - Starts retry backoff
+    """
+    global _down_until
+    if time.monotonic() >= _down_until:
+        logger.error(f"Redis unavailable, using fallbacks for {REDIS_RETRY_INTERVAL}s: {error}")
+    _down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+
+
+def create_pubsub_client() -> aioredis.Redis:
+    """
+    Create a dedicated client for long-lived subscriptions.
+
+    Returns:
+        Redis: New async client without a read timeout
+
+    Notes:
+        - Caller owns and closes it
+        - A subscription blocks reads, so it can't share the short
+          socket timeout of the request path client
+    """
+    settings = {**REDIS_SETTINGS, "socket_timeout": None, "max_connections": 2}
+    return aioredis.from_url(REDIS_URL, **settings)
+
+
+async def close_redis():
+    """
+    Close the shared Redis connection pool.
+
+    Notes:
+        - Safe if never opened
+        - Called on shutdown
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+__all__ = [
+    'REDIS_URL',
+    'REDIS_UNAVAILABLE_ERRORS',
+    'get_redis',
+    'mark_redis_down',
+    'create_pubsub_client',
+    'close_redis'
+]
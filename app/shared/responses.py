@@ -0,0 +1,99 @@
+"""
+Responses Module
+
+This module provides the orjson-based JSON response used as the app's
+default response class and returned directly by endpoints with large
+payloads.
+
+Features:
+- orjson serialization
+- Native datetime/date/UUID
+- ObjectId and Decimal support
+- Non-string dict keys
+
+Data Model:
+- Any JSON-like content
+- MongoDB documents as-is
+
+Security:
+- Unknown types rejected
+- NaN/Infinity as null
+
+Dependencies:
+- orjson for serialization
+- bson for ObjectId
+- FastAPI for responses
+
+Author: Snapped Development Team
+"""
+
+from decimal import Decimal
+from typing import Any
+import orjson
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from fastapi.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def orjson_default(obj: Any) -> Any:
+    """
+    Serialize types orjson does not handle natively.
+
+    Args:
+        obj: Value to serialize
+
+    Returns:
+        JSON-compatible value
+
+    Raises:
+        TypeError: For unsupported types
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return float(obj.to_decimal())
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "dict"):
+        return obj.dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes.
+
+    Args:
+        content: JSON-like content
+
+    Returns:
+        bytes: UTF-8 JSON
+    """
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Return it directly from an endpoint to skip FastAPI's
+    jsonable_encoder pass as well:
+
+        return FastJSONResponse({"folders": folders})
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+__all__ = [
+    'FastJSONResponse',
+    'orjson_default',
+    'dumps'
+]
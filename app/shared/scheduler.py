@@ -0,0 +1,448 @@
+"""
+Scheduler Module
+
+This module runs cron-scheduled jobs on a cluster of job workers. One
+worker at a time holds a MongoDB leader lease and turns due fire times
+into jobs on the durable job queue (jobs.py); any worker then runs them.
+
+Features:
+- Cron schedules on registered jobs
+- Leader election by lease
+- Exactly-once enqueue per fire time
+- Catch-up after downtime (coalesce, misfire grace)
+- Run history and timing metrics
+- Schedule status endpoint
+
+Data Model:
+- Leader lease in JobQueue.Leases
+- One state document per schedule in JobQueue.Schedules, with the
+  definition the leader registered (cron, queue...) and enabled flag
+- Runs are job documents (name, fire_time arg)
+
+Security:
+- Status visible to admins only
+- Leases expire when a leader dies
+- Bounded catch-up per tick
+
+Dependencies:
+- APScheduler for cron expressions
+- Motor for leases and state
+- jobs for execution
+- prometheus_client for metrics
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from apscheduler.triggers.cron import CronTrigger
+from fastapi import APIRouter, Depends, HTTPException
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from .auth import get_current_user_group
+from .database import jobs_collection, leases_collection, schedules_collection
+from .jobs import JOB_REGISTRY, enqueue, job_view
+
+logger = logging.getLogger(__name__)
+
+# Timezone cron expressions are evaluated in
+SCHEDULER_TIMEZONE = os.getenv("SCHEDULER_TIMEZONE", "UTC")
+
+# Leader lease; a new leader takes over this long after the old one stops
+SCHEDULER_LEASE_SECONDS = 30
+
+# How often the leader checks for due fire times
+SCHEDULER_TICK_SECONDS = 10
+
+# Most fire times enqueued for one schedule per tick (coalesce=False)
+SCHEDULER_MAX_CATCH_UP = 24
+
+# Runs returned per schedule by the status endpoint
+SCHEDULER_HISTORY_LIMIT = 10
+
+LEADER_LEASE_ID = "scheduler"
+
+SCHEDULE_LAG = Histogram(
+    "scheduled_job_enqueue_lag_seconds",
+    "Delay between a fire time and its job being enqueued",
+    ["schedule"],
+    buckets=(1, 5, 15, 30, 60, 300, 900, 3600, 21600, 86400)
+)
+SCHEDULE_RUNS = Counter(
+    "scheduled_job_fire_times_total",
+    "Fire times handled by the scheduler",
+    ["schedule", "outcome"]
+)
+SCHEDULER_LEADER = Gauge(
+    "scheduler_is_leader",
+    "1 while this process holds the scheduler lease",
+    multiprocess_mode="livesum"
+)
+
+
+@dataclass
+class Schedule:
+    """
+    A cron schedule for a registered job.
+
+    Attributes:
+        name: Job registry name (also the schedule id)
+        cron: Crontab expression (min hour day month weekday)
+        coalesce: Run missed fire times once (latest) rather than each
+        misfire_grace: Seconds after which a missed fire time is skipped
+            (None: never skipped)
+    """
+
+    name: str
+    cron: str
+    coalesce: bool = True
+    misfire_grace: Optional[int] = None
+
+    @property
+    def trigger(self) -> CronTrigger:
+        return CronTrigger.from_crontab(self.cron, timezone=SCHEDULER_TIMEZONE)
+
+
+SCHEDULES: Dict[str, Schedule] = {}
+
+
+def scheduled(cron: str, coalesce: bool = True, misfire_grace: Optional[int] = None):
+    """
+    Run a registered job on a cron schedule.
+
+    Apply above @job. The job is called with fire_time, the (UTC)
+    time it was due. SCHEDULE_<NAME> (name upper-cased, dots as
+    underscores) overrides the cron expression; "off" disables it.
+
+    Args:
+        cron: Crontab expression
+        coalesce: Collapse missed fire times into one run
+        misfire_grace: Seconds after which missed fire times are skipped
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        name = func.job_name
+        expression = os.getenv("SCHEDULE_" + name.upper().replace(".", "_"), cron)
+        if expression.strip().lower() == "off":
+            SCHEDULES.pop(name, None)
+            return func
+        schedule = Schedule(name, expression, coalesce, misfire_grace)
+        schedule.trigger  # Validate the expression at import
+        SCHEDULES[name] = schedule
+        return func
+    return decorator
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # Motor returns naive UTC datetimes
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _definition(schedule: Schedule) -> Dict:
+    spec = JOB_REGISTRY.get(schedule.name)
+    return {
+        "cron": schedule.cron,
+        "timezone": SCHEDULER_TIMEZONE,
+        "coalesce": schedule.coalesce,
+        "misfire_grace": schedule.misfire_grace,
+        "queue": spec.queue if spec else None,
+        "enabled": True,
+    }
+
+
+def due_fire_times(schedule: Schedule, next_run_at: datetime, now: datetime) -> List[datetime]:
+    """
+    Fire times of a schedule from next_run_at up to now.
+
+    Args:
+        schedule: Schedule
+        next_run_at: First fire time not yet handled
+        now: Current time
+
+    Returns:
+        List[datetime]: Due fire times (UTC), oldest first
+    """
+    trigger = schedule.trigger
+    fire_times = []
+    fire_time = next_run_at
+    while fire_time is not None and fire_time <= now:
+        fire_times.append(fire_time.astimezone(timezone.utc))
+        fire_time = trigger.get_next_fire_time(fire_time, fire_time)
+    return fire_times
+
+
+def select_fire_times(schedule: Schedule, fire_times: List[datetime], now: datetime) -> List[datetime]:
+    """
+    Apply catch-up rules to due fire times.
+
+    Args:
+        schedule: Schedule
+        fire_times: Due fire times, oldest first
+        now: Current time
+
+    Returns:
+        List[datetime]: Fire times to run
+
+    Notes:
+        - Fire times older than misfire_grace are dropped
+        - coalesce keeps only the latest
+        - Otherwise at most SCHEDULER_MAX_CATCH_UP, newest kept
+    """
+    if schedule.misfire_grace is not None:
+        fire_times = [t for t in fire_times if (now - t).total_seconds() <= schedule.misfire_grace]
+    if schedule.coalesce:
+        return fire_times[-1:]
+    return fire_times[-SCHEDULER_MAX_CATCH_UP:]
+
+
+class Scheduler:
+    """
+    Leader-elected scheduler loop.
+
+    Attributes:
+        owner: Lease owner id
+        is_leader: Whether the lease was held at the last tick
+    """
+
+    def __init__(self, owner: Optional[str] = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            owner: Lease owner id (default host:pid)
+        """
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop the loop and give up the lease."""
+        self._stopping.set()
+
+    async def acquire_lease(self) -> bool:
+        """
+        Take or renew the leader lease.
+
+        Returns:
+            bool: Whether this process is leader
+        """
+        now = _utcnow()
+        try:
+            lease = await leases_collection.find_one_and_update(
+                {
+                    "_id": LEADER_LEASE_ID,
+                    "$or": [{"owner": self.owner}, {"lease_until": {"$lte": now}}]
+                },
+                {
+                    "$set": {
+                        "owner": self.owner,
+                        "lease_until": now + timedelta(seconds=SCHEDULER_LEASE_SECONDS),
+                        "renewed_at": now,
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Held by another live owner
+            lease = None
+
+        leader = lease is not None and lease.get("owner") == self.owner
+        if leader != self.is_leader:
+            logger.info("Scheduler %s %s leadership", self.owner, "acquired" if leader else "lost")
+        self.is_leader = leader
+        SCHEDULER_LEADER.set(1 if leader else 0)
+        return leader
+
+    async def release_lease(self):
+        """Give up the lease so another worker takes over at once."""
+        await leases_collection.update_one(
+            {"_id": LEADER_LEASE_ID, "owner": self.owner},
+            {"$set": {"lease_until": _utcnow()}}
+        )
+        self.is_leader = False
+        SCHEDULER_LEADER.set(0)
+
+    async def _state(self, schedule: Schedule, now: datetime) -> Dict:
+        # The stored definition is what the status endpoint lists, since
+        # web processes don't import every job module
+        definition = _definition(schedule)
+        state = await schedules_collection.find_one({"_id": schedule.name})
+        if state is None or state.get("cron") != schedule.cron:
+            # New or re-timed schedules start at their next fire time (no catch-up)
+            first_run = schedule.trigger.get_next_fire_time(None, now)
+            state = await schedules_collection.find_one_and_update(
+                {"_id": schedule.name},
+                {"$set": {**definition, "next_run_at": first_run, "updated_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        elif any(state.get(field) != value for field, value in definition.items()):
+            state = await schedules_collection.find_one_and_update(
+                {"_id": schedule.name},
+                {"$set": {**definition, "updated_at": now}},
+                return_document=ReturnDocument.AFTER
+            )
+        return state
+
+    async def fire(self, schedule: Schedule, now: Optional[datetime] = None) -> List[str]:
+        """
+        Enqueue a schedule's due fire times.
+
+        Args:
+            schedule: Schedule
+            now: Current time
+
+        Returns:
+            List[str]: Enqueued job ids
+
+        Notes:
+            - next_run_at is advanced with a compare-and-set before
+              enqueueing, so each fire time is enqueued at most once
+              even if two leaders overlap
+        """
+        now = now or _utcnow()
+        state = await self._state(schedule, now)
+        next_run_at = _aware(state.get("next_run_at"))
+        if next_run_at is None or next_run_at > now:
+            return []
+
+        fire_times = due_fire_times(schedule, next_run_at, now)
+        selected = select_fire_times(schedule, fire_times, now)
+        following = schedule.trigger.get_next_fire_time(fire_times[-1], fire_times[-1])
+
+        claimed = await schedules_collection.find_one_and_update(
+            {"_id": schedule.name, "next_run_at": state["next_run_at"]},
+            {"$set": {"next_run_at": following, "last_fire_time": fire_times[-1], "updated_at": now}}
+        )
+        if claimed is None:
+            return []
+
+        skipped = len(fire_times) - len(selected)
+        if skipped:
+            logger.warning("Schedule %s skipped %d missed fire times", schedule.name, skipped)
+            SCHEDULE_RUNS.labels(schedule.name, "skipped").inc(skipped)
+
+        job_ids = []
+        for fire_time in selected:
+            job_id = await enqueue(schedule.name, key=fire_time.isoformat(), fire_time=fire_time)
+            job_ids.append(job_id)
+            SCHEDULE_LAG.labels(schedule.name).observe((now - fire_time).total_seconds())
+            SCHEDULE_RUNS.labels(schedule.name, "enqueued").inc()
+            logger.info("Schedule %s fired for %s (job %s)", schedule.name, fire_time.isoformat(), job_id)
+        return job_ids
+
+    async def tick(self):
+        """Renew the lease and, as leader, fire every due schedule."""
+        if not await self.acquire_lease():
+            return
+        for schedule in list(SCHEDULES.values()):
+            try:
+                await self.fire(schedule)
+            except Exception as e:
+                logger.error("Error firing schedule %s: %s", schedule.name, e)
+        # Schedules removed or switched off in this deployment
+        await schedules_collection.update_many(
+            {"_id": {"$nin": list(SCHEDULES)}, "enabled": True},
+            {"$set": {"enabled": False, "updated_at": _utcnow()}}
+        )
+
+    async def run(self):
+        """
+        Tick until stop() is called, then release the lease.
+        """
+        logger.info("Scheduler %s started with %d schedules", self.owner, len(SCHEDULES))
+        try:
+            while not self._stopping.is_set():
+                try:
+                    await self.tick()
+                except Exception as e:
+                    logger.error("Scheduler tick failed: %s", e)
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=SCHEDULER_TICK_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self.is_leader:
+                await self.release_lease()
+
+
+schedules_router = APIRouter(prefix="/api/schedules", tags=["jobs"])
+
+
+@schedules_router.get("")
+async def get_schedules(auth_data: dict = Depends(get_current_user_group)):
+    """
+    List schedules with their next fire time, leader and recent runs.
+
+    Args:
+        auth_data: Auth data with groups
+
+    Returns:
+        dict: Leader lease and schedule states
+
+    Raises:
+        HTTPException: 403 for non-admins
+    """
+    if "ADMIN" not in auth_data["groups"]:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    lease = await leases_collection.find_one({"_id": LEADER_LEASE_ID}) or {}
+    # Definitions registered by the leader; local ones fill in until it ticks
+    states = {doc["_id"]: doc async for doc in schedules_collection.find({"enabled": True})}
+    for name, schedule in SCHEDULES.items():
+        states.setdefault(name, _definition(schedule))
+
+    schedules = []
+    for name, state in sorted(states.items()):
+        runs = await jobs_collection.find({"name": name}).sort("created_at", -1).to_list(SCHEDULER_HISTORY_LIMIT)
+        schedules.append({
+            "name": name,
+            "cron": state.get("cron"),
+            "timezone": state.get("timezone"),
+            "coalesce": state.get("coalesce"),
+            "misfire_grace": state.get("misfire_grace"),
+            "queue": state.get("queue"),
+            "next_run_at": state.get("next_run_at"),
+            "last_fire_time": state.get("last_fire_time"),
+            "runs": [_run_view(run) for run in runs],
+        })
+
+    return {
+        "leader": lease.get("owner"),
+        "lease_until": lease.get("lease_until"),
+        "schedules": schedules,
+    }
+
+
+def _run_view(job_doc: Dict) -> Dict:
+    view = job_view(job_doc)
+    view["fire_time"] = job_doc.get("args", {}).get("fire_time")
+    started, finished = job_doc.get("started_at"), job_doc.get("finished_at")
+    view["duration_seconds"] = (finished - started).total_seconds() if started and finished else None
+    return view
+
+
+__all__ = [
+    'SCHEDULES',
+    'Schedule',
+    'Scheduler',
+    'scheduled',
+    'due_fire_times',
+    'select_fire_times',
+    'schedules_router'
+]
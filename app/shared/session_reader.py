@@ -0,0 +1,161 @@
+"""
+Session Reader Module
+
+This module reads single sessions out of the per-client upload documents
+(sessions[].files[]) without shipping the rest of the document: the
+session is picked with $filter on the server and, optionally, its files
+are cut down to a field mask.
+
+Features:
+- One session per read, matched by any session fields
+- Named file masks (thumbnails, captions) or explicit field lists
+- Session listing without files
+- Client scope conditions (partner access) pass straight through
+
+Data Model:
+- Read result: client_ID, last_updated, session
+- Session match: field -> value, or field -> {"$in": [values]}
+- Masks: name -> file fields
+
+Security:
+- Callers pass the client_ID condition; nothing widens it
+- Only projected fields leave the server
+
+Dependencies:
+- Motor for aggregation
+- logging for tracking
+
+Author: Snapped Development Team
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+# Session-level fields (everything but files)
+SESSION_FIELDS = (
+    "session_id", "folder_id", "folder_path", "scan_date", "upload_date", "content_type",
+    "total_files_count", "total_files_size", "total_files_size_human", "total_images", "total_videos",
+    "all_video_length", "editor_note", "total_session_views", "avrg_session_view_time",
+    "approved", "queued"
+)
+
+# File masks for lighter views
+FILE_MASKS = {
+    "thumbnails": ("file_name", "file_type", "CDN_link", "thumbnail", "is_thumbnail", "seq_number"),
+    "captions": ("file_name", "caption", "seq_number"),
+}
+
+FileFields = Union[str, Sequence[str], None]
+
+
+def file_fields_for(mask: FileFields) -> Optional[Sequence[str]]:
+    """
+    Resolve a file mask.
+
+    Args:
+        mask: FILE_MASKS name, explicit field list, or None for every field
+
+    Returns:
+        tuple: File fields, or None for every field
+
+    Raises:
+        ValueError: Unknown mask name
+    """
+    if mask is None or not isinstance(mask, str):
+        return mask
+    if mask not in FILE_MASKS:
+        raise ValueError(f"Unknown file mask {mask!r}; expected one of {sorted(FILE_MASKS)}")
+    return FILE_MASKS[mask]
+
+
+def _session_cond(match: Dict[str, Any]) -> Dict[str, Any]:
+    conds = [
+        {"$in": [f"$$s.{field}", value["$in"]]} if isinstance(value, dict) else {"$eq": [f"$$s.{field}", value]}
+        for field, value in match.items()
+    ]
+    return conds[0] if len(conds) == 1 else {"$and": conds}
+
+
+async def read_session(collection, client_id: Union[str, Dict[str, Any]], match: Dict[str, Any],
+                       files: FileFields = None,
+                       session_fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Read one session of a client.
+
+    Args:
+        collection: Upload collection (Uploads, Saved, Spotlights, Content_Dump)
+        client_id: Client ID, or a client_ID query condition
+        match: Session fields to match, e.g. {"session_id": ...} or
+            {"folder_id": {"$in": [...]}}
+        files: File mask (FILE_MASKS name or field list), None for
+            whole files
+        session_fields: Session fields to keep (default: the whole
+            session, or SESSION_FIELDS when files are masked)
+
+    Returns:
+        dict: client_ID, last_updated and session, or None if not found
+
+    Notes:
+        - The first matching session wins
+        - Masked files keep stored order and omit missing fields
+    """
+    file_fields = file_fields_for(files)
+    pipeline = [
+        {"$match": {"client_ID": client_id, "sessions": {"$elemMatch": match}}},
+        {"$limit": 1},
+        {"$project": {
+            "_id": 0, "client_ID": 1, "last_updated": 1,
+            "session": {"$arrayElemAt": [
+                {"$filter": {"input": "$sessions", "as": "s", "cond": _session_cond(match)}}, 0
+            ]}
+        }},
+    ]
+    if file_fields is not None or session_fields is not None:
+        files_expr = "$session.files" if file_fields is None else {"$map": {
+            "input": {"$ifNull": ["$session.files", []]},
+            "as": "f",
+            "in": {field: f"$$f.{field}" for field in file_fields}
+        }}
+        pipeline.append({"$project": {"client_ID": 1, "last_updated": 1, "session": {
+            **{field: f"$session.{field}" for field in session_fields or SESSION_FIELDS},
+            "files": files_expr
+        }}})
+
+    docs = await collection.aggregate(pipeline).to_list(None)
+    if not docs or not docs[0].get("session"):
+        return None
+    return docs[0]
+
+
+async def list_sessions(collection, client_id: Union[str, Dict[str, Any]],
+                        session_fields: Sequence[str] = SESSION_FIELDS) -> Optional[List[Dict[str, Any]]]:
+    """
+    List a client's sessions without their files.
+
+    Args:
+        collection: Upload collection
+        client_id: Client ID, or a client_ID query condition
+        session_fields: Session fields to return
+
+    Returns:
+        list: Sessions in stored order, or None if the client has no
+            document
+    """
+    doc = await collection.find_one(
+        {"client_ID": client_id},
+        {"_id": 0, **{f"sessions.{field}": 1 for field in session_fields}}
+    )
+    if doc is None:
+        return None
+    return doc.get("sessions") or []
+
+
+__all__ = [
+    'FILE_MASKS',
+    'SESSION_FIELDS',
+    'file_fields_for',
+    'read_session',
+    'list_sessions'
+]
@@ -0,0 +1,369 @@
+"""
+Session Routes Module
+
+This module maps session IDs to the upload collection (and client) that
+holds them, so per-session calls (thumbnails, captions, moves, sequence
+numbers) find their collection without probing. Routes live in
+UploadDB.session_routes and are served from the read-through cache, so
+a warm lookup costs no database round trip.
+
+Features:
+- Cached session ID -> (collection, client_ID) lookups
+- Routes recorded when sessions are created
+- Change stream sync for other writers (scanner, uploads), run as
+  debounced jobs
+- Routes of removed client documents pruned
+- Probe fallback for sessions not routed yet (then recorded)
+- Backfill job
+
+Data Model:
+- session_routes: session_id, collection, client_ID, created_at
+- Unique key: (session_id, collection); an ID can exist in several
+  collections (create_new_session uses F(date)_<client> for every
+  content type)
+- Cache value: {"collection", "client_ID"} of the preferred route;
+  unknown sessions are not cached
+
+Security:
+- Nested documents stay the source of truth; routes only pick the
+  collection to read
+- Ambiguous IDs resolve Content_Dump first, then the collection the ID
+  format points to, then any other
+- Unknown sessions fall back to the ID format (collection_for_session)
+
+Dependencies:
+- Motor for database access
+- app.shared.cache for the read-through cache
+- app.shared.invalidation for change stream sync
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+from pymongo.errors import BulkWriteError
+from .cache import ReadThroughCache
+from .database import (
+    content_dump_collection,
+    saved_collection,
+    session_routes_collection,
+    spotlight_collection,
+    upload_collection
+)
+from .invalidation import InvalidationEvent, invalidation_bus, on_invalidation
+from .jobs import JobContext, debounce, enqueue, job
+from .media_store import collection_for_session
+
+logger = logging.getLogger(__name__)
+
+# Routes only change when sessions are created or removed; workers drop
+# a client's routes when its documents change
+SESSION_ROUTES_L1_TTL = 300
+SESSION_ROUTES_REDIS_TTL = 3600
+SESSION_ROUTES_MAX_ENTRIES = 20000
+
+# Clients per progress update in the backfill
+SESSION_ROUTES_BACKFILL_BATCH = 50
+
+# Changes of a client's documents within this window share one sync job
+SESSION_ROUTES_SYNC_DEBOUNCE_SECONDS = 2
+
+# Source of the events sync jobs publish after changing routes
+SESSION_ROUTES_SOURCE = "UploadDB.session_routes"
+
+# Preferred collection for IDs held by several collections
+ROUTE_PRECEDENCE = ("Content_Dump",)
+
+
+def _preferred(session_id: str, routes: List[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+    if not routes:
+        return None
+    order = [*ROUTE_PRECEDENCE, collection_for_session(session_id)]
+    route = min(routes, key=lambda r: order.index(r["collection"]) if r["collection"] in order else len(order))
+    return {"collection": route["collection"], "client_ID": route["client_ID"]}
+
+
+class SessionRouter:
+    """
+    Session ID -> collection routing table.
+
+    Attributes:
+        routes: session_routes collection
+        nested: Collection name -> nested layout collection
+        cache: Read-through cache of preferred routes
+    """
+
+    def __init__(self, routes=None, nested: Optional[Dict[str, Any]] = None, cache: Optional[ReadThroughCache] = None):
+        """
+        Initialize router.
+
+        Args:
+            routes: session_routes collection (default shared)
+            nested: Collection name -> nested collection (default shared)
+            cache: Route cache (default a "session_routes" namespace)
+        """
+        self.routes = routes if routes is not None else session_routes_collection
+        self.nested = nested or {
+            "Uploads": upload_collection,
+            "Saved": saved_collection,
+            "Spotlights": spotlight_collection,
+            "Content_Dump": content_dump_collection,
+        }
+        self.cache = cache or ReadThroughCache(
+            "session_routes", SESSION_ROUTES_L1_TTL, SESSION_ROUTES_REDIS_TTL, SESSION_ROUTES_MAX_ENTRIES
+        )
+
+    async def resolve(self, session_id: str) -> Optional[Dict[str, str]]:
+        """
+        Get the route of a session.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            dict: collection and client_ID, or None if no collection
+                holds the session
+
+        Notes:
+            - Served from the cache once loaded
+            - Sessions not routed yet are probed for and recorded
+            - Unknown sessions are not cached; they may be created by
+              another worker at any time
+        """
+        route = await self.cache.get_or_load(session_id, lambda: self._load(session_id))
+        if route is None:
+            await self.cache.invalidate(session_id, local=True)
+        return route
+
+    async def collection_name(self, session_id: str) -> Optional[str]:
+        """
+        Get the collection a session lives in.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            str: Collection name; the ID format's collection for unknown
+                sessions, None if the format is unknown too
+        """
+        route = await self.resolve(session_id)
+        return route["collection"] if route else collection_for_session(session_id)
+
+    async def record(self, collection: str, client_id: str, session_id: str):
+        """
+        Route a new session.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+            session_id: Session ID
+        """
+        await self._insert([{"session_id": session_id, "collection": collection, "client_ID": client_id}])
+        await self.cache.invalidate(session_id)
+
+    async def sync_client(self, collection: str, client_id: str) -> int:
+        """
+        Bring a client's routes in one collection in line with its document.
+
+        Args:
+            collection: Nested collection name
+            client_id: Client ID
+
+        Returns:
+            int: Routes added or removed
+        """
+        doc = await self.nested[collection].find_one({"client_ID": client_id}, {"_id": 0, "sessions.session_id": 1})
+        session_ids = {s["session_id"] for s in (doc or {}).get("sessions") or [] if s.get("session_id")}
+        stored = set(await self.routes.distinct("session_id", {"client_ID": client_id, "collection": collection}))
+        added, gone = session_ids - stored, stored - session_ids
+        if added:
+            await self._insert([
+                {"session_id": session_id, "collection": collection, "client_ID": client_id}
+                for session_id in sorted(added)
+            ])
+        if gone:
+            await self.routes.delete_many(
+                {"client_ID": client_id, "collection": collection, "session_id": {"$in": list(gone)}}
+            )
+        if added or gone:
+            await self.cache.invalidate(*(added | gone))
+        return len(added) + len(gone)
+
+    async def prune(self, collection: str) -> int:
+        """
+        Drop the routes of clients whose document in a collection is gone.
+
+        Args:
+            collection: Nested collection name
+
+        Returns:
+            int: Routes removed
+        """
+        live = set(await self.nested[collection].distinct("client_ID"))
+        stale = [c for c in await self.routes.distinct("client_ID", {"collection": collection}) if c not in live]
+        if not stale:
+            return 0
+        query = {"collection": collection, "client_ID": {"$in": stale}}
+        session_ids = await self.routes.distinct("session_id", query)
+        result = await self.routes.delete_many(query)
+        await self.cache.invalidate(*session_ids)
+        return result.deleted_count
+
+    async def forget_clients(self, client_ids: Set[str]):
+        """
+        Drop this worker's cached routes of some clients.
+
+        Args:
+            client_ids: Client IDs whose documents changed
+        """
+        session_ids = [
+            session_id for session_id, (_, route) in list(self.cache.l1.items())
+            if route and route["client_ID"] in client_ids
+        ]
+        await self.cache.invalidate(*session_ids, local=True)
+
+    async def _load(self, session_id: str) -> Optional[Dict[str, str]]:
+        routes = await self.routes.find(
+            {"session_id": session_id}, {"_id": 0, "collection": 1, "client_ID": 1}
+        ).to_list(None)
+        if not routes:
+            routes = await self._probe(session_id)
+        return _preferred(session_id, routes)
+
+    async def _probe(self, session_id: str) -> List[Dict[str, Any]]:
+        # Created before the backfill, or by a writer the change stream
+        # has not reached yet
+        names = list(self.nested)
+        docs = await asyncio.gather(*[
+            self.nested[name].find_one({"sessions.session_id": session_id}, {"_id": 0, "client_ID": 1})
+            for name in names
+        ])
+        routes = [
+            {"session_id": session_id, "collection": name, "client_ID": doc["client_ID"]}
+            for name, doc in zip(names, docs) if doc and doc.get("client_ID")
+        ]
+        if routes:
+            await self._insert(routes)
+        return routes
+
+    async def _insert(self, routes: Iterable[Dict[str, Any]]):
+        now = datetime.utcnow()
+        try:
+            await self.routes.insert_many([{**route, "created_at": now} for route in routes], ordered=False)
+        except BulkWriteError as e:
+            # Routed concurrently (unique key); anything else is an error
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+
+
+session_router = SessionRouter()
+
+
+@on_invalidation("UploadDB.*")
+async def _session_documents_changed(events: List[InvalidationEvent], local: bool):
+    removed = {
+        event.source.split(".", 1)[1]
+        for event in events
+        if not event.is_reset and event.op not in ("insert", "update", "replace")
+    }
+    if not local:
+        # Client documents are rarely removed; pruned before the batch is
+        # published, so other workers reload without the stale routes
+        for collection in removed & set(session_router.nested):
+            await session_router.prune(collection)
+    if removed or any(event.is_reset for event in events):
+        await session_router.cache.invalidate_all(local=local)
+
+    targets = {
+        (event.source.split(".", 1)[1], event.keys["client_ID"])
+        for event in events
+        if not event.is_reset and event.keys.get("client_ID")
+    }
+    await session_router.forget_clients({client_id for _, client_id in targets})
+    # New sessions are routed by a job the leader enqueues
+    if local:
+        return
+    enqueues = []
+    for collection, client_id in targets:
+        if collection in session_router.nested:
+            key, delay = debounce(f"{collection}:{client_id}", SESSION_ROUTES_SYNC_DEBOUNCE_SECONDS)
+            enqueues.append(enqueue(sync_client_job, key=key, delay=delay, collection=collection, client_id=client_id))
+    await asyncio.gather(*enqueues)
+
+
+@job("session_routes.sync_client", queue="default", max_attempts=3, timeout=600)
+async def sync_client_job(ctx: JobContext, collection: str, client_id: str):
+    """
+    Route a client's new sessions after a nested-layout write.
+
+    Args:
+        ctx: Job context
+        collection: Nested collection name
+        client_id: Client ID
+
+    Returns:
+        dict: Routes added or removed
+    """
+    changed = await session_router.sync_client(collection, client_id)
+    if changed:
+        # Other workers may have reloaded the client's routes before this ran
+        await invalidation_bus.publish([
+            InvalidationEvent(SESSION_ROUTES_SOURCE, "update", client_id, {"client_ID": client_id})
+        ])
+    return {"changed": changed}
+
+
+async def backfill_session_routes(collections: Optional[List[str]] = None, ctx: Optional[JobContext] = None) -> Dict[str, int]:
+    """
+    Route every session of the nested layout.
+
+    Args:
+        collections: Nested collection names (default all)
+        ctx: Job context for progress, if run as a job
+
+    Returns:
+        dict: Clients scanned, routes added or removed and routes of
+            removed clients pruned per collection
+
+    Notes:
+        - Idempotent; clients whose routes match are not written
+    """
+    counts = {}
+    for collection in collections or list(session_router.nested):
+        client_ids = await session_router.nested[collection].distinct("client_ID")
+        changed = 0
+        for done, client_id in enumerate(client_ids, 1):
+            changed += await session_router.sync_client(collection, client_id)
+            if ctx and (done % SESSION_ROUTES_BACKFILL_BATCH == 0 or done == len(client_ids)):
+                ctx.update_progress(collection=collection, current=done, total=len(client_ids))
+        pruned = await session_router.prune(collection)
+        counts[collection] = changed
+        counts[f"{collection}_clients"] = len(client_ids)
+        counts[f"{collection}_pruned"] = pruned
+        logger.info(f"Routed {collection}: {changed} routes changed for {len(client_ids)} clients, {pruned} pruned")
+    return counts
+
+
+@job("session_routes.backfill", queue="default", max_attempts=1, timeout=6 * 3600)
+async def backfill_session_routes_job(ctx: JobContext, collections: Optional[List[str]] = None):
+    """
+    Backfill the session routing table.
+
+    Args:
+        ctx: Job context
+        collections: Nested collection names (default all)
+
+    Returns:
+        dict: Clients scanned and routes changed per collection
+    """
+    return await backfill_session_routes(collections, ctx)
+
+
+__all__ = [
+    'SessionRouter',
+    'session_router',
+    'backfill_session_routes',
+    'ROUTE_PRECEDENCE'
+]
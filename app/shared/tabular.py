@@ -0,0 +1,37 @@
+"""
+Tabular Module
+
+This module holds the CPU-bound pandas parsing used by request handlers
+and jobs. Like imaging, it has plain module-level functions with no
+app imports, so it loads quickly on the CPU process pool (run_cpu).
+
+Features:
+- CSV parsing into DataFrames
+
+Data Model:
+- CSV text in, DataFrame out
+
+Security:
+- No network or database access
+
+Dependencies:
+- pandas for parsing
+
+Author: Snapped Development Team
+"""
+
+import io
+import pandas as pd
+
+
+def parse_csv(csv_content: str) -> pd.DataFrame:
+    """
+    Parse CSV text into a DataFrame (run on the CPU pool).
+
+    Args:
+        csv_content: Raw CSV data
+
+    Returns:
+        pd.DataFrame: Parsed rows
+    """
+    return pd.read_csv(io.StringIO(csv_content))
@@ -0,0 +1,702 @@
+"""
+Webhooks Module
+
+This module provides outbound webhook delivery (Make.com, Zapier,
+QuickBooks via Make) through a durable MongoDB outbox. Callers dispatch
+a payload under an idempotency key and get the delivery result; sends
+that still fail stay in the outbox and are retried by a scheduled job,
+so they survive restarts.
+
+Features:
+- Pooled async HTTP client
+- Concurrency cap and send spacing per target
+- Exponential backoff with jitter
+- Circuit breaker per target
+- Idempotency keys (one delivery per key)
+- Durable outbox with scheduled retries (one retry run at a time)
+- Leases renewed while a delivery waits for its turn
+- Delivery latency and failure metrics
+
+Data Model:
+- Targets: name -> URL and limits
+- One outbox document per target and key in JobQueue.WebhookOutbox
+- Status, attempts, next_attempt_at, give_up_at
+- Sender lease: lease_owner, lease_until
+- Retry run lease in JobQueue.Leases
+- Last HTTP status and error
+
+Security:
+- Webhook URLs live server-side only
+- Bounded retries and delivery age
+- Finished deliveries expire
+
+Dependencies:
+- http_clients for pooled sessions
+- Motor for the outbox
+- jobs and scheduler for retries
+- prometheus_client for metrics
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+import aiohttp
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from bson import ObjectId
+from .database import leases_collection, webhook_outbox_collection
+from .http_clients import get_http_session
+from .jobs import JobContext, job
+from .models import WebhookStatus
+from .scheduler import scheduled
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WebhookTarget:
+    """
+    A webhook endpoint and its delivery limits.
+
+    Attributes:
+        name: Target name (metric label, outbox field)
+        url: Webhook URL
+        concurrency: Sends in flight at once, per process
+        interval: Minimum seconds between sends, per process
+        inline_attempts: Attempts made by dispatch before deferring to the outbox
+        max_attempts: Attempts before a delivery is dead-lettered
+        max_age: Seconds after which an undelivered payload is dropped
+    """
+
+    name: str
+    url: str
+    concurrency: int = 4
+    interval: float = 0
+    inline_attempts: int = 3
+    max_attempts: int = 10
+    max_age: int = 86400
+
+
+WEBHOOK_TARGETS: Dict[str, WebhookTarget] = {
+    target.name: target for target in (
+        # Story posts; publish times are same-day, so stale sends are dropped
+        WebhookTarget("make_story", "https://hook.us2.make.com/fheaw13hclbts7ght5n8tmvl8r57qldj",
+                      concurrency=1, interval=10, max_age=6 * 3600),
+        WebhookTarget("make_spotlight", "https://hook.us2.make.com/6mv68gk7h51xn3l9i2ftd173qyt2xcwx",
+                      concurrency=1, interval=10, max_age=6 * 3600),
+        WebhookTarget("make_saved", "https://hook.us2.make.com/7cqutngufim36r18w01rgixdv2ymcuqa",
+                      concurrency=1, interval=5, max_age=6 * 3600),
+        WebhookTarget("zapier_story", "https://hooks.zapier.com/hooks/catch/21145902/28asr8g/",
+                      concurrency=1, interval=5, max_age=6 * 3600),
+        # Bills keep retrying for a week
+        WebhookTarget("quickbooks_bill", "https://hook.us2.make.com/bcpx0sqimgo9dih97dvumlldjk3fpapk",
+                      concurrency=2, max_age=7 * 86400),
+        WebhookTarget("quickbooks_statement", "https://hook.us2.make.com/pm33xp0uztw57perdcn774vdb47gwaql",
+                      concurrency=1, interval=2, max_age=7 * 86400),
+    )
+}
+
+# Retry delay: base * 2^(attempt-1), capped, with jitter over the upper half
+WEBHOOK_RETRY_BASE_SECONDS = 5
+WEBHOOK_RETRY_MAX_SECONDS = 1800
+
+# Consecutive failures that open a target's circuit, and how long it stays open
+WEBHOOK_BREAKER_THRESHOLD = 5
+WEBHOOK_BREAKER_RESET_SECONDS = 60
+
+# A send is reclaimed by the retry job when its sender stops renewing
+# its lease this long (renewed every third of it)
+WEBHOOK_LEASE_SECONDS = 120
+
+# Deliveries retried per run of the retry job
+WEBHOOK_FLUSH_BATCH = 200
+
+# Sending time a retry run plans for: spaced targets get at most
+# window / interval deliveries per run, so a run ends before the next
+WEBHOOK_RETRY_WINDOW_SECONDS = 60
+
+# Retry run lease (one run at a time across workers); the job timeout
+WEBHOOK_RETRY_LEASE_ID = "webhooks.retry_outbox"
+WEBHOOK_RETRY_LEASE_SECONDS = 600
+
+# Delivered and dead outbox documents are removed by a TTL index after this long
+WEBHOOK_RETENTION = timedelta(days=30)
+
+# Stored response/error text
+WEBHOOK_MAX_ERROR_CHARS = 1000
+
+WEBHOOK_LATENCY = Histogram(
+    "webhook_delivery_seconds",
+    "Webhook request latency",
+    ["target", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+WEBHOOK_ATTEMPTS = Counter(
+    "webhook_attempts_total",
+    "Webhook send attempts by outcome",
+    ["target", "outcome"]
+)
+WEBHOOK_DEAD = Counter(
+    "webhook_dead_letters_total",
+    "Webhook deliveries given up on",
+    ["target", "reason"]
+)
+WEBHOOK_CIRCUIT_OPEN = Gauge(
+    "webhook_circuit_open",
+    "1 while a target's circuit breaker is open",
+    ["target"],
+    multiprocess_mode="livemax"
+)
+WEBHOOK_OUTBOX_PENDING = Gauge(
+    "webhook_outbox_pending",
+    "Undelivered outbox documents",
+    ["target"],
+    multiprocess_mode="livemax"
+)
+
+
+@dataclass
+class WebhookResult:
+    """
+    Outcome of a dispatch.
+
+    Attributes:
+        delivered: The target accepted the payload (now or earlier)
+        status: Outbox status after the dispatch
+        attempts: Attempts made so far
+        response_status: Last HTTP status, if any
+        error: Last error or response text
+        duplicate: The key had already been delivered
+    """
+
+    delivered: bool
+    status: str
+    attempts: int = 0
+    response_status: Optional[int] = None
+    error: Optional[str] = None
+    duplicate: bool = False
+
+
+class CircuitBreaker:
+    """
+    Per-target circuit breaker.
+
+    Opens after WEBHOOK_BREAKER_THRESHOLD consecutive failures; while
+    open, sends are deferred without calling the target. After the
+    reset time one probe is let through: success closes the circuit,
+    failure opens it again.
+
+    Attributes:
+        target: Target name
+        failures: Consecutive failures
+        open_until: Monotonic time the circuit reopens for a probe
+    """
+
+    def __init__(self, target: str, threshold: int = WEBHOOK_BREAKER_THRESHOLD,
+                 reset_seconds: float = WEBHOOK_BREAKER_RESET_SECONDS):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            target: Target name
+            threshold: Failures that open the circuit
+            reset_seconds: Seconds the circuit stays open
+        """
+        self.target = target
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.open_until = 0.0
+
+    def retry_after(self) -> float:
+        """
+        Seconds until the circuit lets a send through.
+
+        Returns:
+            float: 0 while closed or when a probe is due
+        """
+        if self.failures < self.threshold:
+            return 0.0
+        return max(0.0, self.open_until - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Check whether a send may go now.
+
+        Returns:
+            bool: True while closed; once per reset period while open (the probe)
+        """
+        if self.retry_after():
+            return False
+        if self.failures >= self.threshold:
+            # Hold further sends until the probe reports back (or its slot lapses)
+            self.open_until = time.monotonic() + self.reset_seconds
+        return True
+
+    def record_success(self):
+        """Close the circuit."""
+        self.failures = 0
+        WEBHOOK_CIRCUIT_OPEN.labels(self.target).set(0)
+
+    def record_failure(self):
+        """Count a failure; opens the circuit at the threshold."""
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.open_until = time.monotonic() + self.reset_seconds
+            WEBHOOK_CIRCUIT_OPEN.labels(self.target).set(1)
+            logger.warning("Webhook circuit open for %s after %s failures", self.target, self.failures)
+
+
+def retry_delay(attempt: int) -> float:
+    """
+    Backoff before retrying a failed send.
+
+    Args:
+        attempt: Attempt that just failed, starting at 1
+
+    Returns:
+        float: Seconds
+    """
+    delay = min(WEBHOOK_RETRY_MAX_SECONDS, WEBHOOK_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def outbox_id_for(target: str, key: str) -> str:
+    """
+    Outbox document id for a target and idempotency key.
+
+    Args:
+        target: Target name
+        key: Idempotency key (any length)
+
+    Returns:
+        str: "<target>:<digest of key>"
+    """
+    return f"{target}:{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"
+
+
+class _Attempt:
+    """Result of one HTTP send."""
+
+    def __init__(self, outcome: str, response_status: Optional[int] = None, error: Optional[str] = None):
+        # outcome: delivered, retryable, permanent or circuit_open
+        self.outcome = outcome
+        self.response_status = response_status
+        self.error = error[:WEBHOOK_MAX_ERROR_CHARS] if error else error
+
+
+class WebhookDispatcher:
+    """
+    Sends outbox deliveries to their targets.
+
+    Semaphores and send spacing are kept per event loop (like the HTTP
+    sessions), circuit breakers per process.
+
+    Attributes:
+        breakers: target -> CircuitBreaker
+    """
+
+    def __init__(self):
+        """Initialize with no per-target state."""
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._loop_state = weakref.WeakKeyDictionary()
+
+    def breaker(self, target: str) -> CircuitBreaker:
+        """
+        Get a target's circuit breaker.
+
+        Args:
+            target: Target name
+
+        Returns:
+            CircuitBreaker: Created closed on first use
+        """
+        breaker = self.breakers.get(target)
+        if breaker is None:
+            breaker = self.breakers[target] = CircuitBreaker(target)
+        return breaker
+
+    def _state(self, target: WebhookTarget) -> Dict[str, Any]:
+        loop_state = self._loop_state.setdefault(asyncio.get_running_loop(), {})
+        state = loop_state.get(target.name)
+        if state is None:
+            state = loop_state[target.name] = {
+                "semaphore": asyncio.Semaphore(target.concurrency),
+                "lock": asyncio.Lock(),
+                "next_send": 0.0
+            }
+        return state
+
+    async def _wait_turn(self, target: WebhookTarget, state: Dict[str, Any]):
+        if not target.interval:
+            return
+        async with state["lock"]:
+            now = time.monotonic()
+            send_at = max(now, state["next_send"])
+            state["next_send"] = send_at + target.interval
+        await asyncio.sleep(send_at - now)
+
+    async def send(self, target: WebhookTarget, key: str, payload: Any) -> _Attempt:
+        """
+        Make one HTTP attempt for a delivery.
+
+        Args:
+            target: Target
+            key: Outbox id (sent as Idempotency-Key)
+            payload: JSON body
+
+        Returns:
+            _Attempt: Outcome, HTTP status and error text
+        """
+        breaker = self.breaker(target.name)
+        if not breaker.allow():
+            WEBHOOK_ATTEMPTS.labels(target.name, "circuit_open").inc()
+            return _Attempt("circuit_open", error="circuit open")
+
+        state = self._state(target)
+        async with state["semaphore"]:
+            await self._wait_turn(target, state)
+            started = time.perf_counter()
+            try:
+                async with get_http_session().post(
+                    target.url, json=payload, headers={"Idempotency-Key": key}
+                ) as response:
+                    status = response.status
+                    text = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                attempt = _Attempt("retryable", error=f"{type(e).__name__}: {e}")
+            else:
+                if 200 <= status < 300:
+                    attempt = _Attempt("delivered", status)
+                elif status == 429 or status >= 500:
+                    attempt = _Attempt("retryable", status, text)
+                else:
+                    attempt = _Attempt("permanent", status, text)
+            WEBHOOK_LATENCY.labels(target.name, attempt.outcome).observe(time.perf_counter() - started)
+
+        WEBHOOK_ATTEMPTS.labels(target.name, attempt.outcome).inc()
+        if attempt.outcome == "delivered":
+            breaker.record_success()
+        elif attempt.outcome == "retryable":
+            breaker.record_failure()
+        return attempt
+
+    async def claim(self, outbox_id: str) -> Optional[Dict]:
+        """
+        Lease a pending (or abandoned) delivery for sending.
+
+        Args:
+            outbox_id: Outbox document id
+
+        Returns:
+            dict: Leased document, or None if delivered, dead or being sent
+
+        Notes:
+            - deliver() renews the lease until the delivery finishes
+        """
+        now = _utcnow()
+        return await webhook_outbox_collection.find_one_and_update(
+            {
+                "_id": outbox_id,
+                "$or": [
+                    {"status": WebhookStatus.PENDING.value},
+                    {"status": WebhookStatus.SENDING.value, "lease_until": {"$lt": now}},
+                ]
+            },
+            {"$set": {
+                "status": WebhookStatus.SENDING.value,
+                "lease_owner": str(ObjectId()),
+                "lease_until": now + timedelta(seconds=WEBHOOK_LEASE_SECONDS),
+                "updated_at": now
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _keep_lease(self, doc: Dict):
+        # Waiting for the semaphore/spacing or backing off must not let
+        # another run reclaim (and resend) the delivery
+        while True:
+            await asyncio.sleep(WEBHOOK_LEASE_SECONDS / 3)
+            try:
+                await webhook_outbox_collection.update_one(
+                    {"_id": doc["_id"], "status": WebhookStatus.SENDING.value, "lease_owner": doc["lease_owner"]},
+                    {"$set": {"lease_until": _utcnow() + timedelta(seconds=WEBHOOK_LEASE_SECONDS)}}
+                )
+            except Exception as e:
+                logger.warning("Webhook lease renewal failed for %s: %s", doc["_id"], e)
+
+    async def _finish(self, doc: Dict, status: WebhookStatus, attempts: int, attempt: _Attempt,
+                      next_attempt_at: Optional[datetime] = None, reason: Optional[str] = None) -> WebhookResult:
+        now = _utcnow()
+        fields = {
+            "status": status.value,
+            "attempts": attempts,
+            "last_status": attempt.response_status,
+            "last_error": attempt.error,
+            "updated_at": now,
+            "lease_until": None
+        }
+        if status == WebhookStatus.PENDING:
+            fields["next_attempt_at"] = next_attempt_at
+        else:
+            fields["expires_at"] = now + WEBHOOK_RETENTION
+        if status == WebhookStatus.DELIVERED:
+            fields["delivered_at"] = now
+        if status == WebhookStatus.DEAD:
+            fields["dead_reason"] = reason
+            WEBHOOK_DEAD.labels(doc["target"], reason).inc()
+            logger.error("Webhook %s dead-lettered (%s): %s", doc["_id"], reason, attempt.error)
+        await webhook_outbox_collection.update_one({"_id": doc["_id"]}, {"$set": fields})
+        return WebhookResult(
+            delivered=status == WebhookStatus.DELIVERED,
+            status=status.value,
+            attempts=attempts,
+            response_status=attempt.response_status,
+            error=attempt.error
+        )
+
+    async def deliver(self, doc: Dict, inline_attempts: int) -> WebhookResult:
+        """
+        Send a claimed delivery, retrying inline up to inline_attempts.
+
+        Args:
+            doc: Claimed outbox document
+            inline_attempts: Attempts to make now
+
+        Returns:
+            WebhookResult: Delivered, dead or left pending for the retry job
+        """
+        lease = asyncio.create_task(self._keep_lease(doc))
+        try:
+            return await self._deliver(doc, inline_attempts)
+        finally:
+            lease.cancel()
+
+    async def _deliver(self, doc: Dict, inline_attempts: int) -> WebhookResult:
+        target = WEBHOOK_TARGETS[doc["target"]]
+        attempts = doc.get("attempts", 0)
+        for i in range(inline_attempts):
+            attempt = await self.send(target, doc["_id"], doc["payload"])
+            if attempt.outcome == "circuit_open":
+                retry_at = _utcnow() + timedelta(seconds=self.breaker(target.name).retry_after() or 1)
+                return await self._finish(doc, WebhookStatus.PENDING, attempts, attempt, retry_at)
+
+            attempts += 1
+            if attempt.outcome == "delivered":
+                return await self._finish(doc, WebhookStatus.DELIVERED, attempts, attempt)
+            if attempt.outcome == "permanent":
+                return await self._finish(doc, WebhookStatus.DEAD, attempts, attempt, reason="rejected")
+            if attempts >= target.max_attempts:
+                return await self._finish(doc, WebhookStatus.DEAD, attempts, attempt, reason="attempts")
+
+            delay = retry_delay(attempts)
+            logger.warning(
+                "Webhook %s attempt %s failed (%s), retrying in %.0fs",
+                doc["_id"], attempts, attempt.error, delay
+            )
+            if i + 1 < inline_attempts:
+                await asyncio.sleep(delay)
+        return await self._finish(doc, WebhookStatus.PENDING, attempts, attempt, _utcnow() + timedelta(seconds=delay))
+
+
+dispatcher = WebhookDispatcher()
+
+
+async def dispatch(target: str, key: str, payload: Any) -> WebhookResult:
+    """
+    Deliver a payload to a webhook target exactly once per key.
+
+    The payload is written to the outbox before sending. Failed sends
+    are retried inline with backoff; if the target is still failing
+    (or its circuit is open) the delivery stays pending and the
+    webhooks.retry_outbox job keeps retrying it.
+
+    Args:
+        target: Target name (see WEBHOOK_TARGETS)
+        key: Idempotency key, unique per logical send (e.g. the
+            profile, media URL and publish time of a post)
+        payload: JSON body
+
+    Returns:
+        WebhookResult: Delivery outcome; delivered is also True when
+        the key was delivered before (duplicate=True)
+
+    Raises:
+        KeyError: Unknown target
+    """
+    spec = WEBHOOK_TARGETS[target]
+    outbox_id = outbox_id_for(target, key)
+    now = _utcnow()
+    try:
+        await webhook_outbox_collection.insert_one({
+            "_id": outbox_id,
+            "target": target,
+            "key": key,
+            "payload": payload,
+            "status": WebhookStatus.PENDING.value,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "give_up_at": now + timedelta(seconds=spec.max_age),
+            "created_at": now,
+            "updated_at": now
+        })
+    except DuplicateKeyError:
+        existing = await webhook_outbox_collection.find_one({"_id": outbox_id})
+        if existing["status"] == WebhookStatus.DELIVERED.value:
+            logger.info("Webhook %s already delivered, skipping", outbox_id)
+            return WebhookResult(True, existing["status"], existing.get("attempts", 0),
+                                 existing.get("last_status"), duplicate=True)
+        if existing["status"] == WebhookStatus.DEAD.value:
+            # Re-dispatching a dead key is an explicit retry with the new payload
+            await webhook_outbox_collection.update_one(
+                {"_id": outbox_id, "status": WebhookStatus.DEAD.value},
+                {"$set": {
+                    "payload": payload,
+                    "status": WebhookStatus.PENDING.value,
+                    "attempts": 0,
+                    "next_attempt_at": now,
+                    "give_up_at": now + timedelta(seconds=spec.max_age),
+                    "updated_at": now
+                }, "$unset": {"expires_at": "", "dead_reason": ""}}
+            )
+
+    doc = await dispatcher.claim(outbox_id)
+    if doc is None:
+        # Another process is sending it right now
+        current = await webhook_outbox_collection.find_one({"_id": outbox_id}) or {}
+        status = current.get("status", WebhookStatus.SENDING.value)
+        return WebhookResult(status == WebhookStatus.DELIVERED.value, status, current.get("attempts", 0))
+    return await dispatcher.deliver(doc, spec.inline_attempts)
+
+
+def batch_limit(target: WebhookTarget, limit: int = WEBHOOK_FLUSH_BATCH) -> int:
+    """
+    Deliveries of a target one retry run takes on.
+
+    Args:
+        target: Target
+        limit: Cap for unspaced targets
+
+    Returns:
+        int: At most what the target's spacing lets through in
+            WEBHOOK_RETRY_WINDOW_SECONDS
+    """
+    if not target.interval:
+        return limit
+    return max(1, min(limit, int(WEBHOOK_RETRY_WINDOW_SECONDS // target.interval)))
+
+
+async def retry_outbox(limit: int = WEBHOOK_FLUSH_BATCH) -> Dict[str, int]:
+    """
+    Retry due outbox deliveries once each.
+
+    Args:
+        limit: Deliveries to retry per target (spaced targets get fewer,
+            see batch_limit)
+
+    Returns:
+        dict: Count per resulting status, plus expired
+    """
+    now = _utcnow()
+
+    # Drop deliveries that are too old to be useful
+    expired = await webhook_outbox_collection.find(
+        {"status": WebhookStatus.PENDING.value, "give_up_at": {"$lte": now}},
+        {"target": 1}
+    ).to_list(None)
+    for doc in expired:
+        await webhook_outbox_collection.update_one(
+            {"_id": doc["_id"], "status": WebhookStatus.PENDING.value},
+            {"$set": {"status": WebhookStatus.DEAD.value, "dead_reason": "expired",
+                      "expires_at": now + WEBHOOK_RETENTION, "updated_at": now}}
+        )
+        WEBHOOK_DEAD.labels(doc["target"], "expired").inc()
+
+    due = []
+    for target in WEBHOOK_TARGETS.values():
+        due += await webhook_outbox_collection.find(
+            {"target": target.name, "$or": [
+                {"status": WebhookStatus.PENDING.value, "next_attempt_at": {"$lte": now}},
+                {"status": WebhookStatus.SENDING.value, "lease_until": {"$lt": now}},
+            ]},
+            {"_id": 1}
+        ).sort("next_attempt_at", 1).limit(batch_limit(target, limit)).to_list(None)
+
+    async def retry(outbox_id: str) -> Optional[str]:
+        doc = await dispatcher.claim(outbox_id)
+        if doc is None:
+            return None
+        return (await dispatcher.deliver(doc, inline_attempts=1)).status
+
+    counts = {"expired": len(expired)}
+    for status in await asyncio.gather(*(retry(doc["_id"]) for doc in due)):
+        if status:
+            counts[status] = counts.get(status, 0) + 1
+
+    for target in WEBHOOK_TARGETS:
+        pending = await webhook_outbox_collection.count_documents(
+            {"target": target, "status": {"$in": [WebhookStatus.PENDING.value, WebhookStatus.SENDING.value]}}
+        )
+        WEBHOOK_OUTBOX_PENDING.labels(target).set(pending)
+    return counts
+
+
+@scheduled("* * * * *")
+@job("webhooks.retry_outbox", queue="default", max_attempts=1, timeout=600)
+async def retry_outbox_job(ctx: JobContext, fire_time: datetime):
+    """
+    Retry pending webhook deliveries every minute.
+
+    Args:
+        ctx: Job context
+        fire_time (datetime): Scheduled time
+
+    Returns:
+        dict: Count per resulting status, or skipped while another run
+            holds the lease
+    """
+    owner = ctx.job_id
+    now = _utcnow()
+    try:
+        await leases_collection.update_one(
+            {"_id": WEBHOOK_RETRY_LEASE_ID, "lease_until": {"$lte": now}},
+            {"$set": {"owner": owner, "lease_until": now + timedelta(seconds=WEBHOOK_RETRY_LEASE_SECONDS)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        logger.info("Webhook retry run still in progress, skipping %s", fire_time)
+        return {"skipped": True}
+    try:
+        return await retry_outbox()
+    finally:
+        await leases_collection.update_one(
+            {"_id": WEBHOOK_RETRY_LEASE_ID, "owner": owner},
+            {"$set": {"lease_until": _utcnow()}}
+        )
+
+
+__all__ = [
+    'WEBHOOK_TARGETS',
+    'WebhookTarget',
+    'WebhookResult',
+    'CircuitBreaker',
+    'WebhookDispatcher',
+    'dispatcher',
+    'outbox_id_for',
+    'batch_limit',
+    'dispatch',
+    'retry_outbox'
+]
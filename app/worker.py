@@ -0,0 +1,139 @@
+"""
+Job Worker Entry Module
+
+This module runs background job workers in their own process, separate
+from the web workers, so long-running work never ties up a request.
+
+Features:
+- Queue selection
+- Cron scheduler (leader elected)
+- Cache invalidation listener (same caches as the web workers)
+- Graceful shutdown
+- Shared HTTP clients
+- Non-blocking logging
+
+Data Model:
+- Jobs from JobQueue.Jobs
+- Job modules registering @job functions
+- Schedules from @scheduled jobs
+
+Security:
+- Same credentials as the web app
+- Metrics port only when configured
+
+Dependencies:
+- jobs for the worker loop
+- scheduler for cron jobs
+- invalidation for cache invalidation
+- database for connections
+- http_clients for pooled sessions
+- executors for media/CPU pools
+
+Usage:
+    python -m app.worker                       # all queues
+    python -m app.worker --queues media scans  # selected queues
+    python -m app.worker --no-scheduler        # jobs only
+
+Author: Snapped Development Team
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import signal
+from prometheus_client import start_http_server
+from .shared.logging_config import setup_logging
+from .shared.database import async_client, init_db
+from .shared.http_clients import http_clients
+from .shared.executors import executors
+from .shared.invalidation import invalidation_bus
+from .shared.jobs import JOB_QUEUES, JOB_REGISTRY, JobWorker
+from .shared.scheduler import SCHEDULES, Scheduler
+
+logger = logging.getLogger(__name__)
+
+# Modules that register @job functions
+JOB_MODULES = [
+    "app.features.tiktok.routes_tiktok",
+    "app.features.bunnyscan.bunny_scanner",
+    "app.features.cdn.cdn_mongo",
+    "app.features.posting.make_processor",
+    "app.features.videosummary.services.twelve_labs",
+    "app.features.lead.route_lead",
+    "app.features.posting.queue_builder",
+    "app.features.posting.spot_queue_builder",
+    "app.features.posting.spot_make_processor",
+    "app.features.bunnyscan.run_scan",
+    "app.features.tasks.scheduler",
+    "app.shared.webhooks",
+    "app.shared.media_store",
+    "app.shared.session_routes",
+]
+
+# Serve job and scheduler metrics on this port (unset: off)
+WORKER_METRICS_PORT = os.getenv("WORKER_METRICS_PORT")
+
+
+def load_job_modules():
+    """
+    Import every job module so its jobs are registered.
+    """
+    for module in JOB_MODULES:
+        importlib.import_module(module)
+    logger.info("Registered jobs: %s", sorted(JOB_REGISTRY))
+    logger.info("Schedules: %s", {name: s.cron for name, s in SCHEDULES.items()})
+
+
+async def serve(queues, with_scheduler=True):
+    """
+    Run a worker, and optionally the scheduler, until SIGTERM/SIGINT.
+
+    Args:
+        queues: Queue names to serve
+        with_scheduler: Also compete for the scheduler lease
+    """
+    if not await init_db():
+        raise Exception("Failed to initialize database")
+    await http_clients.open()
+    executors.start()
+
+    worker = JobWorker(queues)
+    # Jobs read the client directory and ACL caches too; without the bus
+    # their entries would only expire after the (long) L1 TTLs
+    services = [worker, invalidation_bus]
+    if with_scheduler:
+        services.append(Scheduler())
+
+    def stop():
+        for service in services:
+            service.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop)
+
+    try:
+        await asyncio.gather(*(service.run() for service in services))
+    finally:
+        await http_clients.close()
+        await executors.shutdown()
+        async_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--queues", nargs="*", choices=list(JOB_QUEUES), default=list(JOB_QUEUES))
+    parser.add_argument("--no-scheduler", action="store_true", help="Do not run scheduled jobs")
+    args = parser.parse_args()
+
+    setup_logging(logging.INFO)
+    load_job_modules()
+    if WORKER_METRICS_PORT:
+        start_http_server(int(WORKER_METRICS_PORT))
+    asyncio.run(serve(args.queues, with_scheduler=not args.no_scheduler))
+
+
+if __name__ == "__main__":
+    main()
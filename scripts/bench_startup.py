@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark Script
+
+Reports import time per feature module so cold starts and worker
+restarts can be tracked, and compares eager and lazy app startup.
+
+Columns:
+- cold: module imported alone in a fresh interpreter (includes its
+  share of heavy dependencies such as pandas, openai, boto3)
+- incremental: cost of the module when imported in mount order after
+  the previous ones, i.e. what eager startup actually pays for it
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --app   # also time full app import, eager vs lazy
+
+Environment:
+    Requires the same environment as the main application
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from app.routers import FEATURE_ROUTERS
+
+# Timed in a child process so each measurement starts from a clean interpreter
+COLD_IMPORT = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+import app.shared.database
+started = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps(time.perf_counter() - started))
+"""
+
+INCREMENTAL_IMPORT = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+import app.shared.database
+timings = []
+for module in {modules!r}:
+    started = time.perf_counter()
+    importlib.import_module(module)
+    timings.append(time.perf_counter() - started)
+print(json.dumps(timings))
+"""
+
+APP_IMPORT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import app.app
+print(json.dumps(time.perf_counter() - started))
+"""
+
+
+def run_child(code: str, env: dict = None):
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+        env={**os.environ, **(env or {})}
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature module import benchmark")
+    parser.add_argument("--app", action="store_true", help="Also time eager vs lazy app import")
+    args = parser.parse_args()
+
+    modules = list(dict.fromkeys(feature.module for feature in FEATURE_ROUTERS))
+    incremental = dict(zip(modules, run_child(INCREMENTAL_IMPORT.format(root=ROOT, modules=modules))))
+
+    rows = []
+    for module in modules:
+        try:
+            cold = run_child(COLD_IMPORT.format(root=ROOT, module=module))
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to import {module}: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        rows.append((module, cold, incremental[module]))
+
+    print(f"{'module':<55}{'cold ms':>10}{'incremental ms':>16}")
+    for module, cold, inc in sorted(rows, key=lambda row: row[1], reverse=True):
+        print(f"{module:<55}{cold * 1000:>10.1f}{inc * 1000:>16.1f}")
+    print(f"{'total (eager startup pays incremental)':<55}{'':>10}{sum(incremental.values()) * 1000:>16.1f}")
+
+    if args.app:
+        eager = run_child(APP_IMPORT.format(root=ROOT), {"LAZY_ROUTERS": "0"})
+        lazy = run_child(APP_IMPORT.format(root=ROOT), {"LAZY_ROUTERS": "1"})
+        print(f"\napp import eager: {eager * 1000:.1f} ms, lazy: {lazy * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
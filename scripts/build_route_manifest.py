@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Route Manifest Builder Script
+
+Imports every feature router and writes app/route_manifest.json, which
+lets the app start with LAZY_ROUTERS=1 without importing feature modules.
+Stale entries are detected by source hash and loaded eagerly until the
+manifest is rebuilt. Under gunicorn (app/gunicorn_config.py) this runs
+automatically at server start when LAZY_ROUTERS is on and the manifest
+is missing or stale; other deployments run it as a build step.
+
+Usage:
+    python scripts/build_route_manifest.py
+
+Environment:
+    Requires the same environment as the main application
+"""
+
+import json
+import sys
+import os
+import logging
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.routers import FEATURE_ROUTERS
+from app.shared.lazy_routers import ROUTE_MANIFEST_PATH, build_route_manifest
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def main():
+    manifest = build_route_manifest(FEATURE_ROUTERS)
+    with open(ROUTE_MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+    total_routes = sum(len(entry["routes"]) for entry in manifest.values())
+    print(f"Wrote {total_routes} routes for {len(manifest)} features to {ROUTE_MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,12 @@
 Task Template Processor Script
 
 A standalone script to create tasks from active templates.
-Designed to be run via cron job for reliable scheduling.
+The daily run is scheduled in-app as tasks.create_from_templates
+(python -m app.worker); use this script only for manual runs.
 
 Usage:
     python scripts/create_tasks_from_templates.py
 
-Cron example (daily at 12:00 PM):
-    0 12 * * * cd /path/to/snappedii && python scripts/create_tasks_from_templates.py
-
 Environment:
     Requires the same environment as the main application
 """
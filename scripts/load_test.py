@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+API Load Generator
+
+Replays a weighted mix of real API calls against a running instance
+from many concurrent asyncio clients, each with its own locally signed
+JWT, and reports throughput and latency percentiles per route.
+
+Route mix (weight):
+- folder_tree      GET /api/cdn-mongo/list-folders (3)
+- gallery          GET /api/cdn-mongo/file-gallery (3)
+- leads_grid       GET /api/leads/grid (2)
+- tasks            GET /api/tasks (2)
+- analytics_mobile GET /api/analytics/mobile (2)
+- chat             GET /api/messages/ (1)
+
+Usage:
+    # 1. Test signing key; the app trusts its JWKS via AUTH_LOCAL_JWKS_FILE
+    python scripts/load_test.py keygen --out .loadtest
+
+    # 2. Benchmark dataset in a local mongod
+    python scripts/load_test.py seed --mongodb-url mongodb://localhost:27017 --clients 200
+
+    # 3. App against that data, trusting the test key
+    MONGODB_URL=mongodb://localhost:27017 MONGODB_TLS=false \\
+        AUTH_LOCAL_JWKS_FILE=.loadtest/jwks.json \\
+        uvicorn app.main:app --workers 4
+
+    # 4. Load
+    python scripts/load_test.py run --key .loadtest/private.pem \\
+        --base-url http://localhost:8000 --concurrency 200 --duration 60
+
+Notes:
+    Rate limits are per user per path (see app.shared.rate_limit), so
+    every virtual client gets its own user; 429s are reported apart
+    from errors.
+
+Environment:
+    Requires the same environment as the main application
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import aiohttp
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from app.shared.auth.cognito import COGNITO_APP_CLIENT_ID, COGNITO_ISSUER
+from tests.benchmarks.synthetic_data import SyntheticDataset
+
+
+@dataclass
+class RouteSpec:
+    """One entry of the request mix."""
+
+    name: str
+    weight: int
+    build: Callable[[random.Random, SyntheticDataset], str]
+
+
+def _gallery_path(rng: random.Random, dataset: SyntheticDataset) -> str:
+    client_id = rng.choice(dataset.client_ids)
+    day = rng.choice(dataset.session_dates())
+    return f"/api/cdn-mongo/file-gallery?folder_path=sc/{client_id}/STORIES/F({day:%m-%d-%Y})_{client_id}/"
+
+
+ROUTE_MIX: List[RouteSpec] = [
+    RouteSpec("folder_tree", 3, lambda rng, ds: f"/api/cdn-mongo/list-folders?client_id={rng.choice(ds.client_ids)}"),
+    RouteSpec("gallery", 3, _gallery_path),
+    RouteSpec("leads_grid", 2, lambda rng, ds: "/api/leads/grid"),
+    RouteSpec("tasks", 2, lambda rng, ds: "/api/tasks"),
+    RouteSpec("analytics_mobile", 2, lambda rng, ds: f"/api/analytics/mobile?user_ids={rng.choice(ds.client_ids)}&days=7"),
+    RouteSpec("chat", 1, lambda rng, ds: f"/api/messages/?recipient={rng.choice(ds.client_ids)}"),
+]
+
+
+def keygen(out_dir: str):
+    """Write a test RSA key pair: private.pem and jwks.json."""
+    os.makedirs(out_dir, exist_ok=True)
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    kid = f"loadtest-{uuid.uuid4().hex[:12]}"
+
+    with open(os.path.join(out_dir, "private.pem"), "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    os.chmod(os.path.join(out_dir, "private.pem"), 0o600)
+
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    with open(os.path.join(out_dir, "private.kid"), "w") as f:
+        f.write(kid)
+    with open(os.path.join(out_dir, "jwks.json"), "w") as f:
+        json.dump({"keys": [jwk]}, f, indent=2)
+
+    print(f"Wrote {out_dir}/private.pem and {out_dir}/jwks.json (kid {kid})")
+    print(f"Start the app with AUTH_LOCAL_JWKS_FILE={os.path.join(out_dir, 'jwks.json')}")
+
+
+def mint_token(private_key, kid: str, user_id: str, groups: List[str], ttl: int) -> str:
+    """Sign a Cognito-shaped ID token with the test key."""
+    now = int(time.time())
+    claims = {
+        "sub": str(uuid.uuid5(uuid.NAMESPACE_DNS, user_id)),
+        "custom:UserID": user_id,
+        "cognito:username": user_id,
+        "cognito:groups": groups,
+        "email": f"{user_id}@loadtest.local",
+        "token_use": "id",
+        "iss": COGNITO_ISSUER,
+        "aud": COGNITO_APP_CLIENT_ID,
+        "iat": now,
+        "exp": now + ttl,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+async def seed(args):
+    """Load the benchmark dataset into a local mongod."""
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(args.mongodb_url)
+    dataset = SyntheticDataset(clients=args.clients, sessions=args.sessions, files=args.files, seed=args.seed)
+    counts = await dataset.load(client)
+    client.close()
+    for (db_name, collection_name), count in sorted(counts.items()):
+        print(f"{db_name}.{collection_name}: {count}")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run(args):
+    """Drive the route mix and print per-route statistics."""
+    with open(args.key, "rb") as f:
+        private_key = serialization.load_pem_private_key(f.read(), password=None)
+    kid_path = os.path.splitext(args.key)[0] + ".kid"
+    with open(kid_path) as f:
+        kid = f.read().strip()
+
+    dataset = SyntheticDataset(clients=args.clients, sessions=args.sessions, files=args.files, seed=args.seed)
+    routes = [r for r in ROUTE_MIX if not args.routes or r.name in args.routes]
+    weights = [r.weight for r in routes]
+    groups = [g.strip().upper() for g in args.groups.split(",")]
+    ttl = args.duration + 3600
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    sizes: Dict[str, int] = defaultdict(int)
+    deadline = time.perf_counter() + args.duration
+    remaining = [args.requests] if args.requests else None
+
+    async def client_loop(n: int, session: aiohttp.ClientSession):
+        rng = random.Random(args.seed * 1000 + n)
+        token = mint_token(private_key, kid, f"lt{n:06d}", groups, ttl)
+        headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "br, gzip"}
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            route = rng.choices(routes, weights)[0]
+            started = time.perf_counter()
+            try:
+                async with session.get(args.base_url + route.build(rng, dataset), headers=headers) as response:
+                    body = await response.read()
+                    status = response.status
+                    sizes[route.name] += len(body)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = 0
+            latencies[route.name].append(time.perf_counter() - started)
+            statuses[route.name][status] += 1
+            if args.think_ms:
+                await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(client_loop(n, session) for n in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    report = {"started_at": started_at.isoformat(), "elapsed_s": elapsed,
+              "concurrency": args.concurrency, "routes": {}}
+    print(f"\n{args.concurrency} clients, {elapsed:.1f}s against {args.base_url}")
+    print(f"{'route':<18}{'reqs':>8}{'rps':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+          f"{'2xx':>7}{'429':>6}{'err':>6}{'KB/req':>9}")
+    for name in [r.name for r in routes] + ["ALL"]:
+        if name == "ALL":
+            values = sorted(v for lat in latencies.values() for v in lat)
+            codes = defaultdict(int)
+            for per_route in statuses.values():
+                for code, count in per_route.items():
+                    codes[code] += count
+            total_bytes = sum(sizes.values())
+        else:
+            values = sorted(latencies[name])
+            codes = statuses[name]
+            total_bytes = sizes[name]
+        count = len(values)
+        if not count:
+            continue
+        ok = sum(c for code, c in codes.items() if 200 <= code < 300)
+        limited = codes.get(429, 0)
+        row = {
+            "requests": count,
+            "rps": count / elapsed,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p90_ms": percentile(values, 90) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000,
+            "ok": ok,
+            "rate_limited": limited,
+            "errors": count - ok - limited,
+            "kb_per_request": total_bytes / count / 1024,
+            "statuses": dict(codes),
+        }
+        report["routes"][name] = row
+        print(f"{name:<18}{count:>8}{row['rps']:>9.1f}{row['p50_ms']:>9.1f}{row['p90_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}{ok:>7}{limited:>6}{row['errors']:>6}"
+              f"{row['kb_per_request']:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    keygen_parser = commands.add_parser("keygen", help="write a test signing key and JWKS")
+    keygen_parser.add_argument("--out", default=".loadtest")
+
+    def dataset_args(p):
+        p.add_argument("--clients", type=int, default=100)
+        p.add_argument("--sessions", type=int, default=6)
+        p.add_argument("--files", type=int, default=8)
+        p.add_argument("--seed", type=int, default=7)
+
+    seed_parser = commands.add_parser("seed", help="load the benchmark dataset into a local mongod")
+    seed_parser.add_argument("--mongodb-url", default="mongodb://localhost:27017")
+    dataset_args(seed_parser)
+
+    run_parser = commands.add_parser("run", help="generate load")
+    run_parser.add_argument("--key", default=".loadtest/private.pem")
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--concurrency", type=int, default=50)
+    run_parser.add_argument("--duration", type=int, default=30, help="seconds")
+    run_parser.add_argument("--requests", type=int, default=0, help="stop after N requests (0: duration only)")
+    run_parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a client's requests")
+    run_parser.add_argument("--timeout", type=float, default=60)
+    run_parser.add_argument("--groups", default="ADMIN", help="comma separated cognito:groups")
+    run_parser.add_argument("--routes", nargs="*", choices=[r.name for r in ROUTE_MIX])
+    run_parser.add_argument("--json", help="also write the report to this file")
+    dataset_args(run_parser)
+
+    args = parser.parse_args()
+    if args.command == "keygen":
+        keygen(args.out)
+    elif args.command == "seed":
+        url = args.mongodb_url
+        if not url.startswith(("mongodb://localhost", "mongodb://127.0.0.1")):
+            parser.error("seed only writes to a local mongod")
+        asyncio.run(seed(args))
+    else:
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
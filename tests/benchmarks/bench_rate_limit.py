@@ -0,0 +1,128 @@
+"""
+Rate Limit Middleware Benchmark
+
+Measures per-request overhead added by RateLimitMiddleware under
+concurrent load, against a pass-through middleware on the same app.
+
+Modes:
+- baseline: pass-through BaseHTTPMiddleware (isolates rate limit cost)
+- redis: sliding window script against REDIS_URL
+- fallback: in-process token bucket (Redis marked down)
+
+Usage:
+    REDIS_URL=redis://localhost:6379 python tests/benchmarks/bench_rate_limit.py \
+        --requests 5000 --concurrency 100
+
+Author: Snapped Development Team
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.shared import rate_limit
+from app.shared.redis_client import close_redis
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    """Same middleware plumbing as RateLimitMiddleware with no work."""
+
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def build_app(with_rate_limit: bool) -> FastAPI:
+    """Build a minimal app with a single cheap endpoint."""
+    app = FastAPI()
+    if with_rate_limit:
+        app.add_middleware(rate_limit.RateLimitMiddleware)
+    else:
+        app.add_middleware(PassThroughMiddleware)
+
+    @app.get("/api/bench")
+    async def bench_endpoint():
+        return {"status": "ok"}
+
+    return app
+
+
+async def run_load(app: FastAPI, total: int, concurrency: int) -> list:
+    """Fire total requests with bounded concurrency and return latencies (ms)."""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/api/bench", headers={"X-Request": str(i)})
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise RuntimeError(f"Unexpected status {response.status_code}")
+
+        await asyncio.gather(*(one(i) for i in range(total)))
+
+    return latencies
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--modes", default="baseline,redis,fallback")
+    args = parser.parse_args()
+
+    # Never throttle the benchmark itself
+    for name in rate_limit.RATE_LIMITS:
+        rate_limit.RATE_LIMITS[name] = "100000000/minute"
+
+    results = {}
+    for mode in args.modes.split(","):
+        if mode == "fallback":
+            rate_limit.get_redis = lambda: None
+        app = build_app(with_rate_limit=mode != "baseline")
+
+        # Warm up connection pool and script cache
+        await run_load(app, min(200, args.requests), args.concurrency)
+        started = time.perf_counter()
+        latencies = await run_load(app, args.requests, args.concurrency)
+        elapsed = time.perf_counter() - started
+
+        results[mode] = {
+            "rps": args.requests / elapsed,
+            "mean": statistics.mean(latencies),
+            "p50": percentile(latencies, 50),
+            "p99": percentile(latencies, 99),
+        }
+
+    await close_redis()
+
+    baseline = results.get("baseline")
+    print(f"{'mode':<10}{'req/s':>10}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'overhead':>12}")
+    for mode, stats in results.items():
+        overhead = f"{stats['mean'] - baseline['mean']:+.3f}ms" if baseline else "-"
+        print(
+            f"{mode:<10}{stats['rps']:>10.0f}{stats['mean']:>10.3f}"
+            f"{stats['p50']:>10.3f}{stats['p99']:>10.3f}{overhead:>12}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
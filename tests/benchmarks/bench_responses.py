@@ -0,0 +1,134 @@
+"""
+JSON Response Benchmark
+
+Compares serialization time and wire bytes for a synthetic folder tree
+shaped like /api/cdn-mongo/list-folders, built for N clients.
+
+Serializers:
+- default: jsonable_encoder + JSONResponse (FastAPI default path)
+- orjson: FastJSONResponse returned directly
+
+Encodings:
+- identity, gzip, br (as negotiated by CompressionMiddleware)
+
+Usage:
+    python tests/benchmarks/bench_responses.py --clients 500 --repeat 5
+
+Author: Snapped Development Team
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.shared.compression import compress
+from app.shared.responses import FastJSONResponse
+
+COLLECTIONS = ["Uploads", "Saved", "Spotlights", "Content_Dump"]
+
+
+def build_folder_tree(clients: int, sessions: int, files: int, seed: int = 7) -> dict:
+    """Build a get_folder_tree-shaped payload."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    folders = []
+    for collection_name in COLLECTIONS:
+        base_folder = {"name": collection_name, "type": "folder", "path": f"sc/{collection_name}/", "contents": []}
+        for c in range(clients):
+            client_id = f"cl{10000000 + c}"
+            client_folder = {
+                "name": client_id,
+                "type": "folder",
+                "path": f"sc/{client_id}/{collection_name}/",
+                "snap_id": f"snap_{c}",
+                "last_updated": start + timedelta(minutes=c),
+                "contents": []
+            }
+            for s in range(sessions):
+                day = start + timedelta(days=s)
+                session_id = f"F({day:%m-%d-%Y})_{client_id}"
+                session_folder = {
+                    "name": session_id,
+                    "type": "folder",
+                    "path": f"sc/{client_id}/{collection_name}/{session_id}/",
+                    "folder_id": f"{rng.getrandbits(64):016x}",
+                    "scan_date": day,
+                    "upload_date": day,
+                    "total_files": files,
+                    "total_size": f"{rng.uniform(10, 900):.2f} MB",
+                    "total_images": files // 3,
+                    "total_videos": files - files // 3,
+                    "editor_note": "",
+                    "total_session_views": rng.randint(0, 100000),
+                    "avrg_session_view_time": rng.uniform(0, 30),
+                    "all_video_length": rng.uniform(0, 600),
+                    "contents": []
+                }
+                for f in range(files):
+                    file_name = f"{client_id}_{f:04d}.mp4"
+                    session_folder["contents"].append({
+                        "name": file_name,
+                        "type": "video",
+                        "size": f"{rng.uniform(1, 90):.2f} MB",
+                        "CDN_link": f"https://c.snapped.cc/sc/{client_id}/{collection_name}/{session_id}/{file_name}",
+                        "caption": "",
+                        "seq_number": f,
+                        "is_thumbnail": f == 0,
+                        "upload_time": day + timedelta(seconds=f),
+                        "video_length": rng.uniform(1, 60),
+                        "is_indexed": False
+                    })
+                client_folder["contents"].append(session_folder)
+            base_folder["contents"].append(client_folder)
+        folders.append(base_folder)
+    return {"status": "success", "folders": folders}
+
+
+def timed(fn, repeat: int):
+    """Run fn repeat times and return (median ms, last result)."""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--files", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = build_folder_tree(args.clients, args.sessions, args.files)
+
+    default_ms, default_body = timed(lambda: JSONResponse(jsonable_encoder(payload)).body, args.repeat)
+    orjson_ms, orjson_body = timed(lambda: FastJSONResponse(payload).body, args.repeat)
+
+    print(f"Folder tree: {args.clients} clients x {len(COLLECTIONS)} collections x "
+          f"{args.sessions} sessions x {args.files} files")
+    print(f"{'serializer':<12}{'ms':>10}{'bytes':>14}")
+    print(f"{'default':<12}{default_ms:>10.1f}{len(default_body):>14,}")
+    print(f"{'orjson':<12}{orjson_ms:>10.1f}{len(orjson_body):>14,}  ({default_ms / orjson_ms:.1f}x faster)")
+
+    print(f"\n{'encoding':<12}{'ms':>10}{'wire bytes':>14}{'ratio':>8}")
+    print(f"{'identity':<12}{0:>10.1f}{len(orjson_body):>14,}{1:>8.2f}")
+    for encoding in ("gzip", "br"):
+        ms, body = timed(lambda: compress(orjson_body, encoding), args.repeat)
+        print(f"{encoding:<12}{ms:>10.1f}{len(body):>14,}{len(body) / len(orjson_body):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark Fixtures
+
+Runs the hot-path benchmarks against local data only. The feature
+modules' Motor collections are rebound to a benchmark client loaded
+with a SyntheticDataset, so nothing reaches Atlas or S3.
+
+Backends:
+- BENCH_MONGODB_URL=mongodb://localhost:27017: a local mongod
+  (must be localhost; its UploadDB/ClientDb/... are overwritten)
+- otherwise: mongomock-motor in-memory stand-in
+
+Dataset size:
+- BENCH_CLIENTS (default 100), BENCH_SESSIONS (6), BENCH_FILES (8)
+
+Baselines:
+    # Record a baseline on the CI runner
+    pytest tests/benchmarks --confcutdir=tests/benchmarks \
+        --benchmark-storage=tests/benchmarks/.baselines --benchmark-save=baseline
+
+    # Fail when a median regresses by more than 20%
+    pytest tests/benchmarks --confcutdir=tests/benchmarks \
+        --benchmark-storage=tests/benchmarks/.baselines \
+        --benchmark-compare --benchmark-compare-fail=median:20%
+
+Author: Snapped Development Team
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import os
+import sys
+from urllib.parse import urlparse
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT)
+
+from tests.benchmarks.synthetic_data import SyntheticDataset
+
+# Modules whose module-level client/collections serve the benchmarked paths
+BENCHMARKED_MODULES = [
+    "app.features.cdn.cdn_mongo",
+    "app.features.posting.queue_builder",
+    "app.features.uploadtracker.routes_uploadtracker",
+    "app.features.analytics.route_analytics",
+    "app.features.lead.route_lead",
+]
+
+S3_SERVICE_PATH = os.path.join(ROOT, "app", "features", "cdn", "s3_service.py")
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+ADMIN_AUTH = {"groups": ["ADMIN"], "user_id": "bench-admin"}
+
+
+def _bench_client():
+    url = os.getenv("BENCH_MONGODB_URL")
+    if url:
+        if urlparse(url).hostname not in LOCAL_HOSTS:
+            pytest.exit(f"BENCH_MONGODB_URL must point at localhost, got {url}", returncode=2)
+        return AsyncIOMotorClient(url, serverSelectionTimeoutMS=2000), "mongod"
+    mongomock_motor = pytest.importorskip("mongomock_motor", reason="set BENCH_MONGODB_URL or install mongomock-motor")
+    return mongomock_motor.AsyncMongoMockClient(), "mongomock"
+
+
+def _rebind(module, client, monkeypatch):
+    """Point a module's Motor client, databases and collections at client."""
+    for name, value in list(vars(module).items()):
+        if isinstance(value, AsyncIOMotorClient):
+            monkeypatch.setattr(module, name, client)
+        elif isinstance(value, AsyncIOMotorDatabase):
+            monkeypatch.setattr(module, name, client[value.name])
+        elif isinstance(value, AsyncIOMotorCollection):
+            monkeypatch.setattr(module, name, client[value.database.name][value.name])
+
+
+@pytest.fixture(scope="session")
+def bench_loop():
+    """One event loop for every benchmark round (Motor binds to it)."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(bench_loop):
+    """Run a coroutine to completion on the benchmark loop."""
+    return bench_loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    return SyntheticDataset(
+        clients=int(os.getenv("BENCH_CLIENTS", "100")),
+        sessions=int(os.getenv("BENCH_SESSIONS", "6")),
+        files=int(os.getenv("BENCH_FILES", "8")),
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_db(run, dataset):
+    """
+    Load the synthetic dataset and rebind the benchmarked modules to it.
+
+    Yields:
+        Motor-compatible client holding the dataset
+    """
+    client, backend = _bench_client()
+    monkeypatch = pytest.MonkeyPatch()
+
+    # Thumbnail S3 access is not benchmarked. routes_cdn builds an
+    # S3Service (and probes the bucket) when app.features.cdn is first
+    # imported, so load s3_service on its own and disable the probe
+    # before the package is imported
+    if "app.features.cdn" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("app.features.cdn.s3_service", S3_SERVICE_PATH)
+        s3_service = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = s3_service
+        spec.loader.exec_module(s3_service)
+    s3_service = sys.modules["app.features.cdn.s3_service"]
+    monkeypatch.setattr(s3_service.S3Service, "__init__", lambda self: setattr(self, "s3_client", None))
+
+    if backend == "mongod":
+        try:
+            run(client.admin.command("ping"))
+        except Exception as e:
+            pytest.skip(f"local mongod unavailable: {e}")
+
+    for module_name in BENCHMARKED_MODULES:
+        _rebind(importlib.import_module(module_name), client, monkeypatch)
+
+    run(dataset.load(client))
+    yield client
+
+    monkeypatch.undo()
+    if backend == "mongod":
+        client.close()
@@ -0,0 +1,278 @@
+"""
+Synthetic Benchmark Data
+
+Generates a realistic, seeded dataset in the shapes the app reads:
+N clients x sessions x files across the four upload collections, plus
+client profiles, content_data analytics, partners, queues, tasks and
+timesheets.
+
+Collections:
+- UploadDB: Uploads, Saved, Spotlights, Content_Dump
+- ClientDb: ClientInfo, content_data
+- Partners: ReferredBy, MonetizedBy
+- QueueDB: Queue
+- Opps: Employees, Tasks, time_track
+
+Usage:
+    dataset = SyntheticDataset(clients=200, sessions=6, files=8)
+    await dataset.load(client)
+
+Author: Snapped Development Team
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+UPLOAD_COLLECTIONS = ["Uploads", "Saved", "Spotlights", "Content_Dump"]
+
+TIMEZONES = [
+    "America/New_York",
+    "America/Chicago",
+    "America/Denver",
+    "America/Los_Angeles",
+]
+
+PARTNERS = ["Snapped", "Velocity", "Northstar", "Brightline"]
+
+# Time-of-day suffixes recognised by QueueBuilder._get_time_extension
+TIME_EXTENSIONS = ["", "", "-m", "-a", "-e", "-l"]
+
+
+@dataclass
+class SyntheticDataset:
+    """
+    Seeded generator for benchmark documents.
+
+    Attributes:
+        clients: Number of clients
+        sessions: Sessions per client per upload collection
+        files: Files per session
+        seed: Random seed
+        today: Anchor date; session dates fall on and before it
+    """
+
+    clients: int = 100
+    sessions: int = 6
+    files: int = 8
+    seed: int = 7
+    today: datetime = field(default_factory=lambda: datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0))
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+        self.client_ids = [f"bm{10000000 + i}" for i in range(self.clients)]
+
+    def session_dates(self) -> List[datetime]:
+        """Session dates, newest first, starting today."""
+        return [self.today - timedelta(days=2 * s) for s in range(self.sessions)]
+
+    def _file(self, client_id: str, collection_name: str, session_id: str, seq: int, day: datetime) -> Dict:
+        is_video = self.rng.random() < 0.7
+        extension = self.rng.choice(TIME_EXTENSIONS)
+        file_name = f"{client_id}_{seq:04d}{extension}.{'mp4' if is_video else 'jpg'}"
+        size = self.rng.uniform(0.5, 90)
+        return {
+            "file_name": file_name,
+            "file_type": "video" if is_video else "image",
+            "file_size": int(size * 1024 * 1024),
+            "file_size_human": f"{size:.2f} MB",
+            "CDN_link": f"https://c.snapped.cc/sc/{client_id}/{collection_name}/{session_id}/{file_name}",
+            "caption": "",
+            "seq_number": seq,
+            "is_thumbnail": seq == 0,
+            "upload_time": day + timedelta(seconds=seq),
+            "video_length": round(self.rng.uniform(2, 60), 2) if is_video else 0,
+            "is_indexed": False,
+            "content_matches": [],
+            "content_matches_status": "pending",
+        }
+
+    def upload_document(self, client_id: str, collection_name: str, snap_id: str) -> Dict:
+        """Build one client document for an upload collection."""
+        sessions = []
+        for day in self.session_dates():
+            if collection_name == "Content_Dump":
+                session_id = f"CONTENTDUMP_{client_id}_{day:%m%d%Y}"
+            else:
+                session_id = f"F({day:%m-%d-%Y})_{client_id}"
+            files = [self._file(client_id, collection_name, session_id, seq, day) for seq in range(self.files)]
+            videos = [f for f in files if f["file_type"] == "video"]
+            sessions.append({
+                "session_id": session_id,
+                "folder_id": f"{self.rng.getrandbits(64):016x}",
+                "folder_path": f"sc/{client_id}/{collection_name.upper()}/{session_id}/",
+                "scan_date": day,
+                "upload_date": day,
+                "content_type": "SPOTLIGHT" if collection_name == "Spotlights" else "STORY",
+                "total_files_count": len(files),
+                "total_files_size_human": f"{sum(f['file_size'] for f in files) / 1024 / 1024:.2f} MB",
+                "total_images": len(files) - len(videos),
+                "total_videos": len(videos),
+                "all_video_length": round(sum(f["video_length"] for f in videos), 2),
+                "editor_note": "",
+                "approved": self.rng.random() < 0.5,
+                "queued": False,
+                "total_session_views": self.rng.randint(0, 100000),
+                "avrg_session_view_time": round(self.rng.uniform(0, 30), 2),
+                "files": files,
+            })
+        return {
+            "client_ID": client_id,
+            "snap_ID": snap_id,
+            "timezone": self.rng.choice(TIMEZONES),
+            "last_updated": self.today,
+            "sessions": sessions,
+        }
+
+    def client_info_document(self, client_id: str, snap_id: str) -> Dict:
+        """Build one ClientInfo lead/profile document."""
+        first, last = f"First{client_id[-4:]}", f"Last{client_id[-4:]}"
+        return {
+            "client_id": client_id,
+            "snap_id": snap_id,
+            "First_Legal_Name": first,
+            "Last_Legal_Name": last,
+            "Preferred_Name": f"{first} {last}" if self.rng.random() < 0.5 else None,
+            "Stage_Name": f"{first.lower()}.{last.lower()}",
+            "Email_Address": f"{client_id}@example.com",
+            "DOB": f"{self.rng.randint(1980, 2004)}-{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}",
+            "Timezone": self.rng.choice(TIMEZONES),
+            "IG_Username": f"ig_{client_id}",
+            "IG_Followers": self.rng.randint(1000, 5000000),
+            "IG_Verified": self.rng.random() < 0.2,
+            "IG_Engagement": round(self.rng.uniform(0, 12), 2),
+            "TT_Username": f"tt_{client_id}",
+            "TT_Followers": self.rng.randint(1000, 5000000),
+            "YT_Username": f"yt_{client_id}",
+            "YT_Followers": self.rng.randint(0, 1000000),
+            "Snap_Username": snap_id,
+            "Snap_Followers": self.rng.randint(1000, 2000000),
+            "Snap_Star": self.rng.random() < 0.3,
+            "Snap_Monetized": self.rng.random() < 0.3,
+            "is_signed": self.rng.random() < 0.6,
+        }
+
+    def content_data_document(self, client_id: str, snap_id: str) -> Dict:
+        """Build one content_data analytics document with 30 daily sessions."""
+        sessions = []
+        for d in range(30):
+            day = self.today - timedelta(days=d)
+            sessions.append({
+                "date": f"{day:%m-%d-%Y}",
+                "metrics": {
+                    "views": {
+                        "story_views": self.rng.randint(0, 200000),
+                        "impressions": self.rng.randint(0, 400000),
+                        "reach": self.rng.randint(0, 150000),
+                        "profile_views": self.rng.randint(0, 5000),
+                        "spotlight_views": self.rng.randint(0, 100000),
+                        "saved_story_views": self.rng.randint(0, 20000),
+                    },
+                    "time_metrics": {"snap_view_time": self.rng.randint(0, 500000)},
+                    "engagement": {"shares": self.rng.randint(0, 2000), "replies": self.rng.randint(0, 500)},
+                },
+            })
+        return {
+            "client_id": client_id,
+            "user_id": client_id,
+            "platform": "snapchat",
+            "snap_profile_name": snap_id,
+            "sessions": sessions,
+        }
+
+    def timesheet_document(self, user_id: str) -> Dict:
+        """Build one time_track document with two invoices."""
+        invoices = []
+        for invoice in range(2):
+            start = self.today - timedelta(days=28 - 14 * invoice)
+            days = []
+            for d in range(10):
+                entries = [{
+                    "hours": self.rng.randint(0, 8),
+                    "minutes": self.rng.choice([0, 15, 30, 45]),
+                    "description": "Editing",
+                    "hourly_rate": 20,
+                    "earnings": round(self.rng.uniform(20, 160), 2),
+                    "status": "active",
+                } for _ in range(self.rng.randint(1, 3))]
+                days.append({"date": (start + timedelta(days=d)).date().isoformat(), "entries": entries})
+            invoices.append({
+                "start_date": start,
+                "days": days,
+                "submitted": invoice == 0,
+                "total_earnings": round(sum(e["earnings"] for day in days for e in day["entries"]), 2),
+            })
+        return {"user_id": user_id, "invoices": invoices}
+
+    def documents(self) -> Dict[Tuple[str, str], List[Dict]]:
+        """
+        Build every document, keyed by (database, collection).
+
+        Returns:
+            dict: (database, collection) -> documents
+        """
+        docs: Dict[Tuple[str, str], List[Dict]] = {}
+        employees = [f"em{20000000 + i}" for i in range(max(1, self.clients // 20))]
+
+        for i, client_id in enumerate(self.client_ids):
+            snap_id = f"snap_{client_id}"
+            for collection_name in UPLOAD_COLLECTIONS:
+                docs.setdefault(("UploadDB", collection_name), []).append(
+                    self.upload_document(client_id, collection_name, snap_id)
+                )
+            docs.setdefault(("ClientDb", "ClientInfo"), []).append(self.client_info_document(client_id, snap_id))
+            docs.setdefault(("ClientDb", "content_data"), []).append(self.content_data_document(client_id, snap_id))
+
+            partner = PARTNERS[i % len(PARTNERS)]
+            docs.setdefault(("Partners", "ReferredBy"), []).append(
+                {"client_id": client_id, "partner_name": partner, "company_id": partner.lower()}
+            )
+            if i % 3 == 0:
+                docs.setdefault(("Partners", "MonetizedBy"), []).append(
+                    {"client_id": client_id, "partner_name": partner}
+                )
+
+        docs[("Opps", "Employees")] = [
+            {"user_id": user_id, "name": f"Employee {user_id}", "client_ids": self.client_ids[n::len(employees)]}
+            for n, user_id in enumerate(employees)
+        ]
+        docs[("Opps", "time_track")] = [self.timesheet_document(user_id) for user_id in employees]
+        docs[("Opps", "Tasks")] = [
+            {
+                "title": f"Task {n}",
+                "status": self.rng.choice(["pending", "in_progress", "completed"]),
+                "due_date": self.today + timedelta(days=self.rng.randint(-5, 10)),
+                "assignees": [{"user_id": self.rng.choice(employees)}],
+                "client_id": self.rng.choice(self.client_ids),
+            }
+            for n in range(self.clients * 2)
+        ]
+        docs[("QueueDB", "Queue")] = [
+            {
+                "queue_date": (self.today - timedelta(days=d)).date().isoformat(),
+                "status": "completed",
+                "client_queues": {},
+                "total_posts": 0,
+            }
+            for d in range(1, 8)
+        ]
+        return docs
+
+    async def load(self, client) -> Dict[Tuple[str, str], int]:
+        """
+        Replace the benchmark collections with a fresh dataset.
+
+        Args:
+            client: Motor-compatible client
+
+        Returns:
+            dict: (database, collection) -> inserted count
+        """
+        counts = {}
+        for (db_name, collection_name), documents in self.documents().items():
+            collection = client[db_name][collection_name]
+            await collection.delete_many({})
+            await collection.insert_many(documents)
+            counts[(db_name, collection_name)] = len(documents)
+        return counts
@@ -0,0 +1,180 @@
+"""
+Hot Path Benchmarks
+
+pytest-benchmark cases for the heaviest services and endpoints, run
+against the synthetic dataset from conftest. Endpoint functions are
+called directly with admin auth, so timings cover the MongoDB work and
+Python post-processing but not HTTP or auth.
+
+See conftest.py for backends and baseline comparison.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.requests import Request
+
+from app.shared.responses import dumps
+from tests.benchmarks.conftest import ADMIN_AUTH
+from tests.benchmarks.synthetic_data import UPLOAD_COLLECTIONS, SyntheticDataset
+
+# Client with a long history, for the paged folder tree
+LARGE_CLIENT_ID = "bm99999999"
+LARGE_CLIENT_SESSIONS = 500
+
+
+def get_request(headers=()):
+    """Build a bare GET request for endpoints that read request headers."""
+    return Request({"type": "http", "method": "GET", "headers": [
+        (name.encode(), value.encode()) for name, value in headers
+    ]})
+
+
+def test_get_folder_tree(benchmark, bench_db, run, dataset):
+    from app.features.cdn.cdn_mongo import CDNMongoService
+
+    service = CDNMongoService()
+    folders = benchmark(lambda: run(service.get_folder_tree(auth_data=ADMIN_AUTH)))
+
+    assert [f["name"] for f in folders] == UPLOAD_COLLECTIONS
+    assert len(folders[0]["contents"]) == len(dataset.client_ids)
+    client_folders = run(service.get_folder_tree(client_id=dataset.client_ids[0], auth_data=ADMIN_AUTH))
+    assert len(client_folders[0]["contents"][0]["contents"]) == dataset.sessions
+
+
+@pytest.fixture(scope="module")
+def large_client(bench_db, run, dataset):
+    """A client with LARGE_CLIENT_SESSIONS sessions in Uploads."""
+    history = SyntheticDataset(clients=1, sessions=LARGE_CLIENT_SESSIONS, files=dataset.files)
+    uploads = bench_db["UploadDB"]["Uploads"]
+    run(uploads.insert_one(history.upload_document(LARGE_CLIENT_ID, "Uploads", f"snap_{LARGE_CLIENT_ID}")))
+    yield LARGE_CLIENT_ID
+    run(uploads.delete_many({"client_ID": LARGE_CLIENT_ID}))
+
+
+def test_folder_tree_large_client_full(benchmark, run, large_client):
+    from app.features.cdn.cdn_mongo import CDNMongoService
+
+    # Baseline: the whole tree for one client, every session and file
+    service = CDNMongoService()
+    folders = benchmark(lambda: run(service.get_folder_tree(client_id=large_client, auth_data=ADMIN_AUTH)))
+    benchmark.extra_info["bytes"] = len(dumps(folders))
+    assert len(folders[0]["contents"][0]["contents"]) == LARGE_CLIENT_SESSIONS
+
+
+def test_folder_tree_large_client_paged(benchmark, run, large_client):
+    from app.features.cdn.cdn_mongo import CDNMongoService
+
+    # Expanding the client: first page of sessions, then one session's files
+    service = CDNMongoService()
+
+    def expand():
+        sessions = run(service.get_tree_sessions("Uploads", large_client, ADMIN_AUTH))
+        files = run(service.get_tree_files("Uploads", large_client, sessions["items"][0]["name"], ADMIN_AUTH))
+        return sessions, files
+
+    sessions, files = benchmark(expand)
+    page_bytes = len(dumps(sessions)) + len(dumps(files))
+    full_bytes = len(dumps(run(service.get_folder_tree(client_id=large_client, auth_data=ADMIN_AUTH))))
+    benchmark.extra_info["bytes"] = page_bytes
+    benchmark.extra_info["full_tree_bytes"] = full_bytes
+    assert sessions["total"] == LARGE_CLIENT_SESSIONS and sessions["next_offset"] == len(sessions["items"])
+    assert "contents" not in sessions["items"][0]
+    assert len(files["items"]) == sessions["items"][0]["file_count"]
+    assert page_bytes * 20 < full_bytes
+
+
+def test_get_folder_tree_single_client(benchmark, bench_db, run, dataset):
+    from app.features.cdn.cdn_mongo import CDNMongoService
+
+    service = CDNMongoService()
+    client_id = dataset.client_ids[len(dataset.client_ids) // 2]
+    folders = benchmark(lambda: run(service.get_folder_tree(client_id=client_id, auth_data=ADMIN_AUTH)))
+    assert all(len(f["contents"]) == 1 for f in folders)
+
+
+def test_get_users(benchmark, bench_db, run, dataset):
+    from app.features.cdn.cdn_mongo import CDNMongoService, user_directory_cache
+
+    service = CDNMongoService()
+    try:
+        run(service.load_users(ADMIN_AUTH))
+    except Exception as e:
+        pytest.skip(f"aggregation not supported by this backend: {e}")
+
+    def load():
+        # Uncached: the $unionWith aggregation itself
+        run(user_directory_cache.invalidate_all(local=True))
+        return run(service.get_users(ADMIN_AUTH))
+
+    users = benchmark(load)
+    assert [u["client_id"] for u in users] == sorted(dataset.client_ids)
+    assert users[0]["content_types"] == sorted(UPLOAD_COLLECTIONS)
+
+
+def test_list_folders_not_modified(benchmark, bench_db, run, dataset):
+    from app.features.cdn.cdn_mongo import list_folders
+
+    # A dashboard poll whose copy is current: 304 before the tree is built
+    first = run(list_folders(get_request(), auth_data=ADMIN_AUTH))
+    polled = get_request([("if-none-match", first.headers["etag"])])
+    response = benchmark(lambda: run(list_folders(polled, auth_data=ADMIN_AUTH)))
+    assert response.status_code == 304
+
+
+def test_build_daily_queue(benchmark, bench_db, run, dataset):
+    from app.features.posting.queue_builder import QueueBuilder
+
+    uploads = bench_db["UploadDB"]["Uploads"]
+    pristine = dataset.documents()[("UploadDB", "Uploads")]
+
+    def reset():
+        # Each build marks today's sessions as queued
+        async def restore():
+            await uploads.delete_many({})
+            await uploads.insert_many([dict(doc) for doc in pristine])
+        run(restore())
+
+    builder = QueueBuilder()
+    queue_date = datetime.combine(dataset.today.date(), datetime.min.time())
+    queue = benchmark.pedantic(
+        lambda: run(builder.build_daily_queue(queue_date)),
+        setup=reset,
+        rounds=5,
+        iterations=1,
+    )
+    assert queue["total_posts"] > 0
+
+
+def test_get_upload_activity(benchmark, bench_db, run, dataset):
+    from app.features.uploadtracker.routes_uploadtracker import get_upload_activity
+
+    try:
+        first = run(get_upload_activity(get_request(), ADMIN_AUTH))
+    except Exception as e:
+        pytest.skip(f"aggregation not supported by this backend: {e}")
+    response = benchmark(lambda: run(get_upload_activity(get_request(), ADMIN_AUTH)))
+    assert response.status_code == 200
+    revalidated = run(get_upload_activity(get_request([("if-none-match", first.headers["etag"])]), ADMIN_AUTH))
+    assert revalidated.status_code == 304
+
+
+def test_get_mobile_analytics(benchmark, bench_db, run, dataset):
+    from app.features.analytics.route_analytics import get_mobile_analytics
+
+    user_ids = ",".join(dataset.client_ids)
+    try:
+        run(get_mobile_analytics(user_ids=user_ids, user_id=None, days=30, auth_data=ADMIN_AUTH))
+    except Exception as e:
+        pytest.skip(f"aggregation not supported by this backend: {e}")
+    response = benchmark(
+        lambda: run(get_mobile_analytics(user_ids=user_ids, user_id=None, days=30, auth_data=ADMIN_AUTH))
+    )
+    assert response["status"] == "success"
+
+
+def test_get_leads_grid(benchmark, bench_db, run, dataset):
+    from app.features.lead.route_lead import get_leads_grid
+
+    response = benchmark(lambda: run(get_leads_grid({})))
+    assert response.status_code == 200
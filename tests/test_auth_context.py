@@ -0,0 +1,171 @@
+"""
+Test Request Auth Context
+
+This module tests that one request decodes the JWT and resolves the
+partner filter at most once, no matter how many auth dependencies and
+filter_by_partner calls the route uses, and that later requests are
+served from the ACL cache until it is invalidated.
+"""
+
+import asyncio
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.shared import rate_limit
+from app.shared.auth import auth as auth_module
+from app.shared.auth import cognito
+from app.shared.auth import acl_cache as acl_module
+from app.shared.auth import get_current_user_group, get_filtered_query, filter_by_partner
+from app.features.tasks.routes_tasks import get_current_user_group as get_task_user_group
+
+EMPLOYEE = {"user_id": "tj10021994", "clients": ["client_a", "client_b"]}
+CLIENTS = [{"client_id": "client_a"}]
+
+
+class CountingCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class CountingCollection:
+    """Minimal async collection that counts every query."""
+
+    def __init__(self, docs, calls):
+        self.docs = docs
+        self.calls = calls
+
+    def find(self, query, projection=None):
+        self.calls["db"] += 1
+        field, condition = next(iter(query.items()))
+        return CountingCursor([d for d in self.docs if d.get(field) in condition["$in"]])
+
+
+class CountingClient:
+    def __init__(self, calls):
+        self.collections = {
+            "Employees": CountingCollection([EMPLOYEE], calls),
+            "ClientInfo": CountingCollection(CLIENTS, calls),
+        }
+
+    def __getitem__(self, db_name):
+        return self.collections
+
+
+@pytest.fixture
+def signing_key():
+    """Generate an RSA key and publish it as the Cognito JWK set"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key()))
+    jwk["kid"] = "test-kid"
+    cognito._store_jwks({"keys": [jwk]})
+    cognito.token_cache.clear()
+    yield key
+    cognito.token_cache.clear()
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Count JWT decodes and DB queries"""
+    counts = {"decode": 0, "db": 0}
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        counts["decode"] += 1
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+    monkeypatch.setattr(auth_module, "async_client", CountingClient(counts))
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: None)
+    monkeypatch.setattr(acl_module, "get_redis", lambda: None)
+    acl_module.acl_cache.l1.clear()
+    return counts
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(rate_limit.RateLimitMiddleware)
+
+    @app.get("/api/clients")
+    async def list_clients(
+        filter_query: dict = Depends(get_filtered_query),
+        auth_data: dict = Depends(get_current_user_group),
+        task_auth: dict = Depends(get_task_user_group)
+    ):
+        # Routes commonly resolve the filter again themselves
+        again = await filter_by_partner(auth_data)
+        assert again == filter_query
+        return {"filter": filter_query, "user_id": task_auth["user_id"]}
+
+    return TestClient(app)
+
+
+def make_token(key) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {
+            "custom:UserID": EMPLOYEE["user_id"],
+            "cognito:groups": ["employee"],
+            "aud": cognito.COGNITO_APP_CLIENT_ID,
+            "iss": cognito.COGNITO_ISSUER,
+            "iat": now,
+            "exp": now + 300,
+        },
+        key,
+        algorithm="RS256",
+        headers={"kid": "test-kid"},
+    )
+
+
+def test_single_decode_and_filter_per_request(client, calls, signing_key):
+    """Middleware verification is reused by every auth dependency"""
+    headers = {"Authorization": f"Bearer {make_token(signing_key)}"}
+
+    response = client.get("/api/clients", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "filter": {"client_id": {"$in": ["client_a"]}},
+        "user_id": EMPLOYEE["user_id"],
+    }
+    # One verified decode in the middleware, one employee lookup + one ClientInfo query
+    assert calls == {"decode": 1, "db": 2}
+
+    # Same session again: claims from the token cache, filter from the ACL cache
+    calls.update(decode=0, db=0)
+    response = client.get("/api/clients", headers=headers)
+    assert response.status_code == 200
+    assert calls == {"decode": 0, "db": 0}
+
+
+def test_acl_invalidation_forces_resolution(client, calls, signing_key):
+    """Assignment changes drop the cached filter for that employee"""
+    headers = {"Authorization": f"Bearer {make_token(signing_key)}"}
+    client.get("/api/clients", headers=headers)
+
+    asyncio.run(acl_module.invalidate_employee_acl(EMPLOYEE["user_id"]))
+    calls.update(db=0)
+    response = client.get("/api/clients", headers=headers)
+    assert response.status_code == 200
+    assert calls["db"] == 2
+
+
+def test_unverified_fallback_decodes_once(client, calls, signing_key, monkeypatch):
+    """Without middleware claims the dependencies still share one decode"""
+    async def reject(token):
+        raise jwt.InvalidTokenError("rejected")
+
+    monkeypatch.setattr(rate_limit, "validate_token", reject)
+    headers = {"Authorization": f"Bearer {make_token(signing_key)}"}
+
+    response = client.get("/api/clients", headers=headers)
+    assert response.status_code == 200
+    assert calls == {"decode": 1, "db": 2}
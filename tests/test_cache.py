@@ -0,0 +1,105 @@
+"""
+Test Cache Module
+
+This module tests the read-through cache and the client directory built
+on it: concurrent misses share one load, Redis serves other workers,
+negative results stay in worker memory, invalidation reaches both
+levels, and client identifiers resolve through one projected lookup.
+"""
+
+import asyncio
+
+import pytest
+
+from app.shared import cache as cache_module
+from app.shared import directory
+from app.shared.cache import ReadThroughCache
+from app.shared.directory import ClientDirectory
+
+fakeredis = pytest.importorskip("fakeredis")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def test_concurrent_misses_share_one_load(monkeypatch):
+    monkeypatch.setattr(cache_module, "get_redis", lambda: None)
+    cache = ReadThroughCache("test")
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"client_id": "jd01011990"}
+
+    async def scenario():
+        results = await asyncio.gather(*[cache.get_or_load("jd", loader) for _ in range(10)])
+        results[0]["client_id"] = "changed"
+        return results, await cache.get_or_load("jd", loader)
+
+    results, cached = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results[1] == cached == {"client_id": "jd01011990"}
+
+
+def test_redis_level_and_invalidation(monkeypatch):
+    async def scenario():
+        redis_client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        monkeypatch.setattr(cache_module, "get_redis", lambda: redis_client)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return None if len(calls) == 1 else ["a", "b"]
+
+        worker_a, worker_b = ReadThroughCache("test"), ReadThroughCache("test")
+        missing = await worker_a.get_or_load("all", loader)
+        # Negative result is not shared: the second worker loads
+        loaded = await worker_b.get_or_load("all", loader)
+        # ...and a third worker is served from Redis
+        shared = await ReadThroughCache("test").get_or_load("all", loader)
+
+        await worker_b.invalidate_all()
+        stored = await redis_client.keys("cache:test:*")
+        return missing, loaded, shared, len(calls), stored
+
+    missing, loaded, shared, calls, stored = asyncio.run(scenario())
+    assert missing is None
+    assert loaded == shared == ["a", "b"]
+    assert calls == 2
+    assert stored == []
+
+
+def test_client_directory_resolves_identifiers(monkeypatch):
+    monkeypatch.setattr(cache_module, "get_redis", lambda: None)
+    collection = mongomock_motor.AsyncMongoMockClient()["ClientDb"]["ClientInfo"]
+    monkeypatch.setattr(directory, "client_info", collection)
+    clients = ClientDirectory()
+
+    async def scenario():
+        await collection.insert_many([
+            {"client_id": "jd01011990", "snap_id": "snap-1", "Email_Address": "Jane@Example.com",
+             "Username": "janedoe", "Timezone": "UTC", "notes": "not projected"},
+            {"client_ID": "ab02021991", "Email_Address": "old@example.com"},
+        ])
+        found = [
+            await clients.get("jd01011990"),
+            await clients.by_snap_id("snap-1"),
+            await clients.by_email("jane@example.COM"),
+            await clients.by_username("janedoe"),
+        ]
+        upper = await clients.get("ab02021991")
+
+        # Email moves to the other client; the writer invalidates the old owner
+        await clients.by_email("old@example.com")
+        await collection.update_one({"client_ID": "ab02021991"}, {"$set": {"Email_Address": "ab@example.com"}})
+        await collection.update_one({"client_id": "jd01011990"}, {"$set": {"Email_Address": "old@example.com"}})
+        await clients.invalidate("jd01011990")
+        await clients.invalidate("ab02021991")
+        moved = await clients.by_email("old@example.com")
+        return found, upper, moved, await clients.by_username("nobody")
+
+    found, upper, moved, nobody = asyncio.run(scenario())
+    assert all(record["client_id"] == "jd01011990" for record in found)
+    assert "notes" not in found[0] and "_id" not in found[0]
+    assert upper["client_ID"] == "ab02021991"
+    assert moved["client_id"] == "jd01011990"
+    assert nobody is None
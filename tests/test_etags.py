@@ -0,0 +1,91 @@
+"""
+Test ETags Module
+
+This module tests conditional GET handling: ETags follow the view, its
+version and the documents' last_updated stamps, stamps are read without
+the documents, If-None-Match lists and weak tags match, and 304s pass
+through the compression middleware intact.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.shared.compression import CompressionMiddleware
+from app.shared.etags import document_versions, etag_headers, etag_matches, make_etag, not_modified
+from app.shared.responses import FastJSONResponse
+
+DOC = {
+    "_id": ObjectId("65f000000000000000000001"),
+    "client_ID": "ab01012000",
+    "last_updated": datetime(2025, 4, 1, 6, 33, 31),
+    "sessions": [{"session_id": "F(04-01-2025)_ab01012000", "files": [{"file_name": "a.jpg", "caption": ""}]}]
+}
+
+
+def test_etag_tracks_view_and_stamps():
+    stamps = [[str(DOC["_id"]), DOC["client_ID"], DOC["last_updated"]]]
+    etag = make_etag("list-folders", 1, stamps)
+    assert etag.startswith('W/"')
+    assert make_etag("list-folders", 1, [list(stamps[0])]) == etag
+    assert make_etag("file-gallery", 1, stamps) != etag
+    assert make_etag("list-folders", 2, stamps) != etag
+
+    bumped = [[str(DOC["_id"]), DOC["client_ID"], datetime(2025, 4, 2)]]
+    assert make_etag("list-folders", 1, bumped) != etag
+
+
+def test_document_versions_read_stamps_only():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    collection = mongomock_motor.AsyncMongoMockClient()["UploadDB"]["Uploads"]
+    other = {**DOC, "_id": ObjectId("65f000000000000000000002"), "client_ID": "cd01012000"}
+
+    async def scenario():
+        await collection.insert_many([other, DOC])
+        versions = await document_versions(collection, {"client_ID": {"$type": "string"}})
+        scoped = await document_versions(collection, {"client_ID": "cd01012000"})
+        await collection.update_one({"client_ID": "ab01012000"}, {"$set": {"last_updated": datetime(2025, 4, 2)}})
+        return versions, scoped, await document_versions(collection, {"client_ID": {"$type": "string"}})
+
+    versions, scoped, bumped = asyncio.run(scenario())
+    assert versions == [
+        ["65f000000000000000000001", "ab01012000", DOC["last_updated"]],
+        ["65f000000000000000000002", "cd01012000", DOC["last_updated"]],
+    ]
+    assert scoped == versions[1:]
+    assert bumped[0][2] == datetime(2025, 4, 2)
+    assert make_etag("list-folders", 1, bumped) != make_etag("list-folders", 1, versions)
+
+
+def test_conditional_get_round_trip():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+    state = {"docs": [DOC]}
+
+    @app.get("/folders")
+    async def folders(request: Request):
+        etag = make_etag("folders", state["docs"])
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return FastJSONResponse({"folders": state["docs"]}, headers=etag_headers(etag))
+
+    client = TestClient(app)
+    first = client.get("/folders", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["etag"]
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    for header in (etag, etag.removeprefix("W/"), f'W/"other", {etag}', "*"):
+        polled = client.get("/folders", headers={"If-None-Match": header, "Accept-Encoding": "gzip"})
+        assert polled.status_code == 304
+        assert polled.content == b""
+        assert polled.headers["etag"] == etag
+
+    state["docs"] = [{**DOC, "last_updated": datetime(2025, 4, 2)}]
+    changed = client.get("/folders", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
@@ -0,0 +1,76 @@
+"""
+Test Executor Service Module
+
+This module tests the bounded media/CPU pools: results come back from
+both pool kinds, full pools reject work with 503, in-flight counts
+are released when work finishes, and the modules a spawned CPU worker
+imports leave the database client and web stack unloaded.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+from PIL import Image
+
+from app.shared.executors import BoundedPool, ExecutorBusy, ExecutorService
+from app.shared.imaging import square_thumbnail
+
+
+def test_cpu_pool_runs_in_process(tmp_path):
+    source = tmp_path / "wide.png"
+    target = tmp_path / "thumb.jpg"
+    Image.new("RGB", (800, 400), "red").save(source)
+
+    service = ExecutorService()
+
+    async def scenario():
+        try:
+            await service.run("cpu", square_thumbnail, str(source), str(target), 120)
+        finally:
+            await service.shutdown()
+
+    asyncio.run(scenario())
+    with Image.open(target) as thumb:
+        assert thumb.size == (120, 120)
+
+
+def test_cpu_task_modules_import_light():
+    # What a spawned worker imports to unpickle timed_call and its tasks
+    modules = ["app.shared.pool_worker", "app.shared.imaging", "app.shared.tabular",
+               "app.features.contracts.contract_pdf"]
+    script = (
+        "import importlib, json, sys\n"
+        f"for name in {modules!r}: importlib.import_module(name)\n"
+        "print(json.dumps(sorted(sys.modules)))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    loaded = json.loads(subprocess.run(
+        [sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True
+    ).stdout)
+    heavy = {"motor", "pymongo", "app.shared.database", "fastapi", "flask", "prometheus_client"}
+    assert heavy.isdisjoint(loaded)
+
+
+def test_full_pool_rejects_and_releases():
+    pool = BoundedPool("test", "thread", workers=1, max_pending=1)
+    gate = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(gate.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorBusy) as busy:
+            await pool.run(gate.wait, 5)
+        gate.set()
+        results = await asyncio.gather(*running)
+        return busy.value, results
+
+    busy, results = asyncio.run(scenario())
+    pool.shutdown()
+    assert busy.status_code == 503
+    assert results == [True, True]
+    assert pool.in_flight == 0
@@ -0,0 +1,68 @@
+"""
+Test HTTP Client Registry
+
+This module tests that outbound calls share one pooled session per
+event loop and reuse connections across calls.
+"""
+
+import asyncio
+
+from aiohttp import web
+
+from app.shared.http_clients import HTTPClientRegistry, http_session
+
+
+def test_connections_reused_across_calls():
+    async def scenario():
+        peers = set()
+
+        async def handler(request):
+            peers.add(request.transport.get_extra_info("peername"))
+            return web.Response(text="ok")
+
+        server = web.Application()
+        server.router.add_get("/", handler)
+        runner = web.AppRunner(server)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        registry = HTTPClientRegistry()
+        await registry.open()
+        try:
+            for _ in range(5):
+                async with registry.get().get(f"http://127.0.0.1:{port}/") as response:
+                    assert await response.text() == "ok"
+            assert registry.get() is registry.get("default")
+            assert registry.get("transfer") is not registry.get("default")
+        finally:
+            await registry.close()
+            await runner.cleanup()
+        return peers
+
+    # Five sequential calls, one keep-alive connection
+    assert len(asyncio.run(scenario())) == 1
+
+
+def test_sessions_are_per_loop():
+    registry = HTTPClientRegistry()
+
+    async def grab():
+        session = registry.get()
+        assert registry.get() is session
+        await registry.close()
+        assert session.closed
+        return session
+
+    assert asyncio.run(grab()) is not asyncio.run(grab())
+
+
+def test_http_session_leaves_session_open():
+    async def scenario():
+        async with http_session() as session:
+            pass
+        assert not session.closed
+        await session.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,37 @@
+"""
+Test HTTP Metrics Middleware
+
+This module tests that request latency and response sizes are recorded
+per route template and exposed on /metrics.
+"""
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.shared.metrics import HTTPMetricsMiddleware, metrics_router
+
+
+def test_latency_and_size_per_route_template():
+    router = APIRouter()
+
+    @router.get("/grid/{page}")
+    async def grid(page: int):
+        return {"rows": ["x" * 100] * page}
+
+    app = FastAPI()
+    app.add_middleware(HTTPMetricsMiddleware)
+    app.include_router(router, prefix="/api/leads")
+    app.include_router(metrics_router)
+    client = TestClient(app)
+
+    sizes = [len(client.get(f"/api/leads/grid/{page}").content) for page in (1, 50)]
+    client.get("/api/leads/missing")
+
+    body = client.get("/metrics").text
+    labels = 'method="GET",route="/api/leads/grid/{page}",status="200"'
+    assert f"http_request_duration_seconds_count{{{labels}}} 2.0" in body
+    assert f"http_response_bytes_sum{{{labels}}} {float(sum(sizes))}" in body
+    assert 'http_requests_in_progress{method="GET"} 0.0' in body
+    assert 'route="unmatched",status="404"' in body
+    # Scrapes themselves are not recorded
+    assert 'route="/metrics"' not in body
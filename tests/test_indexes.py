@@ -0,0 +1,63 @@
+"""
+Test Index Registry
+
+This module explains every registered hot query against a local mongod
+after applying the index registry, and fails if any of them is planned
+as a collection scan. Skipped when no local mongod is reachable.
+
+Usage:
+    MONGODB_TEST_URL=mongodb://localhost:27017 pytest tests/test_indexes.py
+"""
+
+import asyncio
+import os
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.shared.indexes import HOT_QUERIES, INDEX_REGISTRY, ensure_indexes, find_collection_scans
+
+MONGODB_TEST_URL = os.getenv("MONGODB_TEST_URL", "mongodb://localhost:27017")
+DB_PREFIX = "index_test_"
+
+
+@pytest.fixture(scope="module")
+def local_mongo_url():
+    """Skip unless a local mongod answers"""
+    probe = MongoClient(MONGODB_TEST_URL, serverSelectionTimeoutMS=500)
+    try:
+        probe.admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"No mongod at {MONGODB_TEST_URL}")
+    yield MONGODB_TEST_URL
+    for database in {database for database, _ in INDEX_REGISTRY}:
+        probe.drop_database(DB_PREFIX + database)
+    probe.close()
+
+
+def test_hot_queries_are_registered():
+    """Every hot query targets a collection with declared indexes"""
+    for query in HOT_QUERIES:
+        assert (query.database, query.collection) in INDEX_REGISTRY, query
+
+
+def test_no_hot_query_collscans(local_mongo_url):
+    """Hot queries use an index once the registry is applied"""
+    async def check():
+        client = AsyncIOMotorClient(local_mongo_url)
+        try:
+            # Collections must exist, otherwise explain reports EOF
+            for database, collection in INDEX_REGISTRY:
+                await client[DB_PREFIX + database][collection].insert_one({"seed": True})
+
+            await ensure_indexes(client, DB_PREFIX)
+            # Applying twice is a no-op
+            await ensure_indexes(client, DB_PREFIX)
+            return await find_collection_scans(client, DB_PREFIX)
+        finally:
+            client.close()
+
+    collscans = asyncio.run(check())
+    assert collscans == [], f"Hot queries planned as COLLSCAN: {collscans}"
@@ -0,0 +1,161 @@
+"""
+Test Invalidation Module
+
+This module tests the change stream invalidation bus: change documents
+become identifier-only events, published batches reach handlers on
+other workers (local drops only, own messages skipped, reset on
+subscribe), listeners outlive bad messages, and - against a local single-node replica set - writes to
+a watched collection reach handlers within a second.
+
+Usage:
+    MONGODB_REPLSET_URL="mongodb://localhost:27017/?replicaSet=rs0" pytest tests/test_invalidation.py
+"""
+
+import asyncio
+import os
+
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.shared import invalidation
+from app.shared.invalidation import InvalidationBus, InvalidationEvent, event_from_change, on_invalidation
+
+fakeredis = pytest.importorskip("fakeredis")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+MONGODB_REPLSET_URL = os.getenv("MONGODB_REPLSET_URL", "mongodb://localhost:27017/?replicaSet=rs0")
+DB_PREFIX = "invalidation_test_"
+
+
+@pytest.fixture
+def received(monkeypatch):
+    """Isolated handler registry recording (worker, events, local)"""
+    monkeypatch.setattr(invalidation, "_HANDLERS", [])
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(invalidation, "get_redis", lambda: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(invalidation, "create_pubsub_client", lambda: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+    calls = []
+
+    @on_invalidation("ClientDb.ClientInfo")
+    async def record(events, local):
+        calls.append(([(e.source, e.op, e.keys.get("client_id")) for e in events], local))
+
+    return calls
+
+
+def test_event_from_change_keeps_identifiers():
+    event = event_from_change({
+        "operationType": "update",
+        "ns": {"db": "test_ClientDb", "coll": "ClientInfo"},
+        "documentKey": {"_id": 1},
+        "fullDocument": {"client_id": "jd01011990", "Email_Address": "jane@example.com", "sessions": [], "snap_id": None},
+    }, db_prefix="test_")
+    assert event == InvalidationEvent(
+        "ClientDb.ClientInfo", "update", "1", {"client_id": "jd01011990", "Email_Address": "jane@example.com"}
+    )
+
+
+def test_event_from_change_keeps_changed_paths():
+    change = {
+        "operationType": "update",
+        "ns": {"db": "UploadDB", "coll": "Uploads"},
+        "documentKey": {"_id": 2},
+        "fullDocument": {"client_ID": "jd01011990"},
+        "changedFields": ["sessions.3.files.2.caption", "sessions.3.files.2.seq_number", "last_updated", "sessions.0"],
+    }
+    assert event_from_change(change).fields == ["last_updated", "sessions.0", "sessions.3"]
+    # Too many paths, or not an update: the whole document changed
+    many = {**change, "changedFields": [f"sessions.{i}" for i in range(101)]}
+    assert event_from_change(many).fields is None
+    assert event_from_change({**change, "operationType": "replace"}).fields is None
+
+
+def test_published_batches_reach_other_workers(received):
+    leases = mongomock_motor.AsyncMongoMockClient()
+
+    async def scenario():
+        leader = InvalidationBus(leases, owner="leader")
+        worker = InvalidationBus(leases, owner="worker")
+        listening = asyncio.create_task(worker.listen())
+        await asyncio.wait_for(worker.subscribed.wait(), 2)
+        await leader.publish([
+            InvalidationEvent("ClientDb.ClientInfo", "update", "1", {"client_id": "jd01011990"}),
+            InvalidationEvent("UploadDB.Uploads", "update", "2", {"client_ID": "jd01011990"}),
+        ])
+        await asyncio.sleep(0.2)
+        worker.stop()
+        await listening
+
+    asyncio.run(scenario())
+    reset, on_leader, on_worker = received
+    assert reset == ([("*", "reset", None)], True)
+    assert on_leader == ([("ClientDb.ClientInfo", "update", "jd01011990")], False)
+    assert on_worker == ([("ClientDb.ClientInfo", "update", "jd01011990")], True)
+
+
+def test_listener_resubscribes_after_a_bad_message(received, monkeypatch):
+    monkeypatch.setattr(invalidation, "REDIS_RETRY_INTERVAL", 0.01)
+    leases = mongomock_motor.AsyncMongoMockClient()
+
+    async def scenario():
+        leader = InvalidationBus(leases, owner="leader")
+        worker = InvalidationBus(leases, owner="worker")
+        listening = asyncio.create_task(worker.listen())
+        await asyncio.wait_for(worker.subscribed.wait(), 2)
+        await invalidation.get_redis().publish(invalidation.INVALIDATION_CHANNEL, "not json")
+        await asyncio.sleep(0.1)
+        await asyncio.wait_for(worker.subscribed.wait(), 2)
+        await leader.publish([InvalidationEvent("ClientDb.ClientInfo", "update", "1", {"client_id": "jd01011990"})])
+        await asyncio.sleep(0.2)
+        worker.stop()
+        await listening
+
+    asyncio.run(scenario())
+    assert received[-1] == ([("ClientDb.ClientInfo", "update", "jd01011990")], True)
+    assert received.count(([("*", "reset", None)], True)) == 2
+
+
+@pytest.fixture(scope="module")
+def replica_set_url():
+    """Skip unless a local replica set answers"""
+    probe = MongoClient(MONGODB_REPLSET_URL, serverSelectionTimeoutMS=500)
+    try:
+        if not probe.admin.command("hello").get("setName"):
+            pytest.skip(f"{MONGODB_REPLSET_URL} is not a replica set")
+    except PyMongoError:
+        pytest.skip(f"No replica set at {MONGODB_REPLSET_URL}")
+    yield MONGODB_REPLSET_URL
+    for database in [*invalidation.WATCHED_COLLECTIONS, "JobQueue"]:
+        probe.drop_database(DB_PREFIX + database)
+    probe.close()
+
+
+def test_writes_reach_handlers_within_a_second(received, replica_set_url):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    async def scenario():
+        client = AsyncIOMotorClient(replica_set_url)
+        bus = InvalidationBus(client, DB_PREFIX, owner="leader")
+        running = asyncio.create_task(bus.run())
+        try:
+            for _ in range(50):
+                if bus.is_leader:
+                    break
+                await asyncio.sleep(0.1)
+            # Let the streams open before writing
+            await asyncio.sleep(1)
+            received.clear()
+            await client[DB_PREFIX + "ClientDb"]["ClientInfo"].insert_one({"client_id": "jd01011990"})
+            await client[DB_PREFIX + "ClientDb"]["Unwatched"].insert_one({"client_id": "jd01011990"})
+            await asyncio.sleep(1)
+            return list(received), await bus.leases.find_one({"_id": "invalidation"})
+        finally:
+            bus.stop()
+            running.cancel()
+            await asyncio.gather(running, return_exceptions=True)
+            client.close()
+
+    calls, lease = asyncio.run(scenario())
+    assert calls == [([("ClientDb.ClientInfo", "insert", "jd01011990")], False)]
+    assert lease["resume_tokens"]["ClientDb"]
@@ -0,0 +1,156 @@
+"""
+Test Jobs Module
+
+This module tests the MongoDB job queue against an in-memory
+mongomock-motor collection: enqueue and duplicate suppression (also
+under concurrent enqueues), queue limits across workers, a worker
+running jobs, retries with backoff and permanent failures.
+"""
+
+import asyncio
+
+import pytest
+
+from pymongo import ASCENDING
+
+from app.shared import jobs
+from app.shared.jobs import JobWorker, PermanentJobError, enqueue, get_job, job
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+calls = []
+
+
+@job("test.echo", queue="default")
+async def echo_job(ctx, value):
+    ctx.update_progress(step="done")
+    calls.append(value)
+    return {"value": value}
+
+
+@job("test.flaky", queue="default", max_attempts=2)
+async def flaky_job(ctx):
+    raise RuntimeError(f"attempt {ctx.attempt}")
+
+
+@job("test.permanent", queue="default", max_attempts=5)
+async def permanent_job(ctx):
+    raise PermanentJobError("bad input")
+
+
+@job("test.posting", queue="posting")
+async def posting_job(ctx):
+    return None
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    db = mongomock_motor.AsyncMongoMockClient()["JobQueue"]
+    collection = db["Jobs"]
+    monkeypatch.setattr(jobs, "jobs_collection", collection)
+    monkeypatch.setattr(jobs, "leases_collection", db["Leases"])
+    calls.clear()
+    return collection
+
+
+def run(coro):
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+
+def test_enqueue_dedupes_active_jobs(collection):
+    async def scenario():
+        first = await enqueue(echo_job, key="c1", value=1)
+        second = await enqueue(echo_job, key="c1", value=2)
+        other = await enqueue(echo_job, key="c2", value=3)
+        forced = await enqueue(echo_job, key="c1", dedupe=False, value=4)
+        return first, second, other, forced
+
+    first, second, other, forced = run(scenario())
+    assert first == second
+    assert len({first, other, forced}) == 3
+
+
+def test_concurrent_enqueues_share_one_job(collection, monkeypatch):
+    lookup = jobs._active_job_id
+    checks = []
+
+    async def racing_lookup(name, key):
+        # The first check runs before the other enqueue's insert lands
+        checks.append(key)
+        return None if len(checks) == 1 else await lookup(name, key)
+
+    async def scenario():
+        await collection.create_index(
+            [("name", ASCENDING), ("key", ASCENDING)], unique=True, partialFilterExpression={"active": True}
+        )
+        first = await enqueue(echo_job, key="c1", value=1)
+        monkeypatch.setattr(jobs, "_active_job_id", racing_lookup)
+        second = await enqueue(echo_job, key="c1", value=2)
+        return first, second, await collection.count_documents({})
+
+    first, second, count = run(scenario())
+    assert first == second
+    assert count == 1
+
+
+def test_queue_limit_holds_across_workers(collection):
+    async def scenario():
+        await enqueue(posting_job, key="a")
+        await enqueue(posting_job, key="b")
+        workers = [JobWorker(["posting"], worker_id=f"w{i}") for i in range(3)]
+        claimed = await asyncio.gather(*[worker.claim("posting") for worker in workers])
+        running = [(worker, job_doc) for worker, job_doc in zip(workers, claimed) if job_doc]
+        assert len(running) == 1
+        # The slot is freed when the job finishes
+        await running[0][0].run_job(running[0][1])
+        return await workers[0].claim("posting")
+
+    assert run(scenario())["key"] in ("a", "b")
+
+
+def test_worker_runs_job_to_success(collection):
+    async def scenario():
+        job_id = await enqueue(echo_job, key="c1", value=7)
+        worker = JobWorker(["default"], worker_id="w1")
+        await worker.run_job(await worker.claim("default"))
+        return await get_job(job_id)
+
+    job_doc = run(scenario())
+    assert calls == [7]
+    assert job_doc["status"] == "succeeded"
+    assert job_doc["result"] == {"value": 7}
+    assert job_doc["progress"] == {"step": "done"}
+    assert "expires_at" in job_doc
+
+
+def test_failed_attempt_retries_with_backoff_then_fails(collection):
+    async def scenario():
+        job_id = await enqueue(flaky_job)
+        worker = JobWorker(["default"], worker_id="w1")
+        await worker.run_job(await worker.claim("default"))
+        retried = await get_job(job_id)
+
+        # Not due yet, then make it due
+        assert await worker.claim("default") is None
+        await collection.update_one({"_id": retried["_id"]}, {"$set": {"run_at": retried["created_at"]}})
+        await worker.run_job(await worker.claim("default"))
+        return retried, await get_job(job_id)
+
+    retried, failed = run(scenario())
+    assert retried["status"] == "queued"
+    assert retried["error"] == "RuntimeError: attempt 1"
+    assert failed["status"] == "failed"
+    assert failed["attempts"] == 2
+    assert failed["error"] == "RuntimeError: attempt 2"
+
+
+def test_permanent_error_skips_retries(collection):
+    async def scenario():
+        job_id = await enqueue(permanent_job)
+        worker = JobWorker(["default"], worker_id="w1")
+        await worker.run_job(await worker.claim("default"))
+        return await get_job(job_id)
+
+    job_doc = run(scenario())
+    assert job_doc["status"] == "failed"
+    assert job_doc["attempts"] == 1
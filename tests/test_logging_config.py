@@ -0,0 +1,51 @@
+"""
+Test Logging Configuration
+
+This module tests per-logger rate limiting, capped payload previews and
+that the queue handler leaves message formatting to the listener.
+"""
+
+import logging
+import queue
+
+from app.shared.logging_config import RateLimitFilter, _DeferredQueueHandler, capped
+
+
+def make_record(name: str, level: int, msg: str = "message", args=()):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_rate_limit_drops_info_but_not_warnings():
+    limiter = RateLimitFilter({"app.features.posting": 2})
+    name = "app.features.posting.queue_builder"
+
+    allowed = [limiter.filter(make_record(name, logging.INFO)) for _ in range(10)]
+    assert allowed.count(True) == 2
+    assert limiter.dropped[name] == 8
+
+    assert limiter.filter(make_record(name, logging.WARNING))
+    assert limiter.filter(make_record("app.features.cdn", logging.INFO))
+
+
+def test_capped_payload_is_bounded():
+    results = [{"_id": f"cl{i}", "sessions": list(range(100))} for i in range(1000)]
+    preview = str(capped(results))
+    assert len(preview) < 2000
+    assert preview.endswith("(1000 items)")
+
+
+def test_deferred_handler_does_not_format():
+    class Payload:
+        rendered = False
+
+        def __str__(self):
+            Payload.rendered = True
+            return "payload"
+
+    log_queue = queue.Queue()
+    handler = _DeferredQueueHandler(log_queue)
+    handler.handle(make_record("app", logging.INFO, "value: %s", (Payload(),)))
+
+    record = log_queue.get_nowait()
+    assert not Payload.rendered
+    assert record.getMessage() == "value: payload"
@@ -0,0 +1,215 @@
+"""
+Test Media Store Module
+
+This module tests the normalized media layout: sessions are mirrored
+into one document per file, single-file updates reach both layouts,
+reads follow the nested layout while it is written, re-mirroring skips
+unchanged sessions and rows and drops removed ones, and nested-layout
+changes queue one debounced mirror job per changed session (per client
+when the sessions array was replaced) while MediaStore's own tagged
+writes queue none. Database tests are skipped when no local mongod is
+reachable.
+
+Usage:
+    MONGODB_TEST_URL=mongodb://localhost:27017 pytest tests/test_media_store.py
+"""
+
+import asyncio
+import os
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.shared import jobs, media_store as media_store_module
+from app.shared.invalidation import InvalidationEvent
+from app.shared.media_store import (
+    MEDIA_WRITE_TAG,
+    MediaStore,
+    changed_session_indexes,
+    client_id_for_session,
+    collection_for_session
+)
+
+MONGODB_TEST_URL = os.getenv("MONGODB_TEST_URL", "mongodb://localhost:27017")
+DB_NAME = "media_store_test_UploadDB"
+
+SESSION_ID = "F(01-01-2024)_jd01011990"
+
+
+@pytest.fixture
+def local_mongo_url():
+    """Skip unless a local mongod answers"""
+    probe = MongoClient(MONGODB_TEST_URL, serverSelectionTimeoutMS=500)
+    try:
+        probe.admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"No mongod at {MONGODB_TEST_URL}")
+    probe.drop_database(DB_NAME)
+    yield MONGODB_TEST_URL
+    probe.drop_database(DB_NAME)
+    probe.close()
+
+
+def _store(url):
+    db = AsyncIOMotorClient(url)[DB_NAME]
+    return db["Uploads"], MediaStore({"Uploads": db["Uploads"]}, db["media_files"], db["sessions"])
+
+
+def _nested_doc():
+    return {
+        "client_ID": "jd01011990",
+        "sessions": [
+            {"session_id": SESSION_ID, "total_files_count": 2, "files": [
+                {"file_name": "0001.jpg", "seq_number": 1, "caption": ""},
+                {"file_name": "0002.mp4", "seq_number": 2, "caption": ""},
+            ]},
+            {"session_id": "F(01-02-2024)_jd01011990", "files": []},
+        ],
+    }
+
+
+def test_session_ids_route_to_collections():
+    assert collection_for_session("CONTENTDUMP_jd01011990") == "Content_Dump"
+    assert collection_for_session("F(01-01-2024)_jd01011990_SPOTLIGHT") == "Spotlights"
+    assert collection_for_session(SESSION_ID) == "Uploads"
+    assert collection_for_session("unknown") is None
+    assert client_id_for_session("F(01-01-2024)_jd01011990_SAVED") == "jd01011990"
+
+
+def test_updates_reach_both_layouts(local_mongo_url):
+    async def scenario():
+        nested, store = _store(local_mongo_url)
+        await nested.insert_one(_nested_doc())
+        # Not backfilled yet: read from the nested layout, mirrored on update
+        file = await store.get_file("Uploads", "jd01011990", SESSION_ID, "0002.mp4")
+        result = await store.update_file("Uploads", "jd01011990", SESSION_ID, "0002.mp4", {"caption": "hi"})
+        missing = await store.update_file("Uploads", "jd01011990", SESSION_ID, "0003.mp4", {"caption": "hi"})
+        changed = await store.set_sequence_numbers("Uploads", "jd01011990", SESSION_ID, {"0001.jpg": 2, "0002.mp4": 1})
+        files = await store.list_files("Uploads", "jd01011990", SESSION_ID, {"_id": 0, "file_name": 1, "caption": 1})
+        doc = await nested.find_one({"client_ID": "jd01011990"})
+        return file, result, missing, changed, files, doc["sessions"][0]["files"]
+
+    file, result, missing, changed, files, nested_files = asyncio.run(scenario())
+    assert file["seq_number"] == 2 and file["collection"] == "Uploads"
+    assert result.modified_count == 1
+    assert missing.matched_count == 0
+    assert changed == 2
+    assert files == [{"file_name": "0002.mp4", "caption": "hi"}, {"file_name": "0001.jpg", "caption": ""}]
+    assert [(f["file_name"], f["seq_number"], f["caption"]) for f in nested_files] == [
+        ("0001.jpg", 2, ""), ("0002.mp4", 1, "hi")
+    ]
+
+
+def test_mirror_client_rewrites_changed_sessions_only(local_mongo_url):
+    async def scenario():
+        nested, store = _store(local_mongo_url)
+        await nested.insert_one(_nested_doc())
+        first = await store.mirror_client("Uploads", "jd01011990")
+        unchanged = await store.mirror_client("Uploads", "jd01011990")
+        # A file removed and a session dropped by a nested-layout writer
+        await nested.update_one({"client_ID": "jd01011990"}, {"$set": {"sessions": [
+            {"session_id": SESSION_ID, "files": [{"file_name": "0001.jpg", "seq_number": 1}]}
+        ]}})
+        changed = await store.mirror_client("Uploads", "jd01011990")
+        files = await store.files.distinct("file_name")
+        sessions = await store.sessions.distinct("session_id")
+        return first, unchanged, changed, files, sessions
+
+    first, unchanged, changed, files, sessions = asyncio.run(scenario())
+    assert (first, unchanged, changed) == (2, 0, 1)
+    assert files == ["0001.jpg"]
+    assert sessions == [SESSION_ID]
+
+
+def test_reads_follow_the_nested_layout(local_mongo_url):
+    async def scenario():
+        nested, store = _store(local_mongo_url)
+        await nested.insert_one(_nested_doc())
+        await store.mirror_client("Uploads", "jd01011990")
+        await store.update_file("Uploads", "jd01011990", SESSION_ID, "0001.jpg", {"caption": "dual"})
+        # Added by a nested-layout writer, not mirrored yet
+        await nested.update_one(
+            {"client_ID": "jd01011990"},
+            {"$push": {"sessions.0.files": {"file_name": "0003.jpg", "seq_number": 3}}}
+        )
+        added = await store.get_file("Uploads", "jd01011990", SESSION_ID, "0003.jpg", {"_id": 0, "seq_number": 1})
+        names = [f["file_name"] for f in await store.list_files("Uploads", "jd01011990", SESSION_ID)]
+        before = {f["file_name"]: f["mirrored_at"] async for f in store.files.find()}
+        rewritten = await store.mirror_client("Uploads", "jd01011990")
+        after = {f["file_name"]: f["mirrored_at"] async for f in store.files.find()}
+        return added, names, rewritten, before, after
+
+    added, names, rewritten, before, after = asyncio.run(scenario())
+    assert added == {"seq_number": 3}
+    assert names == ["0001.jpg", "0002.mp4", "0003.jpg"]
+    assert rewritten == 1
+    # The dual-written and untouched rows are left alone
+    assert after["0001.jpg"] == before["0001.jpg"] and after["0002.mp4"] == before["0002.mp4"]
+    assert "0003.jpg" in after
+
+
+def test_nested_changes_queue_debounced_mirror_jobs(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    queue = mongomock_motor.AsyncMongoMockClient()["JobQueue"]["Jobs"]
+    monkeypatch.setattr(jobs, "jobs_collection", queue)
+    monkeypatch.setattr(media_store_module, "MEDIA_MIRROR_DEBOUNCE_SECONDS", 3600)
+    events = [
+        InvalidationEvent("UploadDB.Uploads", "update", "1", {"client_ID": "jd01011990"}),
+        InvalidationEvent("UploadDB.Uploads", "update", "1", {"client_ID": "jd01011990"}),
+        InvalidationEvent("UploadDB.media_files", "update", "2", {"client_ID": "jd01011990"}),
+    ]
+
+    async def scenario():
+        await media_store_module._nested_layout_changed(events, local=True)
+        await media_store_module._nested_layout_changed(events, local=False)
+        await media_store_module._nested_layout_changed(events, local=False)
+        return await queue.find({}, {"_id": 0, "name": 1, "args": 1}).to_list(None)
+
+    assert asyncio.run(scenario()) == [
+        {"name": "media_files.mirror_client", "args": {"collection": "Uploads", "client_id": "jd01011990"}}
+    ]
+
+
+def test_changed_paths_name_sessions():
+    assert changed_session_indexes(["last_updated", "sessions.3", "sessions.0"]) == {0, 3}
+    assert changed_session_indexes(["last_updated", "tt_sessions.1"]) == set()
+    assert changed_session_indexes(["sessions"]) is None
+    assert changed_session_indexes(None) is None
+
+
+def test_nested_changes_mirror_only_named_sessions(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    client = mongomock_motor.AsyncMongoMockClient()
+    queue = client["JobQueue"]["Jobs"]
+    nested = client["UploadDB"]["Uploads"]
+    monkeypatch.setattr(jobs, "jobs_collection", queue)
+    monkeypatch.setattr(media_store_module, "MEDIA_MIRROR_DEBOUNCE_SECONDS", 3600)
+    monkeypatch.setattr(media_store_module.media_store, "nested", {"Uploads": nested})
+    events = [
+        # A caption edit in the second session by a nested-layout writer
+        InvalidationEvent("UploadDB.Uploads", "update", "1", {"client_ID": "jd01011990"},
+                          ["last_updated", "sessions.1"]),
+        # MediaStore's own dual write: already in both layouts
+        InvalidationEvent("UploadDB.Uploads", "update", "1", {"client_ID": "jd01011990"},
+                          ["last_updated", MEDIA_WRITE_TAG, "sessions.0"]),
+        # Only client-level fields changed
+        InvalidationEvent("UploadDB.Uploads", "update", "1", {"client_ID": "jd01011990"}, ["snap_ID"]),
+        # A session pulled from another client: indexes shifted
+        InvalidationEvent("UploadDB.Uploads", "update", "2", {"client_ID": "ab01011990"}, ["sessions"]),
+        InvalidationEvent("UploadDB.Uploads", "update", "2", {"client_ID": "ab01011990"}, ["sessions.0"]),
+    ]
+
+    async def scenario():
+        await nested.insert_many([_nested_doc(), {"client_ID": "ab01011990", "sessions": []}])
+        await media_store_module._nested_layout_changed(events, local=False)
+        await media_store_module._nested_layout_changed(events[:1], local=False)
+        return await queue.find({}, {"_id": 0, "name": 1, "args": 1}).sort("name", 1).to_list(None)
+
+    assert asyncio.run(scenario()) == [
+        {"name": "media_files.mirror_client", "args": {"collection": "Uploads", "client_id": "ab01011990"}},
+        {"name": "media_files.mirror_session", "args": {
+            "collection": "Uploads", "client_id": "jd01011990", "session_id": "F(01-02-2024)_jd01011990"
+        }},
+    ]
@@ -0,0 +1,67 @@
+"""
+Test MongoDB Command Metrics
+
+This module tests that command events are attributed to the route
+template being served and exposed on /metrics.
+"""
+
+from types import SimpleNamespace
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.shared import mongo_metrics
+from app.shared.metrics import RequestContextMiddleware, metrics_router
+
+
+def run_command(listener, request_id, command, reply, duration_micros=1500):
+    """Feed a started/succeeded pair through the listener like PyMongo does"""
+    command_name = next(iter(command))
+    listener.started(SimpleNamespace(
+        command_name=command_name, command=command, database_name="UploadDB",
+        connection_id=("localhost", 27017), request_id=request_id
+    ))
+    listener.succeeded(SimpleNamespace(
+        command_name=command_name, reply=reply, duration_micros=duration_micros,
+        connection_id=("localhost", 27017), request_id=request_id
+    ))
+
+
+def test_commands_attributed_to_route(caplog):
+    listener = mongo_metrics.CommandMetricsListener()
+    router = APIRouter()
+
+    @router.get("/folders/{client_id}")
+    async def folders(client_id: str):
+        reply = {"cursor": {"firstBatch": [{"client_ID": client_id, "sessions": []}] * 3}, "ok": 1}
+        run_command(listener, 1, {"find": "Uploads", "filter": {"client_ID": client_id}}, reply)
+        run_command(listener, 2, {"find": "Uploads", "filter": {"client_ID": client_id}}, reply,
+                    duration_micros=int(mongo_metrics.MONGO_SLOW_QUERY_MS * 1000) + 1)
+        return {"ok": True}
+
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    app.include_router(router, prefix="/api/cdn-mongo")
+    app.include_router(metrics_router)
+    client = TestClient(app)
+
+    assert client.get("/api/cdn-mongo/folders/jd01011990").status_code == 200
+    assert listener.in_flight == {}
+
+    body = client.get("/metrics").text
+    labels = 'command="find",namespace="UploadDB.Uploads",route="/api/cdn-mongo/folders/{client_id}"'
+    assert f"mongo_command_duration_seconds_count{{{labels}}} 2.0" in body
+    assert f"mongo_command_documents_sum{{{labels}}} 6.0" in body
+    assert f"mongo_command_reply_bytes_count{{{labels}}} 2.0" in body
+
+    # Slow query log carries the filter shape, not its values
+    slow = [r.message for r in caplog.records if "Slow Mongo command" in r.message]
+    assert len(slow) == 1
+    assert "['client_ID']" in slow[0]
+    assert "jd01011990" not in slow[0]
+
+
+def test_commands_outside_requests():
+    listener = mongo_metrics.CommandMetricsListener()
+    run_command(listener, 3, {"createIndexes": "Queue"}, {"ok": 1})
+    assert listener.in_flight == {}
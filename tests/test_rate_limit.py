@@ -16,6 +16,7 @@ from datetime import datetime, timedelta
 
 from app.shared.rate_limit import (
     RateLimitMiddleware,
+    LocalTokenBucket,
     get_rate_limit,
     extract_token_from_header
 )
@@ -70,6 +71,20 @@ def test_get_rate_limit(mock_auth):
     default_limit = get_rate_limit(default_request)
     assert default_limit == "100/minute"  # Default limit
 
+def test_local_token_bucket():
+    """Test in-process fallback used when Redis is unavailable"""
+    bucket = LocalTokenBucket(max_keys=2)
+    
+    # Full bucket allows up to the limit, then rejects with retry hint
+    decisions = [bucket.consume("ip:/test", 3) for _ in range(4)]
+    assert [d["allowed"] for d in decisions] == [True, True, True, False]
+    assert decisions[-1]["retry_after"] >= 1
+    
+    # Keys are tracked independently and evicted least recently used
+    assert bucket.consume("ip:/other", 3)["allowed"]
+    assert bucket.consume("ip2:/test", 3)["allowed"]
+    assert "ip:/test" not in bucket.buckets
+
 @pytest.mark.asyncio
 async def test_basic_rate_limiting(client, mock_redis):
     """Test basic rate limiting functionality"""
@@ -0,0 +1,112 @@
+"""
+Test JSON Responses and Compression
+
+This module tests that FastJSONResponse matches FastAPI's default JSON
+output, serializes MongoDB types, and that responses are compressed
+according to Accept-Encoding.
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+
+import brotli
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.shared.compression import CompressionMiddleware, compress, negotiate_encoding
+from app.shared.responses import FastJSONResponse
+
+PAYLOAD = {
+    "folders": [
+        {
+            "name": f"cl{i}",
+            "last_updated": datetime(2024, 1, 2, 3, 4, 5, 123456),
+            "uploaded": datetime(2024, 1, 2, tzinfo=timezone.utc),
+            "total_files": i,
+            "is_thumbnail": False,
+            "caption": "émoji ✓",
+        }
+        for i in range(200)
+    ]
+}
+
+
+def test_matches_default_json_output():
+    expected = json.loads(JSONResponse(jsonable_encoder(PAYLOAD)).body)
+    assert json.loads(FastJSONResponse(PAYLOAD).body) == expected
+
+
+def test_serializes_object_ids():
+    oid = ObjectId()
+    body = json.loads(FastJSONResponse([{"_id": oid, "tags": {"a"}}]).body)
+    assert body == [{"_id": str(oid), "tags": ["a"]}]
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0") == "gzip"
+    assert negotiate_encoding("identity") == ""
+
+
+def build_client():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/big")
+    async def big():
+        return FastJSONResponse(PAYLOAD)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(50):
+                yield json.dumps({"chunk": i, "pad": "x" * 100}) + "\n"
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    @app.get("/events")
+    async def events():
+        async def chunks():
+            yield "data: hello\n\n" * 200
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_compression_negotiated():
+    client = build_client()
+    expected = FastJSONResponse(PAYLOAD).body
+
+    br = client.get("/big", headers={"Accept-Encoding": "br"})
+    assert br.headers["content-encoding"] == "br"
+    assert br.headers["vary"] == "Accept-Encoding"
+    assert int(br.headers["content-length"]) < len(expected) / 5
+
+    gz = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.json() == json.loads(expected)
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "br"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in client.get("/events", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_streaming_compression():
+    client = build_client()
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 50
+
+
+def test_compressed_bodies_decode():
+    body = FastJSONResponse(PAYLOAD).body
+    assert brotli.decompress(compress(body, "br")) == body
+    assert gzip.decompress(compress(body, "gzip")) == body
@@ -0,0 +1,104 @@
+"""
+Test Scheduler Module
+
+This module tests cron catch-up rules, leader election,
+exactly-once enqueueing and the status listing (leader-registered
+definitions) against an in-memory mongomock-motor database.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.shared import jobs, scheduler
+from app.shared.jobs import job
+from app.shared.scheduler import Schedule, Scheduler, due_fire_times, scheduled, select_fire_times
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@scheduled("0 4 * * *")
+@job("test.nightly", queue="default")
+async def nightly_job(ctx, fire_time):
+    return {"fire_time": fire_time}
+
+
+NOW = datetime(2026, 3, 10, 4, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    client = mongomock_motor.AsyncMongoMockClient()
+    monkeypatch.setattr(jobs, "jobs_collection", client["JobQueue"]["Jobs"])
+    monkeypatch.setattr(scheduler, "jobs_collection", client["JobQueue"]["Jobs"])
+    monkeypatch.setattr(scheduler, "schedules_collection", client["JobQueue"]["Schedules"])
+    monkeypatch.setattr(scheduler, "leases_collection", client["JobQueue"]["Leases"])
+    return client["JobQueue"]
+
+
+def run(coro):
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+
+def test_due_fire_times_and_catch_up_rules():
+    schedule = Schedule("test.nightly", "0 4 * * *")
+    fire_times = due_fire_times(schedule, NOW - timedelta(days=3, minutes=30), NOW)
+    assert [t.day for t in fire_times] == [7, 8, 9, 10]
+
+    assert select_fire_times(schedule, fire_times, NOW) == [fire_times[-1]]
+    assert select_fire_times(Schedule("x", "0 4 * * *", coalesce=False), fire_times, NOW) == fire_times
+    graced = Schedule("x", "0 4 * * *", coalesce=False, misfire_grace=2 * 86400)
+    assert select_fire_times(graced, fire_times, NOW) == fire_times[-2:]
+    assert select_fire_times(Schedule("x", "0 4 * * *", misfire_grace=60), fire_times, NOW) == []
+
+
+def test_single_leader():
+    async def scenario():
+        a, b = Scheduler(owner="a"), Scheduler(owner="b")
+        first = await a.acquire_lease(), await b.acquire_lease()
+        await a.release_lease()
+        second = await b.acquire_lease(), await a.acquire_lease()
+        return first, second
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        client = mongomock_motor.AsyncMongoMockClient()
+        monkeypatch.setattr(scheduler, "leases_collection", client["JobQueue"]["Leases"])
+        first, second = run(scenario())
+    assert first == (True, False)
+    assert second == (True, False)
+
+
+def test_fire_enqueues_each_fire_time_once(db):
+    schedule = scheduler.SCHEDULES["test.nightly"]
+
+    async def scenario():
+        a, b = Scheduler(owner="a"), Scheduler(owner="b")
+        # First sight: starts at the next fire time, nothing to catch up
+        assert await a.fire(schedule, now=NOW) == []
+        # Two days later both fire; only one enqueues the coalesced run
+        later = NOW + timedelta(days=2)
+        fired = await a.fire(schedule, now=later) + await b.fire(schedule, now=later)
+        return fired, await db["Jobs"].find({"name": "test.nightly"}).to_list(None)
+
+    fired, job_docs = run(scenario())
+    assert len(fired) == 1
+    assert len(job_docs) == 1
+    assert job_docs[0]["key"] == datetime(2026, 3, 12, 4, tzinfo=timezone.utc).isoformat()
+
+
+def test_status_lists_schedules_registered_by_the_leader(db):
+    async def scenario():
+        await db["Schedules"].insert_one({"_id": "retired.job", "cron": "0 * * * *", "enabled": True})
+        await Scheduler(owner="a").tick()
+        # Registered by a leader that imports a module this process doesn't
+        await db["Schedules"].insert_one({"_id": "remote.job", "cron": "15 * * * *", "queue": "scans", "enabled": True})
+        return await scheduler.get_schedules(auth_data={"groups": ["ADMIN"]})
+
+    status = run(scenario())
+    schedules = {s["name"]: s for s in status["schedules"]}
+    assert status["leader"] == "a"
+    assert "retired.job" not in schedules
+    assert schedules["remote.job"]["queue"] == "scans"
+    assert schedules["test.nightly"]["cron"] == "0 4 * * *"
+    assert schedules["test.nightly"]["queue"] == "default"
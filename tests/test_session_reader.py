@@ -0,0 +1,65 @@
+"""
+Test Session Reader Module
+
+This module tests single-session reads: only the matched session comes
+back, file masks cut files down to their fields (missing fields
+omitted), $in matches pick the first matching session, and session
+listings carry no files.
+"""
+
+import asyncio
+
+import pytest
+
+from app.shared.session_reader import file_fields_for, list_sessions, read_session
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def _collection():
+    collection = mongomock_motor.AsyncMongoMockClient()["UploadDB"]["Uploads"]
+    doc = {
+        "client_ID": "jd01011990",
+        "last_updated": "2024-01-02",
+        "sessions": [
+            {"session_id": "F(01-01-2024)_jd01011990", "folder_id": "F(01-01-2024)_jd01011990", "scan_date": "2024-01-01",
+             "files": [{"file_name": "0001.jpg", "file_type": "image", "CDN_link": "https://c/1", "caption": "a", "seq_number": 1}]},
+            {"session_id": "F(01-02-2024)_jd01011990", "folder_id": "F(01-02-2024)_jd01011990", "scan_date": "2024-01-02",
+             "files": [{"file_name": "0002.mp4", "file_type": "video", "caption": "b", "seq_number": 1}]},
+        ],
+    }
+    asyncio.run(collection.insert_one(doc))
+    return collection
+
+
+def test_read_session_returns_only_the_matched_session():
+    collection = _collection()
+    doc = asyncio.run(read_session(collection, "jd01011990", {"session_id": "F(01-02-2024)_jd01011990"}))
+    assert doc["client_ID"] == "jd01011990" and doc["last_updated"] == "2024-01-02"
+    assert [f["file_name"] for f in doc["session"]["files"]] == ["0002.mp4"]
+    assert asyncio.run(read_session(collection, "jd01011990", {"session_id": "missing"})) is None
+    assert asyncio.run(read_session(collection, {"$in": ["other"]}, {"session_id": "F(01-02-2024)_jd01011990"})) is None
+
+
+def test_file_masks_and_in_matches():
+    collection = _collection()
+    doc = asyncio.run(read_session(
+        collection, "jd01011990",
+        {"folder_id": {"$in": ["F(01-01-2024)_jd01011990", "F(01-02-2024)_jd01011990"]}},
+        files="thumbnails", session_fields=("session_id",)
+    ))
+    assert doc["session"] == {"session_id": "F(01-01-2024)_jd01011990", "files": [
+        {"file_name": "0001.jpg", "file_type": "image", "CDN_link": "https://c/1", "seq_number": 1}
+    ]}
+    with pytest.raises(ValueError):
+        file_fields_for("everything")
+
+
+def test_list_sessions_omits_files():
+    collection = _collection()
+    sessions = asyncio.run(list_sessions(collection, "jd01011990", ("session_id", "scan_date")))
+    assert sessions == [
+        {"session_id": "F(01-01-2024)_jd01011990", "scan_date": "2024-01-01"},
+        {"session_id": "F(01-02-2024)_jd01011990", "scan_date": "2024-01-02"},
+    ]
+    assert asyncio.run(list_sessions(collection, "nobody")) is None
@@ -0,0 +1,130 @@
+"""
+Test Session Routes Module
+
+This module tests the session routing table: unrouted sessions are
+probed for once and recorded, warm lookups stay off the database,
+unknown sessions are not cached, IDs held by several collections
+resolve by precedence, client syncs add and prune routes, routes of
+removed clients are pruned, and change events drop a client's cached
+routes and queue one sync job.
+"""
+
+import asyncio
+
+import pytest
+
+from app.shared import cache as cache_module
+from app.shared import jobs, session_routes
+from app.shared.invalidation import InvalidationEvent
+from app.shared.session_routes import SessionRouter
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.setattr(cache_module, "get_redis", lambda: None)
+    db = mongomock_motor.AsyncMongoMockClient()["UploadDB"]
+    nested = {name: db[name] for name in ("Uploads", "Saved", "Spotlights", "Content_Dump")}
+    return SessionRouter(db["session_routes"], nested)
+
+
+def _sessions(*session_ids):
+    return {"client_ID": "jd01011990", "sessions": [{"session_id": s, "files": []} for s in session_ids]}
+
+
+def test_unrouted_sessions_are_probed_once(router):
+    async def scenario():
+        await router.nested["Spotlights"].insert_one(_sessions("F(01-01-2024)_jd01011990"))
+        first = await router.resolve("F(01-01-2024)_jd01011990")
+        routes = await router.routes.count_documents({})
+        # Served from the cache, not the routes or nested collections
+        await router.nested["Spotlights"].delete_many({})
+        await router.routes.delete_many({})
+        cached = await router.collection_name("F(01-01-2024)_jd01011990")
+        unknown = await router.collection_name("F(01-02-2024)_jd01011990_SAVED")
+        invalid = await router.collection_name("nope")
+        return first, routes, cached, unknown, invalid
+
+    first, routes, cached, unknown, invalid = asyncio.run(scenario())
+    assert first == {"collection": "Spotlights", "client_ID": "jd01011990"}
+    assert routes == 1
+    assert cached == "Spotlights"
+    assert (unknown, invalid) == ("Saved", None)
+
+
+def test_ambiguous_ids_resolve_by_precedence(router):
+    async def scenario():
+        for name in ("Spotlights", "Uploads"):
+            await router.nested[name].insert_one(_sessions("F(01-01-2024)_jd01011990"))
+        by_format = await router.collection_name("F(01-01-2024)_jd01011990")
+        await router.record("Content_Dump", "jd01011990", "F(01-01-2024)_jd01011990")
+        await router.record("Content_Dump", "jd01011990", "F(01-01-2024)_jd01011990")
+        return by_format, await router.collection_name("F(01-01-2024)_jd01011990")
+
+    assert asyncio.run(scenario()) == ("Uploads", "Content_Dump")
+
+
+def test_sync_client_adds_and_prunes_routes(router):
+    async def scenario():
+        await router.nested["Uploads"].insert_one(_sessions("F(01-01-2024)_jd01011990", "F(01-02-2024)_jd01011990"))
+        added = await router.sync_client("Uploads", "jd01011990")
+        unchanged = await router.sync_client("Uploads", "jd01011990")
+        await router.nested["Uploads"].update_one(
+            {"client_ID": "jd01011990"}, {"$pull": {"sessions": {"session_id": "F(01-01-2024)_jd01011990"}}}
+        )
+        pruned = await router.sync_client("Uploads", "jd01011990")
+        return added, unchanged, pruned, await router.routes.distinct("session_id")
+
+    assert asyncio.run(scenario()) == (2, 0, 1, ["F(01-02-2024)_jd01011990"])
+
+
+def test_unknown_sessions_route_once_created(router):
+    async def scenario():
+        before = await router.resolve("F(01-01-2024)_jd01011990")
+        await router.nested["Uploads"].insert_one(_sessions("F(01-01-2024)_jd01011990"))
+        return before, await router.resolve("F(01-01-2024)_jd01011990")
+
+    assert asyncio.run(scenario()) == (None, {"collection": "Uploads", "client_ID": "jd01011990"})
+
+
+def test_removed_clients_are_pruned(router):
+    async def scenario():
+        await router.record("Content_Dump", "jd01011990", "F(01-01-2024)_jd01011990")
+        await router.nested["Uploads"].insert_one(_sessions("F(01-01-2024)_jd01011990"))
+        await router.sync_client("Uploads", "jd01011990")
+        stale = await router.collection_name("F(01-01-2024)_jd01011990")
+        pruned = await router.prune("Content_Dump")
+        return stale, pruned, await router.collection_name("F(01-01-2024)_jd01011990")
+
+    assert asyncio.run(scenario()) == ("Content_Dump", 1, "Uploads")
+
+
+def test_change_events_drop_routes_and_queue_syncs(router, monkeypatch):
+    queue = mongomock_motor.AsyncMongoMockClient()["JobQueue"]["Jobs"]
+    monkeypatch.setattr(jobs, "jobs_collection", queue)
+    monkeypatch.setattr(session_routes, "session_router", router)
+    monkeypatch.setattr(session_routes, "SESSION_ROUTES_SYNC_DEBOUNCE_SECONDS", 3600)
+    changed = [InvalidationEvent("UploadDB.Uploads", "update", "1", {"client_ID": "jd01011990"})]
+
+    async def scenario():
+        await router.nested["Uploads"].insert_one(_sessions("F(01-01-2024)_jd01011990"))
+        await router.nested["Spotlights"].insert_one({**_sessions("F(01-02-2024)_ab01011990"), "client_ID": "ab01011990"})
+        for session_id in ("F(01-01-2024)_jd01011990", "F(01-02-2024)_ab01011990"):
+            await router.resolve(session_id)
+        # Another worker: only the changed client's routes are dropped
+        await session_routes._session_documents_changed(changed, local=True)
+        cached = sorted(router.cache.l1)
+        queued_locally = await queue.count_documents({})
+        # The leader: one sync job per client within the debounce window
+        await session_routes._session_documents_changed(changed, local=False)
+        await session_routes._session_documents_changed(changed, local=False)
+        jobs_queued = await queue.find({}, {"_id": 0, "name": 1, "args": 1}).to_list(None)
+        return cached, queued_locally, jobs_queued
+
+    cached, queued_locally, jobs_queued = asyncio.run(scenario())
+    assert cached == ["F(01-02-2024)_ab01011990"]
+    assert queued_locally == 0
+    assert jobs_queued == [
+        {"name": "session_routes.sync_client", "args": {"collection": "Uploads", "client_id": "jd01011990"}}
+    ]
@@ -0,0 +1,139 @@
+"""
+Test User Directory
+
+This module tests the cached get_users directory of the CDN service with
+the aggregation stubbed out: the pipeline orders union branches before
+picking snap_ID/last_updated, results are cached per ACL scope, new
+client documents drop the cache, and session updates leave it alone.
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import os
+import sys
+
+import pytest
+
+from app.shared import cache as cache_module
+from app.shared.cache import ReadThroughCache
+from app.shared.invalidation import InvalidationEvent
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+S3_SERVICE_PATH = os.path.join(ROOT, "app", "features", "cdn", "s3_service.py")
+
+ADMIN_AUTH = {"groups": ["ADMIN"], "user_id": "admin"}
+
+
+@pytest.fixture(scope="module")
+def cdn_mongo():
+    """cdn_mongo without the S3 bucket probe app.features.cdn runs on import"""
+    monkeypatch = pytest.MonkeyPatch()
+    if "app.features.cdn" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("app.features.cdn.s3_service", S3_SERVICE_PATH)
+        s3_service = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = s3_service
+        spec.loader.exec_module(s3_service)
+    s3_service = sys.modules["app.features.cdn.s3_service"]
+    monkeypatch.setattr(s3_service.S3Service, "__init__", lambda self: setattr(self, "s3_client", None))
+    yield importlib.import_module("app.features.cdn.cdn_mongo")
+    monkeypatch.undo()
+
+
+class AggregationStub:
+    """Uploads collection serving canned aggregation output."""
+
+    def __init__(self, docs):
+        self.name = "Uploads"
+        self.docs = docs
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        docs = self.docs
+
+        class Cursor:
+            async def to_list(self, length):
+                return docs
+
+        return Cursor()
+
+
+@pytest.fixture
+def service(cdn_mongo, monkeypatch):
+    monkeypatch.setattr(cache_module, "get_redis", lambda: None)
+    monkeypatch.setattr(cdn_mongo, "user_directory_cache", ReadThroughCache("cdn_users_test", 60, 300, 10))
+
+    async def partner_scope(auth_data):
+        return {"client_id": {"$in": auth_data["clients"]}}
+
+    async def record(*args):
+        pass
+
+    monkeypatch.setattr(cdn_mongo, "filter_by_partner", partner_scope)
+    monkeypatch.setattr(cdn_mongo.session_router, "record", record)
+    service = cdn_mongo.CDNMongoService()
+    db = mongomock_motor.AsyncMongoMockClient()["UploadDB"]
+    service.collections = {
+        "Uploads": AggregationStub([
+            {"_id": "jd01011990", "snap_id": "jane", "last_updated": "2024-01-02", "content_types": ["Saved", "Uploads"]}
+        ]),
+        **{name: db[name] for name in ("Saved", "Spotlights", "Content_Dump")},
+    }
+    return service
+
+
+def test_union_branches_are_ordered_before_grouping(service):
+    pipeline = service._users_pipeline({"$type": "string"})
+    stages = [next(iter(stage)) for stage in pipeline]
+    assert stages == ["$match", "$project", "$unionWith", "$unionWith", "$unionWith", "$sort", "$group", "$sort"]
+    ordinals = [pipeline[1]["$project"]["branch"]] + [
+        stage["$unionWith"]["pipeline"][1]["$project"]["branch"] for stage in pipeline[2:5]
+    ]
+    assert ordinals == [{"$literal": n} for n in range(4)]
+    assert pipeline[5] == {"$sort": {"client_ID": 1, "branch": 1}}
+    assert pipeline[6]["$group"]["snap_id"] == {"$first": "$snap_ID"}
+
+
+def test_users_are_cached_per_scope(service):
+    uploads = service.collections["Uploads"]
+
+    async def scenario():
+        users = await service.get_users(ADMIN_AUTH)
+        await service.get_users(ADMIN_AUTH)
+        await service.get_users({"groups": ["PARTNER"], "clients": ["b", "a"]})
+        await service.get_users({"groups": ["PARTNER"], "clients": ["a", "b"]})
+        await service.get_users({"groups": ["PARTNER"], "clients": ["c"]})
+        return users
+
+    users = asyncio.run(scenario())
+    assert users == [{"client_id": "jd01011990", "snap_id": "jane", "last_updated": "2024-01-02",
+                      "content_types": ["Saved", "Uploads"]}]
+    scopes = [pipeline[0]["$match"]["client_ID"] for pipeline in uploads.pipelines]
+    assert scopes == [{"$type": "string"}, {"$type": "string", "$in": ["b", "a"]}, {"$type": "string", "$in": ["c"]}]
+
+
+def test_new_client_documents_drop_the_directory(service, cdn_mongo):
+    uploads = service.collections["Uploads"]
+
+    async def scenario():
+        await service.get_users(ADMIN_AUTH)
+        # A second session for the same client only updates its document
+        await service.create_new_session("jd01011990", "SAVED")
+        await service.get_users(ADMIN_AUTH)
+        await service.create_new_session("jd01011990", "SAVED")
+        await service.get_users(ADMIN_AUTH)
+        await cdn_mongo._client_documents_changed(
+            [InvalidationEvent("UploadDB.Saved", "update", "1", {"client_ID": "jd01011990"})], local=True
+        )
+        await service.get_users(ADMIN_AUTH)
+        await cdn_mongo._client_documents_changed(
+            [InvalidationEvent("UploadDB.Saved", "insert", "2", {"client_ID": "ab01011990"})], local=True
+        )
+        await service.get_users(ADMIN_AUTH)
+
+    asyncio.run(scenario())
+    # Loaded at start, after the new Saved document and after the insert
+    assert len(uploads.pipelines) == 3
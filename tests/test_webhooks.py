@@ -0,0 +1,158 @@
+"""
+Test Webhooks Module
+
+This module tests outbound webhook delivery against a local aiohttp
+server and an in-memory mongomock-motor outbox: one delivery per
+idempotency key, rejected payloads, deferral to the outbox with the
+circuit breaker opening, the retry job delivering once the target
+recovers, leases held while deliveries wait for their turn, and retry
+runs that never overlap.
+"""
+
+import asyncio
+import dataclasses
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+from app.shared import webhooks
+from app.shared.http_clients import http_clients
+from app.shared.webhooks import CircuitBreaker, WebhookTarget, batch_limit, dispatch, outbox_id_for, retry_outbox
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    collection = mongomock_motor.AsyncMongoMockClient()["JobQueue"]["WebhookOutbox"]
+    monkeypatch.setattr(webhooks, "webhook_outbox_collection", collection)
+    monkeypatch.setattr(webhooks, "WEBHOOK_RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(webhooks, "dispatcher", webhooks.WebhookDispatcher())
+    return collection
+
+
+def run_with_server(monkeypatch, statuses, scenario):
+    """Serve the given statuses in turn (last one repeats) and run scenario()."""
+    received = []
+
+    async def hook(request):
+        received.append((request.headers.get("Idempotency-Key"), await request.json()))
+        return web.Response(status=statuses[min(len(received), len(statuses)) - 1])
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/hook", hook)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        monkeypatch.setitem(webhooks.WEBHOOK_TARGETS, "test", WebhookTarget(
+            "test", f"http://127.0.0.1:{port}/hook", inline_attempts=2, max_attempts=5
+        ))
+        try:
+            return await scenario()
+        finally:
+            await http_clients.close()
+            await runner.cleanup()
+
+    return asyncio.run(main()), received
+
+
+def test_dispatch_delivers_once_per_key(monkeypatch, outbox):
+    async def scenario():
+        first = await dispatch("test", "profile:media:time", {"n": 1})
+        again = await dispatch("test", "profile:media:time", {"n": 1})
+        return first, again
+
+    (first, again), received = run_with_server(monkeypatch, [200], scenario)
+    assert first.delivered and first.attempts == 1
+    assert again.delivered and again.duplicate
+    assert received == [(outbox_id_for("test", "profile:media:time"), {"n": 1})]
+
+
+def test_rejected_payload_is_dead_lettered(monkeypatch, outbox):
+    result, received = run_with_server(monkeypatch, [400], lambda: dispatch("test", "bad", {}))
+    assert not result.delivered
+    assert result.status == "dead"
+    assert result.response_status == 400
+    assert len(received) == 1
+
+
+def test_failures_defer_to_outbox_and_retry(monkeypatch, outbox):
+    async def scenario():
+        failed = await dispatch("test", "later", {"n": 2})
+        await outbox.update_one({}, {"$set": {"next_attempt_at": webhooks._utcnow()}})
+        counts = await retry_outbox()
+        return failed, counts, await outbox.find_one({})
+
+    (failed, counts, doc), received = run_with_server(monkeypatch, [503, 503, 200], scenario)
+    assert not failed.delivered
+    assert failed.status == "pending"
+    assert failed.attempts == 2
+    assert counts == {"expired": 0, "delivered": 1}
+    assert doc["status"] == "delivered" and doc["attempts"] == 3
+    assert len(received) == 3
+
+
+def test_waiting_deliveries_keep_their_lease(monkeypatch, outbox):
+    monkeypatch.setattr(webhooks, "WEBHOOK_LEASE_SECONDS", 0.15)
+
+    async def scenario():
+        spaced = dataclasses.replace(webhooks.WEBHOOK_TARGETS["test"], concurrency=1, interval=0.2)
+        monkeypatch.setitem(webhooks.WEBHOOK_TARGETS, "test", spaced)
+        sends = asyncio.gather(*(dispatch("test", f"k{n}", {"n": n}) for n in range(3)))
+        # The last send waits past its first lease; a retry run must not take it
+        await asyncio.sleep(0.3)
+        counts = await retry_outbox()
+        return await sends, counts
+
+    (results, counts), received = run_with_server(monkeypatch, [200], scenario)
+    assert all(result.delivered for result in results)
+    assert counts == {"expired": 0}
+    assert sorted(body["n"] for _, body in received) == [0, 1, 2]
+
+
+def test_retry_runs_are_capped_and_do_not_overlap(monkeypatch, outbox):
+    leases = mongomock_motor.AsyncMongoMockClient()["JobQueue"]["Leases"]
+    monkeypatch.setattr(webhooks, "leases_collection", leases)
+    assert batch_limit(WebhookTarget("spaced", "http://x", interval=10)) == 6
+    assert batch_limit(WebhookTarget("fast", "http://x"), 50) == 50
+
+    async def scenario():
+        held = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_retry():
+            held.set()
+            await release.wait()
+            return {"expired": 0}
+
+        monkeypatch.setattr(webhooks, "retry_outbox", slow_retry)
+        first = asyncio.create_task(webhooks.retry_outbox_job(SimpleNamespace(job_id="a"), "t0"))
+        await held.wait()
+        overlapping = await webhooks.retry_outbox_job(SimpleNamespace(job_id="b"), "t1")
+        release.set()
+        done = await first
+        after = await webhooks.retry_outbox_job(SimpleNamespace(job_id="c"), "t2")
+        release.set()
+        return overlapping, done, after
+
+    assert asyncio.run(scenario()) == ({"skipped": True}, {"expired": 0}, {"expired": 0})
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker("test", threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.retry_after() > 0
+
+    # Reset period over: exactly one probe goes through
+    breaker.open_until = 0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()